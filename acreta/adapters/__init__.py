@@ -9,6 +9,7 @@ from acreta.adapters.registry import (
     get_connected_platform_paths,
     list_platforms,
     load_platforms,
+    refresh_platform_counts,
     remove_platform,
     save_platforms,
 )
@@ -24,6 +25,7 @@ __all__ = [
     "connect_platform",
     "remove_platform",
     "list_platforms",
+    "refresh_platform_counts",
     "get_connected_agents",
     "get_connected_platform_paths",
 ]
@@ -59,6 +59,9 @@ class Adapter(Protocol):
     def default_path(self) -> Path | None:
         """Return the default traces directory for this platform."""
 
+    def scan_sessions(self, path: Path) -> tuple[int, int]:
+        """Return ``(sessions, bytes)`` for the session files under ``path``."""
+
     def count_sessions(self, path: Path) -> int:
         """Return total session count under ``path``."""
 
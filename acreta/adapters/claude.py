@@ -8,10 +8,10 @@ from typing import Any
 
 from acreta.adapters.base import SessionRecord, ViewerMessage, ViewerSession
 from acreta.adapters.common import (
-    count_non_empty_files,
     in_window,
     load_jsonl_dict_lines,
     parse_timestamp,
+    scan_non_empty_files,
 )
 
 
@@ -20,9 +20,14 @@ def default_path() -> Path | None:
     return Path("~/.claude/projects/").expanduser()
 
 
+def scan_sessions(path: Path) -> tuple[int, int]:
+    """Return ``(sessions, bytes)`` for non-empty Claude session JSONL files."""
+    return scan_non_empty_files(path, "*.jsonl")
+
+
 def count_sessions(path: Path) -> int:
     """Count readable non-empty Claude session JSONL files."""
-    return count_non_empty_files(path, "*.jsonl")
+    return scan_sessions(path)[0]
 
 
 def find_session_path(session_id: str, traces_dir: Path | None = None) -> Path | None:
@@ -7,10 +7,10 @@ from pathlib import Path
 
 from acreta.adapters.base import SessionRecord, ViewerMessage, ViewerSession
 from acreta.adapters.common import (
-    count_non_empty_files,
     in_window,
     load_jsonl_dict_lines,
     parse_timestamp,
+    scan_non_empty_files,
 )
 
 
@@ -19,9 +19,14 @@ def default_path() -> Path | None:
     return Path("~/.codex/sessions/").expanduser()
 
 
+def scan_sessions(path: Path) -> tuple[int, int]:
+    """Return ``(sessions, bytes)`` for non-empty Codex session JSONL files."""
+    return scan_non_empty_files(path, "*.jsonl")
+
+
 def count_sessions(path: Path) -> int:
     """Count readable non-empty Codex session JSONL files."""
-    return count_non_empty_files(path, "*.jsonl")
+    return scan_sessions(path)[0]
 
 
 def _extract_message_text(content: object) -> str | None:
@@ -54,18 +54,28 @@ def load_jsonl_dict_lines(path: Path) -> list[dict[str, Any]]:
     return entries
 
 
-def count_non_empty_files(path: Path, pattern: str) -> int:
-    """Count non-empty files under ``path`` matching a glob pattern."""
+def scan_non_empty_files(path: Path, pattern: str) -> tuple[int, int]:
+    """Return ``(count, total_bytes)`` of non-empty files under ``path`` matching a glob pattern."""
     if not path.exists():
-        return 0
+        return 0, 0
     count = 0
+    total_bytes = 0
     for file_path in path.rglob(pattern):
         try:
-            if file_path.is_file() and file_path.stat().st_size > 0:
-                count += 1
+            if not file_path.is_file():
+                continue
+            size = file_path.stat().st_size
         except OSError:
             continue
-    return count
+        if size > 0:
+            count += 1
+            total_bytes += size
+    return count, total_bytes
+
+
+def count_non_empty_files(path: Path, pattern: str) -> int:
+    """Count non-empty files under ``path`` matching a glob pattern."""
+    return scan_non_empty_files(path, pattern)[0]
 
 
 def in_window(value: datetime | None, start: datetime | None, end: datetime | None) -> bool:
@@ -93,6 +103,7 @@ if __name__ == "__main__":
         rows = load_jsonl_dict_lines(sample)
         assert rows == [{"a": 1}, {"b": 2}]
         assert count_non_empty_files(Path(tmp_dir), "*.jsonl") == 1
+        assert scan_non_empty_files(Path(tmp_dir), "*.jsonl") == (1, sample.stat().st_size)
 
     now = datetime.now(timezone.utc)
     assert in_window(now, now, now)
@@ -53,16 +53,24 @@ def _count_cursor_db(db_path: Path) -> int:
                 pass
 
 
+def scan_sessions(path: Path) -> tuple[int, int]:
+    """Return ``(sessions, bytes)`` across the Cursor state DBs under ``path``."""
+    if not path.exists():
+        return 0, 0
+    sessions = 0
+    total_bytes = 0
+    for db_path in _resolve_db_paths(path):
+        try:
+            total_bytes += db_path.stat().st_size
+        except OSError:
+            continue
+        sessions += _count_cursor_db(db_path)
+    return sessions, total_bytes
+
+
 def count_sessions(path: Path) -> int:
     """Count Cursor sessions from one file or a storage directory tree."""
-    if not path.exists():
-        return 0
-    if path.is_file():
-        return _count_cursor_db(path)
-    db_path = path / "state.vscdb"
-    if db_path.exists():
-        return _count_cursor_db(db_path)
-    return sum(_count_cursor_db(db) for db in path.glob("*/state.vscdb"))
+    return scan_sessions(path)[0]
 
 
 def _parse_json_value(raw: str) -> Any | None:
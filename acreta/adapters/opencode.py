@@ -67,17 +67,25 @@ def _resolve_storage_roots(traces_dir: Path | None = None) -> list[Path]:
     return roots
 
 
-def count_sessions(path: Path) -> int:
-    """Count unique OpenCode session JSON files under resolved roots."""
+def scan_sessions(path: Path) -> tuple[int, int]:
+    """Return ``(sessions, bytes)`` for unique OpenCode session JSON files under resolved roots."""
     if not path.exists():
-        return 0
-    seen: set[Path] = set()
+        return 0, 0
+    sizes: dict[Path, int] = {}
     for root in _resolve_storage_roots(path):
         session_dir = root / "session"
         for file_path in session_dir.rglob("*.json"):
-            if file_path.is_file():
-                seen.add(file_path)
-    return len(seen)
+            try:
+                if file_path.is_file():
+                    sizes[file_path] = file_path.stat().st_size
+            except OSError:
+                continue
+    return len(sizes), sum(sizes.values())
+
+
+def count_sessions(path: Path) -> int:
+    """Count unique OpenCode session JSON files under resolved roots."""
+    return scan_sessions(path)[0]
 
 
 def find_session_path(session_id: str, traces_dir: Path | None = None) -> Path | None:
@@ -1,9 +1,18 @@
-"""Connected platform registry for session adapters."""
+"""Connected platform registry for session adapters.
+
+Each platform entry caches ``session_count``/``total_bytes`` for status polling. The
+indexer refreshes them with ``only_changed=True``, which rescans a platform only when
+its ``scan_signature`` (a hash over directory mtimes under the traces path) moved:
+adding, removing, or renaming a session file changes it, while appends to existing
+files do not, so ``total_bytes`` can lag until the next add or a ``--live`` rescan.
+"""
 
 from __future__ import annotations
 
+import hashlib
 import importlib
 import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -37,12 +46,44 @@ def _default_path_for(name: str) -> Path | None:
     return adapter.default_path()
 
 
-def _count_sessions(path: Path, name: str) -> int:
-    """Count sessions for a platform at a specific filesystem path."""
+def _scan_sessions(path: Path, name: str) -> tuple[int, int]:
+    """Return ``(sessions, bytes)`` for a platform at a specific filesystem path."""
     adapter = get_adapter(name)
     if not adapter:
-        return 0
-    return adapter.count_sessions(path)
+        return 0, 0
+    return adapter.scan_sessions(path)
+
+
+def _scan_signature(path: Path) -> str:
+    """Hash the mtimes of ``path`` and every directory under it (files are listed, never stat'ed)."""
+    digest = hashlib.sha1()
+    pending = [path]
+    while pending:
+        current = pending.pop()
+        try:
+            stat = current.stat()
+            digest.update(f"{current}\t{stat.st_mtime_ns}\t{stat.st_size}\n".encode("utf-8"))
+            if not current.is_dir():
+                continue
+            with os.scandir(current) as entries:
+                pending.extend(
+                    sorted(Path(entry.path) for entry in entries if entry.is_dir(follow_symlinks=False))
+                )
+        except OSError:
+            continue
+    return digest.hexdigest()
+
+
+def _scan_counters(path: Path, name: str, signature: str | None = None) -> dict[str, Any]:
+    """Scan one platform path and return its cached counter fields."""
+    signature = signature or _scan_signature(path)
+    session_count, total_bytes = _scan_sessions(path, name)
+    return {
+        "session_count": session_count,
+        "total_bytes": total_bytes,
+        "scanned_at": datetime.now(timezone.utc).isoformat(),
+        "scan_signature": signature,
+    }
 
 
 def load_platforms(path: Path) -> dict[str, Any]:
@@ -64,7 +105,9 @@ def load_platforms(path: Path) -> dict[str, Any]:
 def save_platforms(path: Path, data: dict[str, Any]) -> None:
     """Persist connected platform registry data to JSON."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(data, indent=2, ensure_ascii=True) + "\n", encoding="utf-8")
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(data, indent=2, ensure_ascii=True) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
 
 
 def auto_seed(path: Path) -> dict[str, Any]:
@@ -111,17 +154,18 @@ def connect_platform(path: Path, name: str, custom_path: str | None = None) -> d
             "status": "path_not_found",
         }
 
-    session_count = _count_sessions(resolved, name)
+    counters = _scan_counters(resolved, name)
     connected_at = datetime.now(timezone.utc).isoformat()
     data["platforms"][name] = {
         "path": str(resolved),
         "connected_at": connected_at,
+        **counters,
     }
     save_platforms(path, data)
     return {
         "name": name,
         "path": str(resolved),
-        "session_count": session_count,
+        "session_count": counters["session_count"],
         "connected_at": connected_at,
         "status": "connected",
     }
@@ -137,19 +181,50 @@ def remove_platform(path: Path, name: str) -> bool:
     return True
 
 
-def list_platforms(path: Path, with_counts: bool = True) -> list[dict[str, Any]]:
-    """List connected platforms with optional live session counts."""
+def refresh_platform_counts(
+    path: Path, names: list[str] | None = None, *, only_changed: bool = False
+) -> dict[str, dict[str, Any]]:
+    """Rescan connected platforms (all, or ``names``) and persist their cached counters.
+
+    With ``only_changed``, platforms whose directory signature matches the cached one
+    are skipped.
+    """
+    platforms = load_platforms(path)["platforms"]
+    scanned: dict[str, dict[str, Any]] = {}
+    for name, info in platforms.items():
+        if names is not None and name not in names:
+            continue
+        platform_path = Path(str(info.get("path") or "")).expanduser()
+        signature = _scan_signature(platform_path)
+        if only_changed and info.get("scan_signature") == signature:
+            continue
+        scanned[name] = _scan_counters(platform_path, name, signature)
+    if not scanned:
+        return scanned
+    data = load_platforms(path)
+    for name, counters in scanned.items():
+        if name in data["platforms"]:
+            data["platforms"][name].update(counters)
+    save_platforms(path, data)
+    return scanned
+
+
+def list_platforms(path: Path, *, live: bool = False) -> list[dict[str, Any]]:
+    """List connected platforms with counters cached by the indexer, or rescanned when ``live``."""
+    if live:
+        refresh_platform_counts(path)
     data = load_platforms(path)
     output: list[dict[str, Any]] = []
     for name, info in data["platforms"].items():
         platform_path = Path(str(info.get("path") or "")).expanduser()
-        session_count = _count_sessions(platform_path, name) if with_counts else 0
         output.append(
             {
                 "name": name,
                 "path": info.get("path", ""),
                 "connected_at": info.get("connected_at", ""),
-                "session_count": session_count,
+                "session_count": int(info.get("session_count") or 0),
+                "total_bytes": int(info.get("total_bytes") or 0),
+                "scanned_at": info.get("scanned_at"),
                 "exists": platform_path.exists(),
             }
         )
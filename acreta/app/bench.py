@@ -0,0 +1,633 @@
+"""Offline benchmark harness with a deterministic fake LM and fake agent SDK."""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import re
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterator
+
+import dspy
+
+BENCH_PLATFORMS = ("claude", "codex", "opencode", "cursor")
+SYNC_PLATFORMS = ("claude", "codex")
+_BASE_TIME = datetime(2026, 1, 5, 9, 0, tzinfo=timezone.utc)
+_TOPICS = ("queue", "heartbeat", "patching", "docker", "ci-cd", "sqlite", "retries")
+# Per-file hook-plus-write latencies recorded by ``fake_sdk_query`` during the sync phase.
+_MEMORY_WRITE_MS: list[float] = []
+
+
+@dataclass(frozen=True)
+class BenchConfig:
+    """Scale and fake-model settings for one benchmark run."""
+
+    sessions_per_platform: int = 20
+    turns_per_session: int = 12
+    lm_latency_ms: float = 5.0
+    lm_ms_per_token: float = 0.01
+    lm_calls_per_pipeline: int = 2
+    sync_sessions: int = 10
+
+
+# ---------------------------------------------------------------------------
+# Synthetic traces
+# ---------------------------------------------------------------------------
+
+
+def _turn_text(session: int, turn: int) -> str:
+    """Return deterministic turn text, with periodic decision/lesson markers."""
+    topic = _TOPICS[(session + turn) % len(_TOPICS)]
+    if turn % 5 == 3:
+        return f"Decision: keep {topic} handling in one module for session {session}."
+    if turn % 5 == 4:
+        return f"Lesson: {topic} failures need a retry budget and a clear error path."
+    return f"Working on {topic} step {turn} of session {session}; reading files and patching."
+
+
+def _ts(session: int, turn: int) -> datetime:
+    """Deterministic timestamp for one turn."""
+    return _BASE_TIME + timedelta(minutes=session * 7, seconds=turn * 20)
+
+
+def generate_claude_traces(root: Path, sessions: int, turns: int) -> Path:
+    """Write Claude-style JSONL sessions under ``root/claude``."""
+    base = root / "claude" / "bench-project"
+    base.mkdir(parents=True, exist_ok=True)
+    for s in range(sessions):
+        rows: list[dict[str, Any]] = []
+        for t in range(turns):
+            stamp = _ts(s, t).isoformat()
+            if t % 2 == 0:
+                rows.append({"type": "user", "timestamp": stamp, "gitBranch": "main", "message": {"content": _turn_text(s, t)}})
+                continue
+            rows.append(
+                {
+                    "type": "assistant",
+                    "timestamp": stamp,
+                    "message": {
+                        "model": "bench-model",
+                        "content": [
+                            {"type": "text", "text": _turn_text(s, t)},
+                            {"type": "tool_use", "id": f"tu-{s}-{t}", "name": "Edit", "input": {"file_path": f"src/m{t % 4}.py"}},
+                        ],
+                        "usage": {"input_tokens": 400 + t, "output_tokens": 80},
+                    },
+                }
+            )
+        (base / f"claude-bench-{s:05d}.jsonl").write_text(
+            "\n".join(json.dumps(row) for row in rows) + "\n", encoding="utf-8"
+        )
+    return root / "claude"
+
+
+def generate_codex_traces(root: Path, sessions: int, turns: int) -> Path:
+    """Write Codex-style JSONL sessions under ``root/codex``."""
+    base = root / "codex" / "2026" / "01" / "05"
+    base.mkdir(parents=True, exist_ok=True)
+    for s in range(sessions):
+        rows: list[dict[str, Any]] = [
+            {"type": "session_meta", "timestamp": _ts(s, 0).isoformat(), "payload": {"git": {"branch": "main"}}},
+            {"type": "turn_context", "payload": {"model": "bench-codex"}},
+        ]
+        for t in range(turns):
+            kind = "user_message" if t % 2 == 0 else "agent_message"
+            rows.append({"type": "event_msg", "timestamp": _ts(s, t).isoformat(), "payload": {"type": kind, "message": _turn_text(s, t)}})
+            if t % 2:
+                rows.append({"type": "response_item", "payload": {"type": "function_call", "name": "shell", "arguments": json.dumps({"path": f"src/m{t % 4}.py"})}})
+                rows.append({"type": "response_item", "payload": {"type": "function_call_output", "output": "ok"}})
+                rows.append({"type": "event_msg", "payload": {"type": "token_count", "info": {"last_token_usage": {"input_tokens": 300, "output_tokens": 60}}}})
+        (base / f"codex-bench-{s:05d}.jsonl").write_text(
+            "\n".join(json.dumps(row) for row in rows) + "\n", encoding="utf-8"
+        )
+    return root / "codex"
+
+
+def generate_opencode_traces(root: Path, sessions: int, turns: int) -> Path:
+    """Write OpenCode-style JSON storage (session/message/part files)."""
+    storage = root / "opencode" / "storage"
+    for s in range(sessions):
+        session_id = f"opencode-bench-{s:05d}"
+        created_ms = int(_ts(s, 0).timestamp() * 1000)
+        (storage / "session").mkdir(parents=True, exist_ok=True)
+        (storage / "session" / f"{session_id}.json").write_text(
+            json.dumps({"id": session_id, "createdAt": created_ms, "directory": "/bench/repo"}), encoding="utf-8"
+        )
+        msg_dir = storage / "message" / session_id
+        msg_dir.mkdir(parents=True, exist_ok=True)
+        for t in range(turns):
+            msg_id = f"{session_id}-m{t:03d}"
+            (msg_dir / f"{msg_id}.json").write_text(
+                json.dumps(
+                    {
+                        "id": msg_id,
+                        "role": "user" if t % 2 == 0 else "assistant",
+                        "time": {"created": int(_ts(s, t).timestamp() * 1000)},
+                        "tokens": {"input": 200, "output": 50},
+                    }
+                ),
+                encoding="utf-8",
+            )
+            part_dir = storage / "part" / msg_id
+            part_dir.mkdir(parents=True, exist_ok=True)
+            (part_dir / "p0.json").write_text(json.dumps({"type": "text", "text": _turn_text(s, t)}), encoding="utf-8")
+            if t % 2:
+                (part_dir / "p1.json").write_text(
+                    json.dumps({"type": "tool", "tool": "bash", "state": {"input": {"command": "pytest"}, "output": "ok"}}),
+                    encoding="utf-8",
+                )
+    return root / "opencode"
+
+
+def generate_cursor_traces(root: Path, sessions: int, turns: int) -> Path:
+    """Write a Cursor-style ``state.vscdb`` with composerData rows."""
+    base = root / "cursor" / "bench-workspace"
+    base.mkdir(parents=True, exist_ok=True)
+    with sqlite3.connect(base / "state.vscdb") as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS cursorDiskKV (key TEXT UNIQUE ON CONFLICT REPLACE, value BLOB)")
+        for s in range(sessions):
+            conversation = [
+                {"type": 1 if t % 2 == 0 else 2, "text": _turn_text(s, t), "timestamp": _ts(s, t).isoformat()}
+                for t in range(turns)
+            ]
+            conn.execute(
+                "INSERT INTO cursorDiskKV (key, value) VALUES (?, ?)",
+                (f"composerData:cursor-bench-{s:05d}", json.dumps({"conversation": conversation})),
+            )
+        conn.commit()
+    return root / "cursor"
+
+
+TRACE_GENERATORS: dict[str, Callable[[Path, int, int], Path]] = {
+    "claude": generate_claude_traces,
+    "codex": generate_codex_traces,
+    "opencode": generate_opencode_traces,
+    "cursor": generate_cursor_traces,
+}
+
+
+# ---------------------------------------------------------------------------
+# Fake LM, scripted RLM, and fake agent SDK
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class FakeLM:
+    """Deterministic LM stand-in with a fixed latency plus per-token cost."""
+
+    latency_ms: float = 5.0
+    ms_per_token: float = 0.01
+    output_tokens: int = 64
+    model: str = "bench/fake-lm"
+    calls: int = 0
+    tokens: int = 0
+    simulated_ms: float = 0.0
+
+    def __call__(self, prompt: str | None = None, messages: list[dict[str, Any]] | None = None, **_kwargs: Any) -> list[str]:
+        """Sleep for the modeled latency and return a fixed completion."""
+        text = prompt or "\n".join(str(item.get("content") or "") for item in messages or [])
+        tokens = len(text) // 4 + self.output_tokens
+        delay_ms = self.latency_ms + tokens * self.ms_per_token
+        time.sleep(delay_ms / 1000.0)
+        self.calls += 1
+        self.tokens += tokens
+        self.simulated_ms += delay_ms
+        return ["ok"]
+
+
+class ScriptedRLM:
+    """Drop-in for ``dspy.RLM`` that calls the active LM a fixed number of times."""
+
+    llm_calls = 2
+
+    def __init__(self, signature: Any, **_kwargs: Any) -> None:
+        self.signature = signature
+
+    def __call__(self, *, transcript: str, metadata: dict[str, Any], metrics: dict[str, Any]) -> dspy.Prediction:
+        """Return deterministic outputs derived from marker lines in the transcript."""
+        lm = dspy.settings.lm
+        for _ in range(self.llm_calls):
+            lm(messages=[{"role": "user", "content": transcript[:4000]}])
+        outputs = getattr(self.signature, "output_fields", {})
+        if "primitives" in outputs:
+            return dspy.Prediction(primitives=_scripted_candidates(transcript))
+        return dspy.Prediction(summary_payload=_scripted_summary(transcript, metadata))
+
+
+def _scripted_candidates(transcript: str) -> list[dict[str, Any]]:
+    """Turn ``Decision:``/``Lesson:`` lines into up to five candidates."""
+    candidates: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    for match in re.finditer(r"(Decision|Lesson): ([^\"\n]{8,160})", transcript):
+        body = match.group(2).strip().rstrip(".")
+        if body in seen:
+            continue
+        seen.add(body)
+        primitive = "decision" if match.group(1) == "Decision" else "learning"
+        candidates.append(
+            {
+                "primitive": primitive,
+                "kind": None if primitive == "decision" else "insight",
+                "title": body[:60],
+                "body": body,
+                "confidence": 0.8,
+                "tags": [body.split()[1] if len(body.split()) > 1 else "bench"],
+            }
+        )
+        if len(candidates) >= 5:
+            break
+    return candidates
+
+
+def _scripted_summary(transcript: str, metadata: dict[str, Any]) -> dict[str, Any]:
+    """Build a schema-valid summary payload without any model call."""
+    words = re.findall(r"[A-Za-z]+", transcript)[:60]
+    return {
+        "title": f"Bench session {metadata.get('run_id') or 'run'}",
+        "description": "Synthetic benchmark session.",
+        "summary": " ".join(words) or "empty",
+        "date": "2026-01-05",
+        "time": "09:00:00",
+        "coding_agent": "bench",
+        "raw_trace_path": str(metadata.get("raw_trace_path") or ""),
+        "run_id": metadata.get("run_id"),
+        "tags": ["bench"],
+    }
+
+
+def _prompt_field(prompt: str, name: str) -> str:
+    """Read one ``- name: value`` line from the sync prompt."""
+    match = re.search(rf"^- {re.escape(name)}: (.+)$", prompt, flags=re.MULTILINE)
+    if not match:
+        raise RuntimeError(f"bench_prompt_missing:{name}")
+    return match.group(1).strip()
+
+
+async def fake_sdk_query(*, prompt: str, options: Any) -> AsyncIterator[Any]:
+    """Replay the sync flow's tool calls in-process instead of calling the SDK.
+
+    Pipelines run directly (the scripted ``Bash`` calls), memory files go
+    through the real PreToolUse hook (the scripted ``Write`` calls), and the
+    usual run artifacts are written so ``AcretaAgent.sync`` validates them.
+    """
+    from claude_agent_sdk.types import AssistantMessage, ResultMessage, TextBlock
+
+    from acreta.memory.extract_pipeline import extract_memories_from_session_file
+    from acreta.memory.matching import write_match_report
+    from acreta.memory.memory_record import MEMORY_TYPE_FOLDERS, MemoryType
+    from acreta.memory.summarization_pipeline import (
+        summarize_trace_from_session_file,
+        write_summary_markdown,
+    )
+    from acreta.memory.transaction import atomic_write_text
+
+    trace_path = Path(_prompt_field(prompt, "trace_path"))
+    memory_root = Path(_prompt_field(prompt, "memory_root_path"))
+    artifacts = {key: Path(value) for key, value in json.loads(_prompt_field(prompt, "artifact_paths_json")).items()}
+    offset_match = re.search(r"--start-offset (\d+)", prompt)
+    start_offset = int(offset_match.group(1)) if offset_match else 0
+    run_id = artifacts["extract"].parent.name
+
+    candidates = extract_memories_from_session_file(trace_path, metadata={"run_id": run_id}, start_offset=start_offset)
+    artifacts["extract"].write_text(json.dumps(candidates) + "\n", encoding="utf-8")
+    payload = summarize_trace_from_session_file(trace_path, metadata={"run_id": run_id}, start_offset=start_offset)
+    summary_path = write_summary_markdown(payload, memory_root, run_id=run_id)
+    artifacts["summary"].write_text(json.dumps({"summary_path": str(summary_path)}) + "\n", encoding="utf-8")
+
+    report_rows = write_match_report(artifacts["extract"], memory_root, artifacts["matches"])["matches"]
+
+    guard = options.hooks["PreToolUse"][0].hooks[0] if options.hooks else None
+    written: list[str] = []
+    actions: list[dict[str, Any]] = []
+    for row in report_rows:
+        if row["action"] != "add":
+            actions.append({"action": row["action"], "path": row["matched_file"], "score": row["score"]})
+            continue
+        item = candidates[row["candidate_id"]]
+        folder = MEMORY_TYPE_FOLDERS[MemoryType(item["primitive"])]
+        tags = ", ".join(item.get("tags") or [])
+        content = f"---\ntitle: {item['title']}\ntags: [{tags}]\n---\n{item['body']}\n"
+        tool_input = {"file_path": str(memory_root / folder / "draft.md"), "content": content}
+        started = time.perf_counter()
+        if guard is not None:
+            decision = (await guard({"tool_name": "Write", "tool_input": tool_input}, None, None))["hookSpecificOutput"]
+            if decision.get("permissionDecision") != "allow":
+                continue
+            tool_input = decision["updatedInput"]
+        target = atomic_write_text(Path(tool_input["file_path"]), tool_input["content"])
+        _MEMORY_WRITE_MS.append((time.perf_counter() - started) * 1000)
+        written.append(str(target))
+        actions.append({"action": "add", "path": str(target)})
+
+    artifacts["subagents_log"].write_text("", encoding="utf-8")
+    counts = {key: sum(1 for item in actions if item["action"] == key) for key in ("add", "update", "no_op")}
+    report = {
+        "run_id": run_id,
+        "todos": [],
+        "actions": actions,
+        "counts": counts,
+        "written_memory_paths": written,
+        "trace_path": str(trace_path),
+    }
+    artifacts["memory_actions"].write_text(json.dumps(report) + "\n", encoding="utf-8")
+    yield AssistantMessage(content=[TextBlock(text=f"bench sync done: {len(written)} written")], model="bench")
+    yield ResultMessage(
+        subtype="success", duration_ms=0, duration_api_ms=0, is_error=False, num_turns=1, session_id=f"bench-{run_id}"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Harness
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def _patched(target: Any, name: str, value: Any) -> Iterator[None]:
+    """Temporarily replace one attribute."""
+    original = getattr(target, name)
+    setattr(target, name, value)
+    try:
+        yield
+    finally:
+        setattr(target, name, original)
+
+
+@contextmanager
+def _bench_environment(root: Path) -> Iterator[None]:
+    """Point Acreta config at an isolated data root and cwd for the run."""
+    keys = {
+        "ACRETA_DATA_DIR": str(root / "data"),
+        "ACRETA_MEMORY_DIR": str(root / "data" / "memory"),
+        "ACRETA_INDEX_DIR": str(root / "data" / "index"),
+        "ACRETA_SESSIONS_DB": str(root / "data" / "index" / "sessions.sqlite3"),
+        "ACRETA_PLATFORMS_PATH": str(root / "data" / "platforms.json"),
+        "ACRETA_MEMORY_SCOPE": "global_only",
+        "ACRETA_DSPY_PROVIDER": "ollama",
+    }
+    saved = {key: os.environ.get(key) for key in keys}
+    cwd = Path.cwd()
+    os.environ.update(keys)
+    os.chdir(root)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        from acreta.config.settings import load_config
+
+        load_config.cache_clear()
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    """Return p50/p95/mean for millisecond samples."""
+    if not samples:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "mean_ms": 0.0}
+    ordered = sorted(samples)
+    return {
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+    }
+
+
+def _rate(count: int, seconds: float) -> float:
+    """Return items per second rounded for reports."""
+    return round(count / seconds, 3) if seconds > 0 else 0.0
+
+
+def _bench_frontmatter(root: Path, files: int) -> dict[str, Any]:
+    """Write synthetic memory files and compare python-frontmatter and codec parse throughput."""
+    import frontmatter
+
+    from acreta.memory.frontmatter_codec import load_frontmatter
+    from acreta.memory.memory_record import MemoryRecord
+
+    root.mkdir(parents=True, exist_ok=True)
+    paths: list[Path] = []
+    for index in range(files):
+        topic = _TOPICS[index % len(_TOPICS)]
+        record = MemoryRecord(
+            id=f"{topic}-rule-{index}",
+            primitive="learning" if index % 2 else "decision",
+            kind="insight" if index % 2 else None,
+            title=f"{topic} rule {index}: keep handling in one module",
+            body="\n".join(_turn_text(index, turn) for turn in range(12)),
+            confidence=0.8,
+            tags=[topic, "bench"],
+            source="bench-run",
+        )
+        path = root / f"{index:05d}.md"
+        path.write_text(record.to_markdown(), encoding="utf-8")
+        paths.append(path)
+
+    def _throughput(load: Callable[[Path], Any]) -> float:
+        started = time.perf_counter()
+        for path in paths:
+            load(path)
+        return _rate(len(paths), time.perf_counter() - started)
+
+    baseline = _throughput(lambda path: frontmatter.load(str(path)))
+    codec = _throughput(load_frontmatter)
+    return {
+        "files": len(paths),
+        "python_frontmatter_files_per_sec": baseline,
+        "codec_files_per_sec": codec,
+        "speedup": round(codec / baseline, 3) if baseline else 0.0,
+    }
+
+
+def _git_commit() -> str | None:
+    """Return the current git commit for result comparison, when available."""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parents[2],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+@dataclass
+class BenchResult:
+    """Benchmark report emitted as JSON."""
+
+    meta: dict[str, Any] = field(default_factory=dict)
+    results: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable report."""
+        return asdict(self)
+
+
+def run_bench(config: BenchConfig) -> BenchResult:
+    """Generate traces, then measure indexing, queue, pipelines, and sync."""
+    from acreta.adapters import registry
+    from acreta.app import daemon
+    from acreta.config.settings import reload_config
+    from acreta.memory import utils as memory_utils
+    from acreta.memory.extract_pipeline import extract_memories_from_session_file
+    from acreta.memory.summarization_pipeline import summarize_trace_from_session_file
+    from acreta.runtime.agent import AcretaAgent
+    from acreta.sessions import catalog
+
+    import claude_agent_sdk
+
+    report = BenchResult(
+        meta={
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "config": asdict(config),
+        }
+    )
+    fake_lm = FakeLM(latency_ms=config.lm_latency_ms, ms_per_token=config.lm_ms_per_token)
+    ScriptedRLM.llm_calls = max(1, config.lm_calls_per_pipeline)
+
+    with tempfile.TemporaryDirectory(prefix="acreta-bench-") as tmp_dir:
+        root = Path(tmp_dir)
+        with (
+            _bench_environment(root),
+            _patched(dspy, "RLM", ScriptedRLM),
+            _patched(memory_utils, "get_dspy_lm", lambda *_args, **_kwargs: fake_lm),
+            _patched(claude_agent_sdk, "query", fake_sdk_query),
+        ):
+            cfg = reload_config()
+            started = time.perf_counter()
+            trace_roots = {
+                name: TRACE_GENERATORS[name](root / "traces", config.sessions_per_platform, config.turns_per_session)
+                for name in BENCH_PLATFORMS
+            }
+            report.results["generate"] = {"seconds": round(time.perf_counter() - started, 4)}
+            for name, path in trace_roots.items():
+                registry.connect_platform(cfg.platforms_path, name, str(path))
+            catalog.init_sessions_db()
+
+            started = time.perf_counter()
+            indexed = catalog.index_new_sessions(agents=list(BENCH_PLATFORMS), return_details=True)
+            elapsed = time.perf_counter() - started
+            details = indexed if isinstance(indexed, list) else []
+            report.results["indexing"] = {
+                "sessions": len(details),
+                "seconds": round(elapsed, 4),
+                "sessions_per_sec": _rate(len(details), elapsed),
+            }
+
+            started = time.perf_counter()
+            for item in details:
+                catalog.enqueue_session_job(item.run_id, agent_type=item.agent_type, session_path=item.session_path)
+            drained = 0
+            while True:
+                claimed = catalog.claim_session_jobs(limit=50)
+                if not claimed:
+                    break
+                for job in claimed:
+                    catalog.complete_session_job(str(job["run_id"]))
+                    drained += 1
+            elapsed = time.perf_counter() - started
+            report.results["queue"] = {"jobs": drained, "seconds": round(elapsed, 4), "jobs_per_sec": _rate(drained, elapsed)}
+
+            text_sessions = [item for item in details if item.agent_type in SYNC_PLATFORMS]
+            extract_ms: list[float] = []
+            summary_ms: list[float] = []
+            sample = text_sessions[: max(1, config.sync_sessions)]
+            lm_ms_before = fake_lm.simulated_ms
+            for item in sample:
+                started = time.perf_counter()
+                extract_memories_from_session_file(Path(item.session_path), metadata={"run_id": item.run_id})
+                extract_ms.append((time.perf_counter() - started) * 1000)
+                started = time.perf_counter()
+                summarize_trace_from_session_file(Path(item.session_path), metadata={"run_id": item.run_id})
+                summary_ms.append((time.perf_counter() - started) * 1000)
+            lm_ms = fake_lm.simulated_ms - lm_ms_before
+            total_ms = sum(extract_ms) + sum(summary_ms)
+            report.results["pipelines"] = {
+                "runs": len(sample),
+                "extract": _percentiles(extract_ms),
+                "summary": _percentiles(summary_ms),
+                "lm_simulated_ms": round(lm_ms, 3),
+                "overhead_ms_per_run": round((total_ms - lm_ms) / max(1, 2 * len(sample)), 3),
+            }
+
+            sync_ms: list[float] = []
+            original_sync = AcretaAgent.sync
+
+            def _timed_sync(self: AcretaAgent, *args: Any, **kwargs: Any) -> dict[str, Any]:
+                started_at = time.perf_counter()
+                try:
+                    return original_sync(self, *args, **kwargs)
+                finally:
+                    sync_ms.append((time.perf_counter() - started_at) * 1000)
+
+            for item in sample:
+                catalog.enqueue_session_job(
+                    item.run_id, agent_type=item.agent_type, session_path=item.session_path, force=True
+                )
+            _MEMORY_WRITE_MS.clear()
+            with _patched(AcretaAgent, "sync", _timed_sync):
+                started = time.perf_counter()
+                _, summary = daemon.run_sync_once(
+                    run_id=None,
+                    agent_filter=list(SYNC_PLATFORMS),
+                    no_extract=False,
+                    force=True,
+                    max_sessions=len(sample),
+                    dry_run=False,
+                    ignore_lock=True,
+                    trigger="bench",
+                )
+                elapsed = time.perf_counter() - started
+            report.results["sync"] = {
+                "sessions": summary.extracted_sessions,
+                "failed": summary.failed_sessions,
+                "learnings_new": summary.learnings_new,
+                "seconds": round(elapsed, 4),
+                "sessions_per_sec": _rate(summary.extracted_sessions, elapsed),
+                "sync_total": _percentiles(sync_ms),
+                "memory_write": _percentiles(_MEMORY_WRITE_MS),
+            }
+            report.results["fake_lm"] = {"calls": fake_lm.calls, "tokens": fake_lm.tokens}
+            report.results["frontmatter"] = _bench_frontmatter(
+                root / "frontmatter", max(50, config.sessions_per_platform * 25)
+            )
+    return report
+
+
+def compare_results(current: dict[str, Any], baseline: dict[str, Any]) -> dict[str, float]:
+    """Return percent change for every numeric leaf present in both reports."""
+    deltas: dict[str, float] = {}
+
+    def _walk(cur: Any, base: Any, prefix: str) -> None:
+        if isinstance(cur, dict) and isinstance(base, dict):
+            for key, value in cur.items():
+                if key in base:
+                    _walk(value, base[key], f"{prefix}.{key}" if prefix else key)
+        elif isinstance(cur, (int, float)) and isinstance(base, (int, float)) and not isinstance(cur, bool):
+            if base:
+                deltas[prefix] = round((cur - base) / base * 100.0, 2)
+
+    _walk(current.get("results") or {}, baseline.get("results") or {}, "")
+    return deltas
+
+
+if __name__ == "__main__":
+    result = run_bench(BenchConfig(sessions_per_platform=3, turns_per_session=8, lm_latency_ms=0.0, sync_sessions=2))
+    assert result.results["indexing"]["sessions"] == 12
+    assert result.results["sync"]["sessions"] == 2
+    assert compare_results(result.to_dict(), result.to_dict())["indexing.sessions"] == 0.0
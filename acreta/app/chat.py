@@ -0,0 +1,106 @@
+"""Shared chat preparation for CLI and dashboard: retrieve evidence, build the prompt."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from acreta.app.chat_cache import CachedAnswer, ChatAnswerCache, get_chat_cache
+from acreta.config.settings import Config, get_config
+from acreta.memory.access_stats import record_hit_access
+from acreta.memory.digest import existing_memory_digest
+from acreta.memory.retrieval import RetrievalResult, chat_memory_roots, retrieve_chat_context
+from acreta.runtime.prompts.chat import build_chat_prompt, looks_like_auth_error
+
+_CITATION_RE = re.compile(r"\[([^\[\]\s]+)\]")
+
+
+@dataclass
+class ChatRequest:
+    """A chat question with its retrieved evidence and final agent prompt."""
+
+    question: str
+    prompt: str
+    retrieval: RetrievalResult
+    model_key: str = ""
+    cache: ChatAnswerCache | None = None
+    memory_roots: list[Path] = field(default_factory=list)
+
+    @property
+    def memory_ids(self) -> list[str]:
+        """Return ids of the memories packed into the prompt."""
+        return [str(hit.get("id", "")) for hit in self.retrieval.hits]
+
+    @property
+    def cacheable(self) -> bool:
+        """Return whether answers depend only on the versioned memory corpus.
+
+        Low-confidence answers may fan out to files outside the corpus, so they
+        are never cached.
+        """
+        return self.cache is not None and self.retrieval.confident
+
+    def cached_answer(self) -> CachedAnswer | None:
+        """Return a cached answer for this question and corpus version, if any."""
+        if not self.cacheable or self.cache is None:
+            return None
+        return self.cache.get(
+            self.question,
+            corpus_version=self.retrieval.corpus_version,
+            model=self.model_key,
+        )
+
+    def record_citations(self, response: str) -> None:
+        """Count an access citation for every packed memory whose ``[id]`` the answer cites."""
+        cited = set(_CITATION_RE.findall(response or ""))
+        hits = [hit for hit in self.retrieval.hits if str(hit.get("id", "")) in cited]
+        if hits:
+            record_hit_access(self.memory_roots, hits, "citation", path_key="path")
+
+    def remember_answer(self, response: str, session_id: str) -> None:
+        """Cache a successful agent answer for repeated questions."""
+        if not self.cacheable or self.cache is None:
+            return
+        if not response or response == "(no response)" or looks_like_auth_error(response):
+            return
+        self.cache.put(
+            self.question,
+            corpus_version=self.retrieval.corpus_version,
+            model=self.model_key,
+            response=response,
+            session_id=session_id,
+            memory_ids=self.memory_ids,
+        )
+
+
+def prepare_chat(
+    question: str,
+    *,
+    limit: int = 12,
+    cwd: Path | None = None,
+    config: Config | None = None,
+) -> ChatRequest:
+    """Rank memories across scopes and build the retrieval-first chat prompt."""
+    config = config or get_config()
+    roots = chat_memory_roots(config, cwd or Path.cwd())
+    retrieval = retrieve_chat_context(
+        question,
+        roots,
+        limit=limit,
+        token_budget=config.search_chat_context_tokens,
+    )
+    memory_roots = [root.path for root in roots]
+    record_hit_access(memory_roots, retrieval.hits, "retrieval", path_key="path")
+    digest_path = None if retrieval.confident else existing_memory_digest(config.memory_dir)
+    prompt = build_chat_prompt(
+        question, retrieval.hits, [], digest_path, confident=retrieval.confident
+    )
+    return ChatRequest(
+        question=question,
+        prompt=prompt,
+        retrieval=retrieval,
+        model_key=f"{config.provider}:{config.agent_model or ''}:{limit}:{config.search_chat_context_tokens}",
+        cache=get_chat_cache(config),
+        memory_roots=memory_roots,
+    )
@@ -0,0 +1,165 @@
+"""SQLite answer cache for chat keyed by normalized question and memory-corpus version.
+
+Entries live in ``<index_dir>/chat_cache.sqlite3``. A cached answer is reused only
+while the corpus version (a rolling hash over every searched memory) is unchanged,
+so editing any cited memory invalidates it. Entries also expire after a TTL and
+the least recently used ones are evicted past ``max_entries``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from acreta.memory.retrieval import query_terms
+
+CACHE_FILENAME = "chat_cache.sqlite3"
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question to its sorted unique content terms."""
+    terms = sorted(set(query_terms(question)))
+    return " ".join(terms) if terms else " ".join(str(question or "").lower().split())
+
+
+@dataclass
+class CachedAnswer:
+    """One cached chat answer with the session and memories it came from."""
+
+    response: str
+    session_id: str
+    memory_ids: list[str] = field(default_factory=list)
+    created_at: float = 0.0
+
+
+class ChatAnswerCache:
+    """Bounded TTL + LRU store of chat answers."""
+
+    def __init__(self, db_path: Path, *, ttl_seconds: float, max_entries: int) -> None:
+        self.db_path = db_path
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self.max_entries = max(1, int(max_entries))
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database, creating its table on first use."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        if not self._initialized:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chat_answers (
+                    cache_key TEXT PRIMARY KEY,
+                    question TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    memory_ids TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            self._initialized = True
+        return conn
+
+    @staticmethod
+    def cache_key(question: str, *, corpus_version: str, model: str) -> str:
+        """Return the entry key for a question under one corpus version and model."""
+        raw = f"{model}\n{normalize_question(question)}\n{corpus_version}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, question: str, *, corpus_version: str, model: str) -> CachedAnswer | None:
+        """Return a fresh cached answer and mark it recently used, or None."""
+        key = self.cache_key(question, corpus_version=corpus_version, model=model)
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT response, session_id, memory_ids, created_at FROM chat_answers WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if now - float(row[3]) > self.ttl_seconds:
+                conn.execute("DELETE FROM chat_answers WHERE cache_key = ?", (key,))
+                return None
+            conn.execute(
+                "UPDATE chat_answers SET last_used_at = ?, hits = hits + 1 WHERE cache_key = ?",
+                (now, key),
+            )
+        return CachedAnswer(
+            response=str(row[0]),
+            session_id=str(row[1]),
+            memory_ids=list(json.loads(row[2] or "[]")),
+            created_at=float(row[3]),
+        )
+
+    def put(
+        self,
+        question: str,
+        *,
+        corpus_version: str,
+        model: str,
+        response: str,
+        session_id: str,
+        memory_ids: list[str],
+    ) -> None:
+        """Store an answer, then drop expired and least recently used entries."""
+        key = self.cache_key(question, corpus_version=corpus_version, model=model)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO chat_answers
+                    (cache_key, question, response, session_id, memory_ids, created_at, last_used_at, hits)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+                """,
+                (key, question, response, session_id, json.dumps(memory_ids), now, now),
+            )
+            conn.execute("DELETE FROM chat_answers WHERE created_at < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                """
+                DELETE FROM chat_answers WHERE cache_key NOT IN (
+                    SELECT cache_key FROM chat_answers ORDER BY last_used_at DESC LIMIT ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def stats(self) -> dict[str, Any]:
+        """Return entry and hit counts for status output."""
+        with self._connect() as conn:
+            entries, hits = conn.execute("SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM chat_answers").fetchone()
+        return {"entries": int(entries), "hits": int(hits)}
+
+
+def get_chat_cache(config: Any) -> ChatAnswerCache | None:
+    """Return the chat answer cache for ``config``, or None when disabled."""
+    if not config.chat_cache_enabled:
+        return None
+    return ChatAnswerCache(
+        Path(config.index_dir) / CACHE_FILENAME,
+        ttl_seconds=config.chat_cache_ttl_hours * 3600,
+        max_entries=config.chat_cache_max_entries,
+    )
+
+
+if __name__ == "__main__":
+    """Run a real-path self-test for keying, invalidation, and LRU eviction."""
+    from tempfile import TemporaryDirectory
+
+    with TemporaryDirectory() as tmp_dir:
+        cache = ChatAnswerCache(Path(tmp_dir) / CACHE_FILENAME, ttl_seconds=3600, max_entries=2)
+        cache.put("Why LanceDB?", corpus_version="v1", model="m", response="fast", session_id="s", memory_ids=["a"])
+        assert cache.get("why lancedb", corpus_version="v1", model="m").response == "fast"
+        assert cache.get("why lancedb", corpus_version="v2", model="m") is None
+        cache.put("q2", corpus_version="v1", model="m", response="2", session_id="s", memory_ids=[])
+        cache.get("Why LanceDB?", corpus_version="v1", model="m")
+        cache.put("q3", corpus_version="v1", model="m", response="3", session_id="s", memory_ids=[])
+        assert cache.get("q2", corpus_version="v1", model="m") is None
+        assert cache.stats()["entries"] == 2
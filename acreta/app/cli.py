@@ -8,7 +8,7 @@ import sys
 from dataclasses import asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Literal, cast
+from typing import Any, Iterable, Literal, cast
 
 from acreta import __version__
 from acreta.adapters.registry import (
@@ -24,20 +24,29 @@ from acreta.app.arg_utils import (
     parse_csv,
     parse_duration_to_seconds,
 )
+from acreta.app.chat import ChatRequest, prepare_chat
 from acreta.app.dashboard import run_dashboard_server
 from acreta.app.daemon import resolve_window_bounds, run_maintain_once, run_sync_once
 from acreta.app.daemon import run_daemon_forever, run_daemon_once
 from acreta.config.project_scope import resolve_data_dirs
 from acreta.config.logging import configure_logging
 from acreta.config.settings import get_config
+from acreta.memory.access_stats import compute_priors, record_hit_access
+from acreta.memory.journal import journal_for_memory_root, record_memory_change
+from acreta.memory.memory_counts import list_memory_files, memory_counts
 from acreta.memory.memory_repo import build_memory_paths, reset_memory_root
 from acreta.memory.memory_record import MemoryRecord, MemoryType, memory_folder, slugify
+from acreta.memory.retrieval import chat_memory_roots, search_memories
+from acreta.memory.summary_store import read_summary_text
+from acreta.memory.transaction import atomic_write_text, memory_root_lock
 from acreta.runtime.agent import AcretaAgent
-from acreta.runtime.prompts.chat import build_chat_prompt, looks_like_auth_error
+from acreta.runtime.streaming import ChatEvent
+from acreta.runtime.prompts.chat import looks_like_auth_error
 from acreta.sessions.catalog import (
     count_fts_indexed,
     count_session_jobs_by_status,
     latest_service_run,
+    rewrite_summary_paths,
 )
 
 
@@ -56,22 +65,16 @@ def _hoist_global_json_flag(raw: list[str]) -> list[str]:
 
 def _list_memory_files(memory_dir: Path) -> list[Path]:
     """List all markdown files in canonical memory primitive folders."""
-    paths: list[Path] = []
-    for mtype in MemoryType:
-        folder = memory_dir / memory_folder(mtype)
-        if folder.exists():
-            paths.extend(sorted(folder.rglob("*.md")))
-    return paths
+    return list_memory_files(memory_dir)
 
 
 def _read_memory_frontmatter(path: Path) -> dict[str, Any] | None:
     """Read frontmatter from a memory markdown file. Returns None on parse error."""
-    import frontmatter
+    from acreta.memory.frontmatter_codec import parse_frontmatter
 
     try:
-        post = frontmatter.load(str(path))
-        fm = dict(post.metadata)
-        fm["_body"] = post.content
+        fm, body = parse_frontmatter(read_summary_text(path))
+        fm["_body"] = body
         fm["_path"] = str(path)
         return fm
     except Exception:
@@ -83,7 +86,8 @@ def _format_memory_hit(fm: dict[str, Any]) -> str:
     mid = fm.get("id", "?")
     title = fm.get("title", "?")
     confidence = fm.get("confidence", "?")
-    return f"{mid} conf={confidence} title={title}"
+    scope = f" scope={fm['scope']}" if fm.get("scope") else ""
+    return f"{mid} conf={confidence} title={title}{scope}"
 
 
 def _cmd_connect(args: argparse.Namespace) -> int:
@@ -93,16 +97,15 @@ def _cmd_connect(args: argparse.Namespace) -> int:
     action = getattr(args, "platform_name", None)
 
     if action == "list" or action is None:
-        entries = list_platforms(platforms_path)
+        entries = list_platforms(platforms_path, live=bool(getattr(args, "live", False)))
         if not entries:
             _emit("No platforms connected.")
             return 0
         _emit(f"Connected platforms: {len(entries)}")
         for entry in entries:
             status = "ok" if entry["exists"] else "missing"
-            _emit(
-                f"- {entry['name']}: {entry['path']} ({entry['session_count']} sessions, {status})"
-            )
+            sessions = f"{entry['session_count']} sessions" if entry["scanned_at"] else "not scanned yet"
+            _emit(f"- {entry['name']}: {entry['path']} ({sessions}, {status})")
         return 0
 
     if action == "auto":
@@ -200,6 +203,131 @@ def _cmd_maintain(args: argparse.Namespace) -> int:
     return code
 
 
+def _cmd_bench(args: argparse.Namespace) -> int:
+    """Run the offline benchmark suite and emit or write JSON results."""
+    from acreta.app.bench import BenchConfig, compare_results, run_bench
+
+    report = run_bench(
+        BenchConfig(
+            sessions_per_platform=max(1, args.sessions),
+            turns_per_session=max(2, args.turns),
+            lm_latency_ms=max(0.0, args.lm_latency_ms),
+            lm_ms_per_token=max(0.0, args.lm_ms_per_token),
+            lm_calls_per_pipeline=max(1, args.lm_calls),
+            sync_sessions=max(1, args.sync_sessions),
+        )
+    ).to_dict()
+    if args.compare:
+        baseline = json.loads(Path(args.compare).expanduser().read_text(encoding="utf-8"))
+        report["delta_pct"] = compare_results(report, baseline)
+    encoded = json.dumps(report, indent=2, ensure_ascii=True)
+    if args.output:
+        output_path = Path(args.output).expanduser()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(encoded + "\n", encoding="utf-8")
+        _emit(f"Bench results written to {output_path}")
+    else:
+        _emit(encoded)
+    return 0
+
+
+def _format_ms(value: Any) -> str:
+    """Render milliseconds as seconds with one decimal."""
+    return f"{float(value or 0) / 1000:.1f}s"
+
+
+def _cmd_runs_profile(args: argparse.Namespace) -> int:
+    """Show the critical-path profile of one run folder, or aggregate a workspace."""
+    from acreta.runtime.tracing import (
+        TRACE_FILENAME,
+        aggregate_profiles,
+        discover_run_folders,
+        profile_run,
+    )
+
+    target = Path(args.run_folder).expanduser().resolve()
+    if not (target / TRACE_FILENAME).exists():
+        folders = discover_run_folders([target], limit=args.limit)
+        if not folders:
+            _emit(f"No {TRACE_FILENAME} found in {target}", file=sys.stderr)
+            return 1
+        report = aggregate_profiles([profile_run(folder) for folder in folders])
+        if args.json:
+            _emit(json.dumps(report, indent=2, ensure_ascii=True))
+            return 0
+        _emit(f"{report['runs']} runs, avg wall {_format_ms(report['avg_wall_ms'])}")
+        for row in report["categories"]:
+            _emit(
+                f"  {row['category']:<20} {_format_ms(row['avg_ms_per_run']):>8}/run  ({row['calls']} calls)"
+            )
+        return 0
+    profile = profile_run(target)
+    if args.json:
+        _emit(json.dumps(profile, indent=2, ensure_ascii=True))
+        return 0
+    phases = profile["phases"]
+    sdk = profile["sdk"]
+    usage = sdk.get("usage") or {}
+    _emit(f"Run {profile['run_id']} ({profile['status']}) wall {_format_ms(profile['wall_ms'])}")
+    if phases:
+        _emit("Phases: " + " | ".join(f"{name} {_format_ms(ms)}" for name, ms in phases.items()))
+    _emit(
+        f"SDK: {sdk.get('num_turns') or 0} turns, api {_format_ms(sdk.get('duration_api_ms'))}, "
+        f"tokens in={usage.get('input_tokens', 0)} out={usage.get('output_tokens', 0)}"
+    )
+    _emit("Critical path:")
+    for row in profile["critical_path"]:
+        _emit(
+            f"  {row['category']:<20} {_format_ms(row['ms']):>8} {row['share'] * 100:5.1f}%  ({row['calls']} calls)"
+        )
+    return 0
+
+
+def _workspace_arg(value: str | None) -> Path:
+    """Resolve a workspace dir argument, defaulting to ``./.acreta/workspace``."""
+    return Path(value).expanduser().resolve() if value else Path.cwd() / ".acreta" / "workspace"
+
+
+def _cmd_runs_compact(args: argparse.Namespace) -> int:
+    """Archive old run folders now using the configured or given retention limits."""
+    from acreta.runtime.workspace_retention import compact_workspace
+
+    config = get_config()
+    result = compact_workspace(
+        _workspace_arg(args.workspace),
+        keep_runs=config.workspace_keep_runs if args.keep_runs is None else max(0, args.keep_runs),
+        keep_days=config.workspace_keep_days if args.keep_days is None else max(0, args.keep_days),
+    ).to_dict()
+    if args.json:
+        _emit(json.dumps(result, indent=2, ensure_ascii=True))
+    else:
+        _emit(
+            f"Kept {result['kept']} runs, archived {result['archived']} "
+            f"({result['bytes_archived']} bytes) into {', '.join(result['archives']) or 'no archives'}"
+        )
+    return 0
+
+
+def _cmd_runs_restore(args: argparse.Namespace) -> int:
+    """Extract one archived run folder back into the workspace or a given dir."""
+    from acreta.runtime.workspace_retention import restore_archived_run
+
+    try:
+        target = restore_archived_run(
+            _workspace_arg(args.workspace),
+            args.run_id,
+            Path(args.dest).expanduser().resolve() if args.dest else None,
+        )
+    except FileNotFoundError:
+        _emit(f"Archived run not found: {args.run_id}", file=sys.stderr)
+        return 1
+    if args.json:
+        _emit(json.dumps({"run_id": args.run_id, "run_folder": str(target)}, ensure_ascii=True))
+    else:
+        _emit(f"Restored {args.run_id} to {target}")
+    return 0
+
+
 def _cmd_daemon(args: argparse.Namespace) -> int:
     """Handle daemon commands for one-shot or continuous execution."""
     if args.once:
@@ -225,29 +353,22 @@ def search_memory(
     project_filter: str | None = None,
     limit: int = 20,
 ) -> list[dict[str, Any]]:
-    """Search memory by keyword tokens with file-scan approach."""
+    """Search project and global memory roots concurrently with merged, scope-labelled ranking."""
     config = get_config()
-    files = _list_memory_files(config.memory_dir)
+    if question.strip():
+        roots = chat_memory_roots(config, Path.cwd())
+        hits = search_memories(question, roots, limit=limit)
+        if hits:
+            record_hit_access([root.path for root in roots], hits, "retrieval")
+            return hits
     all_fm: list[dict[str, Any]] = []
-    for path in files:
+    for path in _list_memory_files(config.memory_dir):
         fm = _read_memory_frontmatter(path)
         if fm:
             all_fm.append(fm)
-    if not question.strip():
-        return all_fm[:limit]
-    tokens = [token.lower() for token in question.split() if token.strip()]
-    hits: list[dict[str, Any]] = []
-    for fm in all_fm:
-        haystack = " ".join(
-            [
-                str(fm.get("title", "")),
-                str(fm.get("_body", "")),
-                " ".join(fm.get("tags", [])),
-            ]
-        ).lower()
-        if any(token in haystack for token in tokens):
-            hits.append(fm)
-    return (hits or all_fm)[:limit]
+        if len(all_fm) >= limit:
+            break
+    return all_fm
 
 
 def _cmd_memory_search(args: argparse.Namespace) -> int:
@@ -302,67 +423,190 @@ def _cmd_memory_add(args: argparse.Namespace) -> int:
         f"{datetime.now(timezone.utc).strftime('%Y%m%d')}-{slugify(args.title)}.md"
     )
     filepath = folder / filename
-    filepath.write_text(record.to_markdown(), encoding="utf-8")
+    content = record.to_markdown()
+    with memory_root_lock(config.memory_dir):
+        op = "update" if filepath.exists() else "add"
+        atomic_write_text(filepath, content)
+    record_memory_change(config.memory_dir, op, filepath, memory_id=record.id, content=content)
     _emit(f"Added memory: {record.id} -> {filepath}")
     return 0
 
 
 def _cmd_memory_export(args: argparse.Namespace) -> int:
-    """Export memories as Markdown or JSON to stdout or a file."""
+    """Stream memories as JSON, Markdown, JSONL, or Parquet to stdout or a file."""
+    from acreta.memory.transfer import export_memories
+
     config = get_config()
-    files = _list_memory_files(config.memory_dir)
-    items: list[dict[str, Any]] = []
-    for path in files:
-        fm = _read_memory_frontmatter(path)
-        if fm:
-            items.append(fm)
+    if args.format == "parquet" and not args.output:
+        _emit("Parquet export needs --output", file=sys.stderr)
+        return 2
+    if not args.output:
+        export_memories(config.memory_dir, args.format, sys.stdout, batch_size=args.batch_size)
+        return 0
+    path = Path(args.output).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = export_memories(config.memory_dir, args.format, path, batch_size=args.batch_size)
+    _emit(f"Exported: {path} ({count} memories)")
+    return 0
 
-    if args.format == "json":
-        output = json.dumps(items, indent=2, ensure_ascii=True, default=str)
-    else:
-        lines = ["# Acreta Memory Export", ""]
-        for fm in items:
-            title = fm.get("title", "?")
-            mid = fm.get("id", "?")
-            confidence = fm.get("confidence", "?")
-            body = str(fm.get("_body", "")).strip()[:260]
-            lines.append(f"## {title} ({mid})")
-            lines.append(f"- confidence: {confidence}")
-            lines.append(body)
-            lines.append("")
-        output = "\n".join(lines)
-    if args.output:
-        path = Path(args.output).expanduser()
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(
-            output + ("\n" if not output.endswith("\n") else ""), encoding="utf-8"
+
+def _cmd_memory_import(args: argparse.Namespace) -> int:
+    """Bulk-load a JSONL or Parquet export into the canonical memory layout."""
+    from acreta.memory.transfer import import_memories
+
+    config = get_config()
+    source = Path(args.path).expanduser()
+    if not source.is_file():
+        _emit(f"Import file not found: {source}", file=sys.stderr)
+        return 2
+    result = import_memories(config.memory_dir, source, fmt=args.format, batch_size=args.batch_size)
+    if args.json:
+        _emit(json.dumps(result.to_dict(), indent=2, ensure_ascii=True))
+        return 0
+    _emit(
+        f"Imported {result.imported} memories "
+        f"(duplicates={result.duplicates} invalid={result.invalid} batches={result.batches})"
+    )
+    return 0
+
+
+def _cmd_memory_changes(args: argparse.Namespace) -> int:
+    """Print memory journal events recorded after ``--since``."""
+    journal = journal_for_memory_root(get_config().memory_dir)
+    events = journal.changes(max(0, args.since), limit=args.limit)
+    if args.json:
+        payload = {"latest_seq": journal.latest_seq(), "events": [event.to_dict() for event in events]}
+        _emit(json.dumps(payload, indent=2, ensure_ascii=True))
+        return 0
+    if not events:
+        _emit("No memory changes.")
+        return 0
+    for event in events:
+        _emit(f"{event.seq} {event.op} {event.memory_id or '-'} {event.path}")
+    return 0
+
+
+def _cmd_memory_priors(args: argparse.Namespace) -> int:
+    """Recompute access priors and print the lowest-value memories first."""
+    from acreta.memory.clustering import ARCHIVE_PRIOR_BELOW
+
+    config = get_config()
+    rows = compute_priors(config.memory_dir, half_life_days=config.memory_prior_half_life_days)
+    rows = rows[: max(0, args.limit)]
+    if args.json:
+        _emit(json.dumps(rows, indent=2, ensure_ascii=True))
+        return 0
+    if not rows:
+        _emit("No memories.")
+        return 0
+    for row in rows:
+        marker = " archive-candidate" if row["prior"] < ARCHIVE_PRIOR_BELOW else ""
+        _emit(
+            f"{row['prior']:.3f} {row['memory_id']} (confidence={row['confidence']:.2f} "
+            f"recency={row['recency']:.2f} usage={row['usage']:.2f}){marker}"
         )
-        _emit(f"Exported: {path}")
-    else:
-        _emit(output)
     return 0
 
 
+def _cmd_memory_migrate_summaries(args: argparse.Namespace) -> int:
+    """Move existing summaries into the requested storage layout."""
+    from acreta.memory.summary_store import migrate_summaries
+
+    config = get_config()
+    layout = args.layout or config.memory_summary_layout
+    result = migrate_summaries((config.memory_dir / "summaries").resolve(), layout)
+    result["watermarks_updated"] = rewrite_summary_paths(result.pop("paths"))
+    if args.json:
+        _emit(json.dumps(result, indent=2, ensure_ascii=True))
+        return 0
+    _emit(
+        f"Summaries migrated to {result['layout']}: moved={result['moved']} "
+        f"packed={result['packed']} unpacked={result['unpacked']} removed_dirs={result['removed_dirs']}"
+    )
+    if result["layout"] != config.memory_summary_layout:
+        _emit(f"Set [memory] summary_layout = \"{result['layout']}\" to keep writing new summaries this way.")
+    return 0
+
+
+def _cmd_memory_materialize_summaries(args: argparse.Namespace) -> int:
+    """Write loose markdown copies of packed summaries so the folder is browsable."""
+    from acreta.memory.summary_store import materialize_summaries
+
+    config = get_config()
+    written = materialize_summaries(config.memory_dir / "summaries", month=args.month)
+    if args.json:
+        _emit(json.dumps({"materialized": [str(path) for path in written]}, indent=2, ensure_ascii=True))
+        return 0
+    _emit(f"Materialized {len(written)} packed summaries.")
+    return 0
+
+
+def _stream_chat(
+    events: Iterable[ChatEvent], request: ChatRequest, *, as_json: bool, cached: bool
+) -> int:
+    """Print chat output as it arrives: raw text, or one JSON event per line."""
+    response = ""
+    for event in events:
+        if as_json:
+            payload = event.to_dict()
+            if event.type == "done":
+                payload["memory_ids"] = request.memory_ids
+                payload["fallback_used"] = not request.retrieval.confident
+                payload["cached"] = cached
+            _emit(json.dumps(payload, ensure_ascii=True))
+        elif event.type == "text":
+            sys.stdout.write(event.text)
+        elif event.type == "tool_use":
+            _emit(f"[{event.tool}]", file=sys.stderr)
+        if event.type == "done":
+            response = event.text
+            if not as_json:
+                _emit()
+            request.record_citations(response)
+            if not cached:
+                request.remember_answer(response, event.session_id or "")
+        sys.stdout.flush()
+    return 1 if looks_like_auth_error(response) else 0
+
+
 def _cmd_chat(args: argparse.Namespace) -> int:
-    """Run one chat query against the runtime agent."""
-    hits: list[dict[str, Any]] = []
-    context_docs: list[dict[str, Any]] = []
-    prompt = build_chat_prompt(args.question, hits, context_docs)
-    agent = AcretaAgent(
-        skills=["acreta"],
-    )
-    response, session_id = agent.chat(prompt, cwd=str(Path.cwd()))
-    if looks_like_auth_error(response):
-        _emit(response, file=sys.stderr)
-        return 1
+    """Run one chat query against the runtime agent with pre-fetched memory evidence."""
+    request = prepare_chat(
+        args.question, limit=args.limit, cwd=Path.cwd(), config=get_config()
+    )
+    stream = args.stream if args.stream is not None else not args.json
+    cached = None if args.fresh else request.cached_answer()
+    if cached is not None:
+        response, session_id = cached.response, cached.session_id
+        if stream:
+            events = [
+                ChatEvent("text", text=response),
+                ChatEvent("done", text=response, session_id=session_id),
+            ]
+            return _stream_chat(events, request, as_json=bool(args.json), cached=True)
+    else:
+        agent = AcretaAgent(
+            skills=["acreta"],
+        )
+        if stream:
+            events = agent.chat_stream(request.prompt, cwd=str(Path.cwd()))
+            return _stream_chat(events, request, as_json=bool(args.json), cached=False)
+        response, session_id = agent.chat(request.prompt, cwd=str(Path.cwd()))
+        if looks_like_auth_error(response):
+            _emit(response, file=sys.stderr)
+            return 1
+        request.remember_answer(response, session_id)
+    request.record_citations(response)
     if args.json:
         _emit(
             json.dumps(
                 {
                     "response": response,
                     "agent_session_id": session_id,
-                    "memory_ids": [fm.get("id", "") for fm in hits],
-                    "fallback_used": False,
+                    "memory_ids": request.memory_ids,
+                    "fallback_used": not request.retrieval.confident,
+                    "coverage": request.retrieval.coverage,
+                    "cached": cached is not None,
                 },
                 indent=2,
                 ensure_ascii=True,
@@ -417,12 +661,14 @@ def _cmd_memory_reset(args: argparse.Namespace) -> int:
 def _cmd_status(args: argparse.Namespace) -> int:
     """Print runtime status summary across memory, queue, and services."""
     config = get_config()
-    memory_count = len(_list_memory_files(config.memory_dir))
+    live = bool(getattr(args, "live", False))
+    counts = memory_counts(config.memory_dir, live=live)
     payload = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "connected_agents": get_connected_agents(config.platforms_path),
-        "platforms": list_platforms(config.platforms_path),
-        "memory_count": memory_count,
+        "platforms": list_platforms(config.platforms_path, live=live),
+        "memory_count": counts["total"],
+        "memory_counts": counts,
         "sessions_indexed_count": count_fts_indexed(),
         "queue": count_session_jobs_by_status(),
         "latest_sync": latest_service_run("sync"),
@@ -460,6 +706,9 @@ def build_parser() -> argparse.ArgumentParser:
         "extra_arg", nargs="?", help="Extra argument for connect sub-actions"
     )
     connect.add_argument("--path", help="Custom platform path")
+    connect.add_argument(
+        "--live", action="store_true", help="Rescan platform sessions instead of using cached counts"
+    )
     connect.set_defaults(func=_cmd_connect)
 
     sync = sub.add_parser("sync", help="Run hot-path indexing + extraction")
@@ -525,11 +774,22 @@ def build_parser() -> argparse.ArgumentParser:
     memory_export = memory_sub.add_parser("export", help="Export memories")
     memory_export.add_argument("--project")
     memory_export.add_argument(
-        "--format", choices=["json", "markdown"], default="markdown"
+        "--format", choices=["json", "markdown", "jsonl", "parquet"], default="markdown"
     )
     memory_export.add_argument("--output")
+    memory_export.add_argument("--batch-size", type=int, default=500, help="Rows per Parquet row group")
     memory_export.set_defaults(func=_cmd_memory_export)
 
+    memory_import = memory_sub.add_parser(
+        "import", help="Bulk-load a JSONL or Parquet memory export"
+    )
+    memory_import.add_argument("path")
+    memory_import.add_argument(
+        "--format", choices=["jsonl", "parquet"], help="Input format (default: from the file suffix)"
+    )
+    memory_import.add_argument("--batch-size", type=int, default=500, help="Files written per fsync batch")
+    memory_import.set_defaults(func=_cmd_memory_import)
+
     memory_reset = memory_sub.add_parser(
         "reset", help="Destructive reset of memory data for selected scope"
     )
@@ -541,15 +801,92 @@ def build_parser() -> argparse.ArgumentParser:
     )
     memory_reset.set_defaults(func=_cmd_memory_reset)
 
+    memory_changes = memory_sub.add_parser(
+        "changes", help="List memory writes recorded after a journal seq"
+    )
+    memory_changes.add_argument("--since", type=int, default=0, help="Last seq already processed")
+    memory_changes.add_argument("--limit", type=int, help="Maximum events to return")
+    memory_changes.set_defaults(func=_cmd_memory_changes)
+
+    memory_priors = memory_sub.add_parser(
+        "priors", help="Recompute retrieval priors from access stats"
+    )
+    memory_priors.add_argument("--limit", type=int, default=20)
+    memory_priors.set_defaults(func=_cmd_memory_priors)
+
+    memory_migrate = memory_sub.add_parser(
+        "migrate-summaries", help="Move existing summaries into another storage layout"
+    )
+    memory_migrate.add_argument(
+        "--layout",
+        choices=["tree", "flat", "packed"],
+        help="Target layout (default: [memory] summary_layout)",
+    )
+    memory_migrate.set_defaults(func=_cmd_memory_migrate_summaries)
+
+    memory_materialize = memory_sub.add_parser(
+        "materialize-summaries", help="Write loose files for packed summaries"
+    )
+    memory_materialize.add_argument("--month", help="Only this month (YYYY-MM)")
+    memory_materialize.set_defaults(func=_cmd_memory_materialize_summaries)
+
     chat = sub.add_parser("chat", help="Ask the central agent with memory context")
     chat.add_argument("question")
     chat.add_argument("--project")
     chat.add_argument("--limit", type=int, default=12)
+    chat.add_argument(
+        "--stream",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Print tokens as they arrive (default without --json); with --json emit one event per line",
+    )
+    chat.add_argument(
+        "--fresh", action="store_true", help="Bypass the chat answer cache for this question"
+    )
     chat.set_defaults(func=_cmd_chat)
 
     status = sub.add_parser("status", help="Show core runtime status")
+    status.add_argument(
+        "--live", action="store_true", help="Recount sessions and memories instead of using cached counters"
+    )
     status.set_defaults(func=_cmd_status)
 
+    runs = sub.add_parser("runs", help="Inspect sync/maintain run folders")
+    runs_sub = runs.add_subparsers(dest="runs_command")
+    runs_profile = runs_sub.add_parser(
+        "profile", help="Show a run's timing breakdown from trace.jsonl"
+    )
+    runs_profile.add_argument(
+        "run_folder", help="Run folder, or a workspace dir to aggregate its runs"
+    )
+    runs_profile.add_argument("--limit", type=int, default=50, help="Runs to aggregate")
+    runs_profile.set_defaults(func=_cmd_runs_profile)
+    runs_compact = runs_sub.add_parser(
+        "compact", help="Pack old run folders into monthly archives"
+    )
+    runs_compact.add_argument("--workspace", help="Workspace dir (default ./.acreta/workspace)")
+    runs_compact.add_argument("--keep-runs", type=int, help="Newest runs kept in full")
+    runs_compact.add_argument("--keep-days", type=int, help="Runs newer than this many days kept in full")
+    runs_compact.set_defaults(func=_cmd_runs_compact)
+    runs_restore = runs_sub.add_parser("restore", help="Extract an archived run folder")
+    runs_restore.add_argument("run_id")
+    runs_restore.add_argument("--workspace", help="Workspace dir (default ./.acreta/workspace)")
+    runs_restore.add_argument("--dest", help="Directory to restore into (default: the workspace)")
+    runs_restore.set_defaults(func=_cmd_runs_restore)
+
+    bench = sub.add_parser(
+        "bench", help="Run offline benchmarks with a fake LM and fake agent SDK"
+    )
+    bench.add_argument("--sessions", type=int, default=20, help="Sessions per platform")
+    bench.add_argument("--turns", type=int, default=12, help="Turns per session")
+    bench.add_argument("--lm-latency-ms", type=float, default=5.0)
+    bench.add_argument("--lm-ms-per-token", type=float, default=0.01)
+    bench.add_argument("--lm-calls", type=int, default=2, help="LM calls per pipeline run")
+    bench.add_argument("--sync-sessions", type=int, default=10)
+    bench.add_argument("--output", help="Write JSON results to this path")
+    bench.add_argument("--compare", help="Baseline JSON results to diff against")
+    bench.set_defaults(func=_cmd_bench)
+
     return parser
 
 
@@ -566,6 +903,9 @@ def main(argv: list[str] | None = None) -> int:
     if args.command == "memory" and not getattr(args, "memory_command", None):
         parser.parse_args([args.command, "--help"])
         return 0
+    if args.command == "runs" and not getattr(args, "runs_command", None):
+        parser.parse_args([args.command, "--help"])
+        return 0
 
     handler = getattr(args, "func", None)
     if handler is None:
@@ -263,13 +263,22 @@ def run_sync_once(
         IndexedSession,
         claim_session_jobs,
         complete_session_job,
+        compute_trace_watermark,
         enqueue_session_job,
         fail_session_job,
         fetch_session_doc,
+        fetch_session_metrics,
         heartbeat_session_job,
         index_new_sessions,
+        is_append_only_trace,
+        list_grown_sessions,
         record_service_run,
+        record_session_watermark,
+        refresh_session_metrics,
+        resolve_extraction_start,
+        skip_session_job,
     )
+    from acreta.sessions.triage import triage_session
 
     started = datetime.now(timezone.utc).isoformat()
     status = "completed"
@@ -304,6 +313,8 @@ def run_sync_once(
         target_run_ids: list[str] = []
         indexed_sessions = 0
         queued_sessions = 0
+        grown_sessions = 0
+        trivial_sessions = 0
         if run_id:
             target_run_ids = [run_id]
             if not dry_run:
@@ -331,7 +342,31 @@ def run_sync_once(
                     indexed if isinstance(indexed, list) else []
                 )
                 indexed_sessions = len(details)
+                config = get_config()
+                triage_enabled = config.triage_enabled and not force
+                metrics_by_run = (
+                    fetch_session_metrics([item.run_id for item in details])
+                    if triage_enabled
+                    else {}
+                )
                 for item in details:
+                    if triage_enabled:
+                        decision = triage_session(
+                            fetch_session_doc(item.run_id) or {},
+                            metrics_by_run.get(item.run_id),
+                            config,
+                        )
+                        if decision.trivial:
+                            skip_session_job(
+                                item.run_id,
+                                reason=decision.reason,
+                                agent_type=item.agent_type,
+                                session_path=item.session_path,
+                                start_time=item.start_time,
+                                trigger=trigger,
+                            )
+                            trivial_sessions += 1
+                            continue
                     queued = enqueue_session_job(
                         item.run_id,
                         agent_type=item.agent_type,
@@ -341,10 +376,29 @@ def run_sync_once(
                     )
                     if queued:
                         queued_sessions += 1
+                for item in list_grown_sessions():
+                    profile = refresh_session_metrics(item.run_id, item.session_path)
+                    if item.retriage and triage_enabled:
+                        decision = triage_session(
+                            fetch_session_doc(item.run_id) or {}, profile, config
+                        )
+                        if decision.trivial:
+                            continue
+                    queued = enqueue_session_job(
+                        item.run_id,
+                        agent_type=item.agent_type,
+                        session_path=item.session_path,
+                        start_time=item.start_time,
+                        trigger=trigger,
+                        force=True,
+                    )
+                    if queued:
+                        grown_sessions += 1
+                        queued_sessions += 1
                 target_run_ids = [item.run_id for item in details]
 
         extracted = 0
-        skipped = 0
+        skipped = trivial_sessions
         failed = 0
         learnings_new = 0
         learnings_updated = 0
@@ -375,7 +429,23 @@ def run_sync_once(
                         if not session_path:
                             doc = fetch_session_doc(rid) or {}
                             session_path = str(doc.get("session_path") or "").strip()
-                        result = lead_agent.sync(Path(session_path))
+                        trace_path = Path(session_path)
+                        watermark = (
+                            compute_trace_watermark(trace_path)
+                            if is_append_only_trace(trace_path)
+                            else None
+                        )
+                        resume = (
+                            {"start_offset": 0, "previous_summary_path": None}
+                            if force
+                            else resolve_extraction_start(rid, trace_path)
+                        )
+                        result = lead_agent.sync(
+                            trace_path,
+                            metrics=fetch_session_metrics([rid]).get(rid),
+                            start_offset=resume["start_offset"],
+                            previous_summary_path=resume["previous_summary_path"],
+                        )
                 except (
                     Exception
                 ) as exc:  # pragma: no cover - defensive guard for runtime stability.
@@ -390,6 +460,13 @@ def run_sync_once(
                 counts = result.get("counts") or {}
                 learnings_new += int(counts.get("add") or 0)
                 learnings_updated += int(counts.get("update") or 0)
+                if watermark is not None:
+                    record_session_watermark(
+                        rid,
+                        session_path=session_path,
+                        watermark=watermark,
+                        summary_path=str(result.get("summary_path") or "") or None,
+                    )
                 complete_session_job(rid)
 
         summary = SyncSummary(
@@ -421,6 +498,8 @@ def run_sync_once(
             details={
                 "indexed_sessions": indexed_sessions,
                 "queued_sessions": queued_sessions,
+                "grown_sessions": grown_sessions,
+                "trivial_sessions": trivial_sessions,
                 "extracted_sessions": extracted,
                 "skipped_sessions": skipped,
                 "failed_sessions": failed,
@@ -501,7 +580,10 @@ def run_maintain_once(
 
 
 def run_daemon_once() -> dict:
-    """Run one daemon loop containing sync then maintain."""
+    """Run one daemon loop: recover interrupted memory transactions, then sync and maintain."""
+    from acreta.memory.transaction import recover_transactions
+
+    recovered = recover_transactions(get_config().memory_dir)
     window_start, window_end = resolve_window_bounds(
         window="30d",
         since_raw=None,
@@ -526,6 +608,7 @@ def run_daemon_once() -> dict:
         dry_run=False,
     )
     return {
+        "recovered": recovered,
         "sync_code": sync_code,
         "sync_summary": sync_summary.__dict__,
         "maintain_code": maintain_code,
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import heapq
 import json
 import mimetypes
 import sqlite3
@@ -13,16 +14,25 @@ from typing import Any
 from urllib.parse import parse_qs, unquote, urlparse
 
 from acreta.adapters.common import load_jsonl_dict_lines
+from acreta.app.chat import prepare_chat
+from acreta.app.memory_corpus import MemoryCorpus
+from acreta.app.memory_graph import MemoryGraph, memory_confidence, memory_node, node_kind
 from acreta.config.logging import logger
 from acreta.config.settings import get_config, get_config_sources, get_user_config_path
+from acreta.memory.access_stats import record_access
 from acreta.memory.extract_pipeline import build_extract_report
-import frontmatter as fm_lib
+from acreta.memory.frontmatter_codec import parse_frontmatter
 
 from acreta.memory.memory_record import MemoryType, memory_folder
+from acreta.memory.retrieval import chat_memory_roots, search_memories
+from acreta.memory.summary_store import list_summary_paths, read_summary_text, summary_signature
+from acreta.runtime.agent import AcretaAgent
 from acreta.runtime.providers import get_provider_config
+from acreta.runtime.tracing import aggregate_profiles, discover_run_folders, profile_run
 from acreta.sessions.catalog import (
     count_session_jobs_by_status,
     fetch_session_doc,
+    fetch_session_metrics,
     init_sessions_db,
     latest_service_run,
     list_sessions_window,
@@ -131,6 +141,20 @@ def _compute_stats(rows: list[sqlite3.Row]) -> dict[str, Any]:
     by_agent: dict[str, dict[str, int]] = {}
     daily: dict[str, dict[str, int]] = {}
     hourly: dict[int, dict[str, int]] = {}
+    model_usage: dict[str, dict[str, int]] = {}
+    tool_usage: dict[str, int] = {}
+    profiles = fetch_session_metrics([str(row["run_id"] or "") for row in rows])
+    for profile in profiles.values():
+        totals["input_tokens"] += int(profile.get("input_tokens") or 0)
+        totals["output_tokens"] += int(profile.get("output_tokens") or 0)
+        for model, usage in (profile.get("model_usage") or {}).items():
+            bucket = model_usage.setdefault(
+                model, {"total": 0, "input": 0, "output": 0, "calls": 0}
+            )
+            for key in bucket:
+                bucket[key] += int(usage.get(key) or 0)
+        for tool, count in (profile.get("tool_usage") or {}).items():
+            tool_usage[tool] = tool_usage.get(tool, 0) + int(count or 0)
     for row in rows:
         agent = str(row["agent_type"] or "unknown")
         start_time = str(row["start_time"] or "")
@@ -194,8 +218,10 @@ def _compute_stats(rows: list[sqlite3.Row]) -> dict[str, Any]:
         "totals": totals,
         "derived": derived,
         "by_agent": by_agent,
-        "model_usage": {},
-        "tool_usage": {},
+        "model_usage": model_usage,
+        "tool_usage": dict(
+            sorted(tool_usage.items(), key=lambda item: item[1], reverse=True)
+        ),
         "daily_activity": daily_activity,
         "hourly_activity": hourly_activity,
         "cache": {
@@ -239,7 +265,9 @@ def _list_memory_files_dashboard() -> list[Path]:
     paths: list[Path] = []
     for mtype in MemoryType:
         folder = config.memory_dir / memory_folder(mtype)
-        if folder.exists():
+        if mtype == MemoryType.summary:
+            paths.extend(list_summary_paths(folder))
+        elif folder.exists():
             paths.extend(sorted(folder.rglob("*.md")))
     return paths
 
@@ -247,9 +275,8 @@ def _list_memory_files_dashboard() -> list[Path]:
 def _read_fm(path: Path) -> dict[str, Any] | None:
     """Read frontmatter from a memory file, returning None on error."""
     try:
-        post = fm_lib.load(str(path))
-        fm = dict(post.metadata)
-        fm["_body"] = post.content
+        fm, body = parse_frontmatter(read_summary_text(path))
+        fm["_body"] = body
         fm["_path"] = str(path)
         return fm
     except Exception:
@@ -257,13 +284,8 @@ def _read_fm(path: Path) -> dict[str, Any] | None:
 
 
 def _load_all_memories() -> list[dict[str, Any]]:
-    """Load all memory files as frontmatter dicts."""
-    items: list[dict[str, Any]] = []
-    for path in _list_memory_files_dashboard():
-        fm = _read_fm(path)
-        if fm:
-            items.append(fm)
-    return items
+    """Load all memory files as frontmatter dicts, reusing unchanged parses."""
+    return _MEMORY_CORPUS.refresh(_list_memory_files_dashboard())
 
 
 def _serialize_memory(fm: dict[str, Any], *, with_body: bool) -> dict[str, Any]:
@@ -316,16 +338,20 @@ def _detect_primitive(fm: dict[str, Any]) -> str:
     return "learning"
 
 
+_MEMORY_CORPUS = MemoryCorpus(_read_fm, _detect_primitive, summary_signature)
+_MEMORY_GRAPH = MemoryGraph()
+_QUERY_SEED_LIMIT = 2000
+_EXPAND_DEGREE_CAP = 40
+
+
 def _edge_id(source: str, target: str, kind: str) -> str:
     """Build stable edge identity for in-memory graph payload dedupe."""
     return f"{source}|{target}|{kind}"
 
 
-def _memory_graph_options(items: list[dict[str, Any]]) -> dict[str, list[str]]:
-    """Return available filter options derived from loaded memory items."""
-    types = sorted({_detect_primitive(fm) for fm in items})
-    tags = sorted({str(t) for fm in items for t in fm.get("tags", []) if t})
-    return {"types": types, "states": [], "projects": [], "tags": tags}
+def _memory_graph_options(corpus: MemoryCorpus) -> dict[str, list[str]]:
+    """Return available filter options from the refreshed corpus indexes."""
+    return {"types": corpus.primitives(), "states": [], "projects": [], "tags": corpus.tags()}
 
 
 def _graph_filter_values(filters: dict[str, Any], key: str) -> list[str]:
@@ -362,43 +388,21 @@ def _graph_limits(
     return max_nodes, max_edges
 
 
-def _load_memory_graph_edges(
-    *,
-    memory_ids: list[str] | None = None,
-    seed_memory_id: str | None = None,
-    limit: int = 4000,
-) -> list[tuple[str, str, str, float]]:
-    """Load explicit memory graph edges from optional graph SQLite index."""
+def _graph_db_path() -> Path:
+    """Return the optional graph SQLite index path."""
     config = get_config()
-    graph_path = config.graph_db_path or (config.index_dir / "graph.sqlite3")
+    return config.graph_db_path or (config.index_dir / "graph.sqlite3")
+
+
+def _load_memory_graph_edges() -> list[tuple[str, str, str, float]]:
+    """Load explicit memory graph edges from optional graph SQLite index."""
+    graph_path = _graph_db_path()
     if not graph_path.exists():
         return []
     try:
         with sqlite3.connect(graph_path) as conn:
             conn.row_factory = sqlite3.Row
-            if seed_memory_id:
-                rows = conn.execute(
-                    """
-                    SELECT source_id, target_id, reason, score
-                    FROM graph_edges
-                    WHERE source_id = ? OR target_id = ?
-                    LIMIT ?
-                    """,
-                    (seed_memory_id, seed_memory_id, max(1, int(limit))),
-                ).fetchall()
-            elif memory_ids:
-                placeholders = ",".join("?" for _ in memory_ids)
-                rows = conn.execute(
-                    f"""
-                    SELECT source_id, target_id, reason, score
-                    FROM graph_edges
-                    WHERE source_id IN ({placeholders}) AND target_id IN ({placeholders})
-                    LIMIT ?
-                    """,
-                    [*memory_ids, *memory_ids, max(1, int(limit))],
-                ).fetchall()
-            else:
-                rows = []
+            rows = conn.execute("SELECT source_id, target_id, reason, score FROM graph_edges").fetchall()
     except sqlite3.Error:
         return []
     return [
@@ -409,108 +413,111 @@ def _load_memory_graph_edges(
             float(row["score"] or 0.5),
         )
         for row in rows
+        if row["source_id"] and row["target_id"]
     ]
 
 
+def _memory_graph(items: list[dict[str, Any]]) -> MemoryGraph:
+    """Bring the shared memory graph up to date with freshly loaded corpus ``items``."""
+    graph_path = _graph_db_path()
+    try:
+        stat = graph_path.stat()
+        explicit_key: tuple[Any, ...] = (str(graph_path), stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        explicit_key = (str(graph_path), None)
+    _MEMORY_GRAPH.sync(
+        items,
+        version=_MEMORY_CORPUS.version,
+        explicit_key=explicit_key,
+        load_explicit=_load_memory_graph_edges,
+    )
+    return _MEMORY_GRAPH
+
+
+def _graph_node(graph: MemoryGraph, node_id: str, score: float) -> dict[str, Any]:
+    """Build one graph explorer node payload."""
+    kind = node_kind(node_id)
+    label = node_id.split(":", 1)[-1]
+    properties: dict[str, Any] = {}
+    fm = graph.memory(node_id)
+    if fm is not None:
+        label = str(fm.get("title", ""))
+        properties = {
+            "memory_id": str(fm.get("id", "")),
+            "primitive": _detect_primitive(fm),
+            "tags": fm.get("tags", []),
+            "confidence": fm.get("confidence", 0.7),
+            "body_preview": str(fm.get("_body", "")).strip()[:480],
+            "updated": str(fm.get("updated", "")),
+        }
+    return {"id": node_id, "label": label, "kind": kind, "score": score, "properties": properties}
+
+
 def _build_memory_graph_payload(
     *,
-    selected: list[dict[str, Any]],
+    graph: MemoryGraph,
+    scores: dict[str, float],
+    edges: list[tuple[str, str, str, float]],
     matched_memories: int,
     max_nodes: int,
     max_edges: int,
 ) -> dict[str, Any]:
-    """Build graph explorer nodes/edges payload from selected memory dicts."""
-    nodes: dict[str, dict[str, Any]] = {}
-    edges: dict[str, dict[str, Any]] = {}
-
-    def add_node(
-        node_id: str, *, label: str, kind: str, score: float, properties: dict[str, Any]
-    ) -> None:
-        """Insert one graph node once, preserving first-seen payload."""
-        if node_id in nodes:
-            return
-        nodes[node_id] = {
-            "id": node_id,
-            "label": label,
-            "kind": kind,
-            "score": score,
-            "properties": properties,
-        }
+    """Build graph explorer nodes/edges payload keeping the highest-scoring nodes and edges."""
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    truncated = len(ranked) > max_nodes
+    kept = dict(ranked[:max_nodes])
+    node_values = [_graph_node(graph, node_id, score) for node_id, score in kept.items()]
 
-    def add_edge(
-        source: str,
-        target: str,
-        kind: str,
-        weight: float,
-        properties: dict[str, Any] | None = None,
-    ) -> None:
-        """Insert one graph edge once, keyed by deterministic edge id."""
-        edge_id = _edge_id(source, target, kind)
-        if edge_id in edges:
-            return
-        edges[edge_id] = {
-            "id": edge_id,
+    edge_rows = sorted(
+        (
+            (min(kept[source], kept[target]) * weight, source, target, kind, weight)
+            for source, target, kind, weight in edges
+            if source in kept and target in kept
+        ),
+        key=lambda row: (-row[0], row[1], row[2]),
+    )
+    for node in list(node_values):
+        primitive = node["properties"].get("primitive") if node["kind"] == "memory" else None
+        if not primitive:
+            continue
+        type_id = f"type:{primitive}"
+        if type_id not in kept:
+            if len(kept) >= max_nodes:
+                truncated = True
+                continue
+            kept[type_id] = 0.0
+            node_values.append(
+                {"id": type_id, "label": primitive, "kind": "type", "score": 0.0, "properties": {}}
+            )
+        edge_rows.append((0.0, node["id"], type_id, "typed_as", 0.6))
+
+    if len(edge_rows) > max_edges:
+        edge_rows = edge_rows[:max_edges]
+        truncated = True
+    edge_values = [
+        {
+            "id": _edge_id(source, target, kind),
             "source": source,
             "target": target,
             "kind": kind,
             "weight": weight,
-            "properties": properties or {},
+            "properties": {},
         }
-
-    for fm in selected:
-        mid = str(fm.get("id", ""))
-        memory_id = f"mem:{mid}"
-        primitive = _detect_primitive(fm)
-        tags = fm.get("tags", [])
-        confidence = float(fm.get("confidence", 0.7))
-        add_node(
-            memory_id,
-            label=str(fm.get("title", "")),
-            kind="memory",
-            score=confidence,
-            properties={
-                "memory_id": mid,
-                "primitive": primitive,
-                "tags": tags,
-                "body_preview": str(fm.get("_body", "")).strip()[:480],
-                "updated": str(fm.get("updated", "")),
-            },
-        )
-        type_id = f"type:{primitive}"
-        add_node(type_id, label=primitive, kind="type", score=0.4, properties={})
-        add_edge(memory_id, type_id, "typed_as", 0.6)
-        for tag in (tags or [])[:8]:
-            tag_id = f"tag:{tag}"
-            add_node(tag_id, label=str(tag), kind="tag", score=0.4, properties={})
-            add_edge(memory_id, tag_id, "tagged", 0.55)
-
-    memory_ids = [str(fm.get("id", "")) for fm in selected if fm.get("id")]
-    for source_id, target_id, reason, score in _load_memory_graph_edges(
-        memory_ids=memory_ids, limit=4000
-    ):
-        source = f"mem:{source_id}"
-        target = f"mem:{target_id}"
-        if source in nodes and target in nodes:
-            add_edge(source, target, reason, score)
-
-    node_values = list(nodes.values())
-    edge_values = list(edges.values())
-    truncated = False
-    warnings: list[str] = []
-    if len(node_values) > max_nodes:
-        node_values = node_values[:max_nodes]
-        allowed = {item["id"] for item in node_values}
-        edge_values = [
-            item
-            for item in edge_values
-            if item["source"] in allowed and item["target"] in allowed
-        ]
-        truncated = True
-    if len(edge_values) > max_edges:
-        edge_values = edge_values[:max_edges]
-        truncated = True
-    if truncated:
-        warnings.append("Result truncated to requested node/edge limits.")
+        for _rank, source, target, kind, weight in edge_rows
+    ]
+    warnings = ["Result truncated to requested node/edge limits."] if truncated else []
+    return {
+        "nodes": node_values,
+        "edges": edge_values,
+        "stats": {
+            "matched_memories": matched_memories,
+            "returned_nodes": len(node_values),
+            "returned_edges": len(edge_values),
+            "truncated": truncated,
+        },
+        "warnings": warnings,
+        "cursor": None,
+    }
 
 
 def _memory_graph_query(payload: dict[str, Any]) -> dict[str, Any]:
@@ -525,91 +532,79 @@ def _memory_graph_query(payload: dict[str, Any]) -> dict[str, Any]:
     tag_values = _graph_filter_values(filters or {}, "tags")
 
     all_items = _load_all_memories()
+    graph = _memory_graph(all_items)
+    if type_values or tag_values:
+        allowed: set[int] | None = None
+        if type_values:
+            allowed = {id(fm) for value in type_values for fm in _MEMORY_CORPUS.with_primitive(value)}
+        if tag_values:
+            tagged = {id(fm) for value in tag_values for fm in _MEMORY_CORPUS.with_tag(value)}
+            allowed = tagged if allowed is None else allowed & tagged
+        all_items = [item for item in all_items if id(item) in (allowed or set())]
     selected = _filter_memories(
         all_items,
         query=query,
-        type_filter=type_values[0] if type_values else None,
+        type_filter=None,
         state_filter=None,
         project_filter=None,
     )
 
-    if type_values:
-        allowed_types = set(type_values)
-        selected = [
-            item for item in selected if _detect_primitive(item) in allowed_types
-        ]
-    if tag_values:
-        allowed_tags = set(tag_values)
-        selected = [
-            item for item in selected if allowed_tags.intersection(item.get("tags", []))
-        ]
-
-    matched_memories = len(selected)
+    seeds = {
+        memory_node(str(fm.get("id", ""))): memory_confidence(fm)
+        for fm in heapq.nlargest(_QUERY_SEED_LIMIT, selected, key=memory_confidence)
+    }
+    nodes = set(seeds) | graph.context_nodes(seeds)
+    scores, edges = graph.scored_subgraph(seeds, nodes)
     return _build_memory_graph_payload(
-        selected=selected[:max_nodes],
-        matched_memories=matched_memories,
+        graph=graph,
+        scores=scores,
+        edges=edges,
+        matched_memories=len(selected),
         max_nodes=max_nodes,
         max_edges=max_edges,
     )
 
 
 def _memory_graph_expand(payload: dict[str, Any]) -> dict[str, Any]:
-    """Expand one memory node by related/tag neighborhood."""
+    """Expand one memory, tag, or session node by its ranked k-hop neighborhood."""
     node_id = str(payload.get("node_id") or "")
     max_nodes, max_edges = _graph_limits(
         payload, default_nodes=500, default_edges=1200, minimum_edges=50
     )
-    if not node_id.startswith("mem:"):
-        return {
-            "nodes": [],
-            "edges": [],
-            "stats": {"added_nodes": 0, "added_edges": 0, "truncated": False},
-            "warnings": ["Only memory node expansion is supported in this build."],
-        }
-    memory_id = node_id.split("mem:", 1)[1]
-    all_items = _load_all_memories()
-    seed = next((fm for fm in all_items if str(fm.get("id", "")) == memory_id), None)
-    if seed is None:
-        return {
-            "nodes": [],
-            "edges": [],
-            "stats": {"added_nodes": 0, "added_edges": 0, "truncated": False},
-            "warnings": ["Selected memory no longer exists."],
-        }
-
-    neighbor_ids: set[str] = {memory_id}
-    seed_tags = set(seed.get("tags", []))
-    for fm in all_items:
-        fid = str(fm.get("id", ""))
-        if fid == memory_id:
-            continue
-        if seed_tags.intersection(fm.get("tags", [])):
-            neighbor_ids.add(fid)
-
-    for source_id, target_id, _reason, _score in _load_memory_graph_edges(
-        seed_memory_id=memory_id, limit=500
-    ):
-        if source_id == memory_id and target_id:
-            neighbor_ids.add(target_id)
-        if target_id == memory_id and source_id:
-            neighbor_ids.add(source_id)
-
-    focused = [fm for fm in all_items if str(fm.get("id", "")) in neighbor_ids]
-    graph = _build_memory_graph_payload(
-        selected=focused[:max_nodes],
-        matched_memories=len(focused),
+    limits = payload.get("limits") or {}
+    depth = _parse_int(str(payload.get("depth") or 1), 1, minimum=1, maximum=3)
+    degree_cap = _parse_int(
+        str(limits.get("degree_cap") or _EXPAND_DEGREE_CAP), _EXPAND_DEGREE_CAP, minimum=1, maximum=500
+    )
+    empty = {"nodes": [], "edges": [], "stats": {"added_nodes": 0, "added_edges": 0, "truncated": False}}
+    if node_kind(node_id) not in {"memory", "tag", "session"}:
+        return {**empty, "warnings": ["Only memory, tag, and session nodes can be expanded."]}
+    graph = _memory_graph(_load_all_memories())
+    if not graph.has_node(node_id):
+        return {**empty, "warnings": ["Selected node no longer exists."]}
+
+    # Tag and session nodes sit between memories, so one memory hop is two graph hops.
+    nodes = graph.neighborhood(
+        [node_id], hops=2 * depth, degree_cap=degree_cap, seed_cap=max_nodes, max_nodes=4 * max_nodes
+    )
+    scores, edges = graph.scored_subgraph({node_id: 1.0}, nodes)
+    result = _build_memory_graph_payload(
+        graph=graph,
+        scores=scores,
+        edges=edges,
+        matched_memories=sum(1 for node in nodes if node_kind(node) == "memory"),
         max_nodes=max_nodes,
         max_edges=max_edges,
     )
     return {
-        "nodes": graph["nodes"],
-        "edges": graph["edges"],
+        "nodes": result["nodes"],
+        "edges": result["edges"],
         "stats": {
-            "added_nodes": len(graph["nodes"]),
-            "added_edges": len(graph["edges"]),
-            "truncated": bool(graph.get("stats", {}).get("truncated")),
+            "added_nodes": len(result["nodes"]),
+            "added_edges": len(result["edges"]),
+            "truncated": result["stats"]["truncated"],
         },
-        "warnings": graph.get("warnings", []),
+        "warnings": result["warnings"],
     }
 
 
@@ -706,6 +701,13 @@ class DashboardHandler(BaseHTTPRequestHandler):
             }
         )
 
+    def _api_runs_profiles(self, query: dict[str, list[str]]) -> None:
+        """Return critical-path profiles of recent traced sync/maintain runs."""
+        limit = _parse_int((query.get("limit") or ["20"])[0], 20, minimum=1, maximum=200)
+        folders = discover_run_folders([Path.cwd() / ".acreta" / "workspace"], limit=limit)
+        profiles = [profile_run(folder) for folder in folders]
+        self._json({"aggregate": aggregate_profiles(profiles), "runs": profiles})
+
     def _api_search(self, query: dict[str, list[str]]) -> None:
         """Run FTS/keyword session search with optional filters and pagination."""
         config = get_config()
@@ -803,14 +805,18 @@ class DashboardHandler(BaseHTTPRequestHandler):
 
     def _api_memories(self, query: dict[str, list[str]]) -> None:
         """Return filtered memory list for dashboard memory explorer."""
-        all_items = _load_all_memories()
         query_text = (query.get("query") or [""])[0].strip()
         type_filter = (query.get("type") or [""])[0].strip()
         state_filter = (query.get("state") or [""])[0].strip()
         project_filter = (query.get("project") or [""])[0].strip()
+        ranked = (
+            search_memories(query_text, chat_memory_roots(get_config(), Path.cwd()), limit=300)
+            if query_text
+            else []
+        )
         items = _filter_memories(
-            all_items,
-            query=query_text,
+            ranked or _load_all_memories(),
+            query=None if ranked else query_text,
             type_filter=type_filter or None,
             state_filter=state_filter or None,
             project_filter=project_filter or None,
@@ -828,18 +834,18 @@ class DashboardHandler(BaseHTTPRequestHandler):
     def _api_memory_detail(self, path: str) -> None:
         """Return full memory details for one memory id."""
         memory_id = unquote(path.split("/api/memories/", 1)[1])
-        all_items = _load_all_memories()
-        fm = next(
-            (item for item in all_items if str(item.get("id", "")) == memory_id), None
-        )
+        _load_all_memories()
+        fm = _MEMORY_CORPUS.get(memory_id)
         if fm is None:
             self._error(HTTPStatus.NOT_FOUND, "Memory not found")
             return
+        record_access(get_config().memory_dir, [str(fm.get("id") or memory_id)], "view")
         self._json({"memory": _serialize_memory(fm, with_body=True)})
 
     def _api_memory_graph_options(self) -> None:
         """Return memory-graph filter option lists."""
-        self._json(_memory_graph_options(_load_all_memories()))
+        _load_all_memories()
+        self._json(_memory_graph_options(_MEMORY_CORPUS))
 
     def _api_refine_status(self) -> None:
         """Return queue and recent run status for refine panel."""
@@ -904,14 +910,66 @@ class DashboardHandler(BaseHTTPRequestHandler):
         )
         self._json({"models": models})
 
+    def _sse(self, event: str, payload: dict[str, Any]) -> None:
+        """Write one server-sent event and flush it to the client."""
+        data = json.dumps(payload, ensure_ascii=True)
+        self.wfile.write(f"event: {event}\ndata: {data}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def _api_chat_stream(self, query: dict[str, list[str]]) -> None:
+        """Stream a read-only chat answer as server-sent events."""
+        question = (query.get("q") or [""])[0].strip()
+        if not question:
+            self._error(HTTPStatus.BAD_REQUEST, "Missing q")
+            return
+        request = prepare_chat(question, cwd=Path.cwd())
+        cached = request.cached_answer()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            self._sse(
+                "retrieval",
+                {
+                    "type": "retrieval",
+                    "memory_ids": request.memory_ids,
+                    "coverage": request.retrieval.coverage,
+                    "fallback_used": not request.retrieval.confident,
+                    "cached": cached is not None,
+                },
+            )
+            if cached is not None:
+                request.record_citations(cached.response)
+                self._sse("text", {"type": "text", "text": cached.response})
+                self._sse(
+                    "done",
+                    {"type": "done", "text": cached.response, "session_id": cached.session_id},
+                )
+                return
+            for event in AcretaAgent(skills=["acreta"]).chat_stream(
+                request.prompt, cwd=str(Path.cwd())
+            ):
+                self._sse(event.type, event.to_dict())
+                if event.type == "done":
+                    request.record_citations(event.text)
+                    request.remember_answer(event.text, event.session_id or "")
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug("dashboard | chat stream client disconnected")
+        except Exception as exc:
+            logger.warning("dashboard | chat stream failed: {}", exc)
+            self._sse("error", {"type": "error", "text": str(exc)})
+
     def _handle_api_get(self, path: str, query: dict[str, list[str]]) -> None:
         """Dispatch GET API routes to the matching handler."""
         query_handlers = {
             "/api/runs/stats": self._api_runs_stats,
             "/api/runs": self._api_runs,
+            "/api/runs/profiles": self._api_runs_profiles,
             "/api/search": self._api_search,
             "/api/memories": self._api_memories,
             "/api/config/models": self._api_config_models,
+            "/api/chat/stream": self._api_chat_stream,
         }
         no_query_handlers = {
             "/api/memory-graph/options": self._api_memory_graph_options,
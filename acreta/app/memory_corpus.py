@@ -0,0 +1,145 @@
+"""Thread-safe in-process memory corpus cache for the dashboard.
+
+Parsed frontmatter dicts are kept per file and revalidated by ``(mtime_ns, size)``
+on every ``refresh`` (or by a caller-supplied ``signature`` for entries that do not
+live in their own file, such as packed summaries), so a request costs one directory
+walk and one ``stat`` per file instead of a full read and YAML parse. Id, tag, and primitive indexes are
+rebuilt only when some file was added, changed, or removed. Cached dicts are
+shared between requests and must be treated as read-only by callers.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+MemoryDict = dict[str, Any]
+
+
+@dataclass(frozen=True)
+class _Entry:
+    """One parsed memory file with the stat signature it was parsed at."""
+
+    mtime_ns: int
+    size: int
+    fm: MemoryDict
+
+
+def _stat_signature(path: Path) -> tuple[int, int]:
+    """Return the ``(mtime_ns, size)`` change signature of one file."""
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+class MemoryCorpus:
+    """Cache of parsed memory files with id, tag, and primitive indexes."""
+
+    def __init__(
+        self,
+        read: Callable[[Path], MemoryDict | None],
+        classify: Callable[[MemoryDict], str],
+        signature: Callable[[Path], tuple[int, int]] | None = None,
+    ) -> None:
+        self._read = read
+        self._classify = classify
+        self._signature = signature or _stat_signature
+        self._lock = threading.Lock()
+        self._entries: dict[Path, _Entry] = {}
+        self._items: list[MemoryDict] = []
+        self._by_id: dict[str, MemoryDict] = {}
+        self._by_tag: dict[str, list[MemoryDict]] = {}
+        self._by_primitive: dict[str, list[MemoryDict]] = {}
+        self.version = 0
+        self.parses = 0
+
+    def refresh(self, paths: list[Path]) -> list[MemoryDict]:
+        """Revalidate cached files against ``paths`` and return items in path order."""
+        with self._lock:
+            changed = set(self._entries) != set(paths)
+            entries: dict[Path, _Entry] = {}
+            for path in paths:
+                try:
+                    mtime_ns, size = self._signature(path)
+                except OSError:
+                    changed = True
+                    continue
+                cached = self._entries.get(path)
+                if cached and cached.mtime_ns == mtime_ns and cached.size == size:
+                    entries[path] = cached
+                    continue
+                fm = self._read(path)
+                self.parses += 1
+                changed = True
+                if fm is not None:
+                    entries[path] = _Entry(mtime_ns, size, fm)
+            if changed:
+                self._entries = entries
+                self._reindex([entries[path].fm for path in paths if path in entries])
+            return self._items
+
+    def _reindex(self, items: list[MemoryDict]) -> None:
+        """Rebuild the item list and lookup indexes after a corpus change."""
+        by_id: dict[str, MemoryDict] = {}
+        by_tag: dict[str, list[MemoryDict]] = {}
+        by_primitive: dict[str, list[MemoryDict]] = {}
+        for fm in items:
+            by_id.setdefault(str(fm.get("id", "")), fm)
+            tags = fm.get("tags")
+            for tag in dict.fromkeys(str(tag) for tag in tags if tag) if isinstance(tags, list) else ():
+                by_tag.setdefault(tag, []).append(fm)
+            by_primitive.setdefault(self._classify(fm), []).append(fm)
+        self._items = items
+        self._by_id = by_id
+        self._by_tag = by_tag
+        self._by_primitive = by_primitive
+        self.version += 1
+
+    def get(self, memory_id: str) -> MemoryDict | None:
+        """Return the first memory with ``memory_id`` from the last refresh."""
+        return self._by_id.get(memory_id)
+
+    def with_tag(self, tag: str) -> list[MemoryDict]:
+        """Return memories tagged ``tag`` from the last refresh."""
+        return self._by_tag.get(tag, [])
+
+    def with_primitive(self, primitive: str) -> list[MemoryDict]:
+        """Return memories of one primitive from the last refresh."""
+        return self._by_primitive.get(primitive, [])
+
+    def tags(self) -> list[str]:
+        """Return all tags in the corpus, sorted."""
+        return sorted(self._by_tag)
+
+    def primitives(self) -> list[str]:
+        """Return all primitives present in the corpus, sorted."""
+        return sorted(self._by_primitive)
+
+
+if __name__ == "__main__":
+    """Run a real-path self-test for reuse, invalidation, and indexes."""
+    import os
+    from tempfile import TemporaryDirectory
+
+    def _read(path: Path) -> MemoryDict | None:
+        """Parse a tiny ``id|tag`` test file."""
+        memory_id, tag = path.read_text(encoding="utf-8").strip().split("|")
+        return {"id": memory_id, "tags": [tag], "_path": str(path)}
+
+    with TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        first, second = root / "a.md", root / "b.md"
+        first.write_text("a|x", encoding="utf-8")
+        second.write_text("b|x", encoding="utf-8")
+        corpus = MemoryCorpus(_read, lambda fm: "learning")
+        assert [fm["id"] for fm in corpus.refresh([first, second])] == ["a", "b"]
+        corpus.refresh([first, second])
+        assert corpus.parses == 2 and corpus.version == 1
+        second.write_text("b|yy", encoding="utf-8")
+        os.utime(second, ns=(1, 1))
+        corpus.refresh([first, second])
+        assert corpus.parses == 3 and corpus.get("b")["tags"] == ["yy"]
+        assert [fm["id"] for fm in corpus.with_tag("x")] == ["a"]
+        corpus.refresh([first])
+        assert corpus.get("b") is None and corpus.tags() == ["x"]
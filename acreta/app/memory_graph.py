@@ -0,0 +1,296 @@
+"""In-process memory graph adjacency for the dashboard graph explorer.
+
+Nodes are ``mem:<id>``, ``tag:<tag>``, and ``session:<run_id>``. Memories link to
+their tags and source run, and memories link to each other through rows of the
+optional ``graph_edges`` table. ``sync`` applies only what changed since the last
+corpus version: the corpus reuses frontmatter dicts for unchanged files, so dict
+identity tells which memories must be relinked. Explicit edges are reloaded only
+when the graph database changes. Reads take a bounded k-hop neighborhood with
+per-node degree caps and rank it with personalized PageRank, so expanding a hub tag
+touches a few hundred nodes instead of the whole corpus.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+from typing import Any, Callable, Hashable, Iterable
+
+MemoryDict = dict[str, Any]
+ExplicitEdge = tuple[str, str, str, float]
+
+TAG_WEIGHT = 0.55
+SESSION_WEIGHT = 0.5
+MAX_TAGS = 8
+RESTART = 0.2
+ITERATIONS = 30
+TOLERANCE = 1e-6
+_DEFAULT_CONFIDENCE = 0.7
+
+
+def memory_node(memory_id: str) -> str:
+    """Return the graph node id of one memory."""
+    return f"mem:{memory_id}"
+
+
+def node_kind(node_id: str) -> str:
+    """Return the payload kind of a node id from its prefix."""
+    prefix = node_id.split(":", 1)[0]
+    return {"mem": "memory", "tag": "tag", "session": "session", "type": "type"}.get(prefix, prefix)
+
+
+def memory_confidence(fm: MemoryDict) -> float:
+    """Return a memory's confidence, falling back to the write default."""
+    try:
+        return float(fm.get("confidence", _DEFAULT_CONFIDENCE))
+    except (TypeError, ValueError):
+        return _DEFAULT_CONFIDENCE
+
+
+def personalized_pagerank(
+    adjacency: dict[str, dict[str, float]],
+    seeds: dict[str, float],
+    *,
+    restart: float = RESTART,
+    iterations: int = ITERATIONS,
+    tolerance: float = TOLERANCE,
+) -> dict[str, float]:
+    """Score nodes of a weighted undirected ``adjacency`` by random walks restarting at ``seeds``."""
+    seeds = {node: weight for node, weight in seeds.items() if node in adjacency and weight > 0}
+    total = sum(seeds.values())
+    if not total:
+        return {}
+    restart_at = {node: weight / total for node, weight in seeds.items()}
+    out_weight = {node: sum(neighbors.values()) for node, neighbors in adjacency.items()}
+    scores = dict(restart_at)
+    for _ in range(iterations):
+        spread: dict[str, float] = {node: restart * value for node, value in restart_at.items()}
+        dangling = 0.0
+        for node, value in scores.items():
+            weight = out_weight[node]
+            if weight <= 0:
+                dangling += value
+                continue
+            share = (1.0 - restart) * value / weight
+            for neighbor, edge_weight in adjacency[node].items():
+                spread[neighbor] = spread.get(neighbor, 0.0) + share * edge_weight
+        for node, value in restart_at.items():
+            spread[node] += (1.0 - restart) * dangling * value
+        delta = sum(abs(spread.get(node, 0.0) - scores.get(node, 0.0)) for node in spread.keys() | scores.keys())
+        scores = spread
+        if delta < tolerance:
+            break
+    return scores
+
+
+class MemoryGraph:
+    """Incrementally maintained memory/tag/session adjacency with k-hop ranking."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._adjacency: dict[str, dict[str, float]] = {}
+        self._edges: dict[tuple[str, str], tuple[str, float]] = {}
+        self._memories: dict[str, MemoryDict] = {}
+        self._explicit: dict[str, list[ExplicitEdge]] = {}
+        self._corpus_version: int | None = None
+        self._explicit_key: Hashable = None
+        self.linked = 0
+
+    def sync(
+        self,
+        items: Iterable[MemoryDict],
+        *,
+        version: int,
+        explicit_key: Hashable,
+        load_explicit: Callable[[], list[ExplicitEdge]],
+    ) -> None:
+        """Bring the graph up to ``items`` (corpus ``version``) and the explicit edges behind ``explicit_key``."""
+        with self._lock:
+            if explicit_key != self._explicit_key:
+                self._reload_explicit(load_explicit())
+                self._explicit_key = explicit_key
+            if version == self._corpus_version:
+                return
+            current: dict[str, MemoryDict] = {}
+            for fm in items:
+                memory_id = str(fm.get("id", "") or "")
+                if memory_id:
+                    current.setdefault(memory_node(memory_id), fm)
+            for node in [node for node, fm in self._memories.items() if current.get(node) is not fm]:
+                self._unlink_memory(node)
+            for node, fm in current.items():
+                if node not in self._memories:
+                    self._link_memory(node, fm)
+            self._corpus_version = version
+
+    def _connect(self, source: str, target: str, kind: str, weight: float) -> None:
+        """Add one undirected adjacency entry, keeping the heavier edge per node pair."""
+        if weight <= self._adjacency.setdefault(source, {}).get(target, 0.0):
+            return
+        self._adjacency[source][target] = weight
+        self._adjacency.setdefault(target, {})[source] = weight
+        self._edges.pop((target, source), None)
+        self._edges[(source, target)] = (kind, weight)
+
+    def _disconnect(self, node: str, neighbor: str) -> None:
+        """Remove one undirected adjacency entry and drop tag/session ends left without edges."""
+        for end, other in ((node, neighbor), (neighbor, node)):
+            neighbors = self._adjacency.get(end)
+            if neighbors is None:
+                continue
+            neighbors.pop(other, None)
+            if not neighbors and end not in self._memories:
+                del self._adjacency[end]
+        self._edges.pop((node, neighbor), None)
+        self._edges.pop((neighbor, node), None)
+
+    def _link_memory(self, node: str, fm: MemoryDict) -> None:
+        """Add one memory with its tag, source-run, and explicit memory edges."""
+        self._memories[node] = fm
+        self._adjacency.setdefault(node, {})
+        tags = fm.get("tags")
+        for tag in list(dict.fromkeys(str(tag) for tag in tags if tag))[:MAX_TAGS] if isinstance(tags, list) else ():
+            self._connect(node, f"tag:{tag}", "tagged", TAG_WEIGHT)
+        source = str(fm.get("source") or fm.get("run_id") or "").strip()
+        if source:
+            self._connect(node, f"session:{source}", "from_session", SESSION_WEIGHT)
+        for source_node, target_node, reason, score in self._explicit.get(node, ()):
+            if source_node != target_node and source_node in self._memories and target_node in self._memories:
+                self._connect(source_node, target_node, reason, score)
+        self.linked += 1
+
+    def _unlink_memory(self, node: str) -> None:
+        """Remove one memory and every edge touching it."""
+        for neighbor in list(self._adjacency.get(node, ())):
+            self._disconnect(node, neighbor)
+        self._adjacency.pop(node, None)
+        self._memories.pop(node, None)
+
+    def _reload_explicit(self, rows: list[ExplicitEdge]) -> None:
+        """Replace all memory-to-memory edges with ``rows`` of ``(source_id, target_id, reason, score)``."""
+        for source, target in [pair for pair in self._edges if pair[0] in self._memories and pair[1] in self._memories]:
+            self._disconnect(source, target)
+        self._explicit = {}
+        for source_id, target_id, reason, score in rows:
+            edge = (memory_node(source_id), memory_node(target_id), reason, score)
+            self._explicit.setdefault(edge[0], []).append(edge)
+            self._explicit.setdefault(edge[1], []).append(edge)
+            if edge[0] != edge[1] and edge[0] in self._memories and edge[1] in self._memories:
+                self._connect(*edge)
+
+    def has_node(self, node_id: str) -> bool:
+        """Return whether ``node_id`` is in the graph."""
+        return node_id in self._adjacency
+
+    def memory(self, node_id: str) -> MemoryDict | None:
+        """Return the frontmatter dict behind a memory node."""
+        return self._memories.get(node_id)
+
+    def context_nodes(self, memory_nodes: Iterable[str]) -> set[str]:
+        """Return the tag and session nodes attached to ``memory_nodes``."""
+        with self._lock:
+            return {
+                other
+                for node in memory_nodes
+                for other in self._adjacency.get(node, ())
+                if other not in self._memories
+            }
+
+    def _relevance_weight(self, node_id: str) -> float:
+        """Return the factor applied to a walk score: confidence for memories, 1 otherwise."""
+        fm = self._memories.get(node_id)
+        return memory_confidence(fm) if fm is not None else 1.0
+
+    def _prior(self, node_id: str) -> float:
+        """Return a static node prior: confidence for memories, damped degree for hubs."""
+        fm = self._memories.get(node_id)
+        if fm is not None:
+            return memory_confidence(fm)
+        return 1.0 / (1.0 + math.log1p(len(self._adjacency.get(node_id, ()))))
+
+    def neighborhood(
+        self,
+        seeds: Iterable[str],
+        *,
+        hops: int,
+        degree_cap: int,
+        seed_cap: int | None = None,
+        max_nodes: int | None = None,
+    ) -> set[str]:
+        """Collect nodes within ``hops`` of ``seeds``, following at most ``degree_cap`` strongest edges per node."""
+        with self._lock:
+            visited = {node for node in seeds if node in self._adjacency}
+            frontier = sorted(visited)
+            for hop in range(hops):
+                cap = seed_cap if hop == 0 and seed_cap is not None else degree_cap
+                next_frontier: list[str] = []
+                for node in frontier:
+                    neighbors = self._adjacency[node]
+                    if len(neighbors) > cap:
+                        picked = heapq.nlargest(
+                            cap, neighbors, key=lambda other: (neighbors[other] * self._prior(other), other)
+                        )
+                    else:
+                        picked = list(neighbors)
+                    for other in picked:
+                        if other in visited:
+                            continue
+                        visited.add(other)
+                        next_frontier.append(other)
+                        if max_nodes is not None and len(visited) >= max_nodes:
+                            return visited
+                frontier = next_frontier
+            return visited
+
+    def scored_subgraph(
+        self, seeds: dict[str, float], nodes: set[str]
+    ) -> tuple[dict[str, float], list[tuple[str, str, str, float]]]:
+        """Rank ``nodes`` by confidence-weighted personalized PageRank from ``seeds``; scores scale to 1."""
+        with self._lock:
+            restricted: dict[str, dict[str, float]] = {}
+            for node in nodes:
+                neighbors = self._adjacency.get(node)
+                if neighbors is None:
+                    continue
+                if len(neighbors) <= len(nodes):
+                    restricted[node] = {other: weight for other, weight in neighbors.items() if other in nodes}
+                else:
+                    restricted[node] = {other: neighbors[other] for other in nodes if other in neighbors}
+            edges = [
+                (source, target, *self._edges[(source, target)])
+                for source, neighbors in restricted.items()
+                for target in neighbors
+                if (source, target) in self._edges
+            ]
+            ranks = personalized_pagerank(restricted, seeds)
+            weighted = {node: ranks.get(node, 0.0) * self._relevance_weight(node) for node in restricted}
+        top = max(weighted.values(), default=0.0) or 1.0
+        scores = {node: round(value / top, 6) for node, value in weighted.items()}
+        return scores, edges
+
+
+if __name__ == "__main__":
+    """Run a real-data self-test for incremental sync, capped expansion, and ranking."""
+    import time
+
+    items = [{"id": f"m{i}", "tags": ["testing", f"group{i % 50}"], "confidence": 0.5 + (i % 5) / 10} for i in range(10_000)]
+    graph = MemoryGraph()
+    graph.sync(items, version=1, explicit_key=None, load_explicit=list)
+    assert graph.linked == 10_000
+
+    started = time.perf_counter()
+    nodes = graph.neighborhood(["tag:testing"], hops=2, degree_cap=40, seed_cap=500, max_nodes=2000)
+    scores, edges = graph.scored_subgraph({"tag:testing": 1.0}, nodes)
+    elapsed = time.perf_counter() - started
+    assert scores["tag:testing"] == 1.0 and len(nodes) <= 2000 and elapsed < 1.0, elapsed
+    assert all(graph.memory(node)["confidence"] == 0.9 for node in nodes if node.startswith("mem:"))
+
+    items[3] = {"id": "m3", "tags": ["solo"], "source": "run-1"}
+    graph.sync(items, version=2, explicit_key=("edges", 1), load_explicit=lambda: [("m3", "m4", "related", 0.9)])
+    assert graph.linked == 10_001
+    assert set(graph._adjacency["mem:m3"]) == {"tag:solo", "session:run-1", "mem:m4"}
+    graph.sync(items, version=2, explicit_key=("edges", 2), load_explicit=list)
+    assert "mem:m4" not in graph._adjacency["mem:m3"] and "mem:m3" not in graph._adjacency["mem:m4"]
+    graph.sync(items[:3], version=3, explicit_key=("edges", 1), load_explicit=list)
+    assert not graph.has_node("tag:solo") and not graph.has_node("mem:m4")
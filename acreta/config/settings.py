@@ -101,6 +101,7 @@ def _ensure_project_config_exists(data_root: Path) -> Path:
         "[memory]\n"
         "# scope = \"project_fallback_global\"\n"
         "# project_dir_name = \".acreta\"\n"
+        "# summary_layout = \"tree\"   # tree | flat | packed\n"
         "\n"
         "[search]\n"
         "# mode = \"files\"    # files | fts | hybrid\n"
@@ -260,12 +261,30 @@ class Config:
     graph_db_path: Path | None = None
     memory_scope: str = "project_fallback_global"
     memory_project_dir_name: str = DEFAULT_PROJECT_DIR_NAME
+    memory_summary_layout: str = "tree"
+    memory_prior_half_life_days: int = 30
     search_mode: str = "files"
     search_enable_fts: bool = False
     search_enable_vectors: bool = False
     search_enable_graph: bool = True
     search_graph_depth: int = 1
+    search_chat_context_tokens: int = 6000
+    chat_cache_enabled: bool = True
+    chat_cache_ttl_hours: int = 168
+    chat_cache_max_entries: int = 500
     persist_sessions_in_workspace: bool = False
+    workspace_retention_enabled: bool = True
+    workspace_keep_runs: int = 200
+    workspace_keep_days: int = 30
+    agent_pool_enabled: bool = False
+    agent_pool_max_clients: int = 2
+    agent_pool_max_jobs_per_client: int = 20
+    triage_enabled: bool = True
+    triage_min_messages: int = 3
+    triage_min_tool_calls: int = 1
+    triage_min_tokens: int = 2000
+    triage_min_duration_seconds: int = 60
+    triage_classifier: str | None = None
 
     def public_dict(self) -> dict[str, Any]:
         """Return a safe serializable config snapshot for user-facing output."""
@@ -296,13 +315,31 @@ class Config:
             "embedding_max_input_tokens": self.embedding_max_input_tokens,
             "memory_scope": self.memory_scope,
             "memory_project_dir_name": self.memory_project_dir_name,
+            "memory_summary_layout": self.memory_summary_layout,
+            "memory_prior_half_life_days": self.memory_prior_half_life_days,
             "search_mode": self.search_mode,
             "search_enable_fts": self.search_enable_fts,
             "search_enable_vectors": self.search_enable_vectors,
             "search_enable_graph": self.search_enable_graph,
             "search_graph_depth": self.search_graph_depth,
+            "search_chat_context_tokens": self.search_chat_context_tokens,
+            "chat_cache_enabled": self.chat_cache_enabled,
+            "chat_cache_ttl_hours": self.chat_cache_ttl_hours,
+            "chat_cache_max_entries": self.chat_cache_max_entries,
             "persist_sessions_in_workspace": self.persist_sessions_in_workspace,
+            "workspace_retention_enabled": self.workspace_retention_enabled,
+            "workspace_keep_runs": self.workspace_keep_runs,
+            "workspace_keep_days": self.workspace_keep_days,
+            "agent_pool_enabled": self.agent_pool_enabled,
+            "agent_pool_max_clients": self.agent_pool_max_clients,
+            "agent_pool_max_jobs_per_client": self.agent_pool_max_jobs_per_client,
             "graph_export": self.graph_export,
+            "triage_enabled": self.triage_enabled,
+            "triage_min_messages": self.triage_min_messages,
+            "triage_min_tool_calls": self.triage_min_tool_calls,
+            "triage_min_tokens": self.triage_min_tokens,
+            "triage_min_duration_seconds": self.triage_min_duration_seconds,
+            "triage_classifier": self.triage_classifier,
         }
 
 
@@ -338,6 +375,18 @@ def load_config() -> Config:
             default=DEFAULT_PROJECT_DIR_NAME,
         )
     ).strip() or DEFAULT_PROJECT_DIR_NAME
+    memory_summary_layout = str(
+        _env_or_toml("ACRETA_MEMORY_SUMMARY_LAYOUT", toml_data, "memory", "summary_layout", default="tree")
+    ).strip().lower()
+    if memory_summary_layout not in {"tree", "flat", "packed"}:
+        memory_summary_layout = "tree"
+    memory_prior_half_life_days = max(
+        1,
+        _parse_int(
+            _env_or_toml("ACRETA_MEMORY_PRIOR_HALF_LIFE_DAYS", toml_data, "memory", "prior_half_life_days", default=30),
+            30,
+        ),
+    )
     env_memory_dir_set = os.getenv("ACRETA_MEMORY_DIR") not in (None, "")
     env_index_dir_set = os.getenv("ACRETA_INDEX_DIR") not in (None, "")
     env_data_dir_set = os.getenv("ACRETA_DATA_DIR") not in (None, "")
@@ -419,6 +468,17 @@ def load_config() -> Config:
     agent_model_raw = _env_or_toml("ACRETA_MODEL", toml_data, "agent", "model", default=None)
     agent_model = str(agent_model_raw) if agent_model_raw not in (None, "") else None
     agent_timeout = max(30, _parse_int(_env_or_toml("ACRETA_AGENT_TIMEOUT", toml_data, "agent", "timeout", default=120), 120))
+    agent_pool_enabled = _parse_bool(_env_or_toml("ACRETA_AGENT_POOL_ENABLED", toml_data, "agent", "pool_enabled", default=False))
+    agent_pool_max_clients = max(
+        1, _parse_int(_env_or_toml("ACRETA_AGENT_POOL_MAX_CLIENTS", toml_data, "agent", "pool_max_clients", default=2), 2)
+    )
+    agent_pool_max_jobs_per_client = max(
+        1,
+        _parse_int(
+            _env_or_toml("ACRETA_AGENT_POOL_MAX_JOBS_PER_CLIENT", toml_data, "agent", "pool_max_jobs_per_client", default=20),
+            20,
+        ),
+    )
 
     anthropic_api_key = _env_or_toml("ANTHROPIC_API_KEY", toml_data, "api_keys", "anthropic", default=None)
     zai_api_key = _env_or_toml("ZAI_API_KEY", toml_data, "api_keys", "zai", default=None)
@@ -479,6 +539,23 @@ def load_config() -> Config:
         0,
         _parse_int(_env_or_toml("ACRETA_SEARCH_GRAPH_DEPTH", toml_data, "search", "graph_depth", default=1), 1),
     )
+    search_chat_context_tokens = max(
+        500,
+        _parse_int(
+            _env_or_toml("ACRETA_SEARCH_CHAT_CONTEXT_TOKENS", toml_data, "search", "chat_context_tokens", default=6000),
+            6000,
+        ),
+    )
+    chat_cache_enabled = _parse_bool(
+        _env_or_toml("ACRETA_CHAT_CACHE_ENABLED", toml_data, "chat", "cache_enabled", default=True), True
+    )
+    chat_cache_ttl_hours = max(
+        0, _parse_int(_env_or_toml("ACRETA_CHAT_CACHE_TTL_HOURS", toml_data, "chat", "cache_ttl_hours", default=168), 168)
+    )
+    chat_cache_max_entries = max(
+        1,
+        _parse_int(_env_or_toml("ACRETA_CHAT_CACHE_MAX_ENTRIES", toml_data, "chat", "cache_max_entries", default=500), 500),
+    )
 
     graph_export = _parse_bool(_env_or_toml("ACRETA_GRAPH_EXPORT", toml_data, "search", "graph_export", default=False))
     persist_sessions_in_workspace = _parse_bool(
@@ -490,6 +567,35 @@ def load_config() -> Config:
             default=False,
         )
     )
+    workspace_retention_enabled = _parse_bool(
+        _env_or_toml("ACRETA_WORKSPACE_RETENTION_ENABLED", toml_data, "workspace", "retention_enabled", default=True),
+        True,
+    )
+    workspace_keep_runs = max(
+        0, _parse_int(_env_or_toml("ACRETA_WORKSPACE_KEEP_RUNS", toml_data, "workspace", "keep_runs", default=200), 200)
+    )
+    workspace_keep_days = max(
+        0, _parse_int(_env_or_toml("ACRETA_WORKSPACE_KEEP_DAYS", toml_data, "workspace", "keep_days", default=30), 30)
+    )
+
+    triage_enabled = _parse_bool(_env_or_toml("ACRETA_TRIAGE_ENABLED", toml_data, "triage", "enabled", default=True))
+    triage_min_messages = max(
+        0, _parse_int(_env_or_toml("ACRETA_TRIAGE_MIN_MESSAGES", toml_data, "triage", "min_messages", default=3), 3)
+    )
+    triage_min_tool_calls = max(
+        0, _parse_int(_env_or_toml("ACRETA_TRIAGE_MIN_TOOL_CALLS", toml_data, "triage", "min_tool_calls", default=1), 1)
+    )
+    triage_min_tokens = max(
+        0, _parse_int(_env_or_toml("ACRETA_TRIAGE_MIN_TOKENS", toml_data, "triage", "min_tokens", default=2000), 2000)
+    )
+    triage_min_duration_seconds = max(
+        0,
+        _parse_int(
+            _env_or_toml("ACRETA_TRIAGE_MIN_DURATION_SECONDS", toml_data, "triage", "min_duration_seconds", default=60),
+            60,
+        ),
+    )
+    triage_classifier_raw = _env_or_toml("ACRETA_TRIAGE_CLASSIFIER", toml_data, "triage", "classifier", default=None)
 
     from acreta.memory.memory_repo import build_memory_paths, ensure_memory_paths
 
@@ -528,13 +634,31 @@ def load_config() -> Config:
         embedding_max_input_tokens=embedding_max_input_tokens,
         memory_scope=memory_scope,
         memory_project_dir_name=memory_project_dir_name,
+        memory_summary_layout=memory_summary_layout,
+        memory_prior_half_life_days=memory_prior_half_life_days,
         search_mode=search_mode,
         search_enable_fts=search_enable_fts,
         search_enable_vectors=search_enable_vectors,
         search_enable_graph=search_enable_graph,
         search_graph_depth=search_graph_depth,
+        search_chat_context_tokens=search_chat_context_tokens,
+        chat_cache_enabled=chat_cache_enabled,
+        chat_cache_ttl_hours=chat_cache_ttl_hours,
+        chat_cache_max_entries=chat_cache_max_entries,
         persist_sessions_in_workspace=persist_sessions_in_workspace,
+        workspace_retention_enabled=workspace_retention_enabled,
+        workspace_keep_runs=workspace_keep_runs,
+        workspace_keep_days=workspace_keep_days,
+        agent_pool_enabled=agent_pool_enabled,
+        agent_pool_max_clients=agent_pool_max_clients,
+        agent_pool_max_jobs_per_client=agent_pool_max_jobs_per_client,
         graph_export=graph_export,
+        triage_enabled=triage_enabled,
+        triage_min_messages=triage_min_messages,
+        triage_min_tool_calls=triage_min_tool_calls,
+        triage_min_tokens=triage_min_tokens,
+        triage_min_duration_seconds=triage_min_duration_seconds,
+        triage_classifier=str(triage_classifier_raw).strip() if triage_classifier_raw not in (None, "") else None,
     )
 
 
@@ -0,0 +1,358 @@
+"""Memory access tracking and precomputed retrieval priors.
+
+Search hits, chat citations, and dashboard detail views are counted per memory id
+in ``<index_dir>/memory_access.sqlite3``. Callers only bump an in-memory buffer; a
+background thread writes the buffer in one transaction every few seconds (or once
+it reaches a batch size), and an exit hook flushes whatever is left.
+
+``compute_priors`` runs on the maintain cadence and turns the counts into one prior
+per decision/learning file: ``confidence x recency x usage``, where recency and usage
+both decay with a configurable half-life. Priors are keyed by path, since two runs
+writing the same title give two files with one id. Retrieval multiplies BM25 scores by a bounded
+boost from the prior, and maintain gets low-prior memories as archive candidates.
+"""
+
+from __future__ import annotations
+
+import atexit
+import math
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+from acreta.config.logging import logger
+from acreta.memory.digest import read_memory_digest
+from acreta.memory.journal import index_dir_for_memory_root
+
+ACCESS_DB_FILENAME = "memory_access.sqlite3"
+ACCESS_KINDS = ("retrieval", "citation", "view")
+ACCESS_WEIGHTS = {"retrieval": 1.0, "citation": 3.0, "view": 0.5}
+PRIOR_HALF_LIFE_DAYS = 30
+PRIOR_BOOST = 0.25
+FLUSH_INTERVAL_SECONDS = 5.0
+FLUSH_BATCH_SIZE = 200
+_USAGE_SCALE = 3.0
+_DEFAULT_CONFIDENCE = 0.7
+_KIND_COLUMNS = {"retrieval": "retrievals", "citation": "citations", "view": "views"}
+
+
+class AccessStats:
+    """SQLite store for per-memory access counts and computed priors."""
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the stats database, creating its tables on first use."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            columns = {row["name"]: row["pk"] for row in conn.execute("PRAGMA table_info(memory_priors)")}
+            if columns.get("memory_id"):
+                conn.execute("DROP TABLE memory_priors")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS memory_access (
+                    memory_id TEXT PRIMARY KEY,
+                    retrievals INTEGER NOT NULL DEFAULT 0,
+                    citations INTEGER NOT NULL DEFAULT 0,
+                    views INTEGER NOT NULL DEFAULT 0,
+                    last_accessed REAL NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS memory_priors (
+                    path TEXT PRIMARY KEY,
+                    memory_id TEXT NOT NULL,
+                    prior REAL NOT NULL,
+                    confidence REAL NOT NULL,
+                    recency REAL NOT NULL,
+                    usage REAL NOT NULL,
+                    computed_at REAL NOT NULL
+                );
+                """
+            )
+            self._initialized = True
+        return conn
+
+    def add_counts(self, counts: dict[tuple[str, str], int], last_accessed: dict[str, float]) -> None:
+        """Add buffered ``(memory_id, kind) -> count`` increments in one transaction."""
+        if not counts:
+            return
+        with self._connect() as conn:
+            for (memory_id, kind), count in counts.items():
+                column = _KIND_COLUMNS[kind]
+                conn.execute(
+                    f"INSERT INTO memory_access (memory_id, {column}, last_accessed) VALUES (?, ?, ?) "
+                    f"ON CONFLICT(memory_id) DO UPDATE SET {column} = {column} + excluded.{column}, "
+                    "last_accessed = MAX(last_accessed, excluded.last_accessed)",
+                    (memory_id, count, last_accessed.get(memory_id, time.time())),
+                )
+
+    def counts(self) -> dict[str, dict[str, Any]]:
+        """Return access counts keyed by memory id."""
+        if not self.db_path.exists():
+            return {}
+        with self._connect() as conn:
+            return {
+                row["memory_id"]: dict(row)
+                for row in conn.execute(
+                    "SELECT memory_id, retrievals, citations, views, last_accessed FROM memory_access"
+                )
+            }
+
+    def replace_priors(self, rows: list[dict[str, Any]]) -> None:
+        """Replace the stored priors with a freshly computed set."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM memory_priors")
+            conn.executemany(
+                "INSERT INTO memory_priors (memory_id, path, prior, confidence, recency, usage, computed_at) "
+                "VALUES (:memory_id, :path, :prior, :confidence, :recency, :usage, :computed_at)",
+                rows,
+            )
+
+    def priors(self) -> list[dict[str, Any]]:
+        """Return stored priors, lowest first."""
+        if not self.db_path.exists():
+            return []
+        with self._connect() as conn:
+            return [
+                dict(row)
+                for row in conn.execute(
+                    "SELECT memory_id, path, prior, confidence, recency, usage, computed_at "
+                    "FROM memory_priors ORDER BY prior, memory_id, path"
+                )
+            ]
+
+
+def access_stats_for_memory_root(memory_root: Path) -> AccessStats:
+    """Return the access-stats store in the memory root's index dir."""
+    return AccessStats(index_dir_for_memory_root(memory_root) / ACCESS_DB_FILENAME)
+
+
+class AccessRecorder:
+    """Buffer access events in memory and write them from a background thread."""
+
+    def __init__(
+        self,
+        stats: AccessStats,
+        *,
+        interval_seconds: float = FLUSH_INTERVAL_SECONDS,
+        batch_size: int = FLUSH_BATCH_SIZE,
+    ) -> None:
+        self.stats = stats
+        self.interval_seconds = interval_seconds
+        self.batch_size = max(1, batch_size)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending: Counter[tuple[str, str]] = Counter()
+        self._last_accessed: dict[str, float] = {}
+        self._thread: threading.Thread | None = None
+
+    def record(self, memory_ids: Iterable[str], kind: str) -> None:
+        """Count one access of ``kind`` for each id without touching the database."""
+        if kind not in ACCESS_KINDS:
+            raise ValueError(f"unknown_access_kind:{kind}")
+        now = time.time()
+        with self._lock:
+            for memory_id in memory_ids:
+                if not memory_id:
+                    continue
+                self._pending[(memory_id, kind)] += 1
+                self._last_accessed[memory_id] = now
+            full = sum(self._pending.values()) >= self.batch_size
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="acreta-access-stats", daemon=True
+                )
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write buffered counts now and return how many accesses were written."""
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, Counter()
+                last_accessed, self._last_accessed = self._last_accessed, {}
+            if not pending:
+                return 0
+            try:
+                self.stats.add_counts(dict(pending), last_accessed)
+            except (OSError, sqlite3.Error) as exc:
+                logger.warning("memory access stats write failed for {}: {}", self.stats.db_path, exc)
+                return 0
+            return sum(pending.values())
+
+    def _run(self) -> None:
+        """Flush on the interval, or early when a batch fills up."""
+        while True:
+            self._wake.wait(self.interval_seconds)
+            self._wake.clear()
+            self.flush()
+
+
+_RECORDERS: dict[Path, AccessRecorder] = {}
+_RECORDERS_LOCK = threading.Lock()
+
+
+def _recorder_for(memory_root: Path) -> AccessRecorder:
+    """Return the process-wide recorder for one memory root's stats store."""
+    stats = access_stats_for_memory_root(memory_root)
+    with _RECORDERS_LOCK:
+        if not _RECORDERS:
+            atexit.register(flush_access_stats)
+        recorder = _RECORDERS.get(stats.db_path)
+        if recorder is None:
+            recorder = _RECORDERS[stats.db_path] = AccessRecorder(stats)
+        return recorder
+
+
+def record_access(memory_root: Path, memory_ids: Iterable[str], kind: str) -> None:
+    """Queue access events for memories under ``memory_root``; never raises on storage errors."""
+    try:
+        _recorder_for(memory_root).record(memory_ids, kind)
+    except (OSError, ValueError) as exc:
+        logger.warning("memory access tracking failed for {}: {}", memory_root, exc)
+
+
+def record_hit_access(
+    memory_roots: Iterable[Path],
+    hits: Iterable[dict[str, Any]],
+    kind: str,
+    *,
+    path_key: str = "_path",
+) -> None:
+    """Queue one access per hit against the memory root that contains its path."""
+    roots = [Path(root).expanduser().resolve() for root in memory_roots]
+    grouped: dict[Path, list[str]] = {}
+    for hit in hits:
+        path = Path(str(hit.get(path_key) or ""))
+        memory_id = str(hit.get("id") or path.stem)
+        for root in roots:
+            if root in path.parents:
+                grouped.setdefault(root, []).append(memory_id)
+                break
+    for root, memory_ids in grouped.items():
+        record_access(root, memory_ids, kind)
+
+
+def flush_access_stats() -> int:
+    """Write every recorder's buffered counts now; return the number of accesses written."""
+    with _RECORDERS_LOCK:
+        recorders = list(_RECORDERS.values())
+    return sum(recorder.flush() for recorder in recorders)
+
+
+def _timestamp(value: str) -> float | None:
+    """Parse an ISO date or datetime string into epoch seconds."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _decay(age_seconds: float, half_life_days: float) -> float:
+    """Return the exponential decay factor for an age and half-life."""
+    return 0.5 ** (max(0.0, age_seconds) / 86400 / max(half_life_days, 1e-6))
+
+
+def memory_prior(confidence: float, recency: float, usage: float) -> float:
+    """Combine confidence, recency decay, and decayed usage into a prior in ``[0, 1]``."""
+    usage_term = 1 - math.exp(-max(0.0, usage) / _USAGE_SCALE)
+    return confidence * (0.5 + 0.5 * recency) * (0.5 + 0.5 * usage_term)
+
+
+def prior_boost(prior: float | None) -> float:
+    """Return the ranking multiplier for a prior; unknown priors are neutral."""
+    if prior is None:
+        return 1.0
+    return 1 - PRIOR_BOOST + 2 * PRIOR_BOOST * min(1.0, max(0.0, prior))
+
+
+def compute_priors(
+    memory_root: Path,
+    *,
+    half_life_days: float = PRIOR_HALF_LIFE_DAYS,
+    now: float | None = None,
+) -> list[dict[str, Any]]:
+    """Recompute and store priors for every decision/learning under ``memory_root``, lowest first."""
+    flush_access_stats()
+    now = time.time() if now is None else now
+    stats = access_stats_for_memory_root(memory_root)
+    counts = stats.counts()
+    rows: list[dict[str, Any]] = []
+    for row in read_memory_digest(memory_root):
+        try:
+            confidence = min(1.0, max(0.0, float(row.get("confidence") or _DEFAULT_CONFIDENCE)))
+        except ValueError:
+            confidence = _DEFAULT_CONFIDENCE
+        access = counts.get(row["id"], {})
+        last_accessed = float(access.get("last_accessed") or 0.0)
+        updated = _timestamp(row.get("updated", ""))
+        if updated is None:
+            try:
+                updated = Path(row["path"]).stat().st_mtime
+            except OSError:
+                updated = now
+        weighted = sum(ACCESS_WEIGHTS[kind] * int(access.get(column) or 0) for kind, column in _KIND_COLUMNS.items())
+        recency = _decay(now - max(updated, last_accessed), half_life_days)
+        usage = weighted * _decay(now - last_accessed, half_life_days) if weighted else 0.0
+        rows.append(
+            {
+                "memory_id": row["id"],
+                "path": row["path"],
+                "prior": round(memory_prior(confidence, recency, usage), 4),
+                "confidence": confidence,
+                "recency": round(recency, 4),
+                "usage": round(usage, 4),
+                "computed_at": now,
+            }
+        )
+    rows.sort(key=lambda item: (item["prior"], item["memory_id"], item["path"]))
+    stats.replace_priors(rows)
+    return rows
+
+
+def load_priors(memory_root: Path) -> dict[str, float]:
+    """Return stored priors keyed by resolved memory path (empty until ``compute_priors`` has run)."""
+    try:
+        return {row["path"]: float(row["prior"]) for row in access_stats_for_memory_root(memory_root).priors()}
+    except sqlite3.Error as exc:
+        logger.warning("memory priors unreadable for {}: {}", memory_root, exc)
+        return {}
+
+
+if __name__ == "__main__":
+    """Run a real-path self-test for batched access counts and prior ordering."""
+    from tempfile import TemporaryDirectory
+
+    with TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir) / "memory"
+        (root / "learnings").mkdir(parents=True)
+        for name in ("used", "idle"):
+            (root / "learnings" / f"{name}.md").write_text(
+                f"---\nid: {name}\ntitle: {name}\nconfidence: 0.8\nupdated: '2026-01-01T00:00:00Z'\n---\nBody.\n",
+                encoding="utf-8",
+            )
+        recorder = AccessRecorder(AccessStats(Path(tmp_dir) / "index" / ACCESS_DB_FILENAME))
+        _RECORDERS[recorder.stats.db_path] = recorder
+        recorder.record(["used", "used"], "retrieval")
+        recorder.record(["used"], "citation")
+        assert recorder.flush() == 3 and recorder.flush() == 0
+        assert recorder.stats.counts()["used"]["citations"] == 1
+        priors = compute_priors(root)
+        assert [row["memory_id"] for row in priors] == ["idle", "used"]
+        loaded = load_priors(root)
+        assert loaded[str((root / "learnings" / "used.md").resolve())] > loaded[str((root / "learnings" / "idle.md").resolve())]
+        assert prior_boost(None) == 1.0 and prior_boost(1.0) > prior_boost(0.0)
@@ -0,0 +1,255 @@
+"""Deterministic near-duplicate clustering for the maintain flow.
+
+MinHash LSH over word shingles proposes duplicate groups and low-value archive
+candidates (low confidence, near-empty, or a low precomputed access prior), so the
+maintain agent adjudicates ``clusters.json`` instead of scanning every memory file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from acreta.memory.frontmatter_codec import load_frontmatter
+from acreta.memory.matching import MATCHED_PRIMITIVES, normalize_text, tokenize
+from acreta.memory.memory_record import MEMORY_TYPE_FOLDERS
+
+SHINGLE_SIZE = 3
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+CLUSTER_SIMILARITY_THRESHOLD = 0.5
+ARCHIVE_CONFIDENCE_BELOW = 0.3
+ARCHIVE_MIN_BODY_TOKENS = 5
+ARCHIVE_PRIOR_BELOW = 0.2
+_MERSENNE_PRIME = (1 << 61) - 1
+_RNG = random.Random(20260220)
+_PERMUTATIONS = [
+    (_RNG.randrange(1, _MERSENNE_PRIME), _RNG.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+
+@dataclass(frozen=True)
+class ClusterItem:
+    """One active memory file prepared for clustering."""
+
+    path: str
+    primitive: str
+    title: str
+    confidence: float | None
+    body_tokens: int
+    shingles: frozenset[str]
+
+
+def shingle(value: str, size: int = SHINGLE_SIZE) -> frozenset[str]:
+    """Return word n-gram shingles, falling back to single tokens for short text."""
+    words = [word for word in normalize_text(value).split() if word]
+    if len(words) < size:
+        return tokenize(value)
+    return frozenset(" ".join(words[i : i + size]) for i in range(len(words) - size + 1))
+
+
+def minhash_signature(shingles: frozenset[str]) -> tuple[int, ...]:
+    """Return a fixed-seed MinHash signature for one shingle set."""
+    if not shingles:
+        return tuple([_MERSENNE_PRIME] * MINHASH_PERMUTATIONS)
+    hashed = [
+        int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "big")
+        for item in shingles
+    ]
+    return tuple(
+        min((a * value + b) % _MERSENNE_PRIME for value in hashed)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def _jaccard(left: frozenset[str], right: frozenset[str]) -> float:
+    """Return Jaccard similarity of two sets."""
+    union = len(left | right)
+    return len(left & right) / union if union else 0.0
+
+
+def _parse_confidence(value: Any) -> float | None:
+    """Parse frontmatter confidence into a float when possible."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def load_cluster_items(memory_root: Path) -> list[ClusterItem]:
+    """Load active decision/learning files (archived/ and summaries/ are skipped)."""
+    items: list[ClusterItem] = []
+    for primitive in MATCHED_PRIMITIVES:
+        folder = memory_root / MEMORY_TYPE_FOLDERS[primitive]
+        if not folder.is_dir():
+            continue
+        for path in sorted(folder.glob("*.md")):
+            try:
+                meta, body = load_frontmatter(path)
+            except (OSError, ValueError):
+                continue
+            title = str(meta.get("title") or path.stem)
+            items.append(
+                ClusterItem(
+                    path=str(path.resolve()),
+                    primitive=primitive.value,
+                    title=title,
+                    confidence=_parse_confidence(meta.get("confidence")),
+                    body_tokens=len(tokenize(body)),
+                    shingles=shingle(f"{title} {body}"),
+                )
+            )
+    return items
+
+
+def _candidate_pairs(items: list[ClusterItem]) -> set[tuple[int, int]]:
+    """Return same-primitive index pairs sharing at least one LSH band bucket."""
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    buckets: dict[tuple[str, int, tuple[int, ...]], list[int]] = {}
+    for position, item in enumerate(items):
+        signature = minhash_signature(item.shingles)
+        for band in range(LSH_BANDS):
+            key = (item.primitive, band, signature[band * rows : (band + 1) * rows])
+            buckets.setdefault(key, []).append(position)
+    pairs: set[tuple[int, int]] = set()
+    for members in buckets.values():
+        for i, left in enumerate(members):
+            for right in members[i + 1 :]:
+                pairs.add((left, right))
+    return pairs
+
+
+def _rank_key(item: ClusterItem) -> tuple[float, int, str]:
+    """Sort key that puts the most confident, most complete memory first."""
+    return (-(item.confidence or 0.0), -item.body_tokens, item.path)
+
+
+def cluster_memories(
+    memory_root: Path,
+    *,
+    threshold: float = CLUSTER_SIMILARITY_THRESHOLD,
+    priors: dict[str, float] | None = None,
+) -> dict[str, Any]:
+    """Propose duplicate groups and archive candidates; ``priors`` maps resolved paths to access priors."""
+    items = load_cluster_items(memory_root)
+    parent = list(range(len(items)))
+
+    def _find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    similarity: dict[tuple[int, int], float] = {}
+    for left, right in sorted(_candidate_pairs(items)):
+        score = _jaccard(items[left].shingles, items[right].shingles)
+        if score >= threshold:
+            similarity[(left, right)] = score
+            parent[_find(right)] = _find(left)
+
+    groups: dict[int, list[int]] = {}
+    for position in range(len(items)):
+        groups.setdefault(_find(position), []).append(position)
+    max_similarity: dict[int, float] = {}
+    for (left, _right), score in similarity.items():
+        root = _find(left)
+        max_similarity[root] = max(score, max_similarity.get(root, 0.0))
+
+    clusters: list[dict[str, Any]] = []
+    clustered: set[int] = set()
+    for root, members in groups.items():
+        if len(members) < 2:
+            continue
+        clustered.update(members)
+        ranked = sorted(members, key=lambda pos: _rank_key(items[pos]))
+        primary = ranked[0]
+        clusters.append(
+            {
+                "primitive": items[primary].primitive,
+                "primary": items[primary].path,
+                "max_similarity": round(max_similarity[root], 4),
+                "members": [
+                    {
+                        "path": items[pos].path,
+                        "title": items[pos].title,
+                        "confidence": items[pos].confidence,
+                        "similarity_to_primary": round(
+                            _jaccard(items[pos].shingles, items[primary].shingles), 4
+                        ),
+                    }
+                    for pos in ranked
+                ],
+            }
+        )
+    clusters.sort(key=lambda item: (-len(item["members"]), -item["max_similarity"], item["primary"]))
+    for number, cluster in enumerate(clusters, start=1):
+        cluster["cluster_id"] = f"cluster-{number}"
+
+    archive_candidates: list[dict[str, Any]] = []
+    for position, item in enumerate(items):
+        if position in clustered:
+            continue
+        prior = (priors or {}).get(item.path)
+        if item.confidence is not None and item.confidence < ARCHIVE_CONFIDENCE_BELOW:
+            reason = f"confidence<{ARCHIVE_CONFIDENCE_BELOW}"
+        elif item.body_tokens < ARCHIVE_MIN_BODY_TOKENS:
+            reason = f"body_tokens<{ARCHIVE_MIN_BODY_TOKENS}"
+        elif prior is not None and prior < ARCHIVE_PRIOR_BELOW:
+            reason = f"prior<{ARCHIVE_PRIOR_BELOW}"
+        else:
+            continue
+        candidate: dict[str, Any] = {"path": item.path, "title": item.title, "confidence": item.confidence, "reason": reason}
+        if priors is not None:
+            candidate["prior"] = prior
+        archive_candidates.append(candidate)
+    archive_candidates.sort(key=lambda row: (row["confidence"] if row["confidence"] is not None else 1.0, row["path"]))
+
+    return {
+        "threshold": threshold,
+        "counts": {
+            "memories": len(items),
+            "clusters": len(clusters),
+            "clustered_memories": len(clustered),
+            "archive_candidates": len(archive_candidates),
+        },
+        "clusters": clusters,
+        "archive_candidates": archive_candidates,
+    }
+
+
+def write_cluster_report(
+    memory_root: Path, output_path: Path, *, priors: dict[str, float] | None = None
+) -> dict[str, Any]:
+    """Cluster one memory root and write the compact clusters.json artifact."""
+    report = cluster_memories(memory_root, priors=priors)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(report, ensure_ascii=True, indent=2) + "\n", encoding="utf-8")
+    return report
+
+
+if __name__ == "__main__":
+    """Run a real-path self-test for memory clustering."""
+    from tempfile import TemporaryDirectory
+
+    with TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        (root / "learnings").mkdir()
+        body = "Send a queue heartbeat every 15 seconds and move jobs to dead letter after three failed attempts."
+        for name, title, text, confidence in (
+            ("a.md", "Queue heartbeat", body, 0.9),
+            ("b.md", "Queue heartbeat policy", body + " Track retries.", 0.6),
+            ("c.md", "Read before patching", "Read the exact file first, then patch with a larger context window.", 0.8),
+            ("d.md", "Installed package", "Ran pip install.", 0.2),
+        ):
+            (root / "learnings" / name).write_text(
+                f"---\ntitle: {title}\nconfidence: {confidence}\n---\n{text}\n", encoding="utf-8"
+            )
+        report = cluster_memories(root)
+        assert report["counts"]["clusters"] == 1
+        assert report["clusters"][0]["primary"].endswith("a.md")
+        assert [row["path"].rsplit("/", 1)[-1] for row in report["archive_candidates"]] == ["d.md"]
@@ -0,0 +1,153 @@
+"""Compact one-line-per-memory digest kept next to a memory root.
+
+Agents read ``memory_digest.tsv`` once to pick targets instead of discovering
+memories through many Glob/Read/Grep calls. Refresh is incremental: only files
+whose mtime or size changed since the last refresh are re-parsed.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from acreta.memory.frontmatter_codec import load_frontmatter
+from acreta.memory.matching import MATCHED_PRIMITIVES, text_hash
+from acreta.memory.memory_record import MEMORY_TYPE_FOLDERS
+from acreta.memory.transaction import atomic_write_text
+
+DIGEST_FILENAME = "memory_digest.tsv"
+DIGEST_STATE_FILENAME = ".memory_digest_state.json"
+DIGEST_COLUMNS = ("id", "primitive", "title", "tags", "confidence", "updated", "body_hash", "path")
+_DIGEST_VERSION = 1
+
+
+def _clean(value: Any) -> str:
+    """Flatten one field so it cannot break the tab-separated layout."""
+    return " ".join(str(value if value is not None else "").split())
+
+
+def _digest_row(path: Path, primitive: str) -> dict[str, str] | None:
+    """Parse one memory file into a digest row, or None when unreadable."""
+    try:
+        meta, body = load_frontmatter(path)
+    except (OSError, ValueError):
+        return None
+    tags = meta.get("tags") or []
+    updated = meta.get("updated") or meta.get("created") or ""
+    return {
+        "id": _clean(meta.get("id") or path.stem),
+        "primitive": primitive,
+        "title": _clean(meta.get("title") or path.stem),
+        "tags": ",".join(_clean(tag) for tag in tags) if isinstance(tags, list) else _clean(tags),
+        "confidence": _clean(meta.get("confidence")),
+        "updated": _clean(updated.isoformat() if hasattr(updated, "isoformat") else updated),
+        "body_hash": text_hash(body)[:12],
+        "path": str(path.resolve()),
+    }
+
+
+def _load_state(state_path: Path) -> dict[str, Any]:
+    """Load the per-file stat cache from the last refresh."""
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(state, dict) or state.get("version") != _DIGEST_VERSION:
+        return {}
+    files = state.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def render_digest(rows: list[dict[str, str]]) -> str:
+    """Render digest rows as a header line plus one tab-separated line per memory."""
+    lines = ["# " + "\t".join(DIGEST_COLUMNS)]
+    lines.extend("\t".join(row[column] for column in DIGEST_COLUMNS) for row in rows)
+    return "\n".join(lines) + "\n"
+
+
+def refresh_memory_digest(memory_root: Path) -> Path | None:
+    """Bring the digest for ``memory_root`` up to date and return its path.
+
+    Returns None when the memory root does not exist yet.
+    """
+    memory_root = memory_root.expanduser()
+    if not memory_root.is_dir():
+        return None
+    digest_path = memory_root / DIGEST_FILENAME
+    state_path = memory_root / DIGEST_STATE_FILENAME
+    cached = _load_state(state_path)
+    files: dict[str, Any] = {}
+    rows: list[dict[str, str]] = []
+    changed = False
+    for primitive in MATCHED_PRIMITIVES:
+        folder = memory_root / MEMORY_TYPE_FOLDERS[primitive]
+        if not folder.is_dir():
+            continue
+        for path in sorted(folder.glob("*.md")):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            key = str(path)
+            signature = [stat.st_mtime_ns, stat.st_size]
+            entry = cached.get(key)
+            if isinstance(entry, dict) and entry.get("stat") == signature:
+                row = entry.get("row")
+            else:
+                row = _digest_row(path, primitive.value)
+                changed = True
+            if not isinstance(row, dict):
+                continue
+            files[key] = {"stat": signature, "row": row}
+            rows.append(row)
+    if not changed and set(files) == set(cached) and digest_path.exists():
+        return digest_path
+    atomic_write_text(digest_path, render_digest(rows), fsync=False)
+    atomic_write_text(
+        state_path, json.dumps({"version": _DIGEST_VERSION, "files": files}, ensure_ascii=True), fsync=False
+    )
+    return digest_path
+
+
+def existing_memory_digest(memory_root: Path) -> Path | None:
+    """Return the digest path last written by a sync or maintain run, without refreshing it."""
+    digest_path = memory_root.expanduser() / DIGEST_FILENAME
+    return digest_path if digest_path.is_file() else None
+
+
+def read_memory_digest(memory_root: Path) -> list[dict[str, str]]:
+    """Refresh and parse the digest into row dicts."""
+    digest_path = refresh_memory_digest(memory_root)
+    rows: list[dict[str, str]] = []
+    if digest_path is None:
+        return rows
+    for line in digest_path.read_text(encoding="utf-8").splitlines():
+        if not line or line.startswith("#"):
+            continue
+        rows.append(dict(zip(DIGEST_COLUMNS, line.split("\t"))))
+    return rows
+
+
+if __name__ == "__main__":
+    """Run a real-path self-test for incremental digest refresh."""
+    from tempfile import TemporaryDirectory
+
+    with TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        (root / "learnings").mkdir()
+        memory = root / "learnings" / "20260101-queue.md"
+        memory.write_text(
+            "---\nid: queue\ntitle: Queue\ntags: [queue, ops]\nconfidence: 0.8\n---\nBody.\n",
+            encoding="utf-8",
+        )
+        first = read_memory_digest(root)
+        assert [row["id"] for row in first] == ["queue"]
+        assert first[0]["tags"] == "queue,ops"
+        stamp = (root / DIGEST_FILENAME).stat().st_mtime_ns
+        refresh_memory_digest(root)
+        assert (root / DIGEST_FILENAME).stat().st_mtime_ns == stamp
+        assert existing_memory_digest(root) == root / DIGEST_FILENAME
+        memory.unlink()
+        assert read_memory_digest(root) == []
+        assert existing_memory_digest(root / "missing") is None
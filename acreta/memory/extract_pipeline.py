@@ -15,7 +15,12 @@ from typing import Any, Literal
 import dspy
 from pydantic import BaseModel, Field
 
-from acreta.memory.utils import configure_dspy_lm, env_positive_int
+from acreta.memory.utils import (
+    dspy_lm_session,
+    env_positive_int,
+    read_previous_summary,
+    read_trace_text,
+)
 from acreta.sessions import catalog as session_db
 
 
@@ -86,18 +91,18 @@ def _extract_candidates_with_rlm(
         return []
     max_iterations = env_positive_int("ACRETA_DSPY_RLM_MAX_ITERATIONS", 24)
     max_llm_calls = env_positive_int("ACRETA_DSPY_RLM_MAX_LLM_CALLS", 24)
-    configure_dspy_lm()
     rlm = dspy.RLM(
         MemoryExtractSignature,
         max_iterations=max_iterations,
         max_llm_calls=max_llm_calls,
         verbose=True,
     )
-    result = rlm(
-        transcript=transcript,
-        metadata=metadata or {},
-        metrics=metrics or {},
-    )
+    with dspy_lm_session():
+        result = rlm(
+            transcript=transcript,
+            metadata=metadata or {},
+            metrics=metrics or {},
+        )
     primitives = getattr(result, "primitives", [])
     if not isinstance(primitives, list):
         return []
@@ -115,12 +120,26 @@ def extract_memories_from_session_file(
     *,
     metadata: dict[str, Any] | None = None,
     metrics: dict[str, Any] | None = None,
+    start_offset: int = 0,
+    previous_summary_path: Path | None = None,
 ) -> list[dict[str, Any]]:
-    """Extract memory candidates from one on-disk session trace file."""
+    """Extract memory candidates from one on-disk session trace file.
+
+    A positive ``start_offset`` limits extraction to the bytes appended since the
+    last watermark; the previous summary is passed along as context.
+    """
     if not session_file_path.exists() or not session_file_path.is_file():
         raise FileNotFoundError(f"session_file_missing:{session_file_path}")
-    transcript = session_file_path.read_text(encoding="utf-8")
-    return _extract_candidates_with_rlm(transcript, metadata=metadata, metrics=metrics)
+    transcript = read_trace_text(session_file_path, start_offset)
+    session_metadata = dict(metadata or {})
+    if start_offset > 0:
+        session_metadata["start_offset"] = start_offset
+        previous_summary = read_previous_summary(previous_summary_path)
+        if previous_summary:
+            session_metadata["previous_summary"] = previous_summary
+    return _extract_candidates_with_rlm(
+        transcript, metadata=session_metadata, metrics=metrics
+    )
 
 
 def build_extract_report(
@@ -171,6 +190,8 @@ if __name__ == "__main__":
     parser.add_argument("--output")
     parser.add_argument("--metadata-json", default="{}")
     parser.add_argument("--metrics-json", default="{}")
+    parser.add_argument("--start-offset", type=int, default=0)
+    parser.add_argument("--previous-summary-path")
     args = parser.parse_args()
 
     if args.trace_path:
@@ -180,6 +201,12 @@ if __name__ == "__main__":
             Path(args.trace_path).expanduser(),
             metadata=metadata if isinstance(metadata, dict) else {},
             metrics=metrics if isinstance(metrics, dict) else {},
+            start_offset=max(0, args.start_offset),
+            previous_summary_path=(
+                Path(args.previous_summary_path).expanduser()
+                if args.previous_summary_path
+                else None
+            ),
         )
         encoded = json.dumps(payload, ensure_ascii=True, indent=2) + "\n"
         if args.output:
@@ -0,0 +1,299 @@
+"""Fast frontmatter codec for memory and summary files, output-identical to python-frontmatter.
+
+Acreta writes flat frontmatter: scalar ``key: value`` lines and string lists
+(``tags:`` block lists or ``[]``). The fast path parses and emits exactly those
+shapes, using PyYAML's own implicit resolver and scalar analysis to decide types
+and quoting, so results match ``frontmatter.loads``/``frontmatter.dumps`` with
+the safe YAML handler. Anything else (nested maps, timestamps, anchors, escapes,
+multi-line or non-ASCII scalars, long lines the emitter would fold) falls back to
+the C YAML loader/dumper when available, which is what python-frontmatter uses.
+"""
+
+from __future__ import annotations
+
+import io
+import re
+from pathlib import Path
+from typing import Any
+
+import yaml
+from yaml.emitter import Emitter
+from yaml.nodes import ScalarNode
+from yaml.resolver import Resolver
+
+try:
+    from yaml import CSafeDumper as _SafeDumper
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover - libyaml missing
+    from yaml import SafeDumper as _SafeDumper  # type: ignore[assignment]
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+
+_FM_BOUNDARY = re.compile(r"^-{3,}\s*$", re.MULTILINE)
+_KEY_LINE = re.compile(r"^([A-Za-z_][A-Za-z0-9_-]*):(?:[ ]+(.*))?$")
+_LIST_ITEM = re.compile(r"^([ ]*)-[ ]+(.*)$")
+_SIMPLE_INT = re.compile(r"^[-+]?(?:0|[1-9][0-9]*)$")
+_SIMPLE_FLOAT = re.compile(r"^[-+]?[0-9]+\.[0-9]+$")
+_PRINTABLE_ASCII = re.compile(r"^[\x20-\x7e]*$")
+# Single-line strings the emitter can always write plain or single-quoted; skips scalar analysis.
+_PLAIN_SAFE = re.compile(r"^[A-Za-z0-9_(/](?:[A-Za-z0-9 _./()+=,;:'-]*[A-Za-z0-9_./()+=,;'-])?$")
+_PLAIN_START_INDICATORS = frozenset("-?:,[]{}#&*!|>'\"%@`")
+_FLOW_INDICATORS = frozenset(",?[]{}")
+_STR_TAG = "tag:yaml.org,2002:str"
+_INT_TAG = "tag:yaml.org,2002:int"
+_FLOAT_TAG = "tag:yaml.org,2002:float"
+_BOOL_TAG = "tag:yaml.org,2002:bool"
+_NULL_TAG = "tag:yaml.org,2002:null"
+_BEST_WIDTH = 80
+_MAX_SIMPLE_KEY = 128
+
+_RESOLVER = Resolver()
+_ANALYZER = Emitter(io.StringIO(), allow_unicode=True)
+
+
+class _Fallback(Exception):
+    """Raised when text or values fall outside the fast-path shapes."""
+
+
+def _resolve(value: str) -> str:
+    """Return the implicit YAML tag a plain scalar ``value`` resolves to."""
+    return _RESOLVER.resolve(ScalarNode, value, (True, False))
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+
+def _parse_plain(raw: str, *, in_flow: bool = False) -> Any:
+    """Construct one plain scalar the way the safe loader would, or fall back."""
+    value = raw.strip()
+    if not value:
+        return None
+    if (
+        value[0] in _PLAIN_START_INDICATORS
+        or ": " in value
+        or " #" in value
+        or value.endswith(":")
+        or (in_flow and any(char in _FLOW_INDICATORS for char in value))
+    ):
+        raise _Fallback
+    tag = _resolve(value)
+    if tag == _STR_TAG:
+        return value
+    if tag == _NULL_TAG:
+        return None
+    if tag == _BOOL_TAG:
+        return value.lower() in {"yes", "true", "on"}
+    if tag == _INT_TAG and _SIMPLE_INT.match(value):
+        return int(value)
+    if tag == _FLOAT_TAG and _SIMPLE_FLOAT.match(value):
+        return float(value)
+    raise _Fallback
+
+
+def _parse_scalar(raw: str, *, in_flow: bool = False) -> Any:
+    """Parse a single-line plain, single-quoted, or escape-free double-quoted scalar."""
+    value = raw.strip()
+    if not value.isprintable() or (in_flow and not value):
+        raise _Fallback
+    if len(value) >= 2 and value[0] == "'" and value[-1] == "'":
+        inner = value[1:-1]
+        if "'" in inner.replace("''", ""):
+            raise _Fallback
+        return inner.replace("''", "'")
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+        inner = value[1:-1]
+        if '"' in inner or "\\" in inner:
+            raise _Fallback
+        return inner
+    return _parse_plain(value, in_flow=in_flow)
+
+
+def _parse_flow_list(raw: str) -> list[Any]:
+    """Parse a one-line ``[a, b]`` flow sequence of scalars."""
+    inner = raw.strip()[1:-1].strip()
+    if not inner:
+        return []
+    return [_parse_scalar(item, in_flow=True) for item in inner.split(",")]
+
+
+def _parse_key(key: str) -> str:
+    """Return ``key`` if it loads as a plain string key."""
+    if _resolve(key) != _STR_TAG:
+        raise _Fallback
+    return key
+
+
+def _fast_load(fm: str) -> dict[str, Any]:
+    """Parse flat frontmatter without YAML, raising ``_Fallback`` on other shapes."""
+    if "\t" in fm:
+        raise _Fallback
+    metadata: dict[str, Any] = {}
+    list_key: str | None = None
+    list_indent: int | None = None
+    for line in fm.splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        item = _LIST_ITEM.match(line)
+        if item is not None:
+            indent = len(item.group(1))
+            if list_key is None or (list_indent is not None and indent != list_indent):
+                raise _Fallback
+            list_indent = indent
+            if metadata[list_key] is None:
+                metadata[list_key] = []
+            metadata[list_key].append(_parse_scalar(item.group(2)))
+            continue
+        match = _KEY_LINE.match(line)
+        if match is None:
+            raise _Fallback
+        key = _parse_key(match.group(1))
+        raw = (match.group(2) or "").strip()
+        list_key, list_indent = None, None
+        if not raw:
+            metadata[key] = None
+            list_key = key
+        elif raw[0] == "[" and raw[-1] == "]":
+            metadata[key] = _parse_flow_list(raw)
+        else:
+            metadata[key] = _parse_scalar(raw)
+    return metadata
+
+
+def parse_frontmatter(text: str) -> tuple[dict[str, Any], str]:
+    """Split markdown into frontmatter metadata and stripped body like ``frontmatter.parse``."""
+    text = text.strip()
+    if not _FM_BOUNDARY.match(text):
+        import frontmatter
+
+        metadata, content = frontmatter.parse(text)
+        return dict(metadata), content
+    parts = _FM_BOUNDARY.split(text, 2)
+    if len(parts) < 3:
+        return {}, text
+    _, fm, content = parts
+    try:
+        metadata = _fast_load(fm)
+    except _Fallback:
+        loaded = yaml.load(fm, Loader=_SafeLoader)
+        metadata = loaded if isinstance(loaded, dict) else {}
+    return metadata, content.strip()
+
+
+def load_frontmatter(path: Path) -> tuple[dict[str, Any], str]:
+    """Read and parse one memory or summary file."""
+    return parse_frontmatter(Path(path).read_text(encoding="utf-8"))
+
+
+# ---------------------------------------------------------------------------
+# Serialization
+# ---------------------------------------------------------------------------
+
+
+def _dump_str(value: str, prefix: str) -> str:
+    """Render a string scalar after ``prefix`` with the emitter's chosen style."""
+    if _PLAIN_SAFE.match(value) and ": " not in value:
+        allow_plain = allow_single_quoted = True
+    else:
+        if not _PRINTABLE_ASCII.match(value):
+            raise _Fallback
+        analysis = _ANALYZER.analyze_scalar(value)
+        if analysis.multiline:
+            raise _Fallback
+        allow_plain = analysis.allow_block_plain and not analysis.empty
+        allow_single_quoted = analysis.allow_single_quoted
+    if allow_plain and _resolve(value) == _STR_TAG:
+        line = prefix + value
+    elif allow_single_quoted:
+        line = prefix + "'" + value.replace("'", "''") + "'"
+    else:
+        raise _Fallback
+    if " " in line[_BEST_WIDTH + 1 :]:
+        raise _Fallback
+    return line
+
+
+def _dump_float(value: float) -> str:
+    """Render a float exactly like ``SafeRepresenter.represent_float``."""
+    if value != value:
+        return ".nan"
+    if value == float("inf"):
+        return ".inf"
+    if value == float("-inf"):
+        return "-.inf"
+    text = repr(value).lower()
+    if "." not in text and "e" in text:
+        text = text.replace("e", ".0e", 1)
+    return text
+
+
+def _dump_scalar(value: Any, prefix: str) -> str:
+    """Render one scalar after ``prefix`` or fall back for non-flat values."""
+    kind = type(value)
+    if value is None:
+        return prefix + "null"
+    if kind is bool:
+        return prefix + ("true" if value else "false")
+    if kind is int:
+        return prefix + str(value)
+    if kind is float:
+        return prefix + _dump_float(value)
+    if kind is str:
+        return _dump_str(value, prefix)
+    raise _Fallback
+
+
+def _fast_dump(metadata: dict[str, Any]) -> str:
+    """Emit flat metadata as the safe dumper would, raising ``_Fallback`` otherwise."""
+    if not metadata:
+        raise _Fallback
+    lines: list[str] = []
+    for key in sorted(metadata):
+        if type(key) is not str or len(key) > _MAX_SIMPLE_KEY:
+            raise _Fallback
+        key_text = _dump_str(key, "")
+        if key_text != key:
+            raise _Fallback
+        value = metadata[key]
+        if type(value) is list:
+            if not value:
+                lines.append(f"{key}: []")
+                continue
+            lines.append(f"{key}:")
+            for item in value:
+                lines.append(_dump_scalar(item, "- "))
+            continue
+        lines.append(_dump_scalar(value, f"{key}: "))
+    return "\n".join(lines)
+
+
+def dump_frontmatter(metadata: dict[str, Any], body: str) -> str:
+    """Serialize metadata and body exactly like ``frontmatter.dumps(Post(body, **metadata))``."""
+    try:
+        header = _fast_dump(metadata)
+    except _Fallback:
+        header = yaml.dump(
+            metadata, Dumper=_SafeDumper, default_flow_style=False, allow_unicode=True
+        ).strip()
+    return f"---\n{header}\n---\n\n{body}\n".strip()
+
+
+if __name__ == "__main__":
+    """Run a real-path self-test for fast-path parity with python-frontmatter."""
+    import frontmatter
+
+    sample = {
+        "id": "queue-lifecycle",
+        "title": "Queue lifecycle: keep states explicit",
+        "created": "2026-02-20T23:10:32Z",
+        "confidence": 0.8,
+        "tags": ["queue", "yes", "2026"],
+        "kind": "insight",
+    }
+    dumped = dump_frontmatter(sample, "Body text.")
+    assert dumped == frontmatter.dumps(frontmatter.Post("Body text.", **sample))
+    metadata, body = parse_frontmatter(dumped)
+    post = frontmatter.loads(dumped)
+    assert (metadata, body) == (post.metadata, post.content)
+    nested = "---\nid: x\nmeta:\n  a: 1\ncreated: 2026-01-01\n---\nbody"
+    assert parse_frontmatter(nested)[0] == frontmatter.loads(nested).metadata
@@ -0,0 +1,195 @@
+"""Append-only journal of memory writes for incremental consumers.
+
+Every memory or summary write appends one event ``(seq, op, path, memory_id,
+content_hash, run_id)`` to ``<index_dir>/memory_journal.sqlite3``. ``seq`` is a
+monotonically increasing cursor, so a consumer keeps the last seq it processed and
+asks for ``changes(since_seq)`` instead of rescanning the memory tree. Recording is
+best effort: a journal failure is logged and never blocks the write itself.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from acreta.config.logging import logger
+
+JOURNAL_FILENAME = "memory_journal.sqlite3"
+JOURNAL_OPS = ("add", "update", "archive")
+
+
+@dataclass(frozen=True)
+class JournalEvent:
+    """One recorded memory change."""
+
+    seq: int
+    op: str
+    path: str
+    memory_id: str
+    content_hash: str
+    run_id: str
+    recorded_at: float
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the event as a JSON-serializable dict."""
+        return asdict(self)
+
+
+def content_hash(text: str) -> str:
+    """Return the SHA-1 of written content, as stored in journal events."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class MemoryJournal:
+    """SQLite-backed append-only event log with a seq cursor."""
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the journal database, creating its table on first use."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS memory_events (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    op TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    memory_id TEXT NOT NULL DEFAULT '',
+                    content_hash TEXT NOT NULL DEFAULT '',
+                    run_id TEXT NOT NULL DEFAULT '',
+                    recorded_at REAL NOT NULL
+                )
+                """
+            )
+            self._initialized = True
+        return conn
+
+    def record(
+        self,
+        op: str,
+        path: Path | str,
+        *,
+        memory_id: str = "",
+        content_hash: str = "",
+        run_id: str = "",
+    ) -> int:
+        """Append one event and return its seq."""
+        if op not in JOURNAL_OPS:
+            raise ValueError(f"unknown_journal_op:{op}")
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO memory_events (op, path, memory_id, content_hash, run_id, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (op, str(path), memory_id, content_hash, run_id, time.time()),
+            )
+            return int(cursor.lastrowid or 0)
+
+    def record_many(self, events: list[dict[str, str]]) -> int:
+        """Append several events (``op``, ``path``, optional ids/hashes) in one transaction; return the last seq."""
+        rows = []
+        now = time.time()
+        for event in events:
+            if event["op"] not in JOURNAL_OPS:
+                raise ValueError(f"unknown_journal_op:{event['op']}")
+            rows.append(
+                (
+                    event["op"],
+                    str(event["path"]),
+                    event.get("memory_id", ""),
+                    event.get("content_hash", ""),
+                    event.get("run_id", ""),
+                    now,
+                )
+            )
+        if not rows:
+            return self.latest_seq()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO memory_events (op, path, memory_id, content_hash, run_id, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            row = conn.execute("SELECT MAX(seq) FROM memory_events").fetchone()
+        return int(row[0] or 0)
+
+    def changes(self, since_seq: int = 0, *, limit: int | None = None) -> list[JournalEvent]:
+        """Return events with ``seq > since_seq`` in seq order."""
+        if not self.db_path.exists():
+            return []
+        sql = "SELECT seq, op, path, memory_id, content_hash, run_id, recorded_at FROM memory_events WHERE seq > ? ORDER BY seq"
+        params: tuple[Any, ...] = (int(since_seq),)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (max(0, int(limit)),)
+        with self._connect() as conn:
+            return [JournalEvent(*row) for row in conn.execute(sql, params)]
+
+    def latest_seq(self) -> int:
+        """Return the newest seq, or 0 for an empty journal."""
+        if not self.db_path.exists():
+            return 0
+        with self._connect() as conn:
+            row = conn.execute("SELECT MAX(seq) FROM memory_events").fetchone()
+        return int(row[0] or 0)
+
+
+def index_dir_for_memory_root(memory_root: Path) -> Path:
+    """Return the index dir for a memory root: the configured one, else the sibling ``index/``."""
+    from acreta.config.settings import get_config
+
+    memory_root = Path(memory_root).expanduser().resolve()
+    config = get_config()
+    if memory_root == Path(config.memory_dir).expanduser().resolve():
+        return config.index_dir
+    return memory_root.parent / "index"
+
+
+def journal_for_memory_root(memory_root: Path) -> MemoryJournal:
+    """Return the journal stored in the memory root's index dir."""
+    return MemoryJournal(index_dir_for_memory_root(memory_root) / JOURNAL_FILENAME)
+
+
+def record_memory_change(
+    memory_root: Path,
+    op: str,
+    path: Path | str,
+    *,
+    memory_id: str = "",
+    content: str | None = None,
+    run_id: str = "",
+) -> int | None:
+    """Journal one write under ``memory_root``; returns the seq, or None if recording failed."""
+    try:
+        return journal_for_memory_root(memory_root).record(
+            op,
+            path,
+            memory_id=memory_id,
+            content_hash=content_hash(content) if content is not None else "",
+            run_id=run_id,
+        )
+    except (OSError, sqlite3.Error, ValueError) as exc:
+        logger.warning("memory journal write failed for {}: {}", path, exc)
+        return None
+
+
+if __name__ == "__main__":
+    """Run a real-path self-test for seq ordering and the since cursor."""
+    from tempfile import TemporaryDirectory
+
+    with TemporaryDirectory() as tmp_dir:
+        journal = MemoryJournal(Path(tmp_dir) / JOURNAL_FILENAME)
+        assert journal.latest_seq() == 0 and journal.changes() == []
+        first = journal.record("add", "/m/learnings/a.md", memory_id="a", content_hash=content_hash("x"))
+        second = journal.record("archive", "/m/archived/learnings/a.md", memory_id="a")
+        assert second > first and journal.latest_seq() == second
+        assert [event.op for event in journal.changes(first)] == ["archive"]
+        assert len(journal.changes(0, limit=1)) == 1
@@ -0,0 +1,247 @@
+"""Deterministic candidate matching against existing memory files.
+
+Replaces explorer-subagent dedupe in the sync flow: every extract.json row gets
+its best existing match, a token-overlap score, and an add/update/no_op verdict.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from acreta.memory.frontmatter_codec import load_frontmatter
+from acreta.memory.memory_record import MEMORY_TYPE_FOLDERS, MemoryType
+
+UPDATE_OVERLAP_THRESHOLD = 0.72
+MATCHED_PRIMITIVES = (MemoryType.decision, MemoryType.learning)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_text(value: str) -> str:
+    """Lowercase and collapse whitespace for exact-hash comparison."""
+    return " ".join(str(value or "").lower().split())
+
+
+def tokenize(value: str) -> frozenset[str]:
+    """Return the set of lowercase word tokens used for overlap scoring."""
+    return frozenset(
+        token for token in _TOKEN_RE.findall(str(value or "").lower()) if len(token) > 1
+    )
+
+
+def text_hash(value: str) -> str:
+    """Return a stable hash of normalized text."""
+    return hashlib.sha1(normalize_text(value).encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class IndexedMemory:
+    """One existing memory file prepared for matching."""
+
+    path: str
+    primitive: str
+    title: str
+    title_hash: str
+    body_hash: str
+    tokens: frozenset[str]
+
+
+@dataclass
+class CandidateMatch:
+    """Matching verdict for one extract.json row."""
+
+    candidate_id: int
+    primitive: str
+    title: str
+    action: str
+    matched_file: str | None
+    score: float
+    evidence: str
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable match row."""
+        return asdict(self)
+
+
+class MemoryIndex:
+    """In-memory inverted index over decision and learning memory files."""
+
+    def __init__(self, entries: list[IndexedMemory]) -> None:
+        self.entries = entries
+        self._postings: dict[str, list[int]] = {}
+        self._by_title: dict[tuple[str, str], int] = {}
+        self._by_body: dict[tuple[str, str], int] = {}
+        for position, entry in enumerate(entries):
+            for token in entry.tokens:
+                self._postings.setdefault(token, []).append(position)
+            self._by_title.setdefault((entry.primitive, entry.title_hash), position)
+            self._by_body.setdefault((entry.primitive, entry.body_hash), position)
+
+    @classmethod
+    def from_memory_root(cls, memory_root: Path) -> MemoryIndex:
+        """Load every active decision/learning file under ``memory_root``."""
+        entries: list[IndexedMemory] = []
+        for primitive in MATCHED_PRIMITIVES:
+            folder = memory_root / MEMORY_TYPE_FOLDERS[primitive]
+            if not folder.is_dir():
+                continue
+            for path in sorted(folder.glob("*.md")):
+                try:
+                    meta, body = load_frontmatter(path)
+                except (OSError, ValueError):
+                    continue
+                title = str(meta.get("title") or path.stem)
+                entries.append(
+                    _indexed_memory(str(path.resolve()), primitive.value, title, body)
+                )
+        return cls(entries)
+
+    def _overlap_scores(self, tokens: frozenset[str]) -> Counter[int]:
+        """Count shared tokens per indexed entry via the postings lists."""
+        shared: Counter[int] = Counter()
+        for token in tokens:
+            for position in self._postings.get(token, ()):
+                shared[position] += 1
+        return shared
+
+    def match(self, candidate_id: int, candidate: dict[str, Any]) -> CandidateMatch:
+        """Return the best match and add/update/no_op verdict for one candidate."""
+        primitive = str(candidate.get("primitive") or "").strip()
+        title = str(candidate.get("title") or "").strip()
+        body = str(candidate.get("body") or "")
+        probe = _indexed_memory("", primitive, title, body)
+
+        exact = self._by_title.get((primitive, probe.title_hash))
+        if exact is not None and self.entries[exact].body_hash == probe.body_hash:
+            return CandidateMatch(
+                candidate_id, primitive, title, "no_op", self.entries[exact].path, 1.0,
+                "exact primitive + title + body",
+            )
+
+        best_position: int | None = None
+        best_score = 0.0
+        for position, shared in sorted(self._overlap_scores(probe.tokens).items()):
+            entry = self.entries[position]
+            if entry.primitive != primitive:
+                continue
+            score = shared / (len(probe.tokens) + len(entry.tokens) - shared)
+            if score > best_score:
+                best_position, best_score = position, score
+        best_score = round(best_score, 4)
+
+        title_hit = self._by_title.get((primitive, probe.title_hash)) if title else None
+        body_hit = self._by_body.get((primitive, probe.body_hash)) if body.strip() else None
+        exact_hit = title_hit if title_hit is not None else body_hit
+        if exact_hit is not None:
+            matched = self.entries[exact_hit]
+            score = _jaccard(probe.tokens, matched.tokens)
+            evidence = "exact title" if title_hit is not None else "exact body"
+            return CandidateMatch(
+                candidate_id, primitive, title, "update", matched.path, score,
+                f"{evidence}; token overlap {score:.2f}",
+            )
+        if best_position is not None and best_score >= UPDATE_OVERLAP_THRESHOLD:
+            return CandidateMatch(
+                candidate_id, primitive, title, "update", self.entries[best_position].path, best_score,
+                f"token overlap {best_score:.2f} >= {UPDATE_OVERLAP_THRESHOLD}",
+            )
+        return CandidateMatch(
+            candidate_id,
+            primitive,
+            title,
+            "add",
+            self.entries[best_position].path if best_position is not None else None,
+            best_score,
+            f"best token overlap {best_score:.2f} < {UPDATE_OVERLAP_THRESHOLD}",
+        )
+
+
+def _jaccard(left: frozenset[str], right: frozenset[str]) -> float:
+    """Return rounded Jaccard overlap of two token sets."""
+    union = len(left | right)
+    return round(len(left & right) / union, 4) if union else 0.0
+
+
+def _indexed_memory(path: str, primitive: str, title: str, body: str) -> IndexedMemory:
+    """Build the hashed/tokenized form of one memory or candidate."""
+    return IndexedMemory(
+        path=path,
+        primitive=primitive,
+        title=title,
+        title_hash=text_hash(title),
+        body_hash=text_hash(body),
+        tokens=tokenize(f"{title} {body}"),
+    )
+
+
+def match_candidates(
+    candidates: list[dict[str, Any]], memory_root: Path
+) -> list[dict[str, Any]]:
+    """Match extracted candidates against memory files and return verdict rows."""
+    index = MemoryIndex.from_memory_root(memory_root)
+    return [
+        index.match(position, item).to_dict()
+        for position, item in enumerate(candidates)
+        if isinstance(item, dict)
+    ]
+
+
+def write_match_report(extract_path: Path, memory_root: Path, output_path: Path) -> dict[str, Any]:
+    """Match an extract.json artifact and write the evidence report JSON."""
+    raw = json.loads(extract_path.read_text(encoding="utf-8"))
+    candidates = raw if isinstance(raw, list) else []
+    matches = match_candidates(candidates, memory_root)
+    counts = Counter(row["action"] for row in matches)
+    report = {
+        "threshold": UPDATE_OVERLAP_THRESHOLD,
+        "counts": {key: counts.get(key, 0) for key in ("add", "update", "no_op")},
+        "matches": matches,
+    }
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(report, ensure_ascii=True, indent=2) + "\n", encoding="utf-8")
+    return report
+
+
+if __name__ == "__main__":
+    """Run CLI match mode for one extract artifact or a real-path self-test."""
+    import argparse
+    import sys
+    from tempfile import TemporaryDirectory
+
+    parser = argparse.ArgumentParser(prog="python -m acreta.memory.matching")
+    parser.add_argument("--extract-path")
+    parser.add_argument("--memory-root")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    if args.extract_path:
+        report = write_match_report(
+            Path(args.extract_path).expanduser(),
+            Path(args.memory_root or ".").expanduser(),
+            Path(args.output).expanduser() if args.output else Path(args.extract_path).with_name("matches.json"),
+        )
+        sys.stdout.write(json.dumps(report["counts"]) + "\n")
+    else:
+        with TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            (root / "learnings").mkdir()
+            (root / "learnings" / "20260101-queue-heartbeat.md").write_text(
+                "---\ntitle: Queue heartbeat\n---\nSend a heartbeat every 15s and dead letter after 3 attempts.\n",
+                encoding="utf-8",
+            )
+            rows = match_candidates(
+                [
+                    {"primitive": "learning", "title": "Queue heartbeat", "body": "Send a heartbeat every 15s and dead letter after 3 attempts."},
+                    {"primitive": "learning", "title": "Queue heartbeats", "body": "Send a heartbeat every 15s and dead letter after 3 attempts!"},
+                    {"primitive": "decision", "title": "Keep traces in place", "body": "Never copy traces."},
+                ],
+                root,
+            )
+            assert [row["action"] for row in rows] == ["no_op", "update", "add"]
+            assert rows[1]["score"] >= UPDATE_OVERLAP_THRESHOLD
+            assert rows[2]["matched_file"] is None
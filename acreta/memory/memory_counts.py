@@ -0,0 +1,108 @@
+"""Cached per-type memory file counts for status polling.
+
+Counting memories means walking every primitive folder (and reading summary pack
+indexes). ``memory_counts`` instead keeps the last count in
+``<index_dir>/memory_counts.json`` next to the cache key it was taken at: the memory
+journal's latest seq plus the mtimes of the primitive folders. Journaled writes bump
+the seq and file adds/removes bump a folder mtime, so a poll costs one journal query
+and a handful of ``stat`` calls until something changes. ``live=True`` always recounts.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from acreta.memory.journal import index_dir_for_memory_root, journal_for_memory_root
+from acreta.memory.memory_record import MemoryType, memory_folder
+from acreta.memory.summary_store import list_summary_paths
+from acreta.memory.transaction import atomic_write_text
+
+MEMORY_COUNTS_FILENAME = "memory_counts.json"
+_COUNTS_VERSION = 1
+
+
+def list_memory_files(memory_root: Path) -> list[Path]:
+    """List all markdown files in canonical memory primitive folders."""
+    paths: list[Path] = []
+    for mtype in MemoryType:
+        folder = memory_root / memory_folder(mtype)
+        if mtype == MemoryType.summary:
+            paths.extend(list_summary_paths(folder))
+        elif folder.exists():
+            paths.extend(sorted(folder.rglob("*.md")))
+    return paths
+
+
+def count_memory_files(memory_root: Path) -> dict[str, int]:
+    """Count memory files per primitive type by walking the tree."""
+    counts: dict[str, int] = {}
+    for mtype in MemoryType:
+        folder = memory_root / memory_folder(mtype)
+        if mtype == MemoryType.summary:
+            counts[mtype.value] = len(list_summary_paths(folder))
+        else:
+            counts[mtype.value] = sum(1 for _ in folder.rglob("*.md")) if folder.exists() else 0
+    return counts
+
+
+def _cache_key(memory_root: Path) -> dict[str, Any]:
+    """Return the cheap signature that invalidates cached counts."""
+    folders: dict[str, int] = {}
+    for mtype in MemoryType:
+        try:
+            folders[mtype.value] = (memory_root / memory_folder(mtype)).stat().st_mtime_ns
+        except OSError:
+            folders[mtype.value] = 0
+    return {"seq": journal_for_memory_root(memory_root).latest_seq(), "folders": folders}
+
+
+def memory_counts(memory_root: Path, *, live: bool = False) -> dict[str, Any]:
+    """Return ``{total, by_type, counted_at, cached}``, recounting only when the cache key moved."""
+    memory_root = Path(memory_root).expanduser()
+    cache_path = index_dir_for_memory_root(memory_root) / MEMORY_COUNTS_FILENAME
+    key = _cache_key(memory_root)
+    if not live:
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            cached = None
+        if isinstance(cached, dict) and cached.get("version") == _COUNTS_VERSION and cached.get("key") == key:
+            return {**cached["counts"], "cached": True}
+    by_type = count_memory_files(memory_root)
+    counts = {
+        "total": sum(by_type.values()),
+        "by_type": by_type,
+        "counted_at": datetime.now(timezone.utc).isoformat(),
+    }
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": _COUNTS_VERSION, "key": key, "counts": counts}
+        atomic_write_text(cache_path, json.dumps(payload, ensure_ascii=True), fsync=False)
+    except OSError:
+        pass
+    return {**counts, "cached": False}
+
+
+if __name__ == "__main__":
+    """Run a real-path smoke test for cached memory counts."""
+    from tempfile import TemporaryDirectory
+
+    from acreta.memory.journal import record_memory_change
+
+    with TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir) / "memory"
+        learning = root / memory_folder(MemoryType.learning) / "a.md"
+        learning.parent.mkdir(parents=True)
+        learning.write_text("---\nid: a\n---\nA.\n", encoding="utf-8")
+        first = memory_counts(root)
+        assert (first["total"], first["cached"]) == (1, False)
+        assert memory_counts(root)["cached"] is True
+        learning.write_text("---\nid: a\n---\nA2.\n", encoding="utf-8")
+        record_memory_change(root, "update", learning, memory_id="a")
+        assert memory_counts(root)["cached"] is False
+        (learning.parent / "b.md").write_text("---\nid: b\n---\nB.\n", encoding="utf-8")
+        assert memory_counts(root)["total"] == 2
+        assert memory_counts(root, live=True)["cached"] is False
@@ -11,9 +11,10 @@ import unicodedata
 from datetime import datetime, timezone
 from enum import Enum
 
-import frontmatter
 from pydantic import Field
 
+from acreta.memory.frontmatter_codec import dump_frontmatter
+
 
 class MemoryType(str, Enum):
     """Canonical memory types used across runtime, pipelines, and storage."""
@@ -144,8 +145,7 @@ class MemoryRecord(MemoryCandidate):
 
     def to_markdown(self) -> str:
         """Serialize record to frontmatter + body markdown format."""
-        post = frontmatter.Post(self.body, **self.to_frontmatter_dict())
-        return frontmatter.dumps(post) + "\n"
+        return dump_frontmatter(self.to_frontmatter_dict(), self.body) + "\n"
 
 
 if __name__ == "__main__":
@@ -0,0 +1,367 @@
+"""Scope-aware memory retrieval: rank memories and summaries across roots and pack evidence.
+
+Each project and global memory root keeps its own in-process index of parsed docs,
+refreshed concurrently and revalidated per file signature. Roots are ranked with
+BM25 over title, tags, and body against their own statistics, boosted by the
+precomputed access prior (``access_stats``), then merged with scope weights and
+deduplicated by id and body hash. Chat packs the top hits whole into a
+token budget so the agent can answer straight from the prompt; ``confident`` says
+whether the packed evidence covers the question well enough to skip tool fan-out.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from acreta.config.project_scope import resolve_data_dirs
+from acreta.memory.access_stats import access_stats_for_memory_root, load_priors, prior_boost
+from acreta.memory.frontmatter_codec import parse_frontmatter
+from acreta.memory.matching import text_hash
+from acreta.memory.memory_record import MEMORY_TYPE_FOLDERS, MemoryType
+from acreta.memory.summary_store import list_summary_paths, read_summary_text, summary_signature
+
+CHAT_CONTEXT_TOKENS = 6000
+CONFIDENT_COVERAGE = 0.6
+MIN_TRUNCATED_TOKENS = 200
+PRIMITIVE_WEIGHTS = {"decision": 1.0, "learning": 1.0, "summary": 0.8}
+SCOPE_WEIGHTS = {"project": 1.0, "global": 0.9}
+_TITLE_REPEAT = 3
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+_HIT_OVERHEAD_TOKENS = 24
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be did do does for from has have how i in is it of on or our "
+    "that the this to was we were what when where which who why with you".split()
+)
+
+
+@dataclass(frozen=True)
+class MemoryRoot:
+    """One memory root searched by chat retrieval, tagged with its scope."""
+
+    scope: str
+    path: Path
+
+
+@dataclass
+class _Doc:
+    """One parsed memory or summary with its BM25 term counts."""
+
+    memory_id: str
+    primitive: str
+    scope: str
+    title: str
+    body: str
+    path: Path
+    confidence: float
+    terms: Counter[str]
+    length: int
+    content_hash: str
+    body_hash: str = ""
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class RetrievalResult:
+    """Packed chat evidence plus the coverage signal that gates fan-out."""
+
+    hits: list[dict[str, Any]] = field(default_factory=list)
+    coverage: float = 0.0
+    confident: bool = False
+    used_tokens: int = 0
+    budget_tokens: int = CHAT_CONTEXT_TOKENS
+    corpus_version: str = ""
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the token count of ``text`` (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def query_terms(text: str) -> list[str]:
+    """Return lowercase content terms from a question, without stopwords."""
+    return [
+        token
+        for token in _TOKEN_RE.findall(str(text or "").lower())
+        if len(token) > 1 and token not in _STOPWORDS
+    ]
+
+
+def chat_memory_roots(config: Any, repo_path: Path | None = None) -> list[MemoryRoot]:
+    """Return the memory roots chat should search, project scope first.
+
+    An explicitly configured memory dir outside the scope layout is searched alone.
+    """
+    resolution = resolve_data_dirs(
+        scope=config.memory_scope,
+        project_dir_name=config.memory_project_dir_name,
+        global_data_dir=config.global_data_dir or config.data_dir,
+        repo_path=repo_path,
+    )
+    project_dir = resolution.project_data_dir
+
+    def _scope(path: Path) -> str:
+        if project_dir is not None and (path == project_dir or project_dir in path.parents):
+            return "project"
+        return "global"
+
+    memory_dir = Path(config.memory_dir).expanduser().resolve()
+    candidates = [(data_dir / "memory").resolve() for data_dir in resolution.ordered_data_dirs]
+    if not candidates or candidates[0] != memory_dir:
+        return [MemoryRoot(_scope(memory_dir), memory_dir)]
+    return [MemoryRoot(_scope(path), path) for path in candidates]
+
+
+def _float(value: Any, default: float) -> float:
+    """Parse a frontmatter number, falling back to ``default``."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _parse_doc(root: MemoryRoot, primitive: MemoryType, path: Path) -> _Doc | None:
+    """Parse one memory or summary file into a ranked doc, or None when unreadable."""
+    try:
+        meta, body = parse_frontmatter(read_summary_text(path))
+    except (OSError, ValueError):
+        return None
+    title = str(meta.get("title") or path.stem)
+    tags = meta.get("tags") or []
+    tag_text = " ".join(str(tag) for tag in tags) if isinstance(tags, list) else str(tags)
+    body = body.strip()
+    tokens = query_terms(title) * _TITLE_REPEAT + query_terms(tag_text) + query_terms(body)
+    return _Doc(
+        memory_id=str(meta.get("id") or path.stem),
+        primitive=primitive.value,
+        scope=root.scope,
+        title=title,
+        body=body,
+        path=path.resolve(),
+        confidence=min(1.0, max(0.0, _float(meta.get("confidence"), 0.7))),
+        terms=Counter(tokens),
+        length=len(tokens),
+        content_hash=text_hash(f"{title}\n{tag_text}\n{body}"),
+        body_hash=text_hash(body),
+        metadata=meta,
+    )
+
+
+class _RootIndex:
+    """Parsed docs for one memory root, reparsing only files whose signature changed."""
+
+    def __init__(self, root: MemoryRoot) -> None:
+        self.root = root
+        self.docs: list[_Doc] = []
+        self._lock = threading.Lock()
+        self._entries: dict[Path, tuple[tuple[int, int], _Doc | None]] = {}
+        self.priors: dict[str, float] = {}
+        self._priors_signature: tuple[int, int] | None = None
+
+    def _refresh_priors(self) -> None:
+        """Reload access priors when the stats database changed."""
+        try:
+            stat = access_stats_for_memory_root(self.root.path).db_path.stat()
+            signature: tuple[int, int] | None = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+        if signature != self._priors_signature:
+            self.priors = load_priors(self.root.path) if signature is not None else {}
+            self._priors_signature = signature
+
+    def refresh(self) -> list[_Doc]:
+        """Revalidate every file under the root and return its docs in path order."""
+        with self._lock:
+            self._refresh_priors()
+            entries: dict[Path, tuple[tuple[int, int], _Doc | None]] = {}
+            for primitive in MemoryType:
+                folder = self.root.path / MEMORY_TYPE_FOLDERS[primitive]
+                if not folder.is_dir():
+                    continue
+                if primitive == MemoryType.summary:
+                    paths = list_summary_paths(folder)
+                else:
+                    paths = sorted(folder.glob("*.md"))
+                for path in paths:
+                    try:
+                        signature = summary_signature(path)
+                    except OSError:
+                        continue
+                    cached = self._entries.get(path)
+                    if cached is not None and cached[0] == signature:
+                        entries[path] = cached
+                    else:
+                        entries[path] = (signature, _parse_doc(self.root, primitive, path))
+            self._entries = entries
+            self.docs = [doc for _, doc in entries.values() if doc is not None]
+            return self.docs
+
+
+_ROOT_INDEXES: dict[MemoryRoot, _RootIndex] = {}
+_ROOT_INDEXES_LOCK = threading.Lock()
+
+
+def _refresh_indexes(roots: list[MemoryRoot]) -> list[_RootIndex]:
+    """Refresh each root's index, scanning project and global roots concurrently."""
+    with _ROOT_INDEXES_LOCK:
+        indexes = [_ROOT_INDEXES.setdefault(root, _RootIndex(root)) for root in roots]
+    if len(indexes) > 1:
+        with ThreadPoolExecutor(max_workers=len(indexes)) as pool:
+            list(pool.map(_RootIndex.refresh, indexes))
+    else:
+        for index in indexes:
+            index.refresh()
+    return indexes
+
+
+def corpus_version(docs: list[_Doc]) -> str:
+    """Return a rolling hash over every searched memory's path and content hash."""
+    rolling = hashlib.sha1()
+    for doc in sorted(docs, key=lambda item: str(item.path)):
+        rolling.update(f"{doc.path}\t{doc.content_hash}\n".encode("utf-8"))
+    return rolling.hexdigest()
+
+
+def _rank(
+    docs: list[_Doc], terms: list[str], priors: dict[str, float] | None = None
+) -> list[tuple[float, _Doc]]:
+    """Score docs with BM25 weighted by primitive, scope, confidence, and access prior."""
+    if not docs or not terms:
+        return []
+    avg_length = sum(doc.length for doc in docs) / len(docs) or 1.0
+    unique_terms = set(terms)
+    doc_freq = {term: sum(1 for doc in docs if term in doc.terms) for term in unique_terms}
+    ranked: list[tuple[float, _Doc]] = []
+    for doc in docs:
+        score = 0.0
+        for term in unique_terms:
+            tf = doc.terms.get(term, 0)
+            if not tf:
+                continue
+            idf = math.log(1 + (len(docs) - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * doc.length / avg_length)
+            score += idf * tf * (_BM25_K1 + 1) / (tf + norm)
+        if score <= 0:
+            continue
+        score *= PRIMITIVE_WEIGHTS.get(doc.primitive, 1.0) * SCOPE_WEIGHTS.get(doc.scope, 1.0)
+        score *= 0.5 + 0.5 * doc.confidence
+        score *= prior_boost((priors or {}).get(str(doc.path)))
+        ranked.append((score, doc))
+    ranked.sort(key=lambda item: (-item[0], item[1].scope != "project", str(item[1].path)))
+    return ranked
+
+
+def _merge_ranked(indexes: list[_RootIndex], terms: list[str]) -> list[tuple[float, _Doc]]:
+    """Rank each root against its own BM25 stats and merge; earlier roots shadow repeated ids or bodies."""
+    claimed_ids: set[str] = set()
+    claimed_bodies: set[str] = set()
+    ranked: list[tuple[float, _Doc]] = []
+    for index in indexes:
+        docs = [doc for doc in index.docs if doc.memory_id not in claimed_ids and doc.body_hash not in claimed_bodies]
+        claimed_ids.update(doc.memory_id for doc in docs)
+        claimed_bodies.update(doc.body_hash for doc in docs)
+        ranked.extend(_rank(docs, terms, index.priors))
+    ranked.sort(key=lambda item: (-item[0], item[1].scope != "project", str(item[1].path)))
+    seen_ids: set[str] = set()
+    seen_bodies: set[str] = set()
+    merged: list[tuple[float, _Doc]] = []
+    for score, doc in ranked:
+        if doc.memory_id in seen_ids or doc.body_hash in seen_bodies:
+            continue
+        seen_ids.add(doc.memory_id)
+        seen_bodies.add(doc.body_hash)
+        merged.append((score, doc))
+    return merged
+
+
+def search_memories(question: str, roots: list[MemoryRoot], *, limit: int = 20) -> list[dict[str, Any]]:
+    """Return ranked memory hits across scopes as frontmatter dicts labelled with scope and score."""
+    ranked = _merge_ranked(_refresh_indexes(roots), query_terms(question))
+    return [
+        {
+            "id": doc.memory_id,
+            **doc.metadata,
+            "_body": doc.body,
+            "_path": str(doc.path),
+            "scope": doc.scope,
+            "score": round(score, 4),
+        }
+        for score, doc in ranked[: max(0, limit)]
+    ]
+
+
+def retrieve_chat_context(
+    question: str,
+    roots: list[MemoryRoot],
+    *,
+    limit: int = 12,
+    token_budget: int = CHAT_CONTEXT_TOKENS,
+) -> RetrievalResult:
+    """Rank memories for ``question`` and pack the top ``limit`` bodies into the budget."""
+    terms = query_terms(question)
+    indexes = _refresh_indexes(roots)
+    docs = [doc for index in indexes for doc in index.docs]
+    result = RetrievalResult(budget_tokens=token_budget, corpus_version=corpus_version(docs))
+    covered: set[str] = set()
+    for score, doc in _merge_ranked(indexes, terms):
+        if len(result.hits) >= max(1, limit):
+            break
+        body = doc.body
+        cost = estimate_tokens(doc.title) + estimate_tokens(body) + _HIT_OVERHEAD_TOKENS
+        remaining = token_budget - result.used_tokens
+        truncated = False
+        if cost > remaining:
+            if result.hits and remaining < MIN_TRUNCATED_TOKENS:
+                continue
+            keep_chars = max(0, (remaining - estimate_tokens(doc.title) - _HIT_OVERHEAD_TOKENS) * 4)
+            body, truncated = body[:keep_chars].rstrip(), True
+            cost = remaining
+        result.used_tokens += cost
+        covered.update(term for term in set(terms) if term in doc.terms)
+        result.hits.append(
+            {
+                "id": doc.memory_id,
+                "title": doc.title,
+                "primitive": doc.primitive,
+                "scope": doc.scope,
+                "confidence": doc.confidence,
+                "path": str(doc.path),
+                "score": round(score, 4),
+                "truncated": truncated,
+                "_body": body,
+            }
+        )
+    result.coverage = round(len(covered) / len(set(terms)), 4) if terms else 0.0
+    result.confident = bool(result.hits) and result.coverage >= CONFIDENT_COVERAGE
+    return result
+
+
+if __name__ == "__main__":
+    """Run a real-path self-test for ranking, packing, and confidence."""
+    from tempfile import TemporaryDirectory
+
+    with TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        (root / "learnings").mkdir()
+        (root / "summaries").mkdir()
+        (root / "learnings" / "20260101-deploy.md").write_text(
+            "---\nid: deploy\ntitle: Deploy with blue green\nconfidence: 0.9\n---\nShift traffic gradually.\n",
+            encoding="utf-8",
+        )
+        (root / "summaries" / "20260101-session.md").write_text(
+            "---\ntitle: Session about caching\n---\nWe tuned redis caching.\n", encoding="utf-8"
+        )
+        found = retrieve_chat_context("how do we deploy?", [MemoryRoot("project", root)])
+        assert [hit["id"] for hit in found.hits] == ["deploy"]
+        assert found.confident and found.hits[0]["_body"] == "Shift traffic gradually."
+        missing = retrieve_chat_context("kubernetes autoscaling", [MemoryRoot("project", root)])
+        assert not missing.hits and not missing.confident
@@ -1,7 +1,10 @@
 """Trace summarization pipeline that outputs markdown-frontmatter-ready metadata + summary.
 
 When --memory-root is provided, the pipeline writes the summary markdown file
-directly to memory_root/summaries/YYYYMMDD/HHMMSS/{slug}.md using python-frontmatter.
+directly to memory_root/summaries/ in the configured summary layout (see
+``acreta.memory.summary_store``) using the memory frontmatter codec. Inside a sync
+run the write joins the run's memory transaction (looked up by the metadata run id), so a
+failed run rolls the summary back together with its decisions and learnings.
 """
 
 from __future__ import annotations
@@ -13,11 +16,20 @@ from pathlib import Path
 from typing import Any
 
 import dspy
-import frontmatter
 from pydantic import BaseModel, Field
 
+from acreta.config.settings import get_config
+from acreta.memory.frontmatter_codec import dump_frontmatter
+from acreta.memory.journal import content_hash, record_memory_change
 from acreta.memory.memory_record import slugify
-from acreta.memory.utils import configure_dspy_lm, env_positive_int
+from acreta.memory.summary_store import normalize_layout, pack_files_for, summary_path_for, write_summary
+from acreta.memory.transaction import MemoryTransaction, memory_root_lock
+from acreta.memory.utils import (
+    dspy_lm_session,
+    env_positive_int,
+    read_previous_summary,
+    read_trace_text,
+)
 from acreta.sessions import catalog as session_db
 
 
@@ -78,18 +90,18 @@ def _summarize_trace_with_rlm(
         raise RuntimeError("session_trace_empty")
     max_iterations = env_positive_int("ACRETA_DSPY_RLM_MAX_ITERATIONS", 24)
     max_llm_calls = env_positive_int("ACRETA_DSPY_RLM_MAX_LLM_CALLS", 24)
-    configure_dspy_lm()
     rlm = dspy.RLM(
         TraceSummarySignature,
         max_iterations=max_iterations,
         max_llm_calls=max_llm_calls,
         verbose=True,
     )
-    result = rlm(
-        transcript=transcript,
-        metadata=metadata or {},
-        metrics=metrics or {},
-    )
+    with dspy_lm_session():
+        result = rlm(
+            transcript=transcript,
+            metadata=metadata or {},
+            metrics=metrics or {},
+        )
     payload = getattr(result, "summary_payload", None)
     if isinstance(payload, TraceSummaryCandidate):
         candidate = payload
@@ -105,8 +117,9 @@ def write_summary_markdown(
     memory_root: Path,
     *,
     run_id: str = "",
+    layout: str | None = None,
 ) -> Path:
-    """Write summary markdown with frontmatter to memory_root/summaries/YYYYMMDD/HHMMSS/{slug}.md."""
+    """Write summary markdown with frontmatter under memory_root/summaries/ in ``layout``."""
     title = str(payload.get("title") or "untitled")
     summary_body = str(payload.get("summary") or "")
     now_iso = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -132,12 +145,29 @@ def write_summary_markdown(
     if len(date_compact) != 8 or len(time_compact) != 6:
         date_compact = datetime.now(timezone.utc).strftime("%Y%m%d")
         time_compact = datetime.now(timezone.utc).strftime("%H%M%S")
-    summaries_dir = memory_root / "summaries" / date_compact / time_compact
-    summaries_dir.mkdir(parents=True, exist_ok=True)
-    summary_path = summaries_dir / f"{slug}.md"
-
-    post = frontmatter.Post(summary_body, **fm_dict)
-    summary_path.write_text(frontmatter.dumps(post) + "\n", encoding="utf-8")
+    text = dump_frontmatter(fm_dict, summary_body) + "\n"
+    layout = normalize_layout(layout or get_config().memory_summary_layout)
+    summaries_dir = memory_root / "summaries"
+    event_run_id = str(fm_dict["run_id"] or "")
+    transaction = MemoryTransaction.for_run(memory_root, run_id)
+    with memory_root_lock(memory_root):
+        if transaction is not None:
+            target = summary_path_for(summaries_dir, layout, date_compact, time_compact, slug)
+            pack_files = pack_files_for(target) if layout == "packed" else None
+            transaction.track(
+                *(pack_files or (target,)),
+                event={
+                    "op": "add",
+                    "path": str(target.resolve()),
+                    "memory_id": slug,
+                    "content_hash": content_hash(text),
+                    "run_id": event_run_id,
+                },
+                append=pack_files is not None,
+            )
+        summary_path = write_summary(summaries_dir, layout, date_compact, time_compact, slug, text)
+    if transaction is None:
+        record_memory_change(memory_root, "add", summary_path, memory_id=slug, content=text, run_id=event_run_id)
     return summary_path
 
 
@@ -146,12 +176,19 @@ def summarize_trace_from_session_file(
     *,
     metadata: dict[str, Any] | None = None,
     metrics: dict[str, Any] | None = None,
+    start_offset: int = 0,
+    previous_summary_path: Path | None = None,
 ) -> dict[str, Any]:
     """Summarize one session trace file into markdown-ready metadata + <=300 word summary."""
     if not session_file_path.exists() or not session_file_path.is_file():
         raise FileNotFoundError(f"session_file_missing:{session_file_path}")
-    transcript = session_file_path.read_text(encoding="utf-8")
+    transcript = read_trace_text(session_file_path, start_offset)
     session_metadata = {**(metadata or {}), "raw_trace_path": str(session_file_path)}
+    if start_offset > 0:
+        session_metadata["start_offset"] = start_offset
+        previous_summary = read_previous_summary(previous_summary_path)
+        if previous_summary:
+            session_metadata["previous_summary"] = previous_summary
     return _summarize_trace_with_rlm(
         transcript,
         metadata=session_metadata,
@@ -179,6 +216,8 @@ if __name__ == "__main__":
     )
     parser.add_argument("--metadata-json", default="{}")
     parser.add_argument("--metrics-json", default="{}")
+    parser.add_argument("--start-offset", type=int, default=0)
+    parser.add_argument("--previous-summary-path")
     args = parser.parse_args()
 
     if args.trace_path:
@@ -189,6 +228,12 @@ if __name__ == "__main__":
             session_file,
             metadata=metadata if isinstance(metadata, dict) else {},
             metrics=metrics if isinstance(metrics, dict) else {},
+            start_offset=max(0, args.start_offset),
+            previous_summary_path=(
+                Path(args.previous_summary_path).expanduser()
+                if args.previous_summary_path
+                else None
+            ),
         )
 
         # Write summary markdown and output pointer
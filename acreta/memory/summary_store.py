@@ -0,0 +1,347 @@
+"""Session summary storage layouts: legacy tree, flat monthly folders, and monthly packs.
+
+``tree``   ``summaries/YYYYMMDD/HHMMSS/{slug}.md`` (legacy; two directories per summary)
+``flat``   ``summaries/YYYY-MM/YYYYMMDD-HHMMSS-{slug}.md``
+``packed`` append-only ``summaries/.packs/YYYY-MM.pack`` plus ``YYYY-MM.index.jsonl``
+
+Packed summaries keep their flat path as identity: readers resolve a missing flat
+file through the month index, and ``materialize_summaries`` writes the loose files
+back on demand so ``summaries/`` stays browsable. A loose file always shadows the
+packed entry with the same path, and a later pack entry shadows an earlier one.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from acreta.memory.transaction import atomic_write_text
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+SUMMARY_LAYOUTS = ("tree", "flat", "packed")
+DEFAULT_SUMMARY_LAYOUT = "tree"
+PACKS_DIRNAME = ".packs"
+_MONTH_RE = re.compile(r"^\d{4}-\d{2}$")
+_FLAT_NAME_RE = re.compile(r"^(\d{8})-(\d{6})-(.+)\.md$")
+_INDEX_SUFFIX = ".index.jsonl"
+
+_INDEX_LOCK = threading.Lock()
+_INDEX_CACHE: dict[Path, tuple[tuple[int, int], dict[str, "PackedEntry"]]] = {}
+
+
+@dataclass(frozen=True)
+class PackedEntry:
+    """Location of one summary inside a monthly pack file."""
+
+    pack: Path
+    offset: int
+    length: int
+    sha1: str
+
+
+def normalize_layout(layout: str | None) -> str:
+    """Return a supported layout name, falling back to the legacy tree."""
+    value = str(layout or "").strip().lower()
+    return value if value in SUMMARY_LAYOUTS else DEFAULT_SUMMARY_LAYOUT
+
+
+def summary_path_for(summaries_dir: Path, layout: str, date_compact: str, time_compact: str, slug: str) -> Path:
+    """Return the path a summary stamped ``date_compact``/``time_compact`` lives at."""
+    if normalize_layout(layout) == "tree":
+        return summaries_dir / date_compact / time_compact / f"{slug}.md"
+    month = f"{date_compact[:4]}-{date_compact[4:6]}"
+    return summaries_dir / month / f"{date_compact}-{time_compact}-{slug}.md"
+
+
+def _pack_files(summaries_dir: Path, month: str) -> tuple[Path, Path]:
+    """Return the pack and index file paths for one month."""
+    packs = summaries_dir / PACKS_DIRNAME
+    return packs / f"{month}.pack", packs / f"{month}{_INDEX_SUFFIX}"
+
+
+def _sha1(data: bytes) -> str:
+    """Return the hex SHA-1 of ``data``."""
+    return hashlib.sha1(data).hexdigest()
+
+
+def _load_month_index(index_path: Path) -> dict[str, PackedEntry]:
+    """Return ``name -> entry`` for one month index, cached by file signature."""
+    try:
+        stat = index_path.stat()
+    except OSError:
+        return {}
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _INDEX_LOCK:
+        cached = _INDEX_CACHE.get(index_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+    pack = index_path.with_name(index_path.name[: -len(_INDEX_SUFFIX)] + ".pack")
+    entries: dict[str, PackedEntry] = {}
+    with index_path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                row = json.loads(line)
+                entries[str(row["name"])] = PackedEntry(pack, int(row["offset"]), int(row["length"]), str(row["sha1"]))
+            except (ValueError, KeyError, TypeError):
+                continue
+    with _INDEX_LOCK:
+        _INDEX_CACHE[index_path] = (signature, entries)
+    return entries
+
+
+def _packed_entries(summaries_dir: Path) -> dict[Path, PackedEntry]:
+    """Return every packed summary keyed by its flat path."""
+    packs = summaries_dir / PACKS_DIRNAME
+    if not packs.is_dir():
+        return {}
+    entries: dict[Path, PackedEntry] = {}
+    for index_path in sorted(packs.glob(f"*{_INDEX_SUFFIX}")):
+        month = index_path.name[: -len(_INDEX_SUFFIX)]
+        for name, entry in _load_month_index(index_path).items():
+            entries[summaries_dir / month / name] = entry
+    return entries
+
+
+def packed_entry(path: Path) -> PackedEntry | None:
+    """Return the pack entry backing the flat summary ``path``, if any."""
+    month = path.parent.name
+    if not _MONTH_RE.match(month):
+        return None
+    _, index_path = _pack_files(path.parent.parent, month)
+    return _load_month_index(index_path).get(path.name)
+
+
+def _read_entry(entry: PackedEntry) -> str:
+    """Read one summary's text out of its pack file."""
+    with entry.pack.open("rb") as handle:
+        handle.seek(entry.offset)
+        return handle.read(entry.length).decode("utf-8")
+
+
+def pack_files_for(path: Path) -> tuple[Path, Path] | None:
+    """Return the month pack and index files a flat summary ``path`` would be appended to."""
+    month = path.parent.name
+    return _pack_files(path.parent.parent, month) if _MONTH_RE.match(month) else None
+
+
+def pack_file_for(path: Path) -> Path | None:
+    """Return the month pack file a flat summary ``path`` would be appended to."""
+    files = pack_files_for(path)
+    return files[0] if files else None
+
+
+def append_packed_summary(path: Path, text: str, *, fsync: bool = True) -> Path:
+    """Append summary ``text`` to its month pack under the flat ``path`` and return ``path``.
+
+    Bulk writers pass ``fsync=False`` and sync ``pack_file_for(path)`` once per batch.
+    """
+    month = path.parent.name
+    if not _MONTH_RE.match(month):
+        raise ValueError(f"not_a_flat_summary_path:{path}")
+    pack, index_path = _pack_files(path.parent.parent, month)
+    pack.parent.mkdir(parents=True, exist_ok=True)
+    data = text.encode("utf-8")
+    with pack.open("ab") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            offset = handle.seek(0, os.SEEK_END)
+            handle.write(data)
+            handle.flush()
+            if fsync:
+                os.fsync(handle.fileno())
+            row = {"name": path.name, "offset": offset, "length": len(data), "sha1": _sha1(data)}
+            with index_path.open("a", encoding="utf-8") as index:
+                index.write(json.dumps(row, ensure_ascii=True) + "\n")
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    return path
+
+
+def write_summary(
+    summaries_dir: Path,
+    layout: str,
+    date_compact: str,
+    time_compact: str,
+    slug: str,
+    text: str,
+    *,
+    fsync: bool = True,
+) -> Path:
+    """Store one rendered summary in ``layout`` and return its canonical path."""
+    layout = normalize_layout(layout)
+    path = summary_path_for(summaries_dir, layout, date_compact, time_compact, slug)
+    if layout == "packed":
+        return append_packed_summary(path, text, fsync=fsync)
+    return atomic_write_text(path, text, fsync=fsync)
+
+
+def read_summary_text(path: Path) -> str:
+    """Return a summary's text from its loose file or, failing that, its pack."""
+    path = Path(path)
+    if path.is_file():
+        return path.read_text(encoding="utf-8")
+    entry = packed_entry(path)
+    if entry is None:
+        raise FileNotFoundError(str(path))
+    return _read_entry(entry)
+
+
+def summary_exists(path: Path) -> bool:
+    """Return whether ``path`` is a loose or packed summary."""
+    path = Path(path)
+    return path.is_file() or packed_entry(path) is not None
+
+
+def summary_signature(path: Path) -> tuple[int, int]:
+    """Return a change signature for ``path``: stat for loose files, pack position otherwise."""
+    try:
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+    except OSError:
+        entry = packed_entry(path)
+        if entry is None:
+            raise
+        return -entry.offset - 1, entry.length
+
+
+def list_summary_paths(summaries_dir: Path) -> list[Path]:
+    """List loose summaries followed by packed ones that have no loose copy."""
+    if not summaries_dir.is_dir():
+        return []
+    loose = sorted(
+        path for path in summaries_dir.rglob("*.md") if PACKS_DIRNAME not in path.relative_to(summaries_dir).parts
+    )
+    seen = set(loose)
+    return loose + [path for path in sorted(_packed_entries(summaries_dir)) if path not in seen]
+
+
+def iter_summaries(summaries_dir: Path) -> Iterator[tuple[Path, str]]:
+    """Yield ``(path, text)`` for every summary, opening each pack once."""
+    packed = _packed_entries(summaries_dir)
+    handles: dict[Path, Any] = {}
+    try:
+        for path in list_summary_paths(summaries_dir):
+            entry = packed.get(path)
+            if entry is None or path.is_file():
+                yield path, path.read_text(encoding="utf-8")
+                continue
+            handle = handles.get(entry.pack)
+            if handle is None:
+                handle = handles[entry.pack] = entry.pack.open("rb")
+            handle.seek(entry.offset)
+            yield path, handle.read(entry.length).decode("utf-8")
+    finally:
+        for handle in handles.values():
+            handle.close()
+
+
+def materialize_summaries(summaries_dir: Path, month: str | None = None) -> list[Path]:
+    """Write loose flat files for packed summaries missing on disk and return them."""
+    written: list[Path] = []
+    for path, entry in sorted(_packed_entries(summaries_dir).items()):
+        if (month and path.parent.name != month) or path.is_file():
+            continue
+        atomic_write_text(path, _read_entry(entry), fsync=False)
+        written.append(path)
+    return written
+
+
+def _stamp_for(summaries_dir: Path, path: Path) -> tuple[str, str, str]:
+    """Recover ``(date_compact, time_compact, slug)`` from a summary path in any layout."""
+    parts = path.relative_to(summaries_dir).parts
+    if len(parts) == 3 and re.fullmatch(r"\d{8}", parts[0]) and re.fullmatch(r"\d{6}", parts[1]):
+        return parts[0], parts[1], path.stem
+    match = _FLAT_NAME_RE.match(path.name)
+    if len(parts) == 2 and _MONTH_RE.match(parts[0]) and match:
+        return match.group(1), match.group(2), match.group(3)
+    stamp = datetime.fromtimestamp(path.stat().st_mtime, tz=timezone.utc)
+    return stamp.strftime("%Y%m%d"), stamp.strftime("%H%M%S"), path.stem
+
+
+def _remove_empty_dirs(summaries_dir: Path) -> int:
+    """Delete empty directories below ``summaries_dir`` and return how many were removed."""
+    removed = 0
+    for folder in sorted((path for path in summaries_dir.rglob("*") if path.is_dir()), reverse=True):
+        try:
+            folder.rmdir()
+            removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def migrate_summaries(summaries_dir: Path, layout: str) -> dict[str, Any]:
+    """Move every summary into ``layout`` and return counts plus an old-to-new path map."""
+    layout = normalize_layout(layout)
+    moved: dict[str, str] = {}
+    packed_count = 0
+    unpacked_count = 0
+    packed = _packed_entries(summaries_dir)
+    for path, text in list(iter_summaries(summaries_dir)):
+        date_compact, time_compact, slug = _stamp_for(summaries_dir, path)
+        target = summary_path_for(summaries_dir, layout, date_compact, time_compact, slug)
+        if layout == "packed":
+            existing = packed_entry(target)
+            if existing is None or existing.sha1 != _sha1(text.encode("utf-8")):
+                append_packed_summary(target, text)
+                packed_count += 1
+            if path.is_file():
+                path.unlink()
+        elif path.is_file():
+            if path == target:
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(path, target)
+        else:
+            atomic_write_text(target, text)
+            unpacked_count += 1
+        if path != target:
+            moved[str(path)] = str(target)
+    if layout != "packed" and packed:
+        shutil.rmtree(summaries_dir / PACKS_DIRNAME, ignore_errors=True)
+    return {
+        "layout": layout,
+        "moved": len(moved),
+        "packed": packed_count,
+        "unpacked": unpacked_count,
+        "removed_dirs": _remove_empty_dirs(summaries_dir) if summaries_dir.is_dir() else 0,
+        "paths": moved,
+    }
+
+
+if __name__ == "__main__":
+    """Run a real-path self-test for packed writes, reads, materialization, and migration."""
+    from tempfile import TemporaryDirectory
+
+    with TemporaryDirectory() as tmp_dir:
+        summaries = Path(tmp_dir) / "summaries"
+        legacy = write_summary(summaries, "tree", "20260105", "101010", "old", "---\nid: old\n---\nOld.")
+        first = write_summary(summaries, "packed", "20260201", "090000", "one", "---\nid: one\n---\nOne.")
+        assert not first.exists() and summary_exists(first)
+        assert read_summary_text(first).endswith("One.")
+        assert list_summary_paths(summaries) == [legacy, first]
+        assert materialize_summaries(summaries) == [first] and first.is_file()
+        result = migrate_summaries(summaries, "packed")
+        assert result["moved"] == 1 and not legacy.exists()
+        assert sorted(path.name for path in summaries.iterdir()) == [PACKS_DIRNAME]
+        assert [path.name for path, _ in iter_summaries(summaries)] == [
+            "20260105-101010-old.md",
+            "20260201-090000-one.md",
+        ]
+        back = migrate_summaries(summaries, "tree")
+        assert back["unpacked"] == 2 and (summaries / "20260105" / "101010" / "old.md").is_file()
+        assert not (summaries / PACKS_DIRNAME).exists()
@@ -0,0 +1,441 @@
+"""Crash-safe memory writes: atomic file replacement, a per-root lock, and run transactions.
+
+``atomic_write_text`` writes a sibling temp file, fsyncs it, renames it over the
+target, and fsyncs the directory, so readers see either the old or the new file.
+``memory_root_lock`` is an advisory ``flock`` on ``<index_dir>/memory.lock`` that
+serializes writers of one memory root across processes.
+
+``MemoryTransaction.begin`` also takes the run lease, a ``flock`` on
+``<index_dir>/memory.run.lock`` held until ``commit`` or ``rollback``, so only one
+run at a time has an open transaction on a root. Otherwise a rollback could
+restore pre-images over edits another run already committed. The lease is separate
+from the write lock because pipeline subprocesses of the open run still take the
+write lock for their own writes. ``begin`` polls the lease with ``LOCK_NB`` and
+raises ``RunLeaseTimeoutError`` naming the holder's run once its deadline passes,
+so a hung sync in one process cannot stall the others forever.
+
+A ``MemoryTransaction`` groups the memory writes of one sync or maintain run in a commit
+record under ``<index_dir>/transactions/<run_id>/``. Before a file changes, its pre-image is
+copied into the record (for append-only pack files only the size is noted), along
+with the journal event the write will produce. ``commit`` journals every event in
+one batch and drops the record; ``rollback`` restores the pre-images and removes
+files the run created. Pipeline subprocesses started by the agent join the run's
+transaction by run id (``for_run``), which reaches them through ``--metadata-json``.
+
+``recover_transactions`` runs when the daemon starts a cycle: records left ``open``
+or ``rolling_back`` by a dead process are rolled back, and records that died while
+``committing`` are replayed into the journal. ``begin`` runs it too once it holds the
+lease, so project-scoped roots the daemon cycle never visits are recovered by their
+next run.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+from acreta.config.logging import logger
+from acreta.memory.journal import index_dir_for_memory_root, journal_for_memory_root
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
+
+TXN_DIRNAME = "transactions"
+LOCK_FILENAME = "memory.lock"
+RUN_LOCK_FILENAME = "memory.run.lock"
+TXN_STATES = ("open", "committing", "committed", "rolling_back", "rolled_back")
+RUN_LEASE_TIMEOUT_SECONDS = 900.0
+RUN_LEASE_POLL_SECONDS = 0.1
+_RECORD_FILENAME = "record.json"
+_BACKUPS_DIRNAME = "backups"
+
+
+def _fsync_dir(path: Path) -> None:
+    """Flush a directory entry so a rename survives a crash."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(path: Path, text: str, *, fsync: bool = True) -> Path:
+    """Replace ``path`` with ``text`` via temp file + rename; readers never see partial output."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            handle.write(text)
+            if fsync:
+                handle.flush()
+                os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    if fsync:
+        _fsync_dir(path.parent)
+    return path
+
+
+@contextmanager
+def _flock(lock_path: Path) -> Iterator[None]:
+    """Hold an exclusive ``flock`` on ``lock_path`` for the duration of the block."""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("a") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+class _RootLock:
+    """Thread-reentrant holder of one root's cross-process ``flock``."""
+
+    def __init__(self, lock_path: Path) -> None:
+        self.lock_path = lock_path
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+
+
+_ROOT_LOCKS: dict[Path, _RootLock] = {}
+_ROOT_LOCKS_GUARD = threading.Lock()
+
+
+@contextmanager
+def memory_root_lock(memory_root: Path) -> Iterator[None]:
+    """Hold the advisory writer lock for ``memory_root``; nested use in one thread is allowed."""
+    lock_path = index_dir_for_memory_root(memory_root) / LOCK_FILENAME
+    with _ROOT_LOCKS_GUARD:
+        root_lock = _ROOT_LOCKS.setdefault(lock_path, _RootLock(lock_path))
+    with root_lock.thread_lock:
+        if root_lock.depth:
+            root_lock.depth += 1
+            try:
+                yield
+            finally:
+                root_lock.depth -= 1
+            return
+        with _flock(lock_path):
+            root_lock.depth = 1
+            try:
+                yield
+            finally:
+                root_lock.depth = 0
+
+
+def _pid_alive(pid: Any) -> bool:
+    """Return whether ``pid`` names a live process on this host."""
+    if not isinstance(pid, int) or pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class RunLeaseTimeoutError(RuntimeError):
+    """Raised when another run holds a root's run lease past the wait deadline."""
+
+
+def _acquire_lease(lease: Any, timeout: float) -> None:
+    """Take an exclusive ``flock`` on the open lease file, polling until ``timeout`` seconds pass."""
+    if fcntl is None:
+        return
+    deadline = time.monotonic() + max(0.0, timeout)
+    while True:
+        try:
+            fcntl.flock(lease.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return
+        except BlockingIOError:
+            if time.monotonic() >= deadline:
+                try:
+                    holder = Path(lease.name).read_text(encoding="utf-8").strip() or "unknown"
+                except OSError:
+                    holder = "unknown"
+                raise RunLeaseTimeoutError(
+                    f"memory_run_lease_timeout:{lease.name} (held by {holder}, waited {timeout:g}s)"
+                ) from None
+            time.sleep(RUN_LEASE_POLL_SECONDS)
+
+
+class MemoryTransaction:
+    """Undo log plus pending journal events for the memory writes of one run."""
+
+    def __init__(self, record_dir: Path) -> None:
+        self.record_dir = record_dir
+        self.record_path = record_dir / _RECORD_FILENAME
+        self._lease: Any = None
+
+    @classmethod
+    def begin(
+        cls, memory_root: Path, run_id: str, *, timeout: float = RUN_LEASE_TIMEOUT_SECONDS
+    ) -> MemoryTransaction:
+        """Wait up to ``timeout`` seconds for the root's run lease, then open a commit record for ``run_id``."""
+        memory_root = Path(memory_root).expanduser().resolve()
+        index_dir = index_dir_for_memory_root(memory_root)
+        index_dir.mkdir(parents=True, exist_ok=True)
+        lease = (index_dir / RUN_LOCK_FILENAME).open("a", encoding="utf-8")
+        try:
+            _acquire_lease(lease, timeout)
+            lease.truncate(0)
+            lease.write(f"{run_id} pid={os.getpid()} host={socket.gethostname()}\n")
+            lease.flush()
+            recover_transactions(memory_root)
+            record_dir = index_dir / TXN_DIRNAME / run_id
+            record_dir.mkdir(parents=True, exist_ok=True)
+            transaction = cls(record_dir)
+            transaction._lease = lease
+            transaction._save(
+                {
+                    "run_id": run_id,
+                    "memory_root": str(memory_root),
+                    "pid": os.getpid(),
+                    "host": socket.gethostname(),
+                    "started_at": time.time(),
+                    "state": "open",
+                    "ops": [],
+                    "events": [],
+                }
+            )
+        except BaseException:
+            lease.close()
+            raise
+        return transaction
+
+    def _release_lease(self) -> None:
+        """Let the next run on this root begin; closing the file drops the ``flock``."""
+        lease, self._lease = self._lease, None
+        if lease is not None:
+            lease.close()
+
+    @classmethod
+    def for_run(cls, memory_root: Path, run_id: str) -> MemoryTransaction | None:
+        """Return the open transaction of ``run_id`` when one covers ``memory_root``."""
+        if not run_id or Path(run_id).name != run_id:
+            return None
+        memory_root = Path(memory_root).expanduser().resolve()
+        transaction = cls(index_dir_for_memory_root(memory_root) / TXN_DIRNAME / run_id)
+        try:
+            record = transaction.load()
+        except (OSError, ValueError):
+            return None
+        if record.get("state") != "open":
+            return None
+        if Path(record.get("memory_root", "")) != memory_root:
+            return None
+        return transaction
+
+    def load(self) -> dict[str, Any]:
+        """Read the commit record."""
+        record = json.loads(self.record_path.read_text(encoding="utf-8"))
+        if not isinstance(record, dict):
+            raise ValueError(f"invalid_transaction_record:{self.record_path}")
+        return record
+
+    def _save(self, record: dict[str, Any]) -> None:
+        """Durably replace the commit record."""
+        atomic_write_text(self.record_path, json.dumps(record, ensure_ascii=True, indent=2) + "\n")
+
+    @contextmanager
+    def _update(self) -> Iterator[dict[str, Any]]:
+        """Read-modify-write the record under its own lock (the agent and pipelines share it)."""
+        with _flock(self.record_dir / ".record.lock"):
+            record = self.load()
+            yield record
+            self._save(record)
+
+    @property
+    def memory_root(self) -> Path:
+        """Return the memory root this transaction covers."""
+        return Path(self.load()["memory_root"])
+
+    @property
+    def state(self) -> str:
+        """Return the record state, or ``committed`` once the record is gone."""
+        try:
+            return str(self.load().get("state") or "open")
+        except FileNotFoundError:
+            return "committed"
+
+    def track(self, *paths: Path, event: dict[str, str] | None = None, append: bool = False) -> None:
+        """Save pre-images of ``paths`` before they change and queue ``event`` for the journal.
+
+        ``append`` marks append-only files, which only need their current size.
+        """
+        with self._update() as record:
+            if record["state"] != "open":
+                raise RuntimeError(f"transaction_not_open:{record['state']}")
+            tracked = {op["path"] for op in record["ops"]}
+            for raw in paths:
+                path = Path(raw).expanduser().resolve()
+                if str(path) in tracked:
+                    continue
+                op: dict[str, Any] = {"path": str(path), "existed": path.is_file(), "append": append}
+                if op["existed"] and append:
+                    op["size"] = path.stat().st_size
+                elif op["existed"]:
+                    backup = self.record_dir / _BACKUPS_DIRNAME / str(len(record["ops"]))
+                    backup.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copy2(path, backup)
+                    with backup.open("rb") as handle:
+                        os.fsync(handle.fileno())
+                    op["backup"] = backup.name
+                record["ops"].append(op)
+                tracked.add(str(path))
+            if event is not None:
+                record["events"].append(dict(event))
+
+    def write(self, path: Path, text: str, *, event: dict[str, str] | None = None) -> Path:
+        """Track ``path`` and atomically replace it with ``text`` under the root lock."""
+        with memory_root_lock(self.memory_root):
+            self.track(path, event=event)
+            return atomic_write_text(Path(path), text)
+
+    def commit(self) -> int:
+        """Journal the run's events in one batch and drop the record; return events journaled."""
+        try:
+            with memory_root_lock(self.memory_root):
+                with self._update() as record:
+                    if record["state"] != "open":
+                        raise RuntimeError(f"transaction_not_open:{record['state']}")
+                    record["state"] = "committing"
+                return self._finish_commit()
+        finally:
+            self._release_lease()
+
+    def _finish_commit(self) -> int:
+        """Replay queued events into the journal, then mark committed and clean up."""
+        record = self.load()
+        events = record.get("events") or []
+        if events:
+            journal_for_memory_root(Path(record["memory_root"])).record_many(events)
+        with self._update() as latest:
+            latest["state"] = "committed"
+        shutil.rmtree(self.record_dir, ignore_errors=True)
+        return len(events)
+
+    def rollback(self) -> int:
+        """Restore pre-images, remove files the run created, and drop the record; return files undone."""
+        try:
+            with memory_root_lock(self.memory_root):
+                with self._update() as record:
+                    if record["state"] not in {"open", "rolling_back"}:
+                        raise RuntimeError(f"transaction_not_open:{record['state']}")
+                    record["state"] = "rolling_back"
+                return self._finish_rollback()
+        finally:
+            self._release_lease()
+
+    def _finish_rollback(self) -> int:
+        """Undo every tracked op in reverse order; safe to repeat after a crash."""
+        record = self.load()
+        undone = 0
+        for op in reversed(record.get("ops") or []):
+            path = Path(op["path"])
+            if op.get("append") and op.get("existed"):
+                if path.exists() and path.stat().st_size > int(op["size"]):
+                    with path.open("r+b") as handle:
+                        handle.truncate(int(op["size"]))
+                        os.fsync(handle.fileno())
+                    undone += 1
+            elif op.get("backup"):
+                backup = self.record_dir / _BACKUPS_DIRNAME / op["backup"]
+                tmp_path = path.with_name(f".{path.name}.{os.getpid()}.restore.tmp")
+                path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(backup, tmp_path)
+                os.replace(tmp_path, path)
+                _fsync_dir(path.parent)
+                undone += 1
+            elif path.exists():
+                path.unlink()
+                _fsync_dir(path.parent)
+                undone += 1
+        with self._update() as latest:
+            latest["state"] = "rolled_back"
+        shutil.rmtree(self.record_dir, ignore_errors=True)
+        logger.info("memory transaction {} rolled back ({} files)", record.get("run_id"), undone)
+        return undone
+
+
+def recover_transactions(memory_root: Path) -> dict[str, int]:
+    """Roll back or replay transactions left behind by dead processes under ``memory_root``."""
+    counts = {"rolled_back": 0, "replayed": 0, "skipped": 0}
+    txn_root = index_dir_for_memory_root(memory_root) / TXN_DIRNAME
+    if not txn_root.is_dir():
+        return counts
+    for record_dir in sorted(path for path in txn_root.iterdir() if path.is_dir()):
+        transaction = MemoryTransaction(record_dir)
+        try:
+            record = transaction.load()
+        except FileNotFoundError:
+            shutil.rmtree(record_dir, ignore_errors=True)
+            continue
+        except (OSError, ValueError) as exc:
+            logger.warning("unreadable memory transaction {}: {}", record_dir, exc)
+            counts["skipped"] += 1
+            continue
+        state = record.get("state")
+        if record.get("host") == socket.gethostname() and _pid_alive(record.get("pid")):
+            counts["skipped"] += 1
+        elif state in {"open", "rolling_back"}:
+            with memory_root_lock(memory_root):
+                transaction._finish_rollback()
+            counts["rolled_back"] += 1
+        elif state == "committing":
+            with memory_root_lock(memory_root):
+                transaction._finish_commit()
+            counts["replayed"] += 1
+        else:
+            shutil.rmtree(record_dir, ignore_errors=True)
+    return counts
+
+
+if __name__ == "__main__":
+    """Run a real-path self-test for commit, rollback, and crash recovery."""
+    from tempfile import TemporaryDirectory
+
+    with TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir) / "memory"
+        kept = atomic_write_text(root / "learnings" / "kept.md", "v1\n")
+        txn = MemoryTransaction.begin(root, "sync-a")
+        txn.write(kept, "v2\n", event={"op": "update", "path": str(kept)})
+        txn.write(root / "learnings" / "new.md", "new\n")
+        assert txn.rollback() == 2
+        assert kept.read_text(encoding="utf-8") == "v1\n" and not (root / "learnings" / "new.md").exists()
+
+        txn = MemoryTransaction.begin(root, "sync-b")
+        assert MemoryTransaction.for_run(root, "sync-b").record_dir == txn.record_dir
+        txn.write(kept, "v3\n", event={"op": "update", "path": str(kept)})
+        assert txn.commit() == 1 and txn.state == "committed"
+        assert [event.op for event in journal_for_memory_root(root).changes()] == ["update"]
+
+        crashed = MemoryTransaction.begin(root, "sync-c")
+        crashed.write(kept, "partial\n")
+        with crashed._update() as record:
+            record["pid"] = 0
+        crashed._release_lease()
+        assert recover_transactions(root) == {"rolled_back": 1, "replayed": 0, "skipped": 0}
+        assert kept.read_text(encoding="utf-8") == "v3\n"
@@ -0,0 +1,331 @@
+"""Streaming memory export and bulk import.
+
+Export walks decisions, learnings, and summaries (loose and packed) and writes each
+record as soon as it is parsed, so memory use stays flat for any store size.
+``jsonl`` and ``parquet`` carry one record per memory with the full frontmatter
+(``primitive``, ``id``, ``title``, ``path``, ``metadata``, ``body``) and round-trip
+through ``import_memories``; ``json`` and ``markdown`` are the human-facing formats.
+
+Import streams JSONL lines or Parquet row batches into the canonical layout:
+decision/learning filenames are normalized with ``canonical_memory_filename``,
+summaries go through the configured summary layout, ids already present are
+skipped, and files are fsynced and journaled once per batch instead of per file.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+from acreta.config.logging import logger
+from acreta.memory.digest import read_memory_digest
+from acreta.memory.frontmatter_codec import dump_frontmatter, parse_frontmatter
+from acreta.memory.journal import content_hash, journal_for_memory_root
+from acreta.memory.memory_record import MemoryType, canonical_memory_filename, memory_folder, slugify
+from acreta.memory.summary_store import iter_summaries, pack_file_for, write_summary
+from acreta.memory.transaction import atomic_write_text, memory_root_lock
+
+EXPORT_FORMATS = ("json", "markdown", "jsonl", "parquet")
+IMPORT_FORMATS = ("jsonl", "parquet")
+RECORD_FIELDS = ("primitive", "id", "title", "path", "metadata", "body")
+DEFAULT_BATCH_SIZE = 500
+
+
+def _json_default(value: Any) -> str:
+    """Serialize YAML-loaded dates and other non-JSON values as strings."""
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def iter_memory_records(memory_dir: Path) -> Iterator[dict[str, Any]]:
+    """Yield one export record per decision, learning, and summary under ``memory_dir``."""
+    for primitive in MemoryType:
+        folder = memory_dir / memory_folder(primitive)
+        if primitive == MemoryType.summary:
+            items: Iterator[tuple[Path, str]] = iter_summaries(folder)
+        elif folder.is_dir():
+            items = ((path, path.read_text(encoding="utf-8")) for path in sorted(folder.rglob("*.md")))
+        else:
+            continue
+        for path, text in items:
+            try:
+                metadata, body = parse_frontmatter(text)
+            except Exception as exc:
+                logger.warning("skipping unreadable memory {}: {}", path, exc)
+                continue
+            yield {
+                "primitive": primitive.value,
+                "id": str(metadata.get("id") or path.stem),
+                "title": str(metadata.get("title") or path.stem),
+                "path": path.relative_to(memory_dir).as_posix(),
+                "metadata": metadata,
+                "body": body,
+            }
+
+
+def _write_parquet(records: Iterator[dict[str, Any]], target: Path, batch_size: int) -> int:
+    """Write records to Parquet one row group per batch."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(name, pa.string()) for name in RECORD_FIELDS])
+    count = 0
+    batch: list[dict[str, Any]] = []
+    with pq.ParquetWriter(str(target), schema) as writer:
+
+        def _flush() -> None:
+            columns = {name: [row[name] for row in batch] for name in RECORD_FIELDS}
+            writer.write_table(pa.table(columns, schema=schema))
+            batch.clear()
+
+        for record in records:
+            batch.append({**record, "metadata": json.dumps(record["metadata"], default=_json_default)})
+            count += 1
+            if len(batch) >= batch_size:
+                _flush()
+        if batch or not count:
+            _flush()
+    return count
+
+
+def export_memories(
+    memory_dir: Path,
+    fmt: str,
+    target: Path | TextIO,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """Stream every memory under ``memory_dir`` to ``target`` in ``fmt`` and return the count."""
+    records = iter_memory_records(memory_dir)
+    if fmt == "parquet":
+        if not isinstance(target, Path):
+            raise ValueError("parquet_export_requires_output_path")
+        return _write_parquet(records, target, max(1, batch_size))
+    if isinstance(target, Path):
+        with target.open("w", encoding="utf-8") as handle:
+            return export_memories(memory_dir, fmt, handle, batch_size=batch_size)
+    count = 0
+    if fmt == "markdown":
+        target.write("# Acreta Memory Export\n\n")
+    elif fmt == "json":
+        target.write("[")
+    for record in records:
+        if fmt == "jsonl":
+            target.write(json.dumps(record, ensure_ascii=True, default=_json_default) + "\n")
+        elif fmt == "json":
+            item = {**record["metadata"], "_body": record["body"], "_path": str(memory_dir / record["path"])}
+            rendered = json.dumps(item, indent=2, ensure_ascii=True, default=_json_default)
+            target.write(("," if count else "") + "\n  " + rendered.replace("\n", "\n  "))
+        else:
+            confidence = record["metadata"].get("confidence", "?")
+            target.write(
+                f"## {record['title']} ({record['id']})\n- confidence: {confidence}\n{record['body'].strip()}\n\n"
+            )
+        count += 1
+    if fmt == "json":
+        target.write("\n]\n" if count else "]\n")
+    return count
+
+
+def iter_import_rows(source: Path, fmt: str | None = None, *, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[dict[str, Any]]:
+    """Stream records from a JSONL or Parquet export without loading the whole file."""
+    fmt = fmt or ("parquet" if source.suffix.lower() in {".parquet", ".pq"} else "jsonl")
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(str(source)).iter_batches(batch_size=max(1, batch_size)):
+            yield from batch.to_pylist()
+        return
+    with source.open("r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("skipping invalid JSONL line {} in {}", line_number, source)
+                yield {}
+                continue
+            yield row if isinstance(row, dict) else {}
+
+
+@dataclass
+class ImportResult:
+    """Counts and written paths from one bulk import."""
+
+    imported: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    batches: int = 0
+    paths: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return counts (without the path list) as a JSON-serializable dict."""
+        payload = asdict(self)
+        payload.pop("paths")
+        return payload
+
+
+def _compact_stamp(metadata: dict[str, Any]) -> tuple[str, str]:
+    """Return ``(YYYYMMDD, HHMMSS)`` from a record's date/time or created fields."""
+    created = str(metadata.get("created") or "")
+    date_compact = re.sub(r"[^0-9]", "", str(metadata.get("date") or created[:10]))[:8]
+    time_compact = re.sub(r"[^0-9]", "", str(metadata.get("time") or created[11:19]))[:6]
+    if len(date_compact) != 8 or len(time_compact) != 6:
+        now = datetime.now(timezone.utc)
+        return now.strftime("%Y%m%d"), now.strftime("%H%M%S")
+    return date_compact, time_compact
+
+
+def _unique_path(path: Path) -> Path:
+    """Return ``path`` or the first ``-N`` suffixed sibling that does not exist."""
+    candidate, index = path, 2
+    while candidate.exists():
+        candidate = path.with_name(f"{path.stem}-{index}{path.suffix}")
+        index += 1
+    return candidate
+
+
+def _fsync_paths(paths: set[Path]) -> None:
+    """Flush written files and their directories to disk."""
+    for path in sorted(paths):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _existing_ids(memory_dir: Path, primitive: MemoryType) -> set[str]:
+    """Return ids already stored for one primitive."""
+    if primitive == MemoryType.summary:
+        ids: set[str] = set()
+        for path, text in iter_summaries(memory_dir / memory_folder(primitive)):
+            try:
+                ids.add(str(parse_frontmatter(text)[0].get("id") or path.stem))
+            except Exception:
+                continue
+        return ids
+    return {row["id"] for row in read_memory_digest(memory_dir) if row.get("primitive") == primitive.value}
+
+
+def import_memories(
+    memory_dir: Path,
+    source: Path,
+    *,
+    fmt: str | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    summary_layout: str | None = None,
+    run_id: str = "import",
+) -> ImportResult:
+    """Bulk-load exported records into ``memory_dir``, skipping ids that already exist."""
+    if summary_layout is None:
+        from acreta.config.settings import get_config
+
+        summary_layout = get_config().memory_summary_layout
+    batch_size = max(1, batch_size)
+    result = ImportResult()
+    journal = journal_for_memory_root(memory_dir)
+    known: dict[MemoryType, set[str]] = {}
+    pending_sync: set[Path] = set()
+    pending_events: list[dict[str, str]] = []
+
+    def _flush() -> None:
+        if not pending_events:
+            return
+        _fsync_paths(pending_sync)
+        journal.record_many(pending_events)
+        result.batches += 1
+        pending_sync.clear()
+        pending_events.clear()
+
+    with memory_root_lock(memory_dir):
+        for row in iter_import_rows(source, fmt, batch_size=batch_size):
+            try:
+                primitive = MemoryType(str(row.get("primitive") or ""))
+            except ValueError:
+                result.invalid += 1
+                continue
+            metadata = row.get("metadata") or {}
+            if isinstance(metadata, str):
+                try:
+                    metadata = json.loads(metadata)
+                except json.JSONDecodeError:
+                    metadata = None
+            if not isinstance(metadata, dict):
+                result.invalid += 1
+                continue
+            title = str(metadata.get("title") or row.get("title") or "").strip()
+            if not title:
+                result.invalid += 1
+                continue
+            memory_id = str(metadata.get("id") or row.get("id") or slugify(title))
+            if primitive not in known:
+                known[primitive] = _existing_ids(memory_dir, primitive)
+            if memory_id in known[primitive]:
+                result.duplicates += 1
+                continue
+            metadata = {**metadata, "id": memory_id, "title": title}
+            text = dump_frontmatter(metadata, str(row.get("body") or "")) + "\n"
+            if primitive == MemoryType.summary:
+                date_compact, time_compact = _compact_stamp(metadata)
+                path = write_summary(
+                    memory_dir / memory_folder(primitive),
+                    summary_layout,
+                    date_compact,
+                    time_compact,
+                    slugify(title),
+                    text,
+                    fsync=False,
+                )
+                synced = path if path.exists() else pack_file_for(path)
+            else:
+                date_compact, _ = _compact_stamp(metadata)
+                folder = memory_dir / memory_folder(primitive)
+                path = _unique_path(folder / canonical_memory_filename(title=title, run_id=f"{run_id}-{date_compact}"))
+                atomic_write_text(path, text, fsync=False)
+                synced = path
+            if synced is not None:
+                pending_sync.update((synced, synced.parent))
+            known[primitive].add(memory_id)
+            pending_events.append(
+                {"op": "add", "path": str(path), "memory_id": memory_id, "content_hash": content_hash(text), "run_id": run_id}
+            )
+            result.imported += 1
+            result.paths.append(str(path))
+            if len(pending_events) >= batch_size:
+                _flush()
+        _flush()
+    return result
+
+
+if __name__ == "__main__":
+    """Run a real-path self-test for JSONL and Parquet round trips with dedupe."""
+    from tempfile import TemporaryDirectory
+
+    with TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        source = root / "src" / "memory"
+        (source / "learnings").mkdir(parents=True)
+        (source / "learnings" / "20260101-retry.md").write_text(
+            "---\nid: retry\ntitle: Retry budget\ncreated: '2026-01-01T00:00:00Z'\n---\nCap retries.\n",
+            encoding="utf-8",
+        )
+        for fmt in ("jsonl", "parquet"):
+            export_path = root / f"export.{fmt}"
+            assert export_memories(source, fmt, export_path) == 1
+            target = root / fmt / "memory"
+            first = import_memories(target, export_path, summary_layout="tree")
+            again = import_memories(target, export_path, summary_layout="tree")
+            assert (first.imported, again.duplicates) == (1, 1)
+            assert Path(first.paths[0]).name == "20260101-retry-budget.md"
+            assert parse_frontmatter(Path(first.paths[0]).read_text(encoding="utf-8"))[1] == "Cap retries."
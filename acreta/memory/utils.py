@@ -2,68 +2,302 @@
 
 from __future__ import annotations
 
+import json
 import os
-from typing import Any
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore[assignment]
 
 import dspy
 from dotenv import load_dotenv
-from openrouter import OpenRouter
+from dspy.utils.callback import BaseCallback
 
 from acreta.config.logging import logger
+from acreta.config.settings import get_config
+from acreta.memory.frontmatter_codec import parse_frontmatter
+from acreta.memory.summary_store import read_summary_text, summary_exists
+
+
+DEFAULT_PROVIDER_CONCURRENCY = {"ollama": 2, "openrouter": 16}
+LM_SLOTS_DIRNAME = "lm_slots"
+SLOT_POLL_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class LMSettings:
+    """Resolved provider settings that identify one reusable DSPy LM client."""
+
+    provider: str
+    model: str
+    api_base: str
+    api_key: str
+    headers: tuple[tuple[str, str], ...] = ()
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        """Registry key: one client per provider, model, and API base."""
+        return (self.provider, self.model, self.api_base)
+
+
+class TokenBucket:
+    """Thread-safe token bucket that paces LM requests for one provider.
+
+    With a ``state_path`` the bucket lives in a flock-protected JSON file, so every
+    pipeline process draws from one shared budget instead of starting with its own
+    full bucket.
+    """
+
+    def __init__(
+        self, rate_per_minute: int, capacity: int | None = None, state_path: Path | None = None
+    ) -> None:
+        self.rate_per_second = max(0, rate_per_minute) / 60.0
+        self.capacity = float(capacity or max(1, rate_per_minute))
+        self.tokens = self.capacity
+        self.updated = time.time()
+        self.state_path = state_path if fcntl is not None else None
+        self._lock = threading.Lock()
+
+    def _take(self, tokens: float, updated: float) -> tuple[float, float, float]:
+        """Refill from ``updated`` to now and take one token; return new state and the wait (0 if taken)."""
+        now = time.time()
+        tokens = min(self.capacity, tokens + max(0.0, now - updated) * self.rate_per_second)
+        if tokens >= 1:
+            return tokens - 1, now, 0.0
+        return tokens, now, (1 - tokens) / self.rate_per_second
+
+    def _take_shared(self, state_path: Path) -> float:
+        """Take a token from the shared state file under ``flock``; return the wait (0 if taken)."""
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        with state_path.open("a+", encoding="utf-8") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                try:
+                    state = json.loads(handle.read() or "{}")
+                    tokens, updated = float(state["tokens"]), float(state["updated"])
+                except (ValueError, KeyError, TypeError):
+                    tokens, updated = self.capacity, time.time()
+                tokens, updated, wait = self._take(tokens, updated)
+                handle.seek(0)
+                handle.truncate()
+                handle.write(json.dumps({"tokens": tokens, "updated": updated}))
+                handle.flush()
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        return wait
+
+    def acquire(self) -> None:
+        """Block until one request token is available; no-op when unlimited."""
+        if self.rate_per_second <= 0:
+            return
+        while True:
+            with self._lock:
+                wait = None
+                if self.state_path is not None:
+                    try:
+                        wait = self._take_shared(self.state_path)
+                    except OSError as exc:
+                        logger.warning("lm rate state unavailable, pacing in-process only | error={}", str(exc))
+                        self.state_path = None
+                if wait is None:
+                    self.tokens, self.updated, wait = self._take(self.tokens, self.updated)
+                if wait <= 0:
+                    return
+            time.sleep(wait)
+
+
+class ProviderLimiter:
+    """Per-request concurrency slots and pacing for one LM provider.
+
+    Both limits are enforced across processes: pipelines run as ``python -m``
+    subprocesses, so each in-flight request also holds one of ``limit`` flock'ed
+    slot files under ``<index_dir>/lm_slots``, and the token bucket state is shared
+    through ``<provider>.bucket.json`` in the same folder.
+    """
+
+    def __init__(
+        self, provider: str, limit: int, rate_per_minute: int, slot_dir: Path | None
+    ) -> None:
+        self.provider = provider
+        self.limit = max(1, limit)
+        self.semaphore = threading.BoundedSemaphore(self.limit)
+        self.slot_dir = slot_dir if fcntl is not None else None
+        self.bucket = TokenBucket(
+            rate_per_minute,
+            state_path=self.slot_dir / f"{provider}.bucket.json" if self.slot_dir is not None else None,
+        )
+
+    def _lock_slot(self) -> Any:
+        """Block until one cross-process slot file is locked and return its handle."""
+        if self.slot_dir is None:
+            return None
+        try:
+            self.slot_dir.mkdir(parents=True, exist_ok=True)
+            while True:
+                for index in range(self.limit):
+                    handle = (self.slot_dir / f"{self.provider}.{index}.lock").open("a")
+                    try:
+                        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except OSError:
+                        handle.close()
+                        continue
+                    return handle
+                time.sleep(SLOT_POLL_SECONDS)
+        except OSError as exc:
+            logger.warning("lm slot unavailable, limiting in-process only | error={}", str(exc))
+            return None
+
+    def acquire(self) -> Any:
+        """Take a concurrency slot and a rate token for one LM request."""
+        self.semaphore.acquire()
+        try:
+            handle = self._lock_slot()
+            self.bucket.acquire()
+        except BaseException:
+            self.semaphore.release()
+            raise
+        return handle
+
+    def release(self, handle: Any) -> None:
+        """Return the slot taken by ``acquire``."""
+        try:
+            if handle is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+                handle.close()
+        finally:
+            self.semaphore.release()
+
+
+class _ProviderLimitCallback(BaseCallback):
+    """DSPy callback that holds a provider slot for the span of each LM request."""
+
+    def __init__(self, limiter: ProviderLimiter) -> None:
+        self.limiter = limiter
+        self._held: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def on_lm_start(self, call_id: str, instance: Any, inputs: dict[str, Any]) -> None:
+        """Wait for a slot and a rate token before the request starts."""
+        handle = self.limiter.acquire()
+        with self._lock:
+            self._held[call_id] = handle
 
+    def on_lm_end(
+        self, call_id: str, outputs: Any | None, exception: Exception | None = None
+    ) -> None:
+        """Release the slot once the request returned or raised."""
+        with self._lock:
+            if call_id not in self._held:
+                return
+            handle = self._held.pop(call_id)
+        self.limiter.release(handle)
 
-def configure_dspy_lm() -> dspy.LM:
-    """Configure DSPy LM from environment for either ollama or openrouter."""
+
+_LM_LOCK = threading.Lock()
+_LIMITS_LOCK = threading.Lock()
+_LM_REGISTRY: dict[tuple[str, str, str], dspy.LM] = {}
+_PROVIDER_LIMITERS: dict[str, ProviderLimiter] = {}
+
+
+def resolve_lm_settings() -> LMSettings:
+    """Resolve DSPy provider settings from environment for ollama or openrouter."""
     load_dotenv()
     provider = str(os.environ.get("ACRETA_DSPY_PROVIDER", "ollama") or "ollama").strip().lower()
-    logger.info(f"Configuring DSPy LM for provider: {provider}")
 
     if provider == "ollama":
-        ollama_api_base = os.environ.get("ACRETA_DSPY_OLLAMA_API_BASE", "http://127.0.0.1:11434")
-        ollama_model = os.environ.get("ACRETA_DSPY_OLLAMA_MODEL", "qwen3:8b")
-        logger.info(f"Configuring DSPy LM for ollama: {ollama_model}")
-
-        lm = dspy.LM(
-            f"ollama_chat/{ollama_model}",
-            api_base=ollama_api_base,
+        return LMSettings(
+            provider=provider,
+            model=f"ollama_chat/{os.environ.get('ACRETA_DSPY_OLLAMA_MODEL', 'qwen3:8b')}",
+            api_base=os.environ.get("ACRETA_DSPY_OLLAMA_API_BASE", "http://127.0.0.1:11434"),
             api_key="ollama",
-            cache=False,
         )
-        dspy.configure(lm=lm)
-        return lm
 
     if provider == "openrouter":
         api_key = str(os.environ.get("OPENROUTER_API_KEY") or "").strip()
         if not api_key:
             raise RuntimeError("OPENROUTER_API_KEY is required when ACRETA_DSPY_PROVIDER=openrouter")
+        headers: list[tuple[str, str]] = []
+        http_referer = str(os.environ.get("OPENROUTER_HTTP_REFERER") or "").strip()
+        x_title = str(os.environ.get("OPENROUTER_X_TITLE") or "").strip()
+        if http_referer:
+            headers.append(("HTTP-Referer", http_referer))
+        if x_title:
+            headers.append(("X-Title", x_title))
+        model = str(os.environ.get("ACRETA_DSPY_OPENROUTER_MODEL") or "openai/gpt-4o-mini").strip()
+        return LMSettings(
+            provider=provider,
+            model=f"openrouter/{model}",
+            api_base=str(os.environ.get("ACRETA_DSPY_OPENROUTER_API_BASE") or "https://openrouter.ai/api/v1").strip(),
+            api_key=api_key,
+            headers=tuple(headers),
+        )
 
-        http_referer = str(os.environ.get("OPENROUTER_HTTP_REFERER") or "").strip() or None
-        x_title = str(os.environ.get("OPENROUTER_X_TITLE") or "").strip() or None
-        OpenRouter(api_key=api_key, http_referer=http_referer, x_title=x_title)
+    raise RuntimeError(f"Unsupported ACRETA_DSPY_PROVIDER={provider!r}; use 'ollama' or 'openrouter'")
 
-        model = str(os.environ.get("ACRETA_DSPY_OPENROUTER_MODEL") or "openai/gpt-4o-mini").strip()
-        api_base = str(os.environ.get("ACRETA_DSPY_OPENROUTER_API_BASE") or "https://openrouter.ai/api/v1").strip()
-        logger.info(f"Configuring DSPy LM for openrouter: {model}")
 
-        headers: dict[str, str] = {}
-        if http_referer:
-            headers["HTTP-Referer"] = http_referer
-        if x_title:
-            headers["X-Title"] = x_title
+def _provider_limiter(provider: str) -> ProviderLimiter:
+    """Return the concurrency and rate limiter for one provider, creating it once."""
+    with _LIMITS_LOCK:
+        limiter = _PROVIDER_LIMITERS.get(provider)
+        if limiter is None:
+            limit = env_positive_int(
+                f"ACRETA_DSPY_{provider.upper()}_MAX_CONCURRENCY", DEFAULT_PROVIDER_CONCURRENCY.get(provider, 4)
+            )
+            try:
+                rate = int(str(os.environ.get("ACRETA_DSPY_RATE_PER_MINUTE", "0")).strip())
+            except ValueError:
+                rate = 0
+            slot_dir = get_config().index_dir / LM_SLOTS_DIRNAME
+            limiter = _PROVIDER_LIMITERS[provider] = ProviderLimiter(provider, limit, rate, slot_dir)
+        return limiter
 
+
+def get_dspy_lm(settings: LMSettings | None = None) -> dspy.LM:
+    """Return the process-wide DSPy LM for the resolved settings, creating it once."""
+    settings = settings or resolve_lm_settings()
+    with _LM_LOCK:
+        lm = _LM_REGISTRY.get(settings.key)
+        if lm is not None:
+            return lm
         lm_kwargs: dict[str, Any] = {
-            "api_key": api_key,
-            "api_base": api_base,
+            "api_key": settings.api_key,
+            "api_base": settings.api_base,
             "cache": False,
+            "callbacks": [_ProviderLimitCallback(_provider_limiter(settings.provider))],
         }
-        if headers:
-            lm_kwargs["extra_headers"] = headers
-
-        lm = dspy.LM(f"openrouter/{model}", **lm_kwargs)
-        dspy.configure(lm=lm)
+        if settings.headers:
+            lm_kwargs["extra_headers"] = dict(settings.headers)
+        logger.info(f"Creating DSPy LM for {settings.provider}: {settings.model}")
+        lm = _LM_REGISTRY[settings.key] = dspy.LM(settings.model, **lm_kwargs)
         return lm
 
-    raise RuntimeError(f"Unsupported ACRETA_DSPY_PROVIDER={provider!r}; use 'ollama' or 'openrouter'")
+
+@contextmanager
+def dspy_lm_session() -> Iterator[dspy.LM]:
+    """Run a DSPy block on the registry LM for the resolved settings.
+
+    Uses ``dspy.context`` instead of global ``dspy.configure`` so concurrent
+    pipeline threads never race on process-wide DSPy settings. Provider limits
+    apply per LM request through the LM callback, not to the whole block.
+    """
+    lm = get_dspy_lm(resolve_lm_settings())
+    with dspy.context(lm=lm):
+        yield lm
+
+
+def reset_lm_registry() -> None:
+    """Drop cached LM clients and limiters so new env settings take effect."""
+    with _LM_LOCK, _LIMITS_LOCK:
+        _LM_REGISTRY.clear()
+        _PROVIDER_LIMITERS.clear()
 
 
 def env_positive_int(name: str, default: int) -> int:
@@ -76,8 +310,34 @@ def env_positive_int(name: str, default: int) -> int:
     return max(1, parsed)
 
 
+def read_trace_text(session_file_path: Path, start_offset: int = 0) -> str:
+    """Read trace text, skipping bytes already covered by an extraction watermark."""
+    if start_offset <= 0:
+        return session_file_path.read_text(encoding="utf-8")
+    with session_file_path.open("rb") as handle:
+        handle.seek(start_offset)
+        return handle.read().decode("utf-8", errors="replace")
+
+
+def read_previous_summary(summary_path: Path | None) -> str:
+    """Return the body of an earlier session summary, or empty text when missing."""
+    if summary_path is None or not summary_exists(summary_path):
+        return ""
+    return parse_frontmatter(read_summary_text(summary_path))[1].strip()
+
+
 if __name__ == "__main__":
     """Run direct smoke checks for helper behaviors without mocking."""
     os.environ["ACRETA_UTILS_SMOKE_INT"] = "7"
     assert env_positive_int("ACRETA_UTILS_SMOKE_INT", 3) == 7
     assert env_positive_int("ACRETA_UTILS_MISSING_INT", 3) == 3
+    os.environ["ACRETA_DSPY_PROVIDER"] = "ollama"
+    assert get_dspy_lm() is get_dspy_lm()
+
+    from tempfile import TemporaryDirectory
+
+    with TemporaryDirectory() as tmp_dir:
+        trace = Path(tmp_dir) / "trace.jsonl"
+        trace.write_text('{"a":1}\n{"b":2}\n', encoding="utf-8")
+        assert read_trace_text(trace, 8) == '{"b":2}\n'
+        assert read_previous_summary(Path(tmp_dir) / "missing.md") == ""
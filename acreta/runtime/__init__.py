@@ -7,10 +7,14 @@ from acreta.runtime.providers import (
     get_provider_config,
     resolve_model,
 )
-from acreta.runtime.agent import AcretaAgent
+from acreta.runtime.agent import AcretaAgent, SyncJob, SyncJobResult
+from acreta.runtime.streaming import ChatEvent
 
 __all__ = [
     "AcretaAgent",
+    "ChatEvent",
+    "SyncJob",
+    "SyncJobResult",
     "ProviderConfig",
     "get_provider_config",
     "resolve_model",
@@ -5,14 +5,21 @@ from __future__ import annotations
 import asyncio
 import json
 import secrets
+import time
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
-
-import frontmatter
+from typing import Any, AsyncIterator, Iterator
 
 from acreta.config.settings import get_config
+from acreta.memory.access_stats import compute_priors
+from acreta.memory.clustering import write_cluster_report
+from acreta.memory.digest import refresh_memory_digest
+from acreta.memory.frontmatter_codec import dump_frontmatter, parse_frontmatter
+from acreta.memory.journal import content_hash, record_memory_change
+from acreta.memory.summary_store import summary_exists
+from acreta.memory.transaction import MemoryTransaction
 from acreta.runtime.prompts import (
     build_maintain_prompt,
     build_sync_prompt,
@@ -25,6 +32,10 @@ from acreta.runtime.providers import (
     get_provider_config,
     resolve_model,
 )
+from acreta.runtime.sdk_pool import SDKClientPool, get_sdk_pool, pool_key
+from acreta.runtime.streaming import ChatEvent, ChatStreamState, iterate_async
+from acreta.runtime.tracing import TRACE_FILENAME, RunTracer, active_tracer, use_tracer
+from acreta.runtime.workspace_retention import compact_workspace
 
 READ_ONLY_TOOLS = ["Read", "Grep", "Glob", "Task"]
 MEMORY_WRITE_TOOLS = [
@@ -39,6 +50,32 @@ MEMORY_WRITE_TOOLS = [
 ]
 
 
+DEFAULT_BATCH_CONCURRENCY = 4
+
+
+@dataclass(frozen=True)
+class SyncJob:
+    """One trace to run through the memory-write flow in a batch."""
+
+    trace_path: str | Path
+    memory_root: str | Path | None = None
+    workspace_root: str | Path | None = None
+    metrics: dict[str, Any] | None = None
+    start_offset: int = 0
+    previous_summary_path: str | Path | None = None
+
+
+@dataclass
+class SyncJobResult:
+    """Outcome of one batch sync job: ok, error, timeout, or cancelled."""
+
+    trace_path: str
+    status: str
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    duration_ms: int = 0
+
+
 def _default_run_folder_name(prefix: str = "sync") -> str:
     """Build deterministic per-run workspace folder name with given prefix."""
     stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
@@ -55,15 +92,34 @@ def _run_coroutine_sync(coro: Any) -> Any:
         return executor.submit(asyncio.run, coro).result()
 
 
+async def _begin_transaction(memory_root: Path, run_id: str) -> MemoryTransaction:
+    """Open the run's transaction off-loop; a begin that lands after cancellation is rolled back."""
+    beginning = asyncio.ensure_future(
+        asyncio.to_thread(MemoryTransaction.begin, memory_root, run_id)
+    )
+    try:
+        return await asyncio.shield(beginning)
+    except asyncio.CancelledError:
+
+        def _rollback_late(future: asyncio.Future) -> None:
+            if not future.cancelled() and future.exception() is None:
+                future.result().rollback()
+
+        beginning.add_done_callback(_rollback_late)
+        raise
+
+
 def _build_artifact_paths(run_folder: Path) -> dict[str, Path]:
     """Return canonical workspace artifact paths for one sync run folder."""
     return {
         "extract": run_folder / "extract.json",
+        "matches": run_folder / "matches.json",
         "summary": run_folder / "summary.json",
         "memory_actions": run_folder / "memory_actions.json",
         "agent_log": run_folder / "agent.log",
         "subagents_log": run_folder / "subagents.log",
         "session_log": run_folder / "session.log",
+        "trace": run_folder / TRACE_FILENAME,
     }
 
 
@@ -102,6 +158,12 @@ class AcretaAgent:
             else config.agent_timeout
         )
         self._persist_sessions_in_workspace = bool(config.persist_sessions_in_workspace)
+        self._workspace_retention = (
+            (config.workspace_keep_runs, config.workspace_keep_days)
+            if config.workspace_retention_enabled
+            else None
+        )
+        self._prior_half_life_days = config.memory_prior_half_life_days
 
     @staticmethod
     def generate_session_id() -> str:
@@ -126,6 +188,13 @@ class AcretaAgent:
                 deduped.append(value)
         return deduped
 
+    def _resolve_memory_root(self, memory_root: str | Path | None) -> Path:
+        """Return the absolute memory root, defaulting to the repo's ``.acreta/memory``."""
+        if memory_root:
+            return Path(memory_root).expanduser().resolve()
+        repo_root = Path(self._default_cwd or Path.cwd()).expanduser().resolve()
+        return repo_root / ".acreta" / "memory"
+
     def _runtime_env(self, runtime_cwd: Path) -> dict[str, str]:
         """Build SDK process env additions for this runtime invocation."""
         if not self._persist_sessions_in_workspace:
@@ -141,8 +210,13 @@ class AcretaAgent:
         allowed_roots: tuple[Path, ...],
         memory_root: Path | None = None,
         metadata: dict[str, str] | None = None,
+        transaction: MemoryTransaction | None = None,
     ) -> dict[str, list[Any]]:
-        """Build PreToolUse hook config: boundary guard + memory file normalizer."""
+        """Build PreToolUse hook config: boundary guard + memory file normalizer.
+
+        With a ``transaction``, memory writes are tracked in its undo log and journaled
+        on commit instead of immediately.
+        """
         from claude_agent_sdk import HookMatcher
 
         from acreta.memory.memory_record import (
@@ -192,18 +266,21 @@ class AcretaAgent:
             # boundary check only (file was validated on original Write)
             is_edit = "old_string" in tool_input or "new_string" in tool_input
             if is_edit:
+                if transaction is not None:
+                    transaction.track(
+                        resolved, event={"op": "update", "path": str(resolved), "run_id": run_id}
+                    )
+                else:
+                    record_memory_change(memory_root or resolved.parent, "update", resolved, run_id=run_id)
                 return tool_input
 
             content = str(tool_input.get("content", ""))
-            # Parse frontmatter via python-frontmatter
             try:
-                post = frontmatter.loads(content)
+                fm, body = parse_frontmatter(content)
             except Exception:
                 return {"__deny": "memory_write_unparseable_frontmatter"}
-            fm = post.metadata
             if not isinstance(fm, dict) or not fm:
                 return {"__deny": "memory_write_missing_frontmatter"}
-            body = post.content
 
             # Ensure required fields
             title = str(fm.get("title", "")).strip() or resolved.stem
@@ -223,13 +300,33 @@ class AcretaAgent:
             fm = {k: fm[k] for k in allowed_keys if k in fm}
 
             # Rebuild content with normalized frontmatter
-            normalized_post = frontmatter.Post(body, **fm)
-            normalized_content = frontmatter.dumps(normalized_post) + "\n"
+            normalized_content = dump_frontmatter(fm, body) + "\n"
 
             # Normalize filename
             canonical_name = canonical_memory_filename(title=title, run_id=run_id)
             canonical_path = resolved.parent / canonical_name
 
+            op = "update" if canonical_path.exists() else "add"
+            if transaction is not None:
+                transaction.track(
+                    canonical_path,
+                    event={
+                        "op": op,
+                        "path": str(canonical_path),
+                        "memory_id": str(fm.get("id") or ""),
+                        "content_hash": content_hash(normalized_content),
+                        "run_id": run_id,
+                    },
+                )
+            else:
+                record_memory_change(
+                    memory_root or resolved.parent,
+                    op,
+                    canonical_path,
+                    memory_id=str(fm.get("id") or ""),
+                    content=normalized_content,
+                    run_id=run_id,
+                )
             updated = dict(tool_input)
             updated["file_path"] = str(canonical_path)
             updated["content"] = normalized_content
@@ -298,24 +395,17 @@ class AcretaAgent:
             "PreToolUse": [HookMatcher(matcher="Write|Edit", hooks=[_pretool_guard])]
         }
 
-    async def _run_sdk_once(
+    def _sdk_option_kwargs(
         self,
         *,
-        prompt: str,
-        session_id: str | None,
         cwd: str | None,
         allowed_tools: list[str],
         permission_mode: str,
         add_dirs: tuple[Path, ...] = (),
         env: dict[str, str] | None = None,
-        hooks: dict[str, list[Any]] | None = None,
         agents: dict[str, Any] | None = None,
-    ) -> tuple[str, str]:
-        """Execute one prompt via Claude Agent SDK and return response + session id."""
-        from claude_agent_sdk import ClaudeAgentOptions, query
-        from claude_agent_sdk.types import AssistantMessage, ResultMessage, TextBlock
-
-        apply_provider_env(self.provider_config)
+    ) -> dict[str, Any]:
+        """Build ClaudeAgentOptions kwargs (without hooks) for one SDK run."""
         runtime_cwd = (
             Path(cwd or self._default_cwd or str(Path.cwd())).expanduser().resolve()
         )
@@ -331,18 +421,19 @@ class AcretaAgent:
         }
         if env:
             option_kwargs["env"] = {str(key): str(value) for key, value in env.items()}
-        if hooks:
-            option_kwargs["hooks"] = hooks
         if agents:
             option_kwargs["agents"] = agents
         if "Skill" in allowed_tools:
             option_kwargs["setting_sources"] = ["user", "project"]
+        return option_kwargs
+
+    @staticmethod
+    def _collect_response(messages: Any, session_id: str) -> tuple[list[str], str]:
+        """Fold SDK messages into response text parts and the final session id."""
+        from claude_agent_sdk.types import AssistantMessage, ResultMessage, TextBlock
 
         parts: list[str] = []
-        resolved_session_id = session_id or self.generate_session_id()
-        async for message in query(
-            prompt=prompt, options=ClaudeAgentOptions(**option_kwargs)
-        ):
+        for message in messages:
             if isinstance(message, AssistantMessage):
                 parts.extend(
                     block.text
@@ -351,13 +442,55 @@ class AcretaAgent:
                 )
             elif isinstance(message, ResultMessage):
                 if message.session_id:
-                    resolved_session_id = message.session_id
+                    session_id = message.session_id
                 if message.result and not parts:
                     parts.append(message.result)
+        return parts, session_id
+
+    async def _run_sdk_once(
+        self,
+        *,
+        prompt: str,
+        session_id: str | None,
+        cwd: str | None,
+        allowed_tools: list[str],
+        permission_mode: str,
+        add_dirs: tuple[Path, ...] = (),
+        env: dict[str, str] | None = None,
+        hooks: dict[str, list[Any]] | None = None,
+        agents: dict[str, Any] | None = None,
+    ) -> tuple[str, str]:
+        """Execute one prompt via Claude Agent SDK and return response + session id."""
+        from claude_agent_sdk import ClaudeAgentOptions, query
+
+        apply_provider_env(self.provider_config)
+        option_kwargs = self._sdk_option_kwargs(
+            cwd=cwd,
+            allowed_tools=allowed_tools,
+            permission_mode=permission_mode,
+            add_dirs=add_dirs,
+            env=env,
+            agents=agents,
+        )
+        if hooks:
+            option_kwargs["hooks"] = hooks
+
+        tracer = active_tracer()
+        messages = []
+        async for message in query(
+            prompt=prompt, options=ClaudeAgentOptions(**option_kwargs)
+        ):
+            if tracer is not None:
+                tracer.record_message(message)
+            messages.append(message)
+        parts, resolved_session_id = self._collect_response(
+            messages, session_id or self.generate_session_id()
+        )
         return ("".join(parts).strip() or "(no response)"), resolved_session_id
 
-    def _run_sdk_sync(
+    async def _run_sdk_pooled(
         self,
+        pool: SDKClientPool,
         *,
         prompt: str,
         session_id: str | None,
@@ -369,35 +502,100 @@ class AcretaAgent:
         hooks: dict[str, list[Any]] | None = None,
         agents: dict[str, Any] | None = None,
     ) -> tuple[str, str]:
-        """Synchronous wrapper around one SDK run with timeout."""
-        return _run_coroutine_sync(
-            asyncio.wait_for(
-                self._run_sdk_once(
-                    prompt=prompt,
-                    session_id=session_id,
-                    cwd=cwd,
-                    allowed_tools=allowed_tools,
-                    permission_mode=permission_mode,
-                    add_dirs=add_dirs,
-                    env=env,
-                    hooks=hooks,
-                    agents=agents,
-                ),
-                timeout=self._timeout_seconds,
+        """Run one prompt on a warm pooled SDK client; cancellation interrupts the client."""
+        option_kwargs = self._sdk_option_kwargs(
+            cwd=cwd,
+            allowed_tools=allowed_tools,
+            permission_mode=permission_mode,
+            add_dirs=add_dirs,
+            env=env,
+            agents=agents,
+        )
+
+        def _options_factory(pooled_hooks: dict[str, list[Any]] | None) -> Any:
+            """Apply provider env once per client connect and build its options."""
+            from claude_agent_sdk import ClaudeAgentOptions
+
+            apply_provider_env(self.provider_config)
+            kwargs = dict(option_kwargs)
+            if pooled_hooks:
+                kwargs["hooks"] = pooled_hooks
+            return ClaudeAgentOptions(**kwargs)
+
+        resolved_session_id = session_id or self.generate_session_id()
+        tracer = active_tracer()
+        messages = await pool.run_async(
+            key=pool_key(option_kwargs, hooks),
+            options_factory=_options_factory,
+            prompt=prompt,
+            session_id=resolved_session_id,
+            hooks=hooks,
+            timeout=self._timeout_seconds,
+            on_message=tracer.record_message if tracer is not None else None,
+        )
+        parts, resolved_session_id = self._collect_response(
+            messages, resolved_session_id
+        )
+        return ("".join(parts).strip() or "(no response)"), resolved_session_id
+
+    async def _run_sdk_async(
+        self,
+        *,
+        prompt: str,
+        session_id: str | None,
+        cwd: str | None,
+        allowed_tools: list[str],
+        permission_mode: str,
+        add_dirs: tuple[Path, ...] = (),
+        env: dict[str, str] | None = None,
+        hooks: dict[str, list[Any]] | None = None,
+        agents: dict[str, Any] | None = None,
+    ) -> tuple[str, str]:
+        """Run one SDK prompt with timeout on the caller's event loop.
+
+        Uses a warm pooled client (served on the pool's loop thread) when
+        ``[agent] pool_enabled`` is set.
+        """
+        pool = get_sdk_pool()
+        if pool is not None:
+            return await self._run_sdk_pooled(
+                pool,
+                prompt=prompt,
+                session_id=session_id,
+                cwd=cwd,
+                allowed_tools=allowed_tools,
+                permission_mode=permission_mode,
+                add_dirs=add_dirs,
+                env=env,
+                hooks=hooks,
+                agents=agents,
             )
+        return await asyncio.wait_for(
+            self._run_sdk_once(
+                prompt=prompt,
+                session_id=session_id,
+                cwd=cwd,
+                allowed_tools=allowed_tools,
+                permission_mode=permission_mode,
+                add_dirs=add_dirs,
+                env=env,
+                hooks=hooks,
+                agents=agents,
+            ),
+            timeout=self._timeout_seconds,
         )
 
-    def chat(
+    async def asyncio_chat(
         self,
         prompt: str,
         session_id: str | None = None,
         cwd: str | None = None,
     ) -> tuple[str, str]:
-        """Run one chat/read prompt in synchronous mode."""
+        """Run one chat/read prompt and return response + session id."""
         runtime_cwd = (
             Path(cwd or self._default_cwd or str(Path.cwd())).expanduser().resolve()
         )
-        return self._run_sdk_sync(
+        return await self._run_sdk_async(
             prompt=prompt,
             session_id=session_id,
             cwd=str(runtime_cwd),
@@ -406,11 +604,222 @@ class AcretaAgent:
             env=self._runtime_env(runtime_cwd),
         )
 
+    def chat(
+        self,
+        prompt: str,
+        session_id: str | None = None,
+        cwd: str | None = None,
+    ) -> tuple[str, str]:
+        """Run one chat/read prompt in synchronous mode."""
+        return _run_coroutine_sync(
+            self.asyncio_chat(prompt, session_id=session_id, cwd=cwd)
+        )
+
+    async def _stream_sdk_once(
+        self,
+        *,
+        prompt: str,
+        cwd: str | None,
+        allowed_tools: list[str],
+        permission_mode: str,
+        env: dict[str, str] | None = None,
+    ) -> AsyncIterator[Any]:
+        """Yield raw SDK messages, including partial text deltas, for one prompt."""
+        from claude_agent_sdk import ClaudeAgentOptions, query
+
+        apply_provider_env(self.provider_config)
+        option_kwargs = self._sdk_option_kwargs(
+            cwd=cwd,
+            allowed_tools=allowed_tools,
+            permission_mode=permission_mode,
+            env=env,
+        )
+        option_kwargs["include_partial_messages"] = True
+        async for message in query(
+            prompt=prompt, options=ClaudeAgentOptions(**option_kwargs)
+        ):
+            yield message
+
+    async def asyncio_chat_stream(
+        self,
+        prompt: str,
+        session_id: str | None = None,
+        cwd: str | None = None,
+    ) -> AsyncIterator[ChatEvent]:
+        """Stream one chat/read prompt as text and tool events, ending with ``done``.
+
+        The SDK stream is consumed by one producer task bounded by the agent
+        timeout; streaming always uses a fresh SDK process, not the client pool.
+        """
+        runtime_cwd = (
+            Path(cwd or self._default_cwd or str(Path.cwd())).expanduser().resolve()
+        )
+        state = ChatStreamState(session_id or self.generate_session_id())
+        inbox: asyncio.Queue[Any] = asyncio.Queue()
+        end = object()
+
+        async def _produce() -> None:
+            try:
+                async for message in self._stream_sdk_once(
+                    prompt=prompt,
+                    cwd=str(runtime_cwd),
+                    allowed_tools=self.single_tools,
+                    permission_mode="acceptEdits",
+                    env=self._runtime_env(runtime_cwd),
+                ):
+                    inbox.put_nowait(message)
+            finally:
+                inbox.put_nowait(end)
+
+        producer = asyncio.ensure_future(
+            asyncio.wait_for(_produce(), timeout=self._timeout_seconds)
+        )
+        try:
+            while True:
+                message = await inbox.get()
+                if message is end:
+                    break
+                for event in state.feed(message):
+                    yield event
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
+        yield state.done()
+
+    def chat_stream(
+        self,
+        prompt: str,
+        session_id: str | None = None,
+        cwd: str | None = None,
+    ) -> Iterator[ChatEvent]:
+        """Stream one chat/read prompt as a blocking iterator of chat events."""
+        return iterate_async(
+            lambda: self.asyncio_chat_stream(prompt, session_id=session_id, cwd=cwd)
+        )
+
     def sync(
         self,
         trace_path: str | Path,
         memory_root: str | Path | None = None,
         workspace_root: str | Path | None = None,
+        *,
+        metrics: dict[str, Any] | None = None,
+        start_offset: int = 0,
+        previous_summary_path: str | Path | None = None,
+    ) -> dict[str, Any]:
+        """Run lead memory-write flow in synchronous mode."""
+        return _run_coroutine_sync(
+            self.asyncio_sync(
+                trace_path,
+                memory_root,
+                workspace_root,
+                metrics=metrics,
+                start_offset=start_offset,
+                previous_summary_path=previous_summary_path,
+            )
+        )
+
+    def sync_batch(
+        self,
+        jobs: list[SyncJob],
+        *,
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        job_timeout: float | None = None,
+    ) -> list[SyncJobResult]:
+        """Run many sync jobs under one event loop in synchronous mode."""
+        return _run_coroutine_sync(
+            self.asyncio_sync_batch(
+                jobs, concurrency=concurrency, job_timeout=job_timeout
+            )
+        )
+
+    def maintain(
+        self,
+        memory_root: str | Path | None = None,
+        workspace_root: str | Path | None = None,
+    ) -> dict[str, Any]:
+        """Run lead memory-maintenance flow in synchronous mode."""
+        return _run_coroutine_sync(self.asyncio_maintain(memory_root, workspace_root))
+
+    async def asyncio_sync_batch(
+        self,
+        jobs: list[SyncJob],
+        *,
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        job_timeout: float | None = None,
+    ) -> list[SyncJobResult]:
+        """Run sync jobs concurrently and return one structured result per job.
+
+        At most ``concurrency`` jobs run at once; ``job_timeout`` bounds each whole
+        job. Jobs that share a memory root run one after another, since each holds
+        the root's transaction lease for its whole run. Failures are captured per
+        job; cancelling the batch cancels every in-flight job and marks the rest
+        ``cancelled``.
+        """
+        limiter = asyncio.Semaphore(max(1, int(concurrency)))
+        root_locks: dict[Path, asyncio.Lock] = {}
+
+        async def _one(job: SyncJob) -> SyncJobResult:
+            root_lock = root_locks.setdefault(
+                self._resolve_memory_root(job.memory_root), asyncio.Lock()
+            )
+            async with root_lock, limiter:
+                started = time.monotonic()
+                status, result, error = "ok", None, None
+                try:
+                    result = await asyncio.wait_for(
+                        self.asyncio_sync(
+                            job.trace_path,
+                            job.memory_root,
+                            job.workspace_root,
+                            metrics=job.metrics,
+                            start_offset=job.start_offset,
+                            previous_summary_path=job.previous_summary_path,
+                        ),
+                        timeout=job_timeout,
+                    )
+                except asyncio.TimeoutError:
+                    status, error = "timeout", "timeout"
+                except Exception as exc:
+                    status, error = "error", f"{type(exc).__name__}: {exc}"
+                return SyncJobResult(
+                    trace_path=str(job.trace_path),
+                    status=status,
+                    result=result,
+                    error=error,
+                    duration_ms=int((time.monotonic() - started) * 1000),
+                )
+
+        tasks = [asyncio.ensure_future(_one(job)) for job in jobs]
+        try:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return [
+            task.result()
+            if not task.cancelled() and task.exception() is None
+            else SyncJobResult(
+                trace_path=str(job.trace_path),
+                status="cancelled",
+                error="batch_cancelled",
+            )
+            for job, task in zip(jobs, tasks)
+        ]
+
+    async def asyncio_sync(
+        self,
+        trace_path: str | Path,
+        memory_root: str | Path | None = None,
+        workspace_root: str | Path | None = None,
+        *,
+        metrics: dict[str, Any] | None = None,
+        start_offset: int = 0,
+        previous_summary_path: str | Path | None = None,
     ) -> dict[str, Any]:
         """Run lead memory-write flow using trace-path input and SDK orchestration."""
         trace_file = Path(trace_path).expanduser().resolve()
@@ -418,11 +827,7 @@ class AcretaAgent:
             raise FileNotFoundError(f"trace_path_missing:{trace_file}")
 
         repo_root = Path(self._default_cwd or Path.cwd()).expanduser().resolve()
-        resolved_memory_root = (
-            Path(memory_root).expanduser().resolve()
-            if memory_root
-            else (repo_root / ".acreta" / "memory")
-        )
+        resolved_memory_root = self._resolve_memory_root(memory_root)
         resolved_workspace_root = (
             Path(workspace_root).expanduser().resolve()
             if workspace_root
@@ -431,6 +836,7 @@ class AcretaAgent:
         run_folder = resolved_workspace_root / _default_run_folder_name("sync")
         run_folder.mkdir(parents=True, exist_ok=True)
         artifact_paths = _build_artifact_paths(run_folder)
+        tracer = RunTracer(artifact_paths["trace"])
         metadata = {
             "run_id": run_folder.name,
             "trace_path": str(trace_file),
@@ -449,107 +855,130 @@ class AcretaAgent:
             run_folder=run_folder,
             artifact_paths=artifact_paths,
             metadata=metadata,
-        )
-        hooks = self._build_pretool_hooks(
-            (resolved_memory_root, run_folder),
-            memory_root=resolved_memory_root,
-            metadata=metadata,
-        )
-        tools = list(MEMORY_WRITE_TOOLS)
-        if self.skills and "Skill" not in tools:
-            tools.append("Skill")
-        from claude_agent_sdk import AgentDefinition
-
-        agents = {
-            "explore-reader": AgentDefinition(
-                description="Read-only memory explorer for candidate matching evidence.",
-                prompt="Return JSONL-style evidence with fields: candidate_id, action_hint, matched_file, evidence.",
-                tools=["Read", "Grep", "Glob"],
-                model="inherit",
-            )
-        }
-        response, _ = self._run_sdk_sync(
-            prompt=prompt,
-            session_id=self.generate_session_id(),
-            cwd=str(repo_root),
-            allowed_tools=tools,
-            permission_mode="acceptEdits",
-            add_dirs=(
-                resolved_memory_root,
-                resolved_workspace_root,
-                run_folder,
-                trace_file.parent,
+            metrics=metrics,
+            start_offset=max(0, int(start_offset)),
+            previous_summary_path=(
+                Path(previous_summary_path) if previous_summary_path else None
             ),
-            env=self._runtime_env(repo_root),
-            hooks=hooks,
-            agents=agents,
+            digest_path=await asyncio.to_thread(refresh_memory_digest, resolved_memory_root),
         )
-        artifact_paths["agent_log"].write_text(
-            (response if response.endswith("\n") else f"{response}\n"), encoding="utf-8"
-        )
-
-        for key in ("extract", "summary", "memory_actions", "subagents_log"):
-            if not artifact_paths[key].exists():
-                raise RuntimeError(f"missing_artifact:{artifact_paths[key]}")
-
-        # Read summary_path directly from pipeline output (not agent report)
+        # One transaction per run: a crash, timeout, or failed validation undoes
+        # every memory and summary write the run made.
+        transaction = await _begin_transaction(resolved_memory_root, run_folder.name)
         try:
-            summary_artifact = json.loads(
-                artifact_paths["summary"].read_text(encoding="utf-8")
-            )
-        except json.JSONDecodeError as exc:
-            raise RuntimeError(
-                f"invalid_json_artifact:{artifact_paths['summary']}"
-            ) from exc
-        raw_summary = str(
-            (summary_artifact if isinstance(summary_artifact, dict) else {}).get(
-                "summary_path", ""
+            hooks = self._build_pretool_hooks(
+                (resolved_memory_root, run_folder),
+                memory_root=resolved_memory_root,
+                metadata=metadata,
+                transaction=transaction,
             )
-        ).strip()
-        if not raw_summary:
-            raise RuntimeError("missing_summary_path_in_pipeline_output")
-        summary_path_resolved = Path(raw_summary).resolve()
-        if not self._is_within(summary_path_resolved, resolved_memory_root):
-            raise RuntimeError(
-                f"summary_path_outside_memory_root:{summary_path_resolved}"
-            )
-        if not summary_path_resolved.exists():
-            raise RuntimeError(f"summary_path_not_found:{summary_path_resolved}")
-        summary_path = str(summary_path_resolved)
+            tools = list(MEMORY_WRITE_TOOLS)
+            if self.skills and "Skill" not in tools:
+                tools.append("Skill")
+            from claude_agent_sdk import AgentDefinition
 
-        try:
-            report = json.loads(
-                artifact_paths["memory_actions"].read_text(encoding="utf-8")
-            )
-        except json.JSONDecodeError as exc:
-            raise RuntimeError(
-                f"invalid_json_artifact:{artifact_paths['memory_actions']}"
-            ) from exc
-        if not isinstance(report, dict):
-            raise RuntimeError(
-                f"invalid_report_shape:{artifact_paths['memory_actions']}"
+            agents = {
+                "explore-reader": AgentDefinition(
+                    description="Read-only memory explorer, fallback when candidate matching fails.",
+                    prompt="Return JSONL-style evidence with fields: candidate_id, action_hint, matched_file, evidence.",
+                    tools=["Read", "Grep", "Glob"],
+                    model="inherit",
+                )
+            }
+            with tracer.span("agent"), use_tracer(tracer):
+                response, _ = await self._run_sdk_async(
+                    prompt=prompt,
+                    session_id=self.generate_session_id(),
+                    cwd=str(repo_root),
+                    allowed_tools=tools,
+                    permission_mode="acceptEdits",
+                    # Only run-stable options go to the SDK so a pooled client is
+                    # reused across syncs: the run folder sits under the workspace
+                    # root, and pipelines find the transaction by the run id in
+                    # the prompt's --metadata-json.
+                    add_dirs=(
+                        resolved_memory_root,
+                        resolved_workspace_root,
+                        trace_file.parent,
+                    ),
+                    env=self._runtime_env(repo_root),
+                    hooks=hooks,
+                    agents=agents,
+                )
+            artifact_paths["agent_log"].write_text(
+                (response if response.endswith("\n") else f"{response}\n"), encoding="utf-8"
             )
 
-        counts_raw = (
-            report.get("counts") if isinstance(report.get("counts"), dict) else {}
-        )
-        counts = {
-            "add": int(counts_raw.get("add") or 0),
-            "update": int(counts_raw.get("update") or 0),
-            "no_op": int(counts_raw.get("no_op") or counts_raw.get("no-op") or 0),
-        }
-        written_memory_paths: list[str] = []
-        for item in report.get("written_memory_paths") or []:
-            if not isinstance(item, str) or not item:
-                continue
-            rp = Path(item).resolve()
-            if not (
-                self._is_within(rp, resolved_memory_root)
-                or self._is_within(rp, run_folder)
-            ):
-                raise RuntimeError(f"report_path_outside_allowed_roots:{rp}")
-            written_memory_paths.append(str(rp))
+            for key in ("extract", "summary", "memory_actions", "subagents_log"):
+                if not artifact_paths[key].exists():
+                    raise RuntimeError(f"missing_artifact:{artifact_paths[key]}")
+
+            # Read summary_path directly from pipeline output (not agent report)
+            try:
+                summary_artifact = json.loads(
+                    artifact_paths["summary"].read_text(encoding="utf-8")
+                )
+            except json.JSONDecodeError as exc:
+                raise RuntimeError(
+                    f"invalid_json_artifact:{artifact_paths['summary']}"
+                ) from exc
+            raw_summary = str(
+                (summary_artifact if isinstance(summary_artifact, dict) else {}).get(
+                    "summary_path", ""
+                )
+            ).strip()
+            if not raw_summary:
+                raise RuntimeError("missing_summary_path_in_pipeline_output")
+            summary_path_resolved = Path(raw_summary).resolve()
+            if not self._is_within(summary_path_resolved, resolved_memory_root):
+                raise RuntimeError(
+                    f"summary_path_outside_memory_root:{summary_path_resolved}"
+                )
+            if not summary_exists(summary_path_resolved):
+                raise RuntimeError(f"summary_path_not_found:{summary_path_resolved}")
+            summary_path = str(summary_path_resolved)
+
+            try:
+                report = json.loads(
+                    artifact_paths["memory_actions"].read_text(encoding="utf-8")
+                )
+            except json.JSONDecodeError as exc:
+                raise RuntimeError(
+                    f"invalid_json_artifact:{artifact_paths['memory_actions']}"
+                ) from exc
+            if not isinstance(report, dict):
+                raise RuntimeError(
+                    f"invalid_report_shape:{artifact_paths['memory_actions']}"
+                )
 
+            counts_raw = (
+                report.get("counts") if isinstance(report.get("counts"), dict) else {}
+            )
+            counts = {
+                "add": int(counts_raw.get("add") or 0),
+                "update": int(counts_raw.get("update") or 0),
+                "no_op": int(counts_raw.get("no_op") or counts_raw.get("no-op") or 0),
+            }
+            written_memory_paths: list[str] = []
+            for item in report.get("written_memory_paths") or []:
+                if not isinstance(item, str) or not item:
+                    continue
+                rp = Path(item).resolve()
+                if not (
+                    self._is_within(rp, resolved_memory_root)
+                    or self._is_within(rp, run_folder)
+                ):
+                    raise RuntimeError(f"report_path_outside_allowed_roots:{rp}")
+                written_memory_paths.append(str(rp))
+        except BaseException as exc:
+            await asyncio.shield(asyncio.to_thread(transaction.rollback))
+            # Chat reads the digest without refreshing it, so drop rolled-back rows now.
+            await asyncio.shield(asyncio.to_thread(refresh_memory_digest, resolved_memory_root))
+            tracer.finish(status=f"error:{type(exc).__name__}")
+            raise
+        await asyncio.to_thread(transaction.commit)
+        await asyncio.to_thread(refresh_memory_digest, resolved_memory_root)
+        tracer.finish(counts=counts)
         return {
             "trace_path": str(trace_file),
             "memory_root": str(resolved_memory_root),
@@ -561,7 +990,7 @@ class AcretaAgent:
             "summary_path": summary_path,
         }
 
-    def maintain(
+    async def asyncio_maintain(
         self,
         memory_root: str | Path | None = None,
         workspace_root: str | Path | None = None,
@@ -581,93 +1010,159 @@ class AcretaAgent:
         run_folder = resolved_workspace_root / _default_run_folder_name("maintain")
         run_folder.mkdir(parents=True, exist_ok=True)
         artifact_paths = build_maintain_artifact_paths(run_folder)
-
-        prompt = build_maintain_prompt(
-            memory_root=resolved_memory_root,
-            run_folder=run_folder,
-            artifact_paths=artifact_paths,
-        )
-        metadata = {"run_id": run_folder.name}
-        hooks = self._build_pretool_hooks(
-            (resolved_memory_root, run_folder),
-            memory_root=resolved_memory_root,
-            metadata=metadata,
-        )
-        tools = list(MEMORY_WRITE_TOOLS)
-        if self.skills and "Skill" not in tools:
-            tools.append("Skill")
-        from claude_agent_sdk import AgentDefinition
-
-        agents = {
-            "explore-reader": AgentDefinition(
-                description="Read-only memory explorer for candidate matching evidence.",
-                prompt="Return JSONL-style evidence with fields: candidate_id, action_hint, matched_file, evidence.",
-                tools=["Read", "Grep", "Glob"],
-                model="inherit",
-            )
-        }
-        response, _ = self._run_sdk_sync(
-            prompt=prompt,
-            session_id=self.generate_session_id(),
-            cwd=str(repo_root),
-            allowed_tools=tools,
-            permission_mode="acceptEdits",
-            add_dirs=(
+        tracer = RunTracer(artifact_paths["trace"])
+        try:
+            with tracer.span("priors"):
+                priors = await asyncio.to_thread(
+                    compute_priors,
+                    resolved_memory_root,
+                    half_life_days=self._prior_half_life_days,
+                )
+            cluster_report = await asyncio.to_thread(
+                write_cluster_report,
                 resolved_memory_root,
-                resolved_workspace_root,
-                run_folder,
-            ),
-            env=self._runtime_env(repo_root),
-            hooks=hooks,
-            agents=agents,
-        )
-        artifact_paths["agent_log"].write_text(
-            (response if response.endswith("\n") else f"{response}\n"), encoding="utf-8"
-        )
+                artifact_paths["clusters"],
+                priors={row["path"]: row["prior"] for row in priors},
+            )
 
-        actions_path = artifact_paths["maintain_actions"]
-        if not actions_path.exists():
-            raise RuntimeError(f"missing_artifact:{actions_path}")
-        try:
-            report = json.loads(actions_path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError as exc:
-            raise RuntimeError(f"invalid_json_artifact:{actions_path}") from exc
-        if not isinstance(report, dict):
-            raise RuntimeError(f"invalid_report_shape:{actions_path}")
-
-        counts_raw = (
-            report.get("counts") if isinstance(report.get("counts"), dict) else {}
-        )
-        counts = {
-            "merged": int(counts_raw.get("merged") or 0),
-            "archived": int(counts_raw.get("archived") or 0),
-            "consolidated": int(counts_raw.get("consolidated") or 0),
-            "unchanged": int(counts_raw.get("unchanged") or 0),
-        }
+            prompt = build_maintain_prompt(
+                memory_root=resolved_memory_root,
+                run_folder=run_folder,
+                artifact_paths=artifact_paths,
+                digest_path=await asyncio.to_thread(refresh_memory_digest, resolved_memory_root),
+            )
+            metadata = {"run_id": run_folder.name}
+            # Merges and rewrites share the sync transaction model: a failed or
+            # rejected maintain run undoes every Write/Edit it made.
+            transaction = await _begin_transaction(resolved_memory_root, run_folder.name)
+            try:
+                hooks = self._build_pretool_hooks(
+                    (resolved_memory_root, run_folder),
+                    memory_root=resolved_memory_root,
+                    metadata=metadata,
+                    transaction=transaction,
+                )
+                tools = list(MEMORY_WRITE_TOOLS)
+                if self.skills and "Skill" not in tools:
+                    tools.append("Skill")
+                from claude_agent_sdk import AgentDefinition
 
-        # Validate all action paths are inside allowed roots
-        for action in report.get("actions") or []:
-            if not isinstance(action, dict):
-                continue
-            for path_key in ("source_path", "target_path"):
-                raw = str(action.get(path_key) or "").strip()
-                if not raw:
-                    continue
-                rp = Path(raw).resolve()
-                if not (
-                    self._is_within(rp, resolved_memory_root)
-                    or self._is_within(rp, run_folder)
-                ):
-                    raise RuntimeError(
-                        f"maintain_action_path_outside_allowed_roots:{path_key}={rp}"
+                agents = {
+                    "explore-reader": AgentDefinition(
+                        description="Read-only memory explorer for candidate matching evidence.",
+                        prompt="Return JSONL-style evidence with fields: candidate_id, action_hint, matched_file, evidence.",
+                        tools=["Read", "Grep", "Glob"],
+                        model="inherit",
+                    )
+                }
+                with tracer.span("agent"), use_tracer(tracer):
+                    response, _ = await self._run_sdk_async(
+                        prompt=prompt,
+                        session_id=self.generate_session_id(),
+                        cwd=str(repo_root),
+                        allowed_tools=tools,
+                        permission_mode="acceptEdits",
+                        add_dirs=(
+                            resolved_memory_root,
+                            resolved_workspace_root,
+                            run_folder,
+                        ),
+                        env=self._runtime_env(repo_root),
+                        hooks=hooks,
+                        agents=agents,
                     )
+                artifact_paths["agent_log"].write_text(
+                    (response if response.endswith("\n") else f"{response}\n"), encoding="utf-8"
+                )
 
+                actions_path = artifact_paths["maintain_actions"]
+                if not actions_path.exists():
+                    raise RuntimeError(f"missing_artifact:{actions_path}")
+                try:
+                    report = json.loads(actions_path.read_text(encoding="utf-8"))
+                except json.JSONDecodeError as exc:
+                    raise RuntimeError(f"invalid_json_artifact:{actions_path}") from exc
+                if not isinstance(report, dict):
+                    raise RuntimeError(f"invalid_report_shape:{actions_path}")
+
+                counts_raw = (
+                    report.get("counts") if isinstance(report.get("counts"), dict) else {}
+                )
+                counts = {
+                    "merged": int(counts_raw.get("merged") or 0),
+                    "archived": int(counts_raw.get("archived") or 0),
+                    "consolidated": int(counts_raw.get("consolidated") or 0),
+                    "unchanged": int(counts_raw.get("unchanged") or 0),
+                }
+
+                # Validate all action paths are inside allowed roots
+                for action in report.get("actions") or []:
+                    if not isinstance(action, dict):
+                        continue
+                    for path_key in ("source_path", "target_path"):
+                        raw = str(action.get(path_key) or "").strip()
+                        if not raw:
+                            continue
+                        rp = Path(raw).resolve()
+                        if not (
+                            self._is_within(rp, resolved_memory_root)
+                            or self._is_within(rp, run_folder)
+                        ):
+                            raise RuntimeError(
+                                f"maintain_action_path_outside_allowed_roots:{path_key}={rp}"
+                            )
+
+                # Archive moves run through Bash mv, which the Write/Edit hook never sees
+                archived_root = resolved_memory_root / "archived"
+                for action in report.get("actions") or []:
+                    raw_target = str(action.get("target_path") or "").strip() if isinstance(action, dict) else ""
+                    target = Path(raw_target).resolve() if raw_target else None
+                    if target is None or not self._is_within(target, archived_root) or not target.is_file():
+                        continue
+                    text = target.read_text(encoding="utf-8")
+                    try:
+                        memory_id = str(parse_frontmatter(text)[0].get("id") or target.stem)
+                    except Exception:
+                        memory_id = target.stem
+                    transaction.track(
+                        event={
+                            "op": "archive",
+                            "path": str(target),
+                            "memory_id": memory_id,
+                            "content_hash": content_hash(text),
+                            "run_id": run_folder.name,
+                        }
+                    )
+            except BaseException:
+                await asyncio.shield(asyncio.to_thread(transaction.rollback))
+                await asyncio.shield(asyncio.to_thread(refresh_memory_digest, resolved_memory_root))
+                raise
+            await asyncio.to_thread(transaction.commit)
+            await asyncio.to_thread(refresh_memory_digest, resolved_memory_root)
+            retention = None
+            if self._workspace_retention is not None:
+                keep_runs, keep_days = self._workspace_retention
+                with tracer.span("retention"):
+                    compacted = await asyncio.to_thread(
+                        compact_workspace,
+                        resolved_workspace_root,
+                        keep_runs=keep_runs,
+                        keep_days=keep_days,
+                        exclude=(run_folder,),
+                    )
+                    retention = compacted.to_dict()
+        except BaseException as exc:
+            tracer.finish(status=f"error:{type(exc).__name__}")
+            raise
+        tracer.finish(counts=counts)
         return {
             "memory_root": str(resolved_memory_root),
             "workspace_root": str(resolved_workspace_root),
             "run_folder": str(run_folder),
             "artifacts": {key: str(path) for key, path in artifact_paths.items()},
             "counts": counts,
+            "cluster_counts": cluster_report["counts"],
+            "retention": retention,
         }
 
 
@@ -706,4 +1201,4 @@ if __name__ == "__main__":
         ),
     )
     assert "memory maintenance" in maintain_prompt
-    assert "scan_memories" in maintain_prompt
+    assert "review_clusters" in maintain_prompt
@@ -2,21 +2,40 @@
 
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Any
 
 
+def _evidence_block(hits: list[dict[str, Any]]) -> str:
+    """Render packed memory hits as cited evidence blocks with full bodies."""
+    blocks = []
+    for fm in hits:
+        header = f"[{fm.get('id', '?')}] {fm.get('title', '?')}"
+        details = [f"conf={fm.get('confidence', '?')}"]
+        for key in ("primitive", "scope", "path"):
+            if fm.get(key):
+                details.append(f"{key}={fm[key]}")
+        if fm.get("truncated"):
+            details.append("truncated=true")
+        body = str(fm.get("_body", "")).strip()
+        blocks.append(f"{header}\n({' '.join(details)})\n{body}")
+    return "\n\n".join(blocks) or "(no relevant memories)"
+
+
 def build_chat_prompt(
-    question: str, hits: list[dict[str, Any]], context_docs: list[dict[str, Any]]
+    question: str,
+    hits: list[dict[str, Any]],
+    context_docs: list[dict[str, Any]],
+    digest_path: Path | None = None,
+    *,
+    confident: bool = False,
 ) -> str:
-    """Build the final agent prompt with memory/context evidence blocks."""
-    context_lines = [
-        (
-            f"- {fm.get('id', '?')} conf={fm.get('confidence', '?')}: "
-            f"{fm.get('title', '?')} :: {str(fm.get('_body', '')).strip()[:260]}"
-        )
-        for fm in hits
-    ]
-    context_block = "\n".join(context_lines) or "(no relevant memories)"
+    """Build the final agent prompt with memory/context evidence blocks.
+
+    With ``confident`` evidence the agent answers from the prompt without tools;
+    otherwise it may fan out to read-only explorers.
+    """
+    context_block = _evidence_block(hits)
 
     context_doc_lines = []
     for row in context_docs:
@@ -31,16 +50,33 @@ def build_chat_prompt(
         else "(no context docs loaded)"
     )
 
-    return f"""\
-Answer the user question using the memory evidence below.
+    if confident:
+        contract = """\
 Retrieval contract:
+- Evidence was pre-fetched and ranked across project and global memory.
+- Answer directly from the evidence below without tool calls.
+- Read a cited path only when its evidence is marked truncated=true.
+"""
+    else:
+        digest_line = (
+            f"- Read the memory digest first ({digest_path}): one line per memory with id, title, tags, confidence, updated, path.\n"
+            if digest_path
+            else ""
+        )
+        contract = f"""\
+Retrieval contract:
+- Pre-fetched evidence below is thin; start from it, then search further.
 - Lead handles retrieval strategy.
-- Delegate parallel read-only Task explorers with dynamic fan-out.
+{digest_line}- Delegate parallel read-only Task explorers with dynamic fan-out.
 - Search project-first, then global fallback.
 - Return evidence with file paths and line refs.
-- Use explicit ids/slugs only in related references (no wikilink syntax).
+"""
+
+    return f"""\
+Answer the user question using the memory evidence below.
+{contract}- Use explicit ids/slugs only in related references (no wikilink syntax).
 If memory is missing or uncertain, say that clearly.
-Cite learning ids and context doc ids you used.
+Cite the [id] of every memory and context doc you used.
 
 Question:
 {question}
@@ -83,6 +119,17 @@ if __name__ == "__main__":
     assert "doc-1" in prompt
     assert "dynamic fan-out" in prompt
     assert "Context docs (loaded only if needed)" in prompt
+    assert "memory digest" not in prompt
+    assert "digest.tsv" in build_chat_prompt("q", [], [], Path("/tmp/memory_digest.tsv"))
+    confident_prompt = build_chat_prompt(
+        "how to deploy",
+        [{"id": "mem-1", "title": "Deploy tips", "_body": "Use CI. " * 100, "path": "/m/a.md"}],
+        [],
+        confident=True,
+    )
+    assert "without tool calls" in confident_prompt
+    assert "fan-out" not in confident_prompt
+    assert ("Use CI. " * 100).strip() in confident_prompt
 
     assert looks_like_auth_error("Failed to authenticate with provider")
     assert looks_like_auth_error("authentication_error: invalid key")
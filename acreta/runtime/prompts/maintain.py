@@ -7,14 +7,17 @@ from pathlib import Path
 from typing import Any
 
 from acreta.memory.memory_record import memory_write_schema_prompt
+from acreta.runtime.tracing import TRACE_FILENAME
 
 
 def build_maintain_artifact_paths(run_folder: Path) -> dict[str, Path]:
     """Return canonical workspace artifact paths for a maintain run folder."""
     return {
+        "clusters": run_folder / "clusters.json",
         "maintain_actions": run_folder / "maintain_actions.json",
         "agent_log": run_folder / "agent.log",
         "subagents_log": run_folder / "subagents.log",
+        "trace": run_folder / TRACE_FILENAME,
     }
 
 
@@ -23,6 +26,7 @@ def build_maintain_prompt(
     memory_root: Path,
     run_folder: Path,
     artifact_paths: dict[str, Path],
+    digest_path: Path | None = None,
 ) -> str:
     """Build lead-agent prompt for the memory maintenance flow."""
     artifact_json = json.dumps(
@@ -37,9 +41,10 @@ Inputs:
 - memory_root: {memory_root}
 - run_folder: {run_folder} (use this for intermediate files to manage your context)
 - artifact_paths: {artifact_json}
+- memory_digest: {digest_path or "(not available)"} (one line per memory: id, primitive, title, tags, confidence, updated, body_hash, path)
 
 Checklist (use TodoWrite, move pending -> in_progress -> completed):
-- scan_memories
+- review_clusters
 - analyze_duplicates
 - merge_similar
 - archive_low_value
@@ -48,9 +53,12 @@ Checklist (use TodoWrite, move pending -> in_progress -> completed):
 
 Instructions:
 
-1. SCAN: Use Task with Explore subagents to read all memory files in {memory_root}/decisions/ and {memory_root}/learnings/. Parse their frontmatter (id, title, confidence, tags, created, updated) and body content. Save a summary to {run_folder} for reference if the list is large.
+1. REVIEW CLUSTERS: Read {artifact_paths["clusters"]} first. It was computed deterministically (MinHash LSH over word shingles) and holds:
+   - clusters: proposed near-duplicate groups with cluster_id, primitive, primary (suggested keeper), max_similarity, and ranked members (path, title, confidence, similarity_to_primary).
+   - archive_candidates: low-confidence, near-empty, or rarely used memories with a reason. A "prior<..." reason means the precomputed access prior (confidence x recency x decayed retrieval/citation usage) is low.
+   Do NOT scan the whole corpus. Use the memory digest for metadata of any other memory. Read only files named in clusters.json, and use Explore subagents only when a proposed group needs extra context.
 
-2. ANALYZE DUPLICATES: Identify memories that cover the same topic or have substantially overlapping content. Group them by similarity.
+2. ANALYZE DUPLICATES: For each proposed cluster, confirm which members truly cover the same topic. Reject members that only share wording. Unconfirmed members stay unchanged.
 
 3. MERGE: For memories with overlapping content about the same topic:
    - Keep the most comprehensive version as the primary.
@@ -58,13 +66,14 @@ Instructions:
    - Update the primary's "updated" timestamp to now.
    - Archive the secondary by moving it: use Bash to run `mkdir -p {memory_root}/archived/{{folder}}/ && mv {{old_path}} {memory_root}/archived/{{folder}}/` where folder is "decisions" or "learnings".
 
-4. ARCHIVE LOW-VALUE: Archive memories that are:
+4. ARCHIVE LOW-VALUE: Start from archive_candidates in clusters.json. Archive memories that are:
    - Very low confidence (< 0.3)
+   - Rarely retrieved or cited for a long time (low prior), unless the content is still clearly useful
    - Trivial or obvious (e.g., "installed package X", "ran command Y" with no insight)
    - Superseded by a more complete memory covering the same ground
    Use the same Bash mv pattern to move them to archived/.
 
-5. CONSOLIDATE: When you find 3+ small related memories about the same broader topic, consider combining them into one comprehensive memory file. Write the new consolidated memory via Write tool. Archive the originals.
+5. CONSOLIDATE: When a confirmed cluster holds 3+ small related memories about the same broader topic, consider combining them into one comprehensive memory file. Write the new consolidated memory via Write tool. Archive the originals.
 
 6. REPORT: Write a JSON report to {artifact_paths["maintain_actions"]} with keys:
    - run_id: the run folder name
@@ -98,7 +107,8 @@ if __name__ == "__main__":
             artifact_paths=artifact_paths,
         )
         assert "memory maintenance" in prompt
-        assert "scan_memories" in prompt
+        assert "review_clusters" in prompt
+        assert "clusters.json" in prompt
         assert "analyze_duplicates" in prompt
         assert "merge_similar" in prompt
         assert "archive_low_value" in prompt
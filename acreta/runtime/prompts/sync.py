@@ -17,9 +17,21 @@ def build_sync_prompt(
     run_folder: Path,
     artifact_paths: dict[str, Path],
     metadata: dict[str, str],
+    metrics: dict[str, Any] | None = None,
+    start_offset: int = 0,
+    previous_summary_path: Path | None = None,
+    digest_path: Path | None = None,
 ) -> str:
     """Build lead-agent prompt for the memory write flow."""
     metadata_json = json.dumps(metadata, ensure_ascii=True)
+    metrics_json = json.dumps(metrics or {}, ensure_ascii=True)
+    resume_args = ""
+    if start_offset > 0:
+        resume_args = f" --start-offset {int(start_offset)}"
+        if previous_summary_path:
+            resume_args += (
+                f" --previous-summary-path {shlex.quote(str(previous_summary_path))}"
+            )
     artifact_json = json.dumps(
         {key: str(path) for key, path in artifact_paths.items()}, ensure_ascii=True
     )
@@ -28,7 +40,8 @@ def build_sync_prompt(
         f"--trace-path {shlex.quote(str(trace_file))} "
         f"--output {shlex.quote(str(artifact_paths['extract']))} "
         f"--metadata-json {shlex.quote(metadata_json)} "
-        "--metrics-json '{}'"
+        f"--metrics-json {shlex.quote(metrics_json)}"
+        f"{resume_args}"
     )
     summary_cmd = (
         "python3 -m acreta.memory.summarization_pipeline "
@@ -36,7 +49,29 @@ def build_sync_prompt(
         f"--output {shlex.quote(str(artifact_paths['summary']))} "
         f"--memory-root {shlex.quote(str(memory_root))} "
         f"--metadata-json {shlex.quote(metadata_json)} "
-        "--metrics-json '{}'"
+        f"--metrics-json {shlex.quote(metrics_json)}"
+        f"{resume_args}"
+    )
+    matches_path = artifact_paths.get("matches") or artifact_paths["extract"].with_name(
+        "matches.json"
+    )
+    match_cmd = (
+        "python3 -m acreta.memory.matching "
+        f"--extract-path {shlex.quote(str(artifact_paths['extract']))} "
+        f"--memory-root {shlex.quote(str(memory_root))} "
+        f"--output {shlex.quote(str(matches_path))}"
+    )
+    resume_rule = (
+        f"- Incremental run: pipelines read only trace bytes after offset {int(start_offset)}; "
+        "earlier content was already extracted, so only add/update memories for new evidence.\n"
+        if start_offset > 0
+        else ""
+    )
+    digest_rule = (
+        f"- Memory digest at {digest_path} lists every memory (id, primitive, title, tags, confidence, updated, body_hash, path), one per line. "
+        "Read it once to locate update targets; do not Glob/Grep memory_root to discover files.\n"
+        if digest_path
+        else ""
     )
     schema_rules = memory_write_schema_prompt()
     return f"""\
@@ -52,7 +87,7 @@ Checklist (must use TodoWrite and move statuses from pending -> in_progress -> c
 - validate_inputs
 - run_extract_pipeline
 - run_summary_pipeline
-- run_explorer_checks
+- run_candidate_matching
 - decide_add_update_no_op
 - write_memory_files
 - write_run_decision_report
@@ -61,23 +96,23 @@ Checklist (must use TodoWrite and move statuses from pending -> in_progress -> c
 
 Execution rules:
 - Do not inline or normalize trace content. Use only trace_path file access.
-- Use Bash to run DSPy pipelines:
+{resume_rule}- Use Bash to run DSPy pipelines:
   1) {extract_cmd}
   2) {summary_cmd}
 - Read extract.json from artifact paths.
 - The summary pipeline writes the summary directly to memory_root/summaries/ via --memory-root. Do NOT write summary files yourself.
-- For candidate matching, use Task with built-in Explore subagent first. If unavailable, use Task with `explore-reader`.
-- Explorer subagents are read-only and must return: candidate_id, action_hint, matched_file, evidence.
-- Lead agent is the only writer and final decider.
-- Deterministic decision policy for non-summary candidates:
+- For candidate matching, run after extract:
+  3) {match_cmd}
+- Read matches.json once. Each row has candidate_id (index into extract.json), action, matched_file, score, evidence.
+- Apply each row's action as given (deterministic policy, no explorer needed):
   - no_op when matched memory has exact same primitive + title + body.
-  - update when primitive matches and token-overlap score >= 0.72.
+  - update when primitive matches and title/body hash matches or token-overlap score >= 0.72; edit matched_file in place.
   - add otherwise.
-- Write/update markdown memory files with YAML frontmatter in memory_root/decisions, memory_root/learnings.
-- If extract returns 0 candidates, write an empty JSONL file to subagents_log (explorer is skipped).
-- Write explorer outputs to {artifact_paths["subagents_log"]} as JSONL.
+- Only if the matching command fails, fall back to Task with built-in Explore subagent (or `explore-reader`) and write explorer outputs to {artifact_paths["subagents_log"]} as JSONL; otherwise leave subagents_log empty.
+- Lead agent is the only writer and final decider.
+{digest_rule}- Write/update markdown memory files with YAML frontmatter in memory_root/decisions, memory_root/learnings.
 - Write run report JSON to {artifact_paths["memory_actions"]} with keys: run_id, todos, actions, counts, written_memory_paths, trace_path.
-- Include overlap score evidence in actions when action is update/no_op.
+- Include the matches.json score and evidence in actions when action is update/no_op.
 - counts keys must be: add, update, no_op.
 - Every written/updated file path must be absolute.
 
@@ -94,6 +129,7 @@ if __name__ == "__main__":
         run_folder = root / "workspace" / "sync-selftest"
         artifact_paths = {
             "extract": run_folder / "extract.json",
+            "matches": run_folder / "matches.json",
             "summary": run_folder / "summary.json",
             "memory_actions": run_folder / "memory_actions.json",
             "agent_log": run_folder / "agent.log",
@@ -113,4 +149,5 @@ if __name__ == "__main__":
         )
         assert "artifact_paths_json" in prompt
         assert "--memory-root" in prompt
+        assert "python3 -m acreta.memory.matching" in prompt
         assert "Do NOT write summary files yourself" in prompt
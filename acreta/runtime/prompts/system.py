@@ -14,7 +14,7 @@ Rules:
 - Lead agent is the only writer and final decider.
 - Decisions must be explicit: add, update, or no-op.
 - Use TodoWrite for checklist lifecycle.
-- Use Task with Explore subagent for read-only memory matching.
+- Match candidates with the deterministic matching command; use Task with Explore subagent only as a read-only fallback.
 - Search project-first, then global fallback.
 - Never emit wikilink syntax.
 - Keep outputs concise and structured.{skills_section}"""
@@ -0,0 +1,383 @@
+"""Pool of long-lived Claude Agent SDK clients reused across sync/maintain/chat jobs.
+
+Each pooled client is one connected ``ClaudeSDKClient`` owned by a single task
+on a dedicated event-loop thread (the SDK requires all client calls to happen in
+the async context that connected it). Jobs are routed to an idle client with the
+same options signature; per-job PreToolUse hooks are swapped in through
+dispatcher hooks registered once at connect. Between jobs the conversation is
+reset with ``/clear``; clients are recycled after ``max_jobs_per_client`` jobs or
+on any error or timeout. A timed-out or cancelled job interrupts its client and
+waits for it to disconnect, so the CLI stops acting for a caller that gave up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from loguru import logger
+
+CLEAR_COMMAND = "/clear"
+INTERRUPT_TIMEOUT_SECONDS = 10.0
+
+HookConfig = dict[str, list[Any]]
+OptionsFactory = Callable[[HookConfig | None], Any]
+
+
+def hook_shape(hooks: HookConfig | None) -> tuple[tuple[str, str | None, int], ...]:
+    """Return the (event, matcher, hook count) layout of a hook config."""
+    shape: list[tuple[str, str | None, int]] = []
+    for event, matchers in sorted((hooks or {}).items()):
+        for matcher in matchers:
+            shape.append((event, getattr(matcher, "matcher", None), len(matcher.hooks)))
+    return tuple(shape)
+
+
+def pool_key(option_kwargs: dict[str, Any], hooks: HookConfig | None) -> str:
+    """Return the options signature that decides which clients a job may reuse."""
+    stable = {key: value for key, value in option_kwargs.items() if key != "hooks"}
+    return repr((sorted(stable.items(), key=lambda item: item[0]), hook_shape(hooks)))
+
+
+@dataclass
+class _Job:
+    """One prompt routed to a pooled client."""
+
+    prompt: str
+    session_id: str
+    hooks: HookConfig | None
+    on_message: Callable[[Any], None] | None = None
+    future: Future = field(default_factory=Future)
+
+
+class PooledClient:
+    """One connected SDK client plus the owner task that serves its jobs."""
+
+    def __init__(self, key: str, options_factory: OptionsFactory, hooks: HookConfig | None) -> None:
+        self.key = key
+        self.jobs_run = 0
+        self.healthy = True
+        self._options_factory = options_factory
+        self._shape = hook_shape(hooks)
+        self._current_hooks: HookConfig = {}
+        self._inbox: asyncio.Queue[_Job | None] = asyncio.Queue()
+        self._task: Future | None = None
+        self._serve_task: asyncio.Task | None = None
+        self._sdk: Any = None
+
+    def _dispatch_hooks(self) -> HookConfig | None:
+        """Build stable hooks that forward to the current job's hooks."""
+        if not self._shape:
+            return None
+        from claude_agent_sdk import HookMatcher
+
+        def _make(event: str, matcher_index: int, hook_index: int) -> Callable[..., Any]:
+            async def _dispatch(input_data: Any, tool_use_id: Any, context: Any) -> dict[str, Any]:
+                matchers = self._current_hooks.get(event) or []
+                if matcher_index >= len(matchers):
+                    return {}
+                hook = matchers[matcher_index].hooks[hook_index]
+                return await hook(input_data, tool_use_id, context)
+
+            return _dispatch
+
+        config: HookConfig = {}
+        counters: dict[str, int] = {}
+        for event, matcher, count in self._shape:
+            index = counters.get(event, 0)
+            counters[event] = index + 1
+            config.setdefault(event, []).append(
+                HookMatcher(matcher=matcher, hooks=[_make(event, index, n) for n in range(count)])
+            )
+        return config
+
+    async def _serve(self) -> None:
+        """Connect, answer jobs until stopped or unhealthy, then disconnect."""
+        from claude_agent_sdk import ClaudeSDKClient
+
+        self._serve_task = asyncio.current_task()
+        client = self._sdk = ClaudeSDKClient(options=self._options_factory(self._dispatch_hooks()))
+        try:
+            await client.connect()
+        except BaseException as exc:
+            self.healthy = False
+            self._fail_pending(exc)
+            raise
+        try:
+            while True:
+                job = await self._inbox.get()
+                if job is None:
+                    break
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                self._current_hooks = job.hooks or {}
+                try:
+                    await client.query(job.prompt, session_id=job.session_id)
+                    messages = []
+                    async for message in client.receive_response():
+                        if job.on_message is not None:
+                            job.on_message(message)
+                        messages.append(message)
+                except BaseException as exc:
+                    self.healthy = False
+                    job.future.set_exception(exc)
+                    break
+                finally:
+                    self._current_hooks = {}
+                    self.jobs_run += 1
+                job.future.set_result(messages)
+                try:
+                    await client.query(CLEAR_COMMAND, session_id=job.session_id)
+                    async for _ in client.receive_response():
+                        pass
+                except Exception as exc:
+                    logger.warning("sdk pool reset failed, recycling client: {}", exc)
+                    self.healthy = False
+                    break
+        finally:
+            self.healthy = False
+            self._fail_pending(RuntimeError("sdk_pool_client_closed"))
+            await client.disconnect()
+
+    def _fail_pending(self, exc: BaseException) -> None:
+        """Fail jobs still queued on a client that can no longer serve them."""
+        while not self._inbox.empty():
+            job = self._inbox.get_nowait()
+            if job is not None and job.future.set_running_or_notify_cancel():
+                job.future.set_exception(exc)
+
+    async def interrupt(self) -> None:
+        """Interrupt the running query, then stop the owner task and wait for disconnect."""
+        self.healthy = False
+        if self._sdk is not None:
+            try:
+                await asyncio.wait_for(self._sdk.interrupt(), timeout=INTERRUPT_TIMEOUT_SECONDS)
+            except Exception as exc:
+                logger.warning("sdk pool interrupt failed: {}", exc)
+        task = self._serve_task
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.wait([task], timeout=INTERRUPT_TIMEOUT_SECONDS)
+
+    def alive(self) -> bool:
+        """Return whether the client can take another job."""
+        return self.healthy and self._task is not None and not self._task.done()
+
+
+class SDKClientPool:
+    """Bounded pool of warm SDK clients keyed by options signature."""
+
+    def __init__(self, *, max_clients: int = 2, max_jobs_per_client: int = 20) -> None:
+        self.max_clients = max(1, int(max_clients))
+        self.max_jobs_per_client = max(1, int(max_jobs_per_client))
+        self._cond = threading.Condition()
+        self._loop_lock = threading.Lock()
+        self._idle: dict[str, list[PooledClient]] = {}
+        self._size = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self.stats = {"created": 0, "reused": 0, "recycled": 0}
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the pool's event-loop thread on first use."""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="acreta-sdk-pool", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def _start(self, client: PooledClient) -> None:
+        """Start a client's owner task on the pool loop."""
+        loop = self._ensure_loop()
+        client._task = asyncio.run_coroutine_threadsafe(client._serve(), loop)
+
+    def _stop(self, client: PooledClient) -> None:
+        """Ask a client's owner task to disconnect after any queued job."""
+        client.healthy = False
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(client._inbox.put_nowait, None)
+
+    def _acquire(self, key: str, options_factory: OptionsFactory, hooks: HookConfig | None) -> PooledClient:
+        """Return an idle healthy client for ``key`` or a new, not yet started one."""
+        with self._cond:
+            while True:
+                idle = self._idle.get(key) or []
+                while idle:
+                    client = idle.pop()
+                    if client.alive():
+                        self.stats["reused"] += 1
+                        return client
+                    self._size -= 1
+                if self._size < self.max_clients:
+                    self._size += 1
+                    break
+                victim = next((items.pop() for items in self._idle.values() if items), None)
+                if victim is not None:
+                    self._stop(victim)
+                    self._size -= 1
+                    self.stats["recycled"] += 1
+                    continue
+                self._cond.wait()
+        self.stats["created"] += 1
+        return PooledClient(key, options_factory, hooks)
+
+    def _abort(self, client: PooledClient) -> Future:
+        """Mark ``client`` unhealthy and interrupt it on the pool loop; thread-safe."""
+        client.healthy = False
+        return asyncio.run_coroutine_threadsafe(client.interrupt(), self._ensure_loop())
+
+    def _submit(
+        self,
+        client: PooledClient,
+        prompt: str,
+        session_id: str,
+        hooks: HookConfig | None,
+        on_message: Callable[[Any], None] | None,
+    ) -> _Job:
+        """Queue one job on ``client``, starting its owner task on first use."""
+        job = _Job(prompt=prompt, session_id=session_id, hooks=hooks, on_message=on_message)
+        self._ensure_loop().call_soon_threadsafe(client._inbox.put_nowait, job)
+        if client._task is None:
+            self._start(client)
+        return job
+
+    def _release(self, client: PooledClient) -> None:
+        """Return a client to the idle list, or recycle it when spent or unhealthy."""
+        with self._cond:
+            if client.alive() and client.jobs_run < self.max_jobs_per_client:
+                self._idle.setdefault(client.key, []).append(client)
+            else:
+                self._stop(client)
+                self._size -= 1
+                self.stats["recycled"] += 1
+            self._cond.notify()
+
+    def run(
+        self,
+        *,
+        key: str,
+        options_factory: OptionsFactory,
+        prompt: str,
+        session_id: str,
+        hooks: HookConfig | None,
+        timeout: float | None,
+        on_message: Callable[[Any], None] | None = None,
+    ) -> list[Any]:
+        """Run one prompt on a pooled client and return its messages.
+
+        ``on_message`` is called on the pool thread as each message arrives.
+        """
+        client = self._acquire(key, options_factory, hooks)
+        job = self._submit(client, prompt, session_id, hooks, on_message)
+        try:
+            return job.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            try:
+                self._abort(client).result(timeout=2 * INTERRUPT_TIMEOUT_SECONDS)
+            except Exception:
+                pass
+            raise
+        finally:
+            self._release(client)
+
+    async def run_async(
+        self,
+        *,
+        key: str,
+        options_factory: OptionsFactory,
+        prompt: str,
+        session_id: str,
+        hooks: HookConfig | None,
+        timeout: float | None,
+        on_message: Callable[[Any], None] | None = None,
+    ) -> list[Any]:
+        """Await one prompt on a pooled client from another event loop.
+
+        Cancelling the caller (for example a per-job ``wait_for``) interrupts the
+        pooled client and waits for it to disconnect before re-raising.
+        """
+        acquiring = asyncio.ensure_future(asyncio.to_thread(self._acquire, key, options_factory, hooks))
+        try:
+            client = await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+
+            def _release_late(future: asyncio.Future) -> None:
+                if not future.cancelled() and future.exception() is None:
+                    self._release(future.result())
+
+            acquiring.add_done_callback(_release_late)
+            raise
+        job = self._submit(client, prompt, session_id, hooks, on_message)
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(job.future)), timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            job.future.cancel()
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(asyncio.wrap_future(self._abort(client))),
+                    2 * INTERRUPT_TIMEOUT_SECONDS,
+                )
+            except Exception:
+                pass
+            raise
+        finally:
+            self._release(client)
+
+    def close(self) -> None:
+        """Disconnect every pooled client and stop the loop thread."""
+        with self._cond:
+            clients = [client for items in self._idle.values() for client in items]
+            self._idle.clear()
+            self._size = 0
+        for client in clients:
+            self._stop(client)
+        for client in clients:
+            if client._task is not None:
+                try:
+                    client._task.result(timeout=10)
+                except Exception:
+                    pass
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            if self._thread is not None:
+                self._thread.join(timeout=5)
+            self._loop.close()
+            self._loop, self._thread = None, None
+
+
+_POOL: SDKClientPool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_sdk_pool() -> SDKClientPool | None:
+    """Return the process-wide pool when ``[agent] pool_enabled`` is set, else None."""
+    global _POOL
+    from acreta.config.settings import get_config
+
+    config = get_config()
+    if not config.agent_pool_enabled:
+        return None
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = SDKClientPool(
+                max_clients=config.agent_pool_max_clients,
+                max_jobs_per_client=config.agent_pool_max_jobs_per_client,
+            )
+            atexit.register(close_sdk_pool)
+        return _POOL
+
+
+def close_sdk_pool() -> None:
+    """Close the process-wide pool if one was started."""
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.close()
@@ -0,0 +1,165 @@
+"""Incremental chat events folded from Claude Agent SDK stream messages.
+
+``ChatStreamState.feed`` turns raw SDK messages (partial ``StreamEvent`` text
+deltas, assistant/user messages, and the final ``ResultMessage``) into small
+``ChatEvent`` records; ``iterate_async`` exposes an async iterator to sync callers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_END = object()
+
+
+@dataclass(frozen=True)
+class ChatEvent:
+    """One chat stream event: ``text``, ``tool_use``, ``tool_result``, or ``done``."""
+
+    type: str
+    text: str = ""
+    tool: str = ""
+    data: dict[str, Any] | None = None
+    session_id: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a compact JSON-ready payload without empty fields."""
+        payload: dict[str, Any] = {"type": self.type}
+        if self.text:
+            payload["text"] = self.text
+        if self.tool:
+            payload["tool"] = self.tool
+        if self.data:
+            payload["data"] = self.data
+        if self.session_id:
+            payload["session_id"] = self.session_id
+        return payload
+
+
+class ChatStreamState:
+    """Fold SDK messages into chat events and the final response text."""
+
+    def __init__(self, session_id: str) -> None:
+        self.session_id = session_id
+        self.parts: list[str] = []
+        self._streamed_text = False
+
+    def feed(self, message: Any) -> list[ChatEvent]:
+        """Return the chat events carried by one SDK message."""
+        from claude_agent_sdk.types import (
+            AssistantMessage,
+            ResultMessage,
+            StreamEvent,
+            TextBlock,
+            ToolResultBlock,
+            ToolUseBlock,
+            UserMessage,
+        )
+
+        events: list[ChatEvent] = []
+        if isinstance(message, StreamEvent):
+            event = message.event or {}
+            delta = event.get("delta") or {}
+            if event.get("type") == "content_block_delta" and delta.get("type") == "text_delta":
+                text = str(delta.get("text") or "")
+                if text:
+                    self._streamed_text = True
+                    self.parts.append(text)
+                    events.append(ChatEvent("text", text=text))
+        elif isinstance(message, AssistantMessage):
+            for block in message.content:
+                if isinstance(block, TextBlock) and not self._streamed_text:
+                    self.parts.append(block.text)
+                    events.append(ChatEvent("text", text=block.text))
+                elif isinstance(block, ToolUseBlock):
+                    events.append(
+                        ChatEvent("tool_use", tool=block.name, data={"id": block.id, "input": block.input})
+                    )
+            self._streamed_text = False
+        elif isinstance(message, UserMessage) and isinstance(message.content, list):
+            for block in message.content:
+                if isinstance(block, ToolResultBlock):
+                    events.append(
+                        ChatEvent(
+                            "tool_result",
+                            data={"tool_use_id": block.tool_use_id, "is_error": bool(block.is_error)},
+                        )
+                    )
+        elif isinstance(message, ResultMessage):
+            if message.session_id:
+                self.session_id = message.session_id
+            if message.result and not self.parts:
+                self.parts.append(message.result)
+                events.append(ChatEvent("text", text=message.result))
+        return events
+
+    def done(self) -> ChatEvent:
+        """Return the closing event with the full response and session id."""
+        response = "".join(self.parts).strip() or "(no response)"
+        return ChatEvent("done", text=response, session_id=self.session_id)
+
+
+def iterate_async(factory: Callable[[], AsyncIterator[T]]) -> Iterator[T]:
+    """Drive an async iterator on a worker-thread loop and yield its items in order.
+
+    Stopping the returned iterator early closes the async iterator after its next item.
+    """
+    items: queue.Queue[tuple[Any, BaseException | None]] = queue.Queue()
+    stop = threading.Event()
+
+    async def _pump() -> None:
+        source = factory()
+        try:
+            async for item in source:
+                items.put((item, None))
+                if stop.is_set():
+                    break
+        except BaseException as exc:
+            items.put((_END, exc))
+            return
+        finally:
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        items.put((_END, None))
+
+    threading.Thread(target=asyncio.run, args=(_pump(),), name="acreta-chat-stream", daemon=True).start()
+    try:
+        while True:
+            item, error = items.get()
+            if item is _END:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+if __name__ == "__main__":
+    """Run a real-path self-test for event folding and the sync bridge."""
+    from claude_agent_sdk.types import AssistantMessage, ResultMessage, StreamEvent, TextBlock
+
+    state = ChatStreamState("s0")
+    delta = {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hi"}}
+    assert state.feed(StreamEvent(uuid="u", session_id="s1", event=delta)) == [ChatEvent("text", text="Hi")]
+    assert state.feed(AssistantMessage(content=[TextBlock(text="Hi")], model="m")) == []
+    state.feed(
+        ResultMessage(
+            subtype="success", duration_ms=0, duration_api_ms=0, is_error=False, num_turns=1, session_id="s1"
+        )
+    )
+    assert state.done() == ChatEvent("done", text="Hi", session_id="s1")
+
+    async def _numbers() -> AsyncIterator[int]:
+        for value in range(3):
+            await asyncio.sleep(0)
+            yield value
+
+    assert list(iterate_async(_numbers)) == [0, 1, 2]
@@ -0,0 +1,337 @@
+"""Per-run span recording to ``trace.jsonl`` and critical-path profiles of run folders.
+
+``RunTracer`` appends one JSON record per event: phase spans (``agent``, ``run``),
+SDK messages, tool spans (tool_use paired with its tool_result), and the final
+``ResultMessage`` durations and token usage. The tracer for the current run is
+carried in a context variable so ``_run_sdk_once`` and pooled runs record into it
+without changing their call signatures.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Iterator
+
+TRACE_FILENAME = "trace.jsonl"
+MODEL_CATEGORY = "model"
+_LABEL_CHARS = 200
+
+_ACTIVE_TRACER: ContextVar[RunTracer | None] = ContextVar("acreta_run_tracer", default=None)
+
+
+def _tool_label(name: str, tool_input: dict[str, Any]) -> str:
+    """Return a short human label for one tool call."""
+    if name == "Bash":
+        return str(tool_input.get("command") or "")[:_LABEL_CHARS]
+    if name == "Task":
+        return str(tool_input.get("description") or tool_input.get("subagent_type") or "")[:_LABEL_CHARS]
+    return str(tool_input.get("file_path") or tool_input.get("pattern") or tool_input.get("path") or "")[:_LABEL_CHARS]
+
+
+def tool_category(name: str, label: str) -> str:
+    """Map a tool span to the pipeline stage it belongs to."""
+    if name == "Bash":
+        for marker, category in (
+            ("extract_pipeline", "extract_pipeline"),
+            ("summarization_pipeline", "summary_pipeline"),
+            ("memory.matching", "candidate_matching"),
+            ("memory.clustering", "cluster_report"),
+        ):
+            if marker in label:
+                return category
+        return "bash"
+    if name == "Task":
+        return "explorer_subagents"
+    if name in {"Write", "Edit"}:
+        return "memory_writes"
+    if name in {"Read", "Grep", "Glob"}:
+        return "reads"
+    return name.lower() or "tool"
+
+
+class RunTracer:
+    """Append-only span recorder for one sync or maintain run folder."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+        self._open_tools: dict[str, dict[str, Any]] = {}
+
+    def offset_ms(self) -> float:
+        """Return milliseconds since the tracer was created."""
+        return round((time.monotonic() - self._started) * 1000, 3)
+
+    def emit(self, record: dict[str, Any]) -> None:
+        """Append one timestamped record to the trace file."""
+        payload = {"ts": round(time.time(), 3), "offset_ms": self.offset_ms(), **record}
+        line = json.dumps(payload, ensure_ascii=True, default=str) + "\n"
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[None]:
+        """Record a named phase span with its duration and outcome."""
+        start = self.offset_ms()
+        status = "ok"
+        try:
+            yield
+        except BaseException as exc:
+            status = f"error:{type(exc).__name__}"
+            raise
+        finally:
+            end = self.offset_ms()
+            self.emit(
+                {
+                    "type": "span",
+                    "name": name,
+                    "start_ms": start,
+                    "end_ms": end,
+                    "duration_ms": round(end - start, 3),
+                    "status": status,
+                    **attrs,
+                }
+            )
+
+    def finish(self, status: str = "ok", **attrs: Any) -> None:
+        """Record the whole-run span from tracer creation until now."""
+        end = self.offset_ms()
+        self.emit(
+            {
+                "type": "span",
+                "name": "run",
+                "start_ms": 0.0,
+                "end_ms": end,
+                "duration_ms": end,
+                "status": status,
+                **attrs,
+            }
+        )
+
+    def record_message(self, message: Any) -> None:
+        """Record one SDK message, opening and closing tool spans as they pair up."""
+        from claude_agent_sdk.types import (
+            AssistantMessage,
+            ResultMessage,
+            TextBlock,
+            ToolResultBlock,
+            ToolUseBlock,
+            UserMessage,
+        )
+
+        now = self.offset_ms()
+        if isinstance(message, AssistantMessage):
+            parent = message.parent_tool_use_id
+            text_chars = sum(len(block.text) for block in message.content if isinstance(block, TextBlock))
+            self.emit({"type": "message", "kind": "assistant", "parent_tool_use_id": parent, "text_chars": text_chars})
+            for block in message.content:
+                if isinstance(block, ToolUseBlock):
+                    tool_input = block.input if isinstance(block.input, dict) else {}
+                    with self._lock:
+                        self._open_tools[block.id] = {
+                            "name": block.name,
+                            "label": _tool_label(block.name, tool_input),
+                            "parent_tool_use_id": parent,
+                            "start_ms": now,
+                        }
+        elif isinstance(message, UserMessage):
+            results = [block for block in message.content if isinstance(block, ToolResultBlock)] if isinstance(message.content, list) else []
+            self.emit({"type": "message", "kind": "user", "tool_results": len(results)})
+            for block in results:
+                with self._lock:
+                    opened = self._open_tools.pop(block.tool_use_id, None)
+                if opened is None:
+                    continue
+                self.emit(
+                    {
+                        "type": "tool",
+                        "tool_use_id": block.tool_use_id,
+                        **opened,
+                        "end_ms": now,
+                        "duration_ms": round(now - opened["start_ms"], 3),
+                        "is_error": bool(block.is_error),
+                    }
+                )
+        elif isinstance(message, ResultMessage):
+            self.emit(
+                {
+                    "type": "result",
+                    "session_id": message.session_id,
+                    "duration_ms": message.duration_ms,
+                    "duration_api_ms": message.duration_api_ms,
+                    "num_turns": message.num_turns,
+                    "is_error": message.is_error,
+                    "usage": message.usage or {},
+                    "total_cost_usd": message.total_cost_usd,
+                }
+            )
+        else:
+            self.emit({"type": "message", "kind": type(message).__name__})
+
+
+def active_tracer() -> RunTracer | None:
+    """Return the tracer of the run executing in this context, if any."""
+    return _ACTIVE_TRACER.get()
+
+
+@contextmanager
+def use_tracer(tracer: RunTracer) -> Iterator[RunTracer]:
+    """Make ``tracer`` the active tracer for SDK calls in this context."""
+    token = _ACTIVE_TRACER.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _ACTIVE_TRACER.reset(token)
+
+
+def load_trace(path: Path) -> list[dict[str, Any]]:
+    """Read trace records, skipping malformed lines."""
+    records: list[dict[str, Any]] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict):
+            records.append(record)
+    return records
+
+
+def _critical_path(agent: dict[str, Any], tools: list[dict[str, Any]]) -> dict[str, float]:
+    """Attribute agent-span time to the top-level tool gating progress, else the model."""
+    start, end = float(agent["start_ms"]), float(agent["end_ms"])
+    spans = [
+        (max(start, float(tool["start_ms"])), min(end, float(tool["end_ms"])), tool_category(tool["name"], tool.get("label", "")))
+        for tool in tools
+        if not tool.get("parent_tool_use_id")
+    ]
+    spans = [span for span in spans if span[1] > span[0]]
+    bounds = sorted({start, end, *(s for s, _, _ in spans), *(e for _, e, _ in spans)})
+    totals: dict[str, float] = {}
+    for left, right in zip(bounds, bounds[1:]):
+        active = [span for span in spans if span[0] <= left and span[1] >= right]
+        category = max(active, key=lambda span: span[1])[2] if active else MODEL_CATEGORY
+        totals[category] = totals.get(category, 0.0) + (right - left)
+    return totals
+
+
+def profile_run(run_folder: Path) -> dict[str, Any]:
+    """Summarize a run folder's trace into phases, SDK usage, and a critical path."""
+    trace_path = run_folder / TRACE_FILENAME
+    if not trace_path.exists():
+        raise FileNotFoundError(f"trace_missing:{trace_path}")
+    records = load_trace(trace_path)
+    spans = {record["name"]: record for record in records if record.get("type") == "span"}
+    tools = [record for record in records if record.get("type") == "tool"]
+    result = next((record for record in reversed(records) if record.get("type") == "result"), {})
+    last_offset = max((float(record.get("offset_ms") or 0) for record in records), default=0.0)
+    run = spans.get("run")
+    agent = spans.get("agent")
+    wall_ms = float(run["duration_ms"]) if run else last_offset
+    phases: dict[str, float] = {}
+    critical: dict[str, float] = {}
+    if agent:
+        phases = {
+            "prepare": round(float(agent["start_ms"]), 3),
+            "agent": round(float(agent["duration_ms"]), 3),
+            "validate": round(max(0.0, wall_ms - float(agent["end_ms"])), 3),
+        }
+        critical = _critical_path(agent, tools)
+    calls: dict[str, int] = {}
+    for tool in tools:
+        category = tool_category(tool["name"], tool.get("label", ""))
+        calls[category] = calls.get(category, 0) + 1
+    agent_ms = float(agent["duration_ms"]) if agent else 0.0
+    breakdown = [
+        {
+            "category": category,
+            "ms": round(ms, 3),
+            "share": round(ms / agent_ms, 4) if agent_ms else 0.0,
+            "calls": calls.get(category, 0),
+        }
+        for category, ms in sorted(critical.items(), key=lambda item: -item[1])
+    ]
+    return {
+        "run_folder": str(run_folder),
+        "run_id": run_folder.name,
+        "status": (run or agent or {}).get("status", "unknown"),
+        "wall_ms": round(wall_ms, 3),
+        "phases": phases,
+        "sdk": {
+            "duration_ms": result.get("duration_ms"),
+            "duration_api_ms": result.get("duration_api_ms"),
+            "num_turns": result.get("num_turns"),
+            "usage": result.get("usage") or {},
+            "total_cost_usd": result.get("total_cost_usd"),
+        },
+        "critical_path": breakdown,
+        "tool_calls": len(tools),
+    }
+
+
+def discover_run_folders(workspace_roots: list[Path], *, limit: int = 50) -> list[Path]:
+    """Return the most recent traced run folders under the given workspace roots."""
+    folders: dict[Path, float] = {}
+    for root in workspace_roots:
+        if not root.is_dir():
+            continue
+        for trace_path in root.glob(f"*/{TRACE_FILENAME}"):
+            try:
+                folders[trace_path.parent.resolve()] = trace_path.stat().st_mtime
+            except OSError:
+                continue
+    ordered = sorted(folders, key=lambda folder: folders[folder], reverse=True)
+    return ordered[: max(1, limit)]
+
+
+def aggregate_profiles(profiles: list[dict[str, Any]]) -> dict[str, Any]:
+    """Combine run profiles into per-category critical-path totals and averages."""
+    totals: dict[str, dict[str, float]] = {}
+    wall = 0.0
+    for profile in profiles:
+        wall += float(profile.get("wall_ms") or 0.0)
+        for row in profile.get("critical_path") or []:
+            entry = totals.setdefault(row["category"], {"ms": 0.0, "calls": 0, "runs": 0})
+            entry["ms"] += float(row["ms"])
+            entry["calls"] += int(row["calls"])
+            entry["runs"] += 1
+    count = len(profiles)
+    return {
+        "runs": count,
+        "avg_wall_ms": round(wall / count, 3) if count else 0.0,
+        "categories": [
+            {
+                "category": category,
+                "total_ms": round(entry["ms"], 3),
+                "avg_ms_per_run": round(entry["ms"] / count, 3),
+                "calls": int(entry["calls"]),
+            }
+            for category, entry in sorted(totals.items(), key=lambda item: -item[1]["ms"])
+        ],
+    }
+
+
+if __name__ == "__main__":
+    """Run a real-path self-test for span recording and critical-path attribution."""
+    from tempfile import TemporaryDirectory
+
+    with TemporaryDirectory() as tmp_dir:
+        folder = Path(tmp_dir) / "sync-20260101-000000-abc123"
+        folder.mkdir()
+        tracer = RunTracer(folder / TRACE_FILENAME)
+        with tracer.span("agent"):
+            time.sleep(0.01)
+        tracer.finish()
+        tracer.emit(
+            {"type": "tool", "name": "Bash", "label": "python -m acreta.memory.extract_pipeline", "start_ms": 1.0, "end_ms": 5.0}
+        )
+        profile = profile_run(folder)
+        assert set(profile["phases"]) == {"prepare", "agent", "validate"}
+        assert {row["category"] for row in profile["critical_path"]} == {"model", "extract_pipeline"}
+        assert aggregate_profiles([profile, profile])["runs"] == 2
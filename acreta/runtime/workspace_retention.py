@@ -0,0 +1,195 @@
+"""Workspace run-folder retention: keep recent runs in full, pack older ones into monthly archives.
+
+Run folders (``sync-YYYYMMDD-HHMMSS-xxxxxx`` / ``maintain-...``) newer than
+``keep_days`` or among the newest ``keep_runs`` stay untouched. Older folders are
+appended to ``<workspace>/archive/YYYY-MM.zip`` under ``<run_id>/`` and removed;
+``archive/index.jsonl`` records one line per archived run so it can be found and
+restored later. Archiving is idempotent: a run already present in its month's
+zip is not written twice if a previous compaction stopped before removing it.
+
+Each pass rebuilds a month archive in a temp copy and swaps it in with one
+``os.replace``, so a crash mid-append leaves the previous archive intact; run
+folders are removed only after their archive has been replaced.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import zipfile
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+ARCHIVE_DIRNAME = "archive"
+INDEX_FILENAME = "index.jsonl"
+_RUN_NAME_RE = re.compile(r"^(?P<kind>[a-z]+)-(?P<stamp>\d{8}-\d{6})-[0-9a-f]+$")
+
+
+@dataclass
+class RetentionResult:
+    """Counts and archive names from one workspace compaction."""
+
+    kept: int = 0
+    archived: int = 0
+    bytes_archived: int = 0
+    archives: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-safe representation."""
+        return asdict(self)
+
+
+def run_started_at(folder: Path) -> datetime:
+    """Return a run folder's start time from its name, falling back to mtime."""
+    match = _RUN_NAME_RE.match(folder.name)
+    if match:
+        return datetime.strptime(match.group("stamp"), "%Y%m%d-%H%M%S").replace(tzinfo=timezone.utc)
+    return datetime.fromtimestamp(folder.stat().st_mtime, tz=timezone.utc)
+
+
+def list_run_folders(workspace_root: Path) -> list[Path]:
+    """Return run folders in ``workspace_root``, newest first."""
+    if not workspace_root.is_dir():
+        return []
+    folders = [path for path in workspace_root.iterdir() if path.is_dir() and _RUN_NAME_RE.match(path.name)]
+    return sorted(folders, key=lambda path: (run_started_at(path), path.name), reverse=True)
+
+
+def load_archive_index(workspace_root: Path) -> dict[str, dict[str, Any]]:
+    """Return archived run entries keyed by run id."""
+    index_path = workspace_root / ARCHIVE_DIRNAME / INDEX_FILENAME
+    if not index_path.exists():
+        return {}
+    entries: dict[str, dict[str, Any]] = {}
+    for line in index_path.read_text(encoding="utf-8").splitlines():
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(entry, dict) and entry.get("run_id"):
+            entries[str(entry["run_id"])] = entry
+    return entries
+
+
+def _folder_files(folder: Path) -> tuple[list[Path], list[str], int]:
+    """Return a run folder's files, their archive-relative names, and total byte size."""
+    files = sorted(path for path in folder.rglob("*") if path.is_file())
+    names = [path.relative_to(folder).as_posix() for path in files]
+    return files, names, sum(path.stat().st_size for path in files)
+
+
+def _archive_folders(folders: list[Path], archive_path: Path) -> dict[str, tuple[list[str], int]]:
+    """Append run folders to a zip via a temp copy swapped in once, returning files and sizes per run."""
+    tmp_path = archive_path.with_name(f".{archive_path.name}.tmp")
+    if archive_path.exists():
+        shutil.copyfile(archive_path, tmp_path)
+    else:
+        tmp_path.unlink(missing_ok=True)
+    archived: dict[str, tuple[list[str], int]] = {}
+    try:
+        with zipfile.ZipFile(tmp_path, "a", compression=zipfile.ZIP_DEFLATED) as archive:
+            present = {name.split("/", 1)[0] for name in archive.namelist()}
+            for folder in folders:
+                files, names, size = _folder_files(folder)
+                archived[folder.name] = (names, size)
+                if folder.name in present:
+                    continue
+                for path, name in zip(files, names):
+                    archive.write(path, f"{folder.name}/{name}")
+                present.add(folder.name)
+        with tmp_path.open("rb") as handle:
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, archive_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return archived
+
+
+def compact_workspace(
+    workspace_root: Path,
+    *,
+    keep_runs: int,
+    keep_days: int,
+    exclude: tuple[Path, ...] = (),
+    now: datetime | None = None,
+) -> RetentionResult:
+    """Archive run folders older than both retention limits and remove them."""
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=max(0, keep_days))
+    excluded = {path.resolve() for path in exclude}
+    result = RetentionResult()
+    archive_dir = workspace_root / ARCHIVE_DIRNAME
+    indexed = load_archive_index(workspace_root)
+    by_archive: dict[str, list[tuple[Path, datetime]]] = {}
+    for position, folder in enumerate(list_run_folders(workspace_root)):
+        started = run_started_at(folder)
+        if position < max(0, keep_runs) or started >= cutoff or folder.resolve() in excluded:
+            result.kept += 1
+            continue
+        by_archive.setdefault(f"{started:%Y-%m}.zip", []).append((folder, started))
+    for archive_name, runs in by_archive.items():
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        archived = _archive_folders([folder for folder, _ in runs], archive_dir / archive_name)
+        for folder, started in runs:
+            files, size = archived[folder.name]
+            if folder.name not in indexed:
+                entry = {
+                    "run_id": folder.name,
+                    "kind": folder.name.split("-", 1)[0],
+                    "started_at": started.isoformat(),
+                    "archive": archive_name,
+                    "files": files,
+                    "bytes": size,
+                    "archived_at": now.isoformat(),
+                }
+                with (archive_dir / INDEX_FILENAME).open("a", encoding="utf-8") as handle:
+                    handle.write(json.dumps(entry, ensure_ascii=True) + "\n")
+                indexed[folder.name] = entry
+            shutil.rmtree(folder)
+            result.archived += 1
+            result.bytes_archived += size
+        result.archives.append(archive_name)
+    return result
+
+
+def restore_archived_run(workspace_root: Path, run_id: str, dest: Path | None = None) -> Path:
+    """Extract one archived run folder into ``dest`` (default: the workspace)."""
+    entry = load_archive_index(workspace_root).get(run_id)
+    if entry is None:
+        raise FileNotFoundError(f"archived_run_missing:{run_id}")
+    target_root = (dest or workspace_root).resolve()
+    target = target_root / run_id
+    prefix = f"{run_id}/"
+    with zipfile.ZipFile(workspace_root / ARCHIVE_DIRNAME / str(entry["archive"])) as archive:
+        for name in archive.namelist():
+            if not name.startswith(prefix):
+                continue
+            out_path = (target_root / name).resolve()
+            if target not in out_path.parents:
+                raise RuntimeError(f"archive_member_outside_run:{name}")
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            out_path.write_bytes(archive.read(name))
+    return target
+
+
+if __name__ == "__main__":
+    """Run a real-path self-test for compaction, idempotence, and restore."""
+    from tempfile import TemporaryDirectory
+
+    with TemporaryDirectory() as tmp_dir:
+        workspace = Path(tmp_dir)
+        for name in ("sync-20250105-000000-aaaaaa", "maintain-20250220-000000-bbbbbb", "sync-20260101-000000-cccccc"):
+            (workspace / name).mkdir()
+            (workspace / name / "extract.json").write_text("[]\n", encoding="utf-8")
+        stats = compact_workspace(workspace, keep_runs=1, keep_days=30, now=datetime(2026, 1, 2, tzinfo=timezone.utc))
+        assert (stats.kept, stats.archived, stats.archives) == (1, 2, ["2025-02.zip", "2025-01.zip"])
+        assert not (workspace / "sync-20250105-000000-aaaaaa").exists()
+        restored = restore_archived_run(workspace, "sync-20250105-000000-aaaaaa")
+        assert (restored / "extract.json").read_text(encoding="utf-8") == "[]\n"
+        again = compact_workspace(workspace, keep_runs=1, keep_days=30, now=datetime(2026, 1, 2, tzinfo=timezone.utc))
+        assert again.archived == 1 and len(load_archive_index(workspace)) == 2
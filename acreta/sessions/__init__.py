@@ -2,22 +2,32 @@
 
 from acreta.sessions.catalog import (
     IndexedSession,
+    TraceWatermark,
     claim_session_jobs,
     complete_session_job,
+    compute_trace_watermark,
     count_fts_indexed,
     count_session_jobs_by_status,
     enqueue_session_job,
     fail_session_job,
     fetch_session_doc,
+    fetch_session_metrics,
+    fetch_session_watermark,
     get_indexed_run_ids,
     index_new_sessions,
     index_session_for_fts,
     init_sessions_db,
+    is_append_only_trace,
     latest_service_run,
+    list_grown_sessions,
     list_session_jobs,
     list_sessions_for_vectors,
     list_sessions_window,
     record_service_run,
+    record_session_metrics,
+    record_session_watermark,
+    refresh_session_metrics,
+    resolve_extraction_start,
     update_session_extract_fields,
 )
 
@@ -40,4 +50,14 @@ __all__ = [
     "count_session_jobs_by_status",
     "record_service_run",
     "latest_service_run",
+    "TraceWatermark",
+    "compute_trace_watermark",
+    "is_append_only_trace",
+    "record_session_watermark",
+    "fetch_session_watermark",
+    "resolve_extraction_start",
+    "list_grown_sessions",
+    "record_session_metrics",
+    "refresh_session_metrics",
+    "fetch_session_metrics",
 ]
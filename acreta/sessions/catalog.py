@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import sqlite3
@@ -15,6 +16,7 @@ from typing import Any
 from acreta.adapters import registry as adapter_registry
 from acreta.config.logging import logger
 from acreta.config.settings import get_config, reload_config
+from acreta.sessions.metrics import compute_session_metrics
 
 
 JOB_TYPE_EXTRACT = "extract"
@@ -23,8 +25,10 @@ JOB_STATUS_RUNNING = "running"
 JOB_STATUS_DONE = "done"
 JOB_STATUS_FAILED = "failed"
 JOB_STATUS_DEAD_LETTER = "dead_letter"
+JOB_STATUS_SKIPPED_TRIVIAL = "skipped_trivial"
 SESSION_JOB_TERMINAL = {JOB_STATUS_DONE, JOB_STATUS_DEAD_LETTER}
 SESSION_JOB_ACTIVE = {JOB_STATUS_PENDING, JOB_STATUS_RUNNING}
+APPEND_ONLY_TRACE_SUFFIX = ".jsonl"
 _DB_INIT_LOCK = threading.Lock()
 _DB_INITIALIZED_PATH: Path | None = None
 
@@ -37,6 +41,16 @@ class IndexedSession:
     agent_type: str
     session_path: str
     start_time: str | None
+    retriage: bool = False
+
+
+@dataclass(frozen=True)
+class TraceWatermark:
+    """Line-aligned extraction watermark for one append-only trace file."""
+
+    byte_offset: int
+    line_count: int
+    content_hash: str
 
 
 def _utc_now() -> datetime:
@@ -188,6 +202,7 @@ def init_sessions_db() -> None:
                 completed_at TEXT,
                 heartbeat_at TEXT,
                 error TEXT,
+                skip_reason TEXT,
                 created_at TEXT NOT NULL,
                 updated_at TEXT NOT NULL,
                 UNIQUE(run_id, job_type)
@@ -218,6 +233,7 @@ def init_sessions_db() -> None:
             "completed_at": "TEXT",
             "heartbeat_at": "TEXT",
             "error": "TEXT",
+            "skip_reason": "TEXT",
             "created_at": "TEXT",
             "updated_at": "TEXT",
         }
@@ -256,6 +272,39 @@ def init_sessions_db() -> None:
             (JOB_STATUS_DONE,),
         )
 
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS session_watermarks (
+                run_id TEXT PRIMARY KEY,
+                session_path TEXT,
+                byte_offset INTEGER NOT NULL DEFAULT 0,
+                line_count INTEGER NOT NULL DEFAULT 0,
+                content_hash TEXT NOT NULL DEFAULT '',
+                summary_path TEXT,
+                extracted_at TEXT NOT NULL
+            )
+            """
+        )
+
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS session_metrics (
+                run_id TEXT PRIMARY KEY,
+                metrics_json TEXT NOT NULL,
+                byte_offset INTEGER NOT NULL DEFAULT 0,
+                computed_at TEXT NOT NULL
+            )
+            """
+        )
+        metrics_columns = {
+            str(row["name"])
+            for row in conn.execute("PRAGMA table_info(session_metrics)").fetchall()
+        }
+        if "byte_offset" not in metrics_columns:
+            conn.execute(
+                "ALTER TABLE session_metrics ADD COLUMN byte_offset INTEGER NOT NULL DEFAULT 0"
+            )
+
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS service_runs (
@@ -474,6 +523,82 @@ def list_sessions_for_vectors(limit: int = 2000) -> list[dict[str, Any]]:
     return rows
 
 
+def record_session_metrics(
+    run_id: str, metrics: dict[str, Any], *, byte_offset: int = 0
+) -> bool:
+    """Store the deterministic metrics profile computed for one session.
+
+    ``byte_offset`` is the trace size the profile covers; it is the growth
+    baseline for sessions that triage skipped and never got a watermark.
+    """
+    if not run_id:
+        return False
+    _ensure_sessions_db_initialized()
+    with _connect() as conn:
+        conn.execute(
+            """
+            INSERT INTO session_metrics (run_id, metrics_json, byte_offset, computed_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(run_id) DO UPDATE SET
+                metrics_json = excluded.metrics_json,
+                byte_offset = excluded.byte_offset,
+                computed_at = excluded.computed_at
+            """,
+            (
+                run_id,
+                json.dumps(metrics, ensure_ascii=True),
+                max(0, int(byte_offset)),
+                _iso_now(),
+            ),
+        )
+        conn.commit()
+    return True
+
+
+def _trace_size(session_path: Path) -> int:
+    """Return the trace size in bytes, or 0 when it cannot be stat'ed."""
+    try:
+        return session_path.stat().st_size
+    except OSError:
+        return 0
+
+
+def refresh_session_metrics(run_id: str, session_path: str | Path) -> dict[str, Any] | None:
+    """Recompute and store the metrics profile of a trace that changed since indexing."""
+    size = _trace_size(Path(session_path))
+    metrics = compute_session_metrics(Path(session_path))
+    if metrics is None:
+        return None
+    payload = metrics.to_dict()
+    record_session_metrics(run_id, payload, byte_offset=size)
+    return payload
+
+
+def fetch_session_metrics(run_ids: list[str]) -> dict[str, dict[str, Any]]:
+    """Fetch stored metrics profiles keyed by run id."""
+    ids = [rid for rid in dict.fromkeys(run_ids) if rid]
+    if not ids:
+        return {}
+    _ensure_sessions_db_initialized()
+    profiles: dict[str, dict[str, Any]] = {}
+    with _connect() as conn:
+        for start in range(0, len(ids), 500):
+            batch = ids[start : start + 500]
+            placeholders = ",".join("?" for _ in batch)
+            rows = conn.execute(
+                f"SELECT run_id, metrics_json FROM session_metrics WHERE run_id IN ({placeholders})",
+                batch,
+            ).fetchall()
+            for row in rows:
+                try:
+                    payload = json.loads(row.get("metrics_json") or "{}")
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(payload, dict):
+                    profiles[str(row.get("run_id"))] = payload
+    return profiles
+
+
 def index_new_sessions(
     *,
     agents: list[str] | None = None,
@@ -494,12 +619,14 @@ def index_new_sessions(
     indexed_run_ids = get_indexed_run_ids()
 
     new_sessions: list[IndexedSession] = []
+    scanned_agents: list[str] = []
 
     for agent_name in selected_agents:
         adapter = adapter_registry.get_adapter(agent_name)
         traces_dir = connected_paths.get(agent_name)
         if adapter is None or traces_dir is None:
             continue
+        scanned_agents.append(agent_name)
 
         try:
             sessions = adapter.iter_sessions(
@@ -518,6 +645,8 @@ def index_new_sessions(
             if session.run_id in indexed_run_ids:
                 continue
 
+            trace_size = _trace_size(Path(session.session_path))
+            metrics = compute_session_metrics(Path(session.session_path))
             summaries_json = json.dumps(session.summaries, ensure_ascii=True)
             summary_text = "\n".join(item for item in session.summaries if item)
             content = summary_text
@@ -531,7 +660,8 @@ def index_new_sessions(
                 repo_name=session.repo_name,
                 start_time=session.start_time,
                 status=session.status,
-                duration_ms=session.duration_ms,
+                duration_ms=session.duration_ms
+                or (metrics.duration_ms if metrics else 0),
                 message_count=session.message_count,
                 tool_call_count=session.tool_call_count,
                 error_count=session.error_count,
@@ -542,6 +672,10 @@ def index_new_sessions(
             )
             if not indexed:
                 continue
+            if metrics is not None:
+                record_session_metrics(
+                    session.run_id, metrics.to_dict(), byte_offset=trace_size
+                )
 
             indexed_run_ids.add(session.run_id)
             new_sessions.append(
@@ -553,9 +687,230 @@ def index_new_sessions(
                 )
             )
 
+    if scanned_agents:
+        try:
+            adapter_registry.refresh_platform_counts(
+                config.platforms_path, scanned_agents, only_changed=True
+            )
+        except Exception as exc:
+            logger.warning("platform counter refresh failed | error={}", str(exc))
+
     return new_sessions if return_details else len(new_sessions)
 
 
+def is_append_only_trace(session_path: str | Path) -> bool:
+    """Return whether a trace is an append-only JSONL file that supports watermarks.
+
+    Cursor sessions share one ``state.vscdb`` and OpenCode sessions are rewritten
+    JSON documents, so byte offsets into them never describe an extracted prefix.
+    """
+    return Path(session_path).suffix == APPEND_ONLY_TRACE_SUFFIX
+
+
+def has_complete_line_after(session_path: Path, offset: int) -> bool:
+    """Return whether the trace holds a newline-terminated line past ``offset``."""
+    try:
+        if session_path.stat().st_size <= offset:
+            return False
+        with session_path.open("rb") as handle:
+            handle.seek(max(0, int(offset)))
+            while chunk := handle.read(1 << 16):
+                if b"\n" in chunk:
+                    return True
+    except OSError:
+        return False
+    return False
+
+
+def compute_trace_watermark(
+    session_path: Path, *, limit: int | None = None
+) -> TraceWatermark | None:
+    """Hash a trace file up to its last complete line in one streaming pass.
+
+    ``limit`` caps the scanned byte range, which lets callers re-hash only the
+    prefix covered by an earlier watermark.
+    """
+    digest = hashlib.sha256()
+    aligned_digest = digest.copy()
+    aligned_offset = 0
+    line_count = 0
+    scanned = 0
+    try:
+        with session_path.open("rb") as handle:
+            while limit is None or scanned < limit:
+                chunk_size = 1 << 20 if limit is None else min(1 << 20, limit - scanned)
+                chunk = handle.read(chunk_size)
+                if not chunk:
+                    break
+                last_newline = chunk.rfind(b"\n")
+                if last_newline >= 0:
+                    digest.update(chunk[: last_newline + 1])
+                    aligned_digest = digest.copy()
+                    aligned_offset = scanned + last_newline + 1
+                    line_count += chunk.count(b"\n")
+                    digest.update(chunk[last_newline + 1 :])
+                else:
+                    digest.update(chunk)
+                scanned += len(chunk)
+    except OSError:
+        return None
+    return TraceWatermark(
+        byte_offset=aligned_offset,
+        line_count=line_count,
+        content_hash=aligned_digest.hexdigest(),
+    )
+
+
+def record_session_watermark(
+    run_id: str,
+    *,
+    session_path: str,
+    watermark: TraceWatermark,
+    summary_path: str | None = None,
+) -> bool:
+    """Persist the extraction watermark reached by one successful sync."""
+    if not run_id:
+        return False
+    _ensure_sessions_db_initialized()
+    with _connect() as conn:
+        conn.execute(
+            """
+            INSERT INTO session_watermarks (
+                run_id, session_path, byte_offset, line_count, content_hash,
+                summary_path, extracted_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(run_id) DO UPDATE SET
+                session_path = excluded.session_path,
+                byte_offset = excluded.byte_offset,
+                line_count = excluded.line_count,
+                content_hash = excluded.content_hash,
+                summary_path = COALESCE(excluded.summary_path, session_watermarks.summary_path),
+                extracted_at = excluded.extracted_at
+            """,
+            (
+                run_id,
+                session_path,
+                int(watermark.byte_offset),
+                int(watermark.line_count),
+                watermark.content_hash,
+                summary_path,
+                _iso_now(),
+            ),
+        )
+        conn.commit()
+    return True
+
+
+def rewrite_summary_paths(path_map: dict[str, str]) -> int:
+    """Point stored watermark summary paths at their new locations and return rows changed."""
+    if not path_map:
+        return 0
+    _ensure_sessions_db_initialized()
+    changed = 0
+    with _connect() as conn:
+        for old_path, new_path in path_map.items():
+            cursor = conn.execute(
+                "UPDATE session_watermarks SET summary_path = ? WHERE summary_path = ?",
+                (new_path, old_path),
+            )
+            changed += int(cursor.rowcount or 0)
+        conn.commit()
+    return changed
+
+
+def fetch_session_watermark(run_id: str) -> dict[str, Any] | None:
+    """Fetch the stored extraction watermark row for one run id."""
+    if not run_id:
+        return None
+    _ensure_sessions_db_initialized()
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT * FROM session_watermarks WHERE run_id = ?", (run_id,)
+        ).fetchone()
+    return row if isinstance(row, dict) else None
+
+
+def resolve_extraction_start(run_id: str, session_path: Path) -> dict[str, Any]:
+    """Return the byte offset and prior summary to resume extraction from.
+
+    Falls back to a full extraction (offset 0) when no watermark exists or the
+    already-processed prefix no longer hashes to the recorded value, which
+    means the trace was rewritten rather than appended to.
+    """
+    row = fetch_session_watermark(run_id) if is_append_only_trace(session_path) else None
+    if not row:
+        return {"start_offset": 0, "previous_summary_path": None}
+    offset = int(row.get("byte_offset") or 0)
+    prefix = compute_trace_watermark(session_path, limit=offset) if offset else None
+    if (
+        prefix is None
+        or prefix.byte_offset != offset
+        or prefix.content_hash != str(row.get("content_hash") or "")
+    ):
+        return {"start_offset": 0, "previous_summary_path": None}
+    return {
+        "start_offset": offset,
+        "previous_summary_path": row.get("summary_path") or None,
+    }
+
+
+def list_grown_sessions(*, limit: int = 500) -> list[IndexedSession]:
+    """List extracted or triaged-out JSONL sessions with new complete lines.
+
+    Completed extract jobs are compared against their watermark; sessions that
+    triage skipped are compared against the trace size their metrics profile
+    covers and come back with ``retriage=True``. Active or retrying jobs are
+    never re-enqueued underneath a running worker. A trailing partial line does
+    not count as growth, since the next watermark would stop before it anyway.
+    """
+    _ensure_sessions_db_initialized()
+    with _connect() as conn:
+        rows = conn.execute(
+            """
+            SELECT j.run_id, j.status, d.agent_type, d.start_time,
+                COALESCE(w.session_path, j.session_path, d.session_path) AS session_path,
+                CASE WHEN j.status = ? THEN w.byte_offset ELSE m.byte_offset END AS byte_offset
+            FROM session_jobs j
+            LEFT JOIN session_watermarks w ON w.run_id = j.run_id
+            LEFT JOIN session_metrics m ON m.run_id = j.run_id
+            LEFT JOIN session_docs d ON d.run_id = j.run_id
+            WHERE j.job_type = ?
+                AND (
+                    (j.status = ? AND w.run_id IS NOT NULL)
+                    OR (j.status = ? AND m.run_id IS NOT NULL)
+                )
+            ORDER BY COALESCE(w.extracted_at, m.computed_at) ASC
+            LIMIT ?
+            """,
+            (
+                JOB_STATUS_DONE,
+                JOB_TYPE_EXTRACT,
+                JOB_STATUS_DONE,
+                JOB_STATUS_SKIPPED_TRIVIAL,
+                max(1, int(limit)),
+            ),
+        ).fetchall()
+
+    grown: list[IndexedSession] = []
+    for row in rows:
+        raw_path = str(row.get("session_path") or "").strip()
+        if not raw_path or not is_append_only_trace(raw_path):
+            continue
+        if not has_complete_line_after(Path(raw_path), int(row.get("byte_offset") or 0)):
+            continue
+        grown.append(
+            IndexedSession(
+                run_id=str(row.get("run_id")),
+                agent_type=str(row.get("agent_type") or ""),
+                session_path=raw_path,
+                start_time=row.get("start_time"),
+                retriage=row.get("status") == JOB_STATUS_SKIPPED_TRIVIAL,
+            )
+        )
+    return grown
+
+
 def enqueue_session_job(
     run_id: str,
     *,
@@ -583,7 +938,7 @@ def enqueue_session_job(
             existing
             and not force
             and str(existing.get("status") or "")
-            in SESSION_JOB_ACTIVE.union({JOB_STATUS_DONE})
+            in SESSION_JOB_ACTIVE.union({JOB_STATUS_DONE, JOB_STATUS_SKIPPED_TRIVIAL})
         ):
             return False
 
@@ -594,7 +949,7 @@ def enqueue_session_job(
                 SET agent_type = ?, session_path = ?, start_time = ?, status = ?,
                     attempts = 0, trigger = ?, available_at = ?, claimed_at = NULL,
                     completed_at = NULL, heartbeat_at = NULL, error = NULL,
-                    updated_at = ?, max_attempts = ?
+                    skip_reason = NULL, updated_at = ?, max_attempts = ?
                 WHERE run_id = ? AND job_type = ?
                 """,
                 (
@@ -637,6 +992,51 @@ def enqueue_session_job(
     return True
 
 
+def skip_session_job(
+    run_id: str,
+    *,
+    reason: str,
+    job_type: str = JOB_TYPE_EXTRACT,
+    agent_type: str | None = None,
+    session_path: str | None = None,
+    start_time: str | None = None,
+    trigger: str | None = None,
+) -> bool:
+    """Record a session as triaged out so it is never claimed for extraction."""
+    if not run_id:
+        return False
+    _ensure_sessions_db_initialized()
+    now = _iso_now()
+    with _connect() as conn:
+        cursor = conn.execute(
+            """
+            INSERT INTO session_jobs (
+                run_id, job_type, agent_type, session_path, start_time, status,
+                attempts, trigger, available_at, completed_at, skip_reason,
+                created_at, updated_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(run_id, job_type) DO NOTHING
+            """,
+            (
+                run_id,
+                job_type,
+                agent_type,
+                session_path,
+                start_time,
+                JOB_STATUS_SKIPPED_TRIVIAL,
+                trigger,
+                now,
+                now,
+                reason,
+                now,
+                now,
+            ),
+        )
+        conn.commit()
+    return cursor.rowcount > 0
+
+
 def claim_session_jobs(
     *,
     limit: int = 20,
@@ -866,6 +1266,7 @@ def count_session_jobs_by_status() -> dict[str, int]:
         JOB_STATUS_DONE,
         JOB_STATUS_FAILED,
         JOB_STATUS_DEAD_LETTER,
+        JOB_STATUS_SKIPPED_TRIVIAL,
     ):
         counts.setdefault(status, 0)
     return counts
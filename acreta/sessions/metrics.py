@@ -0,0 +1,248 @@
+"""Deterministic per-session metrics computed in one streaming pass over a trace."""
+
+from __future__ import annotations
+
+import json
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from acreta.adapters.common import parse_timestamp
+
+FILE_INPUT_KEYS = ("file_path", "path", "notebook_path", "filePath")
+MAX_FILES_TOUCHED = 50
+
+
+@dataclass
+class SessionMetrics:
+    """Per-session profile passed to pipelines as the ``metrics`` input."""
+
+    message_count: int = 0
+    user_turns: int = 0
+    assistant_turns: int = 0
+    tool_calls: int = 0
+    tool_usage: dict[str, int] = field(default_factory=dict)
+    error_turns: int = 0
+    retries: int = 0
+    files_touched: list[str] = field(default_factory=list)
+    duration_ms: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+    model_usage: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable metrics payload."""
+        return asdict(self)
+
+
+class _MetricsAccumulator:
+    """Mutable state for one streaming metrics pass."""
+
+    def __init__(self) -> None:
+        self.metrics = SessionMetrics()
+        self.tools: Counter[str] = Counter()
+        self.files: dict[str, None] = {}
+        self.first_ts: datetime | None = None
+        self.last_ts: datetime | None = None
+        self.last_call: tuple[str, str] | None = None
+        self.model: str | None = None
+
+    def see_timestamp(self, raw: Any) -> None:
+        """Track the first and last timestamps seen in the trace."""
+        ts = parse_timestamp(raw)
+        if ts is None:
+            return
+        if self.first_ts is None or ts < self.first_ts:
+            self.first_ts = ts
+        if self.last_ts is None or ts > self.last_ts:
+            self.last_ts = ts
+
+    def see_tool_call(self, name: str, tool_input: Any) -> None:
+        """Count one tool call, its touched file, and back-to-back retries."""
+        self.metrics.tool_calls += 1
+        self.tools[name or "tool"] += 1
+        if isinstance(tool_input, str):
+            try:
+                tool_input = json.loads(tool_input)
+            except json.JSONDecodeError:
+                tool_input = {"raw": tool_input}
+        if isinstance(tool_input, dict):
+            for key in FILE_INPUT_KEYS:
+                value = tool_input.get(key)
+                if isinstance(value, str) and value.strip():
+                    self.files.setdefault(value.strip(), None)
+                    break
+        signature = (name, json.dumps(tool_input, sort_keys=True, default=str))
+        if signature == self.last_call:
+            self.metrics.retries += 1
+        self.last_call = signature
+
+    def see_usage(self, model: str | None, input_tokens: int, output_tokens: int) -> None:
+        """Add token usage to totals and the per-model breakdown."""
+        self.metrics.input_tokens += input_tokens
+        self.metrics.output_tokens += output_tokens
+        key = model or self.model or "unknown"
+        bucket = self.metrics.model_usage.setdefault(
+            key, {"input": 0, "output": 0, "total": 0, "calls": 0}
+        )
+        bucket["input"] += input_tokens
+        bucket["output"] += output_tokens
+        bucket["total"] += input_tokens + output_tokens
+        bucket["calls"] += 1
+
+    def finish(self) -> SessionMetrics:
+        """Finalize derived fields and return the metrics profile."""
+        metrics = self.metrics
+        metrics.message_count = metrics.user_turns + metrics.assistant_turns
+        metrics.tool_usage = dict(self.tools.most_common())
+        metrics.files_touched = list(self.files)[:MAX_FILES_TOUCHED]
+        metrics.total_tokens = metrics.input_tokens + metrics.output_tokens
+        if self.first_ts and self.last_ts:
+            metrics.duration_ms = int(
+                (self.last_ts - self.first_ts).total_seconds() * 1000
+            )
+        return metrics
+
+
+def _see_claude_entry(acc: _MetricsAccumulator, entry: dict[str, Any]) -> None:
+    """Fold one Claude JSONL entry into the accumulator."""
+    entry_type = entry.get("type")
+    message = entry.get("message")
+    if not isinstance(message, dict):
+        return
+    content = message.get("content")
+    blocks = content if isinstance(content, list) else []
+    if entry_type == "user":
+        is_tool_result = False
+        for block in blocks:
+            if isinstance(block, dict) and block.get("type") == "tool_result":
+                is_tool_result = True
+                if block.get("is_error"):
+                    acc.metrics.error_turns += 1
+        if not is_tool_result:
+            acc.metrics.user_turns += 1
+        return
+    if entry_type != "assistant":
+        return
+    acc.metrics.assistant_turns += 1
+    for block in blocks:
+        if isinstance(block, dict) and block.get("type") == "tool_use":
+            acc.see_tool_call(str(block.get("name") or ""), block.get("input"))
+    usage = message.get("usage")
+    if isinstance(usage, dict):
+        model = str(message.get("model") or "") or None
+        acc.see_usage(
+            model,
+            int(usage.get("input_tokens", 0) or 0),
+            int(usage.get("output_tokens", 0) or 0),
+        )
+
+
+def _codex_output_failed(output: Any) -> bool:
+    """Return whether a Codex tool output reports a non-zero ``metadata.exit_code``."""
+    if isinstance(output, str):
+        try:
+            output = json.loads(output)
+        except json.JSONDecodeError:
+            return False
+    metadata = output.get("metadata") if isinstance(output, dict) else None
+    exit_code = metadata.get("exit_code") if isinstance(metadata, dict) else None
+    return isinstance(exit_code, int) and exit_code != 0
+
+
+def _see_codex_entry(acc: _MetricsAccumulator, entry: dict[str, Any]) -> None:
+    """Fold one Codex JSONL entry into the accumulator."""
+    payload = entry.get("payload")
+    if not isinstance(payload, dict):
+        return
+    entry_type = entry.get("type")
+    ptype = payload.get("type")
+    if entry_type == "turn_context" and payload.get("model"):
+        acc.model = str(payload.get("model"))
+    elif entry_type == "event_msg":
+        if ptype == "user_message":
+            acc.metrics.user_turns += 1
+        elif ptype == "agent_message":
+            acc.metrics.assistant_turns += 1
+        elif ptype == "token_count":
+            usage = (payload.get("info") or {}).get("last_token_usage")
+            if isinstance(usage, dict):
+                acc.see_usage(
+                    None,
+                    int(usage.get("input_tokens", 0) or 0),
+                    int(usage.get("output_tokens", 0) or 0)
+                    + int(usage.get("reasoning_output_tokens", 0) or 0),
+                )
+    elif entry_type == "response_item":
+        if ptype in {"function_call", "custom_tool_call"}:
+            acc.see_tool_call(
+                str(payload.get("name") or ""),
+                payload.get("arguments", payload.get("input")),
+            )
+        elif ptype in {"function_call_output", "custom_tool_call_output"}:
+            if _codex_output_failed(payload.get("output")):
+                acc.metrics.error_turns += 1
+
+
+def compute_session_metrics(session_path: Path) -> SessionMetrics | None:
+    """Compute a metrics profile for one JSONL trace, or None when unreadable."""
+    if session_path.suffix != ".jsonl":
+        return None
+    acc = _MetricsAccumulator()
+    try:
+        with session_path.open("r", encoding="utf-8", errors="replace") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(entry, dict):
+                    continue
+                payload = entry.get("payload")
+                acc.see_timestamp(
+                    entry.get("timestamp")
+                    or (payload.get("timestamp") if isinstance(payload, dict) else None)
+                )
+                if isinstance(payload, dict):
+                    _see_codex_entry(acc, entry)
+                else:
+                    _see_claude_entry(acc, entry)
+    except OSError:
+        return None
+    return acc.finish()
+
+
+if __name__ == "__main__":
+    from tempfile import TemporaryDirectory
+
+    with TemporaryDirectory() as tmp_dir:
+        trace = Path(tmp_dir) / "session.jsonl"
+        edit = {"type": "tool_use", "name": "Edit", "input": {"file_path": "a.py"}}
+        lines = [
+            {"type": "user", "timestamp": "2026-01-01T00:00:00Z", "message": {"content": "fix"}},
+            {
+                "type": "assistant",
+                "timestamp": "2026-01-01T00:00:05Z",
+                "message": {"model": "m1", "content": [edit, edit], "usage": {"input_tokens": 3, "output_tokens": 2}},
+            },
+            {
+                "type": "user",
+                "timestamp": "2026-01-01T00:00:09Z",
+                "message": {"content": [{"type": "tool_result", "is_error": True}]},
+            },
+        ]
+        trace.write_text("\n".join(json.dumps(item) for item in lines) + "\n", encoding="utf-8")
+        result = compute_session_metrics(trace)
+        assert result is not None
+        assert result.tool_usage == {"Edit": 2}
+        assert result.retries == 1
+        assert result.error_turns == 1
+        assert result.files_touched == ["a.py"]
+        assert result.duration_ms == 9000
+        assert result.model_usage["m1"]["total"] == 5
@@ -0,0 +1,92 @@
+"""Rule-based triage that skips trivial sessions before LLM extraction."""
+
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable
+
+from acreta.config.logging import logger
+from acreta.config.settings import Config
+
+
+@dataclass(frozen=True)
+class TriageDecision:
+    """Triage outcome for one indexed session."""
+
+    trivial: bool
+    reason: str = ""
+
+
+@lru_cache(maxsize=4)
+def _load_classifier(spec: str) -> Callable[[dict[str, Any]], Any] | None:
+    """Import a ``module:function`` classifier, returning None when unavailable."""
+    module_name, _, attr = spec.partition(":")
+    try:
+        func = getattr(importlib.import_module(module_name), attr)
+    except (ImportError, AttributeError) as exc:
+        logger.warning("triage classifier unavailable | spec={} error={}", spec, str(exc))
+        return None
+    return func if callable(func) else None
+
+
+def triage_session(
+    doc: dict[str, Any], metrics: dict[str, Any] | None, config: Config
+) -> TriageDecision:
+    """Decide whether one session is too small to be worth extracting.
+
+    ``doc`` is the ``session_docs`` row and ``metrics`` the stored metrics
+    profile. A configured classifier is consulted first; a ``None`` answer or
+    a raised exception falls through to the threshold rules.
+    """
+    profile = metrics or {}
+    messages = int(profile.get("message_count") or doc.get("message_count") or 0)
+    tool_calls = int(profile.get("tool_calls") or doc.get("tool_call_count") or 0)
+    errors = int(profile.get("error_turns") or doc.get("error_count") or 0)
+    tokens = int(profile.get("total_tokens") or doc.get("total_tokens") or 0)
+    duration_ms = int(profile.get("duration_ms") or doc.get("duration_ms") or 0)
+
+    if config.triage_classifier:
+        classifier = _load_classifier(config.triage_classifier)
+        verdict = None
+        if classifier:
+            try:
+                verdict = classifier(
+                    {
+                        "message_count": messages,
+                        "tool_calls": tool_calls,
+                        "error_turns": errors,
+                        "total_tokens": tokens,
+                        "duration_ms": duration_ms,
+                        **profile,
+                    }
+                )
+            except Exception as exc:
+                logger.warning(
+                    "triage classifier failed, using rules | spec={} error={}",
+                    config.triage_classifier,
+                    str(exc),
+                )
+        if verdict is not None:
+            return TriageDecision(bool(verdict), "classifier" if verdict else "")
+
+    if messages < config.triage_min_messages:
+        return TriageDecision(True, f"messages<{config.triage_min_messages}")
+    if (
+        tool_calls < config.triage_min_tool_calls
+        and errors == 0
+        and tokens < config.triage_min_tokens
+        and duration_ms < config.triage_min_duration_seconds * 1000
+    ):
+        return TriageDecision(True, "low_activity")
+    return TriageDecision(False)
+
+
+if __name__ == "__main__":
+    from acreta.config.settings import get_config
+
+    cfg = get_config()
+    assert triage_session({"message_count": 1}, None, cfg).trivial
+    busy = {"message_count": 40, "tool_calls": 12, "total_tokens": 50_000}
+    assert not triage_session({}, busy, cfg).trivial
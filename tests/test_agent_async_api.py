@@ -0,0 +1,96 @@
+"""Test the async-native AcretaAgent API and batch sync."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import claude_agent_sdk  # noqa: F401  # warm the lazy SDK import so job timeouts measure jobs only
+
+from acreta.runtime.agent import AcretaAgent, SyncJob
+
+
+def _prompt_value(prompt: str, name: str) -> str:
+    """Read one ``- name: value`` input line from the sync prompt."""
+    for line in prompt.splitlines():
+        if line.startswith(f"- {name}: "):
+            return line.split(": ", 1)[1].strip()
+    raise AssertionError(f"{name} not found in prompt")
+
+
+def _install_fake_sdk(monkeypatch, active: dict[str, int]) -> None:
+    """Patch the SDK run with an async fake that writes valid sync artifacts."""
+
+    async def _fake_run(_self, *, prompt: str, session_id, **_kwargs):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        try:
+            trace = _prompt_value(prompt, "trace_path")
+            await asyncio.sleep(2 if "slow" in trace else 0.05)
+            artifacts = json.loads(_prompt_value(prompt, "artifact_paths_json"))
+            memory_root = Path(_prompt_value(prompt, "memory_root_path"))
+            summary = memory_root / "summaries" / f"{Path(trace).stem}.md"
+            summary.parent.mkdir(parents=True, exist_ok=True)
+            summary.write_text("---\ntitle: s\n---\nbody\n", encoding="utf-8")
+            Path(artifacts["extract"]).write_text("[]\n", encoding="utf-8")
+            Path(artifacts["summary"]).write_text(json.dumps({"summary_path": str(summary)}), encoding="utf-8")
+            report = {"counts": {"add": 0, "update": 0, "no_op": 0}, "written_memory_paths": []}
+            Path(artifacts["memory_actions"]).write_text(json.dumps(report), encoding="utf-8")
+            return "ok", session_id or "session"
+        finally:
+            active["now"] -= 1
+
+    monkeypatch.setattr(AcretaAgent, "_run_sdk_once", _fake_run)
+
+
+def test_sync_batch_runs_concurrently_with_structured_results(tmp_path, monkeypatch) -> None:
+    """Jobs on separate memory roots share one loop up to the concurrency cap; failures and timeouts stay per job."""
+    active = {"now": 0, "peak": 0}
+    _install_fake_sdk(monkeypatch, active)
+    traces = []
+    for name in ("a", "b", "c", "d", "slow"):
+        trace = tmp_path / f"{name}.jsonl"
+        trace.write_text('{"role":"user","content":"hi"}\n', encoding="utf-8")
+        traces.append(trace)
+    jobs = [SyncJob(trace_path=trace, memory_root=tmp_path / trace.stem / "memory") for trace in traces]
+    jobs.append(SyncJob(trace_path=tmp_path / "missing.jsonl"))
+
+    agent = AcretaAgent(default_cwd=str(tmp_path))
+    results = agent.sync_batch(jobs, concurrency=3, job_timeout=0.5)
+
+    assert [item.status for item in results] == ["ok", "ok", "ok", "ok", "timeout", "error"]
+    assert active["peak"] == 3
+    assert results[0].result is not None
+    assert results[0].result["summary_path"].endswith("a.md")
+    assert "FileNotFoundError" in (results[5].error or "")
+
+    active["peak"] = 0
+    shared = agent.sync_batch([SyncJob(trace_path=trace) for trace in traces[:3]], concurrency=3)
+    assert [item.status for item in shared] == ["ok", "ok", "ok"]
+    assert active["peak"] == 1
+
+
+def test_async_variants_and_batch_cancellation(tmp_path, monkeypatch) -> None:
+    """asyncio_sync awaits directly; cancelling a batch cancels in-flight jobs."""
+    active = {"now": 0, "peak": 0}
+    _install_fake_sdk(monkeypatch, active)
+    fast = tmp_path / "fast.jsonl"
+    slow = tmp_path / "slow.jsonl"
+    for trace in (fast, slow):
+        trace.write_text('{"role":"user","content":"hi"}\n', encoding="utf-8")
+    agent = AcretaAgent(default_cwd=str(tmp_path))
+
+    async def _scenario() -> None:
+        result = await agent.asyncio_sync(fast)
+        assert result["summary_path"].endswith("fast.md")
+        batch = asyncio.ensure_future(agent.asyncio_sync_batch([SyncJob(slow), SyncJob(slow)]))
+        await asyncio.sleep(0.1)
+        batch.cancel()
+        try:
+            await batch
+        except asyncio.CancelledError:
+            pass
+        assert active["now"] == 0
+
+    asyncio.run(_scenario())
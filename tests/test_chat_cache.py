@@ -0,0 +1,70 @@
+"""Test the chat answer cache: keying, TTL/LRU eviction, and CLI reuse/invalidation."""
+
+from __future__ import annotations
+
+import pytest
+
+from acreta.app import cli
+from acreta.app.chat_cache import CACHE_FILENAME, ChatAnswerCache, normalize_question
+from acreta.config.settings import reload_config
+from tests.helpers import run_cli_json
+
+
+def _put(cache: ChatAnswerCache, question: str, version: str = "v1") -> None:
+    """Store a trivial answer for ``question`` under ``version``."""
+    cache.put(question, corpus_version=version, model="m", response=f"re: {question}", session_id="s", memory_ids=[])
+
+
+def test_cache_keys_expiry_and_lru(tmp_path) -> None:
+    """Equivalent questions share entries; TTL and LRU bound what is kept."""
+    assert normalize_question("Why did we choose LanceDB?") == normalize_question("why choose lancedb")
+    cache = ChatAnswerCache(tmp_path / CACHE_FILENAME, ttl_seconds=3600, max_entries=2)
+    _put(cache, "Why did we choose LanceDB?")
+    assert cache.get("why choose lancedb", corpus_version="v1", model="m") is not None
+    assert cache.get("why choose lancedb", corpus_version="v2", model="m") is None
+    assert cache.get("why choose lancedb", corpus_version="v1", model="other") is None
+
+    _put(cache, "second question")
+    cache.get("Why did we choose LanceDB?", corpus_version="v1", model="m")
+    _put(cache, "third question")
+    assert cache.get("second question", corpus_version="v1", model="m") is None
+    assert cache.stats() == {"entries": 2, "hits": 2}
+
+    expired = ChatAnswerCache(tmp_path / "expired.sqlite3", ttl_seconds=0, max_entries=5)
+    _put(expired, "question")
+    assert expired.get("question", corpus_version="v1", model="m") is None
+
+
+def test_cli_chat_reuses_answers_until_cited_memory_changes(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Repeat questions skip the agent; --fresh and memory edits force a new run."""
+    monkeypatch.setenv("ACRETA_DATA_DIR", str(tmp_path))
+    reload_config()
+    memory = tmp_path / "memory" / "decisions" / "lancedb.md"
+    memory.parent.mkdir(parents=True, exist_ok=True)
+    memory.write_text("---\nid: lancedb\ntitle: Choose LanceDB\n---\nEmbedded vectors, no server.\n", encoding="utf-8")
+    calls: list[str] = []
+
+    class _FakeAgent:
+        def __init__(self, **_kwargs) -> None:
+            pass
+
+        def chat(self, prompt: str, cwd: str | None = None):
+            calls.append(prompt)
+            return f"answer {len(calls)}", f"sid-{len(calls)}"
+
+    monkeypatch.setattr(cli, "AcretaAgent", _FakeAgent)
+    try:
+        _, first = run_cli_json(["chat", "Why did we choose LanceDB?", "--json"])
+        _, second = run_cli_json(["chat", "why choose lancedb", "--json"])
+        _, fresh = run_cli_json(["chat", "why choose lancedb", "--json", "--fresh"])
+        memory.write_text("---\nid: lancedb\ntitle: Choose LanceDB\n---\nEmbedded vectors, zero ops.\n", encoding="utf-8")
+        _, edited = run_cli_json(["chat", "why choose lancedb", "--json"])
+    finally:
+        monkeypatch.delenv("ACRETA_DATA_DIR")
+        reload_config()
+    assert (first["cached"], first["response"]) == (False, "answer 1")
+    assert (second["cached"], second["response"], second["agent_session_id"]) == (True, "answer 1", "sid-1")
+    assert (fresh["cached"], fresh["response"]) == (False, "answer 2")
+    assert (edited["cached"], edited["response"]) == (False, "answer 3")
+    assert len(calls) == 3
+    assert (tmp_path / "index" / CACHE_FILENAME).exists()
@@ -0,0 +1,127 @@
+"""Test retrieval-first chat: ranking across scopes, budget packing, and fan-out gating."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from acreta.app import cli
+from acreta.config.settings import reload_config
+from acreta.memory.retrieval import (
+    MemoryRoot,
+    chat_memory_roots,
+    estimate_tokens,
+    retrieve_chat_context,
+)
+from tests.helpers import make_config, run_cli_json
+
+
+def _write(root: Path, folder: str, name: str, title: str, body: str, confidence: float = 0.8) -> None:
+    """Write one memory or summary markdown file under ``root``."""
+    path = root / folder / f"{name}.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        f"---\nid: {name}\ntitle: {title}\nconfidence: {confidence}\ntags: [ops]\n---\n{body}\n",
+        encoding="utf-8",
+    )
+
+
+def test_ranks_across_scopes_and_packs_full_bodies(tmp_path) -> None:
+    """Project hits outrank equal global hits, copies dedupe, summaries count, and bodies stay whole."""
+    project, global_root = tmp_path / "project", tmp_path / "global"
+    long_body = "Roll out with blue green deploys and watch error budgets. " * 20
+    _write(project, "decisions", "deploy-project", "Deploy strategy", long_body)
+    _write(global_root, "decisions", "deploy-global", "Deploy strategy", long_body.replace("green", "red"))
+    _write(global_root, "decisions", "deploy-copy", "Deploy strategy copy", long_body)
+    _write(global_root, "learnings", "deploy-project", "Deploy strategy", "Same id in global scope.")
+    _write(global_root, "summaries", "session-1", "Session on deploy rollback", "Rolled back a bad deploy.")
+    _write(project, "learnings", "unrelated", "Cache warmup", "Warm redis before traffic.")
+    roots = [MemoryRoot("project", project), MemoryRoot("global", global_root)]
+
+    result = retrieve_chat_context("What is our deploy strategy?", roots)
+    assert [hit["id"] for hit in result.hits] == ["deploy-project", "deploy-global", "session-1"]
+    assert [hit["scope"] for hit in result.hits] == ["project", "global", "global"]
+    assert result.hits[0]["_body"] == long_body.strip()
+    assert result.hits[2]["primitive"] == "summary"
+    assert result.confident
+
+    tight = retrieve_chat_context("deploy strategy", roots, token_budget=estimate_tokens(long_body) + 40)
+    assert [hit["truncated"] for hit in tight.hits] == [False]
+    assert tight.used_tokens <= tight.budget_tokens
+
+    thin = retrieve_chat_context("kubernetes autoscaling limits", roots)
+    assert not thin.hits and not thin.confident
+
+
+def test_explicit_memory_dir_is_searched_alone(tmp_path) -> None:
+    """A configured memory dir outside the scope layout is the only chat root."""
+    config = make_config(tmp_path)
+    assert chat_memory_roots(config, tmp_path) == [MemoryRoot("global", (tmp_path / "memory").resolve())]
+
+
+def test_cli_chat_answers_from_prefetched_evidence(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Confident retrieval puts full bodies in the prompt and drops the fan-out contract."""
+    monkeypatch.setenv("ACRETA_DATA_DIR", str(tmp_path))
+    reload_config()
+    _write(tmp_path / "memory", "learnings", "queue-retries", "Queue retries", "Retry queue jobs with jitter.")
+    captured: dict[str, str] = {}
+
+    class _FakeAgent:
+        def __init__(self, **_kwargs) -> None:
+            pass
+
+        def chat(self, prompt: str, cwd: str | None = None):
+            captured["prompt"] = prompt
+            return "answer [queue-retries]", "sid-1"
+
+    monkeypatch.setattr(cli, "AcretaAgent", _FakeAgent)
+    try:
+        code, payload = run_cli_json(["chat", "how do queue retries work", "--json"])
+    finally:
+        monkeypatch.delenv("ACRETA_DATA_DIR")
+        reload_config()
+    assert code == 0
+    assert payload["memory_ids"] == ["queue-retries"]
+    assert payload["fallback_used"] is False
+    assert "Retry queue jobs with jitter." in captured["prompt"]
+    assert "without tool calls" in captured["prompt"]
+    assert "fan-out" not in captured["prompt"]
+
+
+def test_fallback_chat_never_writes_the_memory_root(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A non-confident chat points at an existing digest but never creates or refreshes one."""
+    monkeypatch.setenv("ACRETA_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("ACRETA_INDEX_DIR", str(tmp_path / "index"))
+    reload_config()
+    memory_root = tmp_path / "memory"
+    _write(memory_root, "learnings", "queue-retries", "Queue retries", "Retry queue jobs with jitter.")
+    prompts: list[str] = []
+
+    class _FakeAgent:
+        def __init__(self, **_kwargs) -> None:
+            pass
+
+        def chat(self, prompt: str, cwd: str | None = None):
+            prompts.append(prompt)
+            return "no evidence", "sid-1"
+
+    def _snapshot() -> dict[str, int]:
+        return {str(path): path.stat().st_mtime_ns for path in memory_root.rglob("*")}
+
+    monkeypatch.setattr(cli, "AcretaAgent", _FakeAgent)
+    try:
+        before = _snapshot()
+        code, _ = run_cli_json(["chat", "kubernetes autoscaling limits", "--json"])
+        assert code == 0 and _snapshot() == before
+        assert "memory digest" not in prompts[-1]
+
+        (memory_root / "memory_digest.tsv").write_text("# id\n", encoding="utf-8")
+        before = _snapshot()
+        code, _ = run_cli_json(["chat", "terraform drift detection", "--json"])
+        assert code == 0 and _snapshot() == before
+        assert str(memory_root / "memory_digest.tsv") in prompts[-1]
+    finally:
+        monkeypatch.delenv("ACRETA_DATA_DIR")
+        monkeypatch.delenv("ACRETA_INDEX_DIR")
+        reload_config()
@@ -0,0 +1,103 @@
+"""Test streaming chat events through the agent, CLI, and dashboard SSE endpoint."""
+
+from __future__ import annotations
+
+import json
+import threading
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+from claude_agent_sdk.types import (
+    AssistantMessage,
+    ResultMessage,
+    StreamEvent,
+    TextBlock,
+    ToolResultBlock,
+    ToolUseBlock,
+    UserMessage,
+)
+
+from acreta.app.dashboard import DashboardHandler
+from acreta.config.settings import reload_config
+from acreta.runtime.agent import AcretaAgent
+from tests.helpers import run_cli
+
+
+def _delta(text: str) -> StreamEvent:
+    """Build one partial text-delta stream event."""
+    event = {"type": "content_block_delta", "delta": {"type": "text_delta", "text": text}}
+    return StreamEvent(uuid="u", session_id="sdk-session", event=event)
+
+
+@pytest.fixture
+def fake_stream(tmp_path, monkeypatch):
+    """Patch the raw SDK stream with a tool call followed by a two-delta answer."""
+    monkeypatch.setenv("ACRETA_DATA_DIR", str(tmp_path))
+    reload_config()
+
+    async def _fake_stream(_self, **_kwargs):
+        yield AssistantMessage(
+            content=[ToolUseBlock(id="t1", name="Read", input={"file_path": "/m.md"})], model="fake"
+        )
+        yield UserMessage(content=[ToolResultBlock(tool_use_id="t1", content="ok")])
+        yield _delta("Hello")
+        yield _delta(" world")
+        yield AssistantMessage(content=[TextBlock(text="Hello world")], model="fake")
+        yield ResultMessage(
+            subtype="success",
+            duration_ms=0,
+            duration_api_ms=0,
+            is_error=False,
+            num_turns=1,
+            session_id="sdk-session",
+            result="Hello world",
+        )
+
+    monkeypatch.setattr(AcretaAgent, "_stream_sdk_once", _fake_stream)
+    yield
+    monkeypatch.delenv("ACRETA_DATA_DIR")
+    reload_config()
+
+
+def test_chat_stream_yields_incremental_events(fake_stream, tmp_path) -> None:
+    """Deltas arrive as separate text events without duplicating the final message."""
+    events = list(AcretaAgent(default_cwd=str(tmp_path)).chat_stream("hi"))
+    assert [event.type for event in events] == ["tool_use", "tool_result", "text", "text", "done"]
+    assert events[0].tool == "Read"
+    assert [event.text for event in events[2:4]] == ["Hello", " world"]
+    assert events[-1].text == "Hello world"
+    assert events[-1].session_id == "sdk-session"
+
+
+def test_cli_chat_streams_text_and_json_events(fake_stream) -> None:
+    """Plain chat prints streamed text; --json --stream prints one event per line."""
+    code, output = run_cli(["chat", "hi"])
+    assert code == 0
+    assert output == "Hello world\n"
+
+    code, output = run_cli(["chat", "hi", "--json", "--stream"])
+    assert code == 0
+    events = [json.loads(line) for line in output.splitlines()]
+    assert [event["type"] for event in events][-3:] == ["text", "text", "done"]
+    assert events[-1]["session_id"] == "sdk-session"
+    assert events[-1]["memory_ids"] == []
+
+
+def test_dashboard_chat_stream_sse(fake_stream) -> None:
+    """The dashboard endpoint emits one SSE frame per chat event."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DashboardHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/api/chat/stream?q=hi"
+        with urllib.request.urlopen(url, timeout=10) as response:
+            assert response.headers["Content-Type"].startswith("text/event-stream")
+            body = response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+    frames = [frame for frame in body.split("\n\n") if frame]
+    assert frames[0].startswith("event: retrieval\ndata: ")
+    assert frames[3].startswith("event: text\ndata: ")
+    assert json.loads(frames[-1].split("data: ", 1)[1])["text"] == "Hello world"
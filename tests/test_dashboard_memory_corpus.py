@@ -0,0 +1,59 @@
+"""Test the dashboard memory corpus cache and the graph endpoints built on it."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from acreta.app import dashboard
+from acreta.config.settings import reload_config
+
+
+def _write(path, memory_id: str, tags: list[str], body: str) -> None:
+    """Write one memory file with id, title, and tags frontmatter."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        f"---\nid: {memory_id}\ntitle: {memory_id} title\ntags: [{', '.join(tags)}]\n---\n{body}\n",
+        encoding="utf-8",
+    )
+
+
+def test_corpus_reuses_parses_and_serves_graph_queries(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Unchanged files are parsed once; edits, lookups, and graph calls see fresh data."""
+    monkeypatch.setenv("ACRETA_DATA_DIR", str(tmp_path))
+    reload_config()
+    memory = tmp_path / "memory"
+    _write(memory / "decisions" / "db.md", "db", ["storage"], "Use sqlite.")
+    _write(memory / "learnings" / "cache.md", "cache", ["storage", "perf"], "Cache parses.")
+    _write(memory / "learnings" / "ui.md", "ui", ["frontend"], "Keep it simple.")
+    corpus = dashboard._MEMORY_CORPUS
+    try:
+        before = corpus.parses
+        assert len(dashboard._load_all_memories()) == 3
+        dashboard._load_all_memories()
+        assert corpus.parses - before == 3
+
+        edited = memory / "learnings" / "ui.md"
+        _write(edited, "ui", ["frontend", "perf"], "Keep it simple and fast.")
+        os.utime(edited, ns=(1, 1))
+        dashboard._load_all_memories()
+        assert corpus.parses - before == 4
+        assert corpus.get("ui")["tags"] == ["frontend", "perf"]
+
+        graph = dashboard._memory_graph_query({"query": "", "filters": {"tags": ["perf"]}})
+        memory_nodes = {node["id"] for node in graph["nodes"] if node["kind"] == "memory"}
+        assert memory_nodes == {"mem:cache", "mem:ui"}
+        assert graph["stats"]["matched_memories"] == 2
+        typed = dashboard._memory_graph_query({"query": "", "filters": {"type": ["decision"]}})
+        assert typed["stats"]["matched_memories"] == 1
+
+        expanded = dashboard._memory_graph_expand({"node_id": "mem:db"})
+        assert {node["id"] for node in expanded["nodes"] if node["kind"] == "memory"} == {"mem:db", "mem:cache"}
+
+        (memory / "decisions" / "db.md").unlink()
+        dashboard._load_all_memories()
+        assert corpus.get("db") is None
+    finally:
+        monkeypatch.delenv("ACRETA_DATA_DIR")
+        reload_config()
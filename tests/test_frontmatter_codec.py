@@ -0,0 +1,155 @@
+"""Test the memory frontmatter codec against python-frontmatter for identical results."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timezone
+
+import frontmatter
+import pytest
+
+from acreta.memory import frontmatter_codec
+from acreta.memory.frontmatter_codec import dump_frontmatter, load_frontmatter, parse_frontmatter
+from acreta.memory.memory_record import MemoryRecord
+
+TRICKY_STRINGS = [
+    "",
+    " leading",
+    "trailing ",
+    "it's",
+    "a: b",
+    "a #b",
+    "#hash",
+    "-dash",
+    "- item",
+    "yes",
+    "No",
+    "on",
+    "OFF",
+    "null",
+    "~",
+    "=",
+    "<<",
+    "2026-01-01",
+    "2026-02-20T23:10:32Z",
+    "2026-02-20T23:10:32.123456+00:00",
+    "1.5",
+    "1_000",
+    "0x1F",
+    "1:20",
+    ".inf",
+    "+1",
+    "007",
+    "[x]",
+    "{y}",
+    "*alias",
+    "&anchor",
+    "!tag",
+    "%dir",
+    "@at",
+    "`tick",
+    "a,b",
+    "a?b",
+    "ends:",
+    "café au lait",
+    "tab\there",
+    "line\nbreak",
+    '"quoted"',
+    "back\\slash",
+    "Queue lifecycle: keep states explicit and observable across restarts and retries in every worker",
+    "x" * 130,
+]
+
+
+def _expected_dump(metadata: dict, body: str) -> str:
+    """Serialize through python-frontmatter, the reference implementation."""
+    return frontmatter.dumps(frontmatter.Post(body, **metadata))
+
+
+@pytest.mark.parametrize("value", TRICKY_STRINGS)
+def test_tricky_strings_round_trip_identically(value: str) -> None:
+    """Quoting, typing, folding, and reload match python-frontmatter for edge-case strings."""
+    metadata = {"id": "m1", "title": value, "tags": [value, "plain"], "kind": value}
+    dumped = dump_frontmatter(metadata, "Body.")
+    assert dumped == _expected_dump(metadata, "Body.")
+    assert parse_frontmatter(dumped) == frontmatter.parse(dumped)
+
+
+def test_scalars_and_fallback_values_match_reference() -> None:
+    """Numbers, booleans, nulls, and nested or dated values produce identical output."""
+    metadata = {
+        "confidence": 0.1,
+        "big": 10**20,
+        "tiny": 1e-7,
+        "huge": 1e20,
+        "inf": float("inf"),
+        "flag": True,
+        "empty": None,
+        "tags": [],
+    }
+    assert dump_frontmatter(metadata, "b") == _expected_dump(metadata, "b")
+    nested = {"id": "x", "meta": {"a": [1, 2]}, "created": datetime(2026, 1, 1, tzinfo=timezone.utc)}
+    assert dump_frontmatter(nested, "") == _expected_dump(nested, "")
+
+
+def test_hand_written_frontmatter_parses_like_yaml() -> None:
+    """Agent-written shapes (flow lists, indented items, comments, quotes) load identically."""
+    texts = [
+        "---\nid: a\ntags: [queue, 'it''s', \"dq\"]\nconfidence: 0.9\n---\nBody",
+        "---\n# note\ntitle: Plain title\ntags:\n  - one\n  - two\nkind:\n---\n\nBody\n",
+        "---\ncreated: 2026-02-20T23:10:32Z\nmeta:\n  nested: 1\n---\nBody",
+        "---\non: yes\ntitle: x\n---\nBody",
+        "---\ntags: [a, ]\n---\nBody",
+        "No frontmatter here",
+        "---\ntitle: only opening",
+    ]
+    for text in texts:
+        assert parse_frontmatter(text) == frontmatter.parse(text)
+
+
+def test_randomized_round_trips_match_reference() -> None:
+    """Seeded random metadata dumps and reloads exactly like python-frontmatter."""
+    rng = random.Random(42)
+    charset = "abcXYZ019 -_:#'\",[]{}?!&*%@`|>.~=+/\\"
+    words = [*TRICKY_STRINGS[:25], "0.7", "True", "y"]
+    for _ in range(1500):
+        metadata: dict = {}
+        for key in rng.sample(["id", "title", "created", "tags", "confidence", "kind", "source"], rng.randint(1, 5)):
+            roll = rng.random()
+            if key == "tags":
+                metadata[key] = [rng.choice(words) for _ in range(rng.randint(0, 3))]
+            elif roll < 0.3:
+                metadata[key] = rng.choice(words)
+            elif roll < 0.4:
+                metadata[key] = rng.choice([0, -3, 0.8, 2.0, True, None])
+            else:
+                metadata[key] = "".join(rng.choice(charset) for _ in range(rng.choice([1, 5, 20, 90])))
+        body = "".join(rng.choice(charset) for _ in range(10))
+        dumped = dump_frontmatter(metadata, body)
+        assert dumped == _expected_dump(metadata, body)
+        assert parse_frontmatter(dumped) == frontmatter.parse(dumped)
+
+
+def test_acreta_records_take_the_fast_path(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Memory records written by Acreta load and dump without calling YAML."""
+    record = MemoryRecord(
+        id="queue-lifecycle",
+        primitive="learning",
+        kind="insight",
+        title="Queue lifecycle: keep states explicit",
+        body="Keep queue states explicit.",
+        confidence=0.8,
+        tags=["queue", "reliability"],
+        source="run-1",
+    )
+    path = tmp_path / "queue.md"
+    path.write_text(record.to_markdown(), encoding="utf-8")
+
+    def _no_yaml(*_args, **_kwargs):
+        raise AssertionError("fell back to YAML")
+
+    monkeypatch.setattr(frontmatter_codec.yaml, "load", _no_yaml)
+    monkeypatch.setattr(frontmatter_codec.yaml, "dump", _no_yaml)
+    metadata, body = load_frontmatter(path)
+    assert metadata["tags"] == ["queue", "reliability"] and body == "Keep queue states explicit."
+    assert dump_frontmatter(metadata, body) + "\n" == path.read_text(encoding="utf-8")
@@ -0,0 +1,118 @@
+"""Test the process-wide DSPy LM registry and provider limits."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import dspy
+
+from acreta.config.settings import reload_config
+from acreta.memory import utils
+
+
+def test_lm_registry_reuses_one_client_per_key(monkeypatch) -> None:
+    """Same provider/model/base reuses one LM; a new model gets its own."""
+    utils.reset_lm_registry()
+    monkeypatch.setenv("ACRETA_DSPY_PROVIDER", "ollama")
+    monkeypatch.setenv("ACRETA_DSPY_OLLAMA_MODEL", "model-a")
+    first = utils.get_dspy_lm()
+    assert utils.get_dspy_lm() is first
+
+    monkeypatch.setenv("ACRETA_DSPY_OLLAMA_MODEL", "model-b")
+    second = utils.get_dspy_lm()
+    assert second is not first
+    assert second.model == "ollama_chat/model-b"
+
+    with utils.dspy_lm_session() as lm:
+        assert lm is second
+        assert dspy.settings.lm is second
+    utils.reset_lm_registry()
+
+
+def test_lm_requests_share_concurrency_cap(tmp_path, monkeypatch) -> None:
+    """The cap applies per LM request, not per session block."""
+    utils.reset_lm_registry()
+    monkeypatch.setenv("ACRETA_DSPY_PROVIDER", "ollama")
+    monkeypatch.setenv("ACRETA_DSPY_OLLAMA_MAX_CONCURRENCY", "2")
+    monkeypatch.setenv("ACRETA_DSPY_OPENROUTER_MAX_CONCURRENCY", "7")
+    monkeypatch.setenv("ACRETA_INDEX_DIR", str(tmp_path / "index"))
+    reload_config()
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    callback = utils.get_dspy_lm().callbacks[0]
+
+    def _worker(index: int) -> None:
+        nonlocal active, peak
+        with utils.dspy_lm_session():
+            for turn in range(2):
+                call_id = f"{index}-{turn}"
+                callback.on_lm_start(call_id, None, {})
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.02)
+                with lock:
+                    active -= 1
+                callback.on_lm_end(call_id, None)
+
+    with utils.dspy_lm_session(), utils.dspy_lm_session(), utils.dspy_lm_session():
+        pass
+    threads = [threading.Thread(target=_worker, args=(index,)) for index in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak == 2
+    assert utils._provider_limiter("openrouter").limit == 7
+    monkeypatch.delenv("ACRETA_DSPY_OPENROUTER_MAX_CONCURRENCY")
+    utils.reset_lm_registry()
+    assert utils._provider_limiter("openrouter").limit == utils.DEFAULT_PROVIDER_CONCURRENCY["openrouter"]
+    callback.on_lm_end("never-started", None)
+    utils.reset_lm_registry()
+    monkeypatch.delenv("ACRETA_INDEX_DIR")
+    reload_config()
+
+
+def test_slot_files_cap_concurrency_across_limiters(tmp_path) -> None:
+    """Limiters in different processes share slots through flock'ed files."""
+    first = utils.ProviderLimiter("ollama", 1, 0, tmp_path / "lm_slots")
+    second = utils.ProviderLimiter("ollama", 1, 0, tmp_path / "lm_slots")
+    handle = first.acquire()
+    acquired = threading.Event()
+
+    def _take() -> None:
+        second.release(second.acquire())
+        acquired.set()
+
+    thread = threading.Thread(target=_take)
+    thread.start()
+    assert not acquired.wait(0.2)
+    first.release(handle)
+    assert acquired.wait(2)
+    thread.join()
+
+
+def test_token_bucket_paces_requests() -> None:
+    """Requests beyond the bucket capacity wait for refill."""
+    bucket = utils.TokenBucket(rate_per_minute=600, capacity=2)
+    started = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    assert time.monotonic() - started >= 0.15
+    unlimited = utils.TokenBucket(rate_per_minute=0)
+    for _ in range(100):
+        unlimited.acquire()
+
+
+def test_token_bucket_state_is_shared_across_limiters(tmp_path) -> None:
+    """Limiters in separate processes draw from one budget instead of each starting full."""
+    first = utils.ProviderLimiter("ollama", 4, 600, tmp_path / "lm_slots")
+    second = utils.ProviderLimiter("ollama", 4, 600, tmp_path / "lm_slots")
+    first.bucket.capacity = second.bucket.capacity = 2.0
+    started = time.monotonic()
+    for limiter in (first, second, first, second):
+        limiter.release(limiter.acquire())
+    assert time.monotonic() - started >= 0.15
+    assert (tmp_path / "lm_slots" / "ollama.bucket.json").is_file()
@@ -0,0 +1,109 @@
+"""Test memory access tracking, computed priors, and their use in ranking and maintain."""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+
+from acreta.app import cli
+from acreta.app.chat import prepare_chat
+from acreta.config.settings import reload_config
+from acreta.memory.access_stats import access_stats_for_memory_root, compute_priors, flush_access_stats, load_priors
+from acreta.memory.clustering import cluster_memories
+from acreta.memory.retrieval import MemoryRoot, search_memories
+from tests.helpers import run_cli_json
+
+_UPDATED = "2026-01-01T00:00:00Z"
+
+
+def _write(memory, name: str, title: str, body: str, confidence: float = 0.8) -> None:
+    """Write one learning with a fixed updated timestamp."""
+    path = memory / "learnings" / f"{name}.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        f"---\nid: {name}\ntitle: {title}\nconfidence: {confidence}\nupdated: '{_UPDATED}'\n---\n{body}\n",
+        encoding="utf-8",
+    )
+
+
+def test_access_counts_feed_priors_ranking_and_archive_candidates(tmp_path, monkeypatch) -> None:
+    """Searches and citations are batched into stats; priors then boost ranking and flag idle memories."""
+    root = tmp_path / "data"
+    memory = root / "memory"
+    monkeypatch.setenv("ACRETA_DATA_DIR", str(root))
+    monkeypatch.setenv("ACRETA_MEMORY_DIR", str(memory))
+    monkeypatch.setenv("ACRETA_INDEX_DIR", str(root / "index"))
+    reload_config()
+    try:
+        body = "Rotate the signing keys every quarter and keep the previous key for verification."
+        _write(memory, "keys-used", "Key rotation", body)
+        _write(memory, "keys-idle", "Key rotation", body.replace("quarter", "season"), confidence=0.6)
+        stats = access_stats_for_memory_root(memory)
+        flush_access_stats()
+
+        hits = cli.search_memory("quarter", limit=5)
+        assert [hit["id"] for hit in hits] == ["keys-used"]
+        assert not stats.db_path.exists() or stats.counts() == {}
+        request = prepare_chat("which quarter?", config=cli.get_config())
+        request.record_citations("Rotate quarterly [keys-used], not [unknown].")
+        assert flush_access_stats() == 3
+        counts = stats.counts()
+        assert (counts["keys-used"]["retrievals"], counts["keys-used"]["citations"]) == (2, 1)
+        assert "keys-idle" not in counts
+
+        now = time.time()
+        priors = {row["memory_id"]: row for row in compute_priors(memory, now=now)}
+        assert priors["keys-used"]["prior"] > priors["keys-idle"]["prior"]
+        assert priors["keys-idle"]["usage"] < priors["keys-used"]["usage"]
+        ranked = search_memories("rotate signing keys", [MemoryRoot("project", memory.resolve())])
+        assert [hit["id"] for hit in ranked] == ["keys-used", "keys-idle"]
+        assert ranked[0]["score"] / ranked[1]["score"] > 1.2
+
+        report = cluster_memories(memory, threshold=1.01, priors={row["path"]: row["prior"] for row in priors.values()})
+        assert [(row["path"].rsplit("/", 1)[-1], row["reason"]) for row in report["archive_candidates"]] == [
+            ("keys-idle.md", "prior<0.2")
+        ]
+
+        _, listed = run_cli_json(["memory", "priors", "--json"])
+        assert [row["memory_id"] for row in listed] == ["keys-idle", "keys-used"]
+        assert listed[0]["confidence"] == 0.6
+    finally:
+        monkeypatch.delenv("ACRETA_MEMORY_DIR")
+        monkeypatch.delenv("ACRETA_INDEX_DIR")
+        reload_config()
+
+
+def test_priors_keep_one_row_per_file_when_ids_repeat(tmp_path, monkeypatch) -> None:
+    """Two runs writing the same title give two files with one id; each still gets its own prior."""
+    root = tmp_path / "data"
+    memory = root / "memory"
+    monkeypatch.setenv("ACRETA_DATA_DIR", str(root))
+    monkeypatch.setenv("ACRETA_MEMORY_DIR", str(memory))
+    monkeypatch.setenv("ACRETA_INDEX_DIR", str(root / "index"))
+    reload_config()
+    try:
+        for stamp, confidence in (("20260101", 0.9), ("20260201", 0.3)):
+            path = memory / "learnings" / f"{stamp}-queue.md"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(
+                f"---\nid: queue\ntitle: Queue\nconfidence: {confidence}\nupdated: '{_UPDATED}'\n---\nDrain the queue.\n",
+                encoding="utf-8",
+            )
+        db_path = access_stats_for_memory_root(memory).db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("CREATE TABLE memory_priors (memory_id TEXT PRIMARY KEY, path TEXT NOT NULL, prior REAL NOT NULL)")
+
+        rows = compute_priors(memory)
+        assert [(row["memory_id"], row["path"].rsplit("/", 1)[-1]) for row in rows] == [
+            ("queue", "20260201-queue.md"),
+            ("queue", "20260101-queue.md"),
+        ]
+        loaded = load_priors(memory)
+        assert loaded == {row["path"]: row["prior"] for row in rows}
+        _, listed = run_cli_json(["memory", "priors", "--json"])
+        assert len(listed) == 2
+    finally:
+        monkeypatch.delenv("ACRETA_MEMORY_DIR")
+        monkeypatch.delenv("ACRETA_INDEX_DIR")
+        reload_config()
@@ -0,0 +1,52 @@
+"""Test deterministic near-duplicate clustering for maintain."""
+
+from __future__ import annotations
+
+import json
+
+from acreta.memory.clustering import cluster_memories, write_cluster_report
+
+
+def _write_memory(root, folder: str, name: str, title: str, body: str, confidence: float) -> None:
+    """Write one memory markdown file with title and confidence frontmatter."""
+    path = root / folder / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\ntitle: {title}\nconfidence: {confidence}\n---\n{body}\n", encoding="utf-8")
+
+
+def test_clusters_group_near_duplicates_per_primitive(tmp_path) -> None:
+    """Near copies cluster with the most confident primary; other types stay apart."""
+    body = "Run the queue heartbeat every 15 seconds and dead letter jobs after three failed attempts in a row."
+    _write_memory(tmp_path, "learnings", "a.md", "Queue heartbeat", body, 0.6)
+    _write_memory(tmp_path, "learnings", "b.md", "Queue heartbeat", body + " Track retries.", 0.9)
+    _write_memory(tmp_path, "learnings", "c.md", "Queue heartbeat", body, 0.5)
+    _write_memory(tmp_path, "decisions", "d.md", "Queue heartbeat", body, 0.9)
+    _write_memory(tmp_path, "learnings", "e.md", "Docker cache", "Pin base images so layer caching survives rebuilds in CI.", 0.8)
+    _write_memory(tmp_path, "learnings", "f.md", "Ran tests", "Ran the tests today.", 0.1)
+    _write_memory(tmp_path, "archived/learnings", "g.md", "Queue heartbeat", body, 0.9)
+
+    report = cluster_memories(tmp_path)
+    assert report["counts"] == {
+        "memories": 6,
+        "clusters": 1,
+        "clustered_memories": 3,
+        "archive_candidates": 1,
+    }
+    cluster = report["clusters"][0]
+    assert cluster["cluster_id"] == "cluster-1"
+    assert cluster["primitive"] == "learning"
+    assert cluster["primary"].endswith("b.md")
+    assert [m["path"].rsplit("/", 1)[-1] for m in cluster["members"]] == ["b.md", "a.md", "c.md"]
+    assert report["archive_candidates"][0]["reason"] == "confidence<0.3"
+
+
+def test_cluster_report_is_written_and_stable(tmp_path) -> None:
+    """The artifact is JSON and repeated runs produce identical output."""
+    memory_root = tmp_path / "memory"
+    body = "Read the exact file first, then patch with file path and larger context to avoid global replace."
+    _write_memory(memory_root, "learnings", "a.md", "Read before patching", body, 0.7)
+    _write_memory(memory_root, "learnings", "b.md", "Read before patch", body, 0.7)
+    output = tmp_path / "run" / "clusters.json"
+    first = write_cluster_report(memory_root, output)
+    assert json.loads(output.read_text(encoding="utf-8")) == first
+    assert cluster_memories(memory_root) == first
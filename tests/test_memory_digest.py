@@ -0,0 +1,81 @@
+"""Test the incremental memory catalog digest and its prompt wiring."""
+
+from __future__ import annotations
+
+import os
+
+from acreta.memory import digest
+from acreta.memory.digest import DIGEST_FILENAME, read_memory_digest, refresh_memory_digest
+from acreta.runtime.prompts import build_maintain_prompt, build_sync_prompt
+from acreta.runtime.prompts.maintain import build_maintain_artifact_paths
+
+
+def _write_memory(path, memory_id: str, title: str, body: str) -> None:
+    """Write one memory markdown file with digest-relevant frontmatter."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        f"---\nid: {memory_id}\ntitle: {title}\ntags: [ops]\nconfidence: 0.7\n"
+        f"updated: '2026-02-01T00:00:00Z'\n---\n{body}\n",
+        encoding="utf-8",
+    )
+
+
+def test_digest_refreshes_only_changed_files(tmp_path, monkeypatch) -> None:
+    """Unchanged files reuse cached rows; edits, adds, and deletes show up."""
+    memory_root = tmp_path / "memory"
+    first = memory_root / "learnings" / "a.md"
+    _write_memory(first, "a", "Alpha\ttabbed", "Body a.")
+    _write_memory(memory_root / "decisions" / "b.md", "b", "Beta", "Body b.")
+    _write_memory(memory_root / "archived" / "learnings" / "c.md", "c", "Gone", "Body c.")
+
+    rows = read_memory_digest(memory_root)
+    assert [(row["id"], row["primitive"]) for row in rows] == [("b", "decision"), ("a", "learning")]
+    assert rows[1]["title"] == "Alpha tabbed"
+    assert rows[1]["updated"] == "2026-02-01T00:00:00Z"
+
+    parsed: list[str] = []
+    original = digest._digest_row
+    monkeypatch.setattr(digest, "_digest_row", lambda path, primitive: parsed.append(path.name) or original(path, primitive))
+    refresh_memory_digest(memory_root)
+    assert parsed == []
+
+    _write_memory(first, "a", "Alpha v2", "Body a, longer now.")
+    os.utime(first, ns=(1, 1))
+    _write_memory(memory_root / "learnings" / "d.md", "d", "Delta", "Body d.")
+    (memory_root / "decisions" / "b.md").unlink()
+    rows = read_memory_digest(memory_root)
+    assert sorted(parsed) == ["a.md", "d.md"]
+    assert [row["title"] for row in rows] == ["Alpha v2", "Delta"]
+
+
+def test_prompts_reference_digest(tmp_path) -> None:
+    """Sync and maintain prompts point the agent at the digest file."""
+    memory_root = tmp_path / "memory"
+    (memory_root / "learnings").mkdir(parents=True)
+    digest_path = refresh_memory_digest(memory_root)
+    assert digest_path == memory_root / DIGEST_FILENAME
+    assert refresh_memory_digest(tmp_path / "missing") is None
+
+    run_folder = tmp_path / "workspace" / "run"
+    trace = tmp_path / "trace.jsonl"
+    sync_prompt = build_sync_prompt(
+        trace_file=trace,
+        memory_root=memory_root,
+        run_folder=run_folder,
+        artifact_paths={
+            "extract": run_folder / "extract.json",
+            "summary": run_folder / "summary.json",
+            "memory_actions": run_folder / "memory_actions.json",
+            "subagents_log": run_folder / "subagents.log",
+        },
+        metadata={"run_id": "run"},
+        digest_path=digest_path,
+    )
+    assert f"Memory digest at {digest_path}" in sync_prompt
+    maintain_prompt = build_maintain_prompt(
+        memory_root=memory_root,
+        run_folder=run_folder,
+        artifact_paths=build_maintain_artifact_paths(run_folder),
+        digest_path=digest_path,
+    )
+    assert f"memory_digest: {digest_path}" in maintain_prompt
@@ -0,0 +1,71 @@
+"""Test the dashboard memory graph engine: incremental sync, capped expansion, and ranked truncation."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+
+import pytest
+
+from acreta.app import dashboard
+from acreta.config.settings import reload_config
+
+
+def _write(path, memory_id: str, tags: list[str], confidence: float, source: str = "") -> None:
+    """Write one learning with tags, confidence, and an optional source run."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    source_line = f"source: {source}\n" if source else ""
+    path.write_text(
+        f"---\nid: {memory_id}\ntitle: {memory_id} title\ntags: [{', '.join(tags)}]\n"
+        f"confidence: {confidence}\n{source_line}---\nBody of {memory_id}.\n",
+        encoding="utf-8",
+    )
+
+
+def test_hub_expansion_is_capped_ranked_and_incremental(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A hub tag expands to its strongest members; explicit edges and source runs link in; edits relink one memory."""
+    monkeypatch.setenv("ACRETA_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("ACRETA_MEMORY_DIR", str(tmp_path / "memory"))
+    monkeypatch.setenv("ACRETA_INDEX_DIR", str(tmp_path / "index"))
+    reload_config()
+    learnings = tmp_path / "memory" / "learnings"
+    for index in range(120):
+        _write(learnings / f"m{index}.md", f"m{index}", ["testing", f"group{index % 6}"], 0.5 + (index % 5) / 10)
+    _write(learnings / "core.md", "core", ["release"], 0.9, source="run-7")
+    (tmp_path / "index").mkdir(exist_ok=True)
+    with sqlite3.connect(tmp_path / "index" / "graph.sqlite3") as conn:
+        conn.execute("CREATE TABLE graph_edges (source_id TEXT, target_id TEXT, reason TEXT, score REAL)")
+        conn.execute("INSERT INTO graph_edges VALUES ('core', 'm4', 'supersedes', 0.9)")
+    graph = dashboard._MEMORY_GRAPH
+    try:
+        expanded = dashboard._memory_graph_expand({"node_id": "tag:testing", "depth": 1, "limits": {"max_nodes": 50}})
+        nodes = expanded["nodes"]
+        assert len(nodes) == 50 and expanded["stats"]["truncated"] is True
+        assert nodes[0]["id"] == "tag:testing" and nodes[0]["score"] == 1.0
+        memory_nodes = [node for node in nodes if node["kind"] == "memory"]
+        confidences = [node["properties"]["confidence"] for node in memory_nodes]
+        assert confidences.count(0.9) == 24 and min(confidences) == 0.8
+        assert [node["score"] for node in nodes if node["kind"] != "type"] == sorted(
+            (node["score"] for node in nodes if node["kind"] != "type"), reverse=True
+        )
+
+        core = dashboard._memory_graph_expand({"node_id": "mem:core"})
+        edges = {(edge["source"], edge["target"], edge["kind"]) for edge in core["edges"]}
+        assert {("mem:core", "session:run-7", "from_session"), ("mem:core", "mem:m4", "supersedes")} <= edges
+        assert "tag:testing" in {node["id"] for node in core["nodes"]}
+
+        linked = graph.linked
+        edited = learnings / "m4.md"
+        _write(edited, "m4", ["testing", "flaky"], 0.95)
+        os.utime(edited, ns=(1, 1))
+        again = dashboard._memory_graph_expand({"node_id": "tag:flaky"})
+        assert graph.linked - linked == 1
+        assert {node["id"] for node in again["nodes"] if node["kind"] == "memory"} >= {"mem:m4", "mem:core"}
+
+        queried = dashboard._memory_graph_query({"query": "", "filters": {"tags": ["testing"]}, "limits": {"max_nodes": 50}})
+        assert queried["stats"]["matched_memories"] == 120 and queried["stats"]["truncated"] is True
+        assert next(node["id"] for node in queried["nodes"] if node["kind"] == "memory") == "mem:m4"
+    finally:
+        for key in ("ACRETA_DATA_DIR", "ACRETA_MEMORY_DIR", "ACRETA_INDEX_DIR"):
+            monkeypatch.delenv(key)
+        reload_config()
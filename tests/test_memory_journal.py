@@ -0,0 +1,113 @@
+"""Test the memory change journal: event sources and the since-seq cursor."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+from acreta.config.settings import reload_config
+from acreta.memory.journal import content_hash, journal_for_memory_root
+from acreta.memory.summarization_pipeline import write_summary_markdown
+from acreta.runtime.agent import AcretaAgent
+from tests.helpers import run_cli, run_cli_json
+
+
+def test_cli_add_and_summary_writes_are_journaled(tmp_path, monkeypatch) -> None:
+    """CLI adds and pipeline summaries append events readable after a cursor."""
+    monkeypatch.setenv("ACRETA_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("ACRETA_MEMORY_DIR", str(tmp_path / "memory"))
+    monkeypatch.setenv("ACRETA_INDEX_DIR", str(tmp_path / "index"))
+    reload_config()
+    try:
+        code, _ = run_cli(["memory", "add", "--title", "Pin sqlite", "--body", "Use WAL."])
+        assert code == 0
+        _, first = run_cli_json(["memory", "changes", "--json"])
+        (event,) = first["events"]
+        assert (event["op"], event["memory_id"]) == ("add", "pin-sqlite")
+        assert event["content_hash"] == content_hash(Path(event["path"]).read_text(encoding="utf-8"))
+
+        summary = write_summary_markdown(
+            {"title": "Queue fix", "summary": "Fixed it.", "date": "2026-02-01", "time": "09:00:00"},
+            tmp_path / "memory",
+            run_id="run-7",
+        )
+        _, later = run_cli_json(["memory", "changes", "--since", str(first["latest_seq"]), "--json"])
+        assert [(item["op"], item["path"], item["run_id"]) for item in later["events"]] == [
+            ("add", str(summary), "run-7")
+        ]
+        assert later["latest_seq"] == first["latest_seq"] + 1
+        assert (tmp_path / "index" / "memory_journal.sqlite3").exists()
+    finally:
+        monkeypatch.delenv("ACRETA_MEMORY_DIR")
+        monkeypatch.delenv("ACRETA_INDEX_DIR")
+        reload_config()
+
+
+def test_pretool_hook_journals_writes_and_edits(tmp_path) -> None:
+    """Allowed memory Write and Edit calls are recorded with normalized content hashes."""
+    memory_root = tmp_path / "memory"
+    agent = AcretaAgent(default_cwd=str(tmp_path))
+    hooks = agent._build_pretool_hooks((memory_root,), memory_root=memory_root, metadata={"run_id": "sync-1"})
+    callback = hooks["PreToolUse"][0].hooks[0]
+    target = memory_root / "learnings" / "draft.md"
+    write = {"file_path": str(target), "content": "---\ntitle: Retry budget\n---\nCap retries."}
+    result = asyncio.run(callback({"tool_name": "Write", "tool_input": write}, None, None))
+    updated = result["hookSpecificOutput"]["updatedInput"]
+    edit = {"file_path": updated["file_path"], "old_string": "Cap", "new_string": "Bound"}
+    asyncio.run(callback({"tool_name": "Edit", "tool_input": edit}, None, None))
+
+    events = journal_for_memory_root(memory_root).changes()
+    assert [(event.op, event.path, event.run_id) for event in events] == [
+        ("add", updated["file_path"], "sync-1"),
+        ("update", updated["file_path"], "sync-1"),
+    ]
+    assert events[0].memory_id == "retry-budget"
+    assert events[0].content_hash == content_hash(updated["content"])
+
+
+async def _fake_archiving_sdk_once(
+    _self: AcretaAgent,
+    *,
+    prompt: str,
+    session_id: str | None,
+    cwd: str | None,
+    allowed_tools: list[str],
+    permission_mode: str,
+    add_dirs=(),
+    env=None,
+    hooks=None,
+    agents=None,
+):
+    """Move one learning into archived/ and report it like the maintain agent."""
+    _ = (session_id, cwd, allowed_tools, permission_mode, env, hooks, agents)
+    memory_root = Path(add_dirs[0])
+    source = memory_root / "learnings" / "old.md"
+    target = memory_root / "archived" / "learnings" / "old.md"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    source.rename(target)
+    line = next(line for line in prompt.splitlines() if line.startswith("- artifact_paths: "))
+    artifacts = json.loads(line.split(": ", 1)[1])
+    report = {
+        "actions": [{"action": "archive", "source_path": str(source), "target_path": str(target)}],
+        "counts": {"archived": 1},
+    }
+    Path(artifacts["maintain_actions"]).write_text(json.dumps(report) + "\n", encoding="utf-8")
+    return "ok", "session-1"
+
+
+def test_maintain_archive_moves_are_journaled(tmp_path) -> None:
+    """Archive moves reported by maintain become archive events with the memory id."""
+    memory_root = tmp_path / "memory"
+    (memory_root / "learnings").mkdir(parents=True)
+    (memory_root / "learnings" / "old.md").write_text("---\nid: old-tip\ntitle: Old\n---\nStale.\n", encoding="utf-8")
+    agent = AcretaAgent(default_cwd=str(tmp_path))
+    agent._workspace_retention = None
+    agent._run_sdk_once = _fake_archiving_sdk_once.__get__(agent, AcretaAgent)
+
+    result = agent.maintain(memory_root=memory_root)
+
+    (event,) = journal_for_memory_root(memory_root).changes()
+    assert (event.op, event.memory_id) == ("archive", "old-tip")
+    assert event.path == str((memory_root / "archived" / "learnings" / "old.md").resolve())
+    assert event.run_id == Path(result["run_folder"]).name
@@ -0,0 +1,58 @@
+"""Test deterministic candidate matching against existing memory files."""
+
+from __future__ import annotations
+
+import json
+
+from acreta.memory.matching import (
+    UPDATE_OVERLAP_THRESHOLD,
+    match_candidates,
+    write_match_report,
+)
+
+
+def _write_memory(root, folder: str, name: str, title: str, body: str) -> None:
+    """Write one memory markdown file with minimal frontmatter."""
+    path = root / folder / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\ntitle: {title}\n---\n{body}\n", encoding="utf-8")
+
+
+def test_match_verdicts_follow_policy(tmp_path) -> None:
+    """Exact copies are no_op, near copies update, and new content or primitive adds."""
+    body = "Heartbeat every 15s, max_attempts=3, then move the job to dead_letter."
+    _write_memory(tmp_path, "learnings", "20260101-queue-heartbeat.md", "Queue heartbeat", body)
+    _write_memory(tmp_path, "decisions", "20260101-keep-traces.md", "Keep traces in place", "Never copy traces.")
+    _write_memory(tmp_path, "archived/learnings", "20260101-old.md", "Old item", "Archived body.")
+
+    rows = match_candidates(
+        [
+            {"primitive": "learning", "title": "Queue heartbeat", "body": body},
+            {"primitive": "learning", "title": "Queue job heartbeat", "body": body},
+            {"primitive": "learning", "title": "Queue heartbeat", "body": "Rewritten body."},
+            {"primitive": "decision", "title": "Queue job heartbeat", "body": body},
+            {"primitive": "learning", "title": "Old item", "body": "Archived body."},
+        ],
+        tmp_path,
+    )
+    assert [row["action"] for row in rows] == ["no_op", "update", "update", "add", "add"]
+    assert rows[0]["matched_file"].endswith("20260101-queue-heartbeat.md")
+    assert rows[1]["score"] >= UPDATE_OVERLAP_THRESHOLD
+    assert rows[2]["evidence"].startswith("exact title")
+    assert [row["candidate_id"] for row in rows] == [0, 1, 2, 3, 4]
+
+
+def test_match_report_artifact(tmp_path) -> None:
+    """The report artifact carries counts and one row per extract candidate."""
+    memory_root = tmp_path / "memory"
+    _write_memory(memory_root, "learnings", "a.md", "Read before patching", "Read the exact file first.")
+    extract = tmp_path / "extract.json"
+    extract.write_text(
+        json.dumps([{"primitive": "learning", "title": "Read before patching", "body": "Read the exact file first."}]),
+        encoding="utf-8",
+    )
+    output = tmp_path / "matches.json"
+    write_match_report(extract, memory_root, output)
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["counts"] == {"add": 0, "update": 0, "no_op": 1}
+    assert len(report["matches"]) == 1
@@ -0,0 +1,279 @@
+"""Test crash-safe memory transactions around sync runs and daemon-start recovery."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from acreta.memory.digest import DIGEST_FILENAME, DIGEST_STATE_FILENAME, existing_memory_digest
+from acreta.memory.journal import journal_for_memory_root
+from acreta.memory.summarization_pipeline import write_summary_markdown
+from acreta.memory.summary_store import list_summary_paths
+from acreta.memory.transaction import TXN_DIRNAME, MemoryTransaction, RunLeaseTimeoutError, recover_transactions
+from acreta.runtime.agent import AcretaAgent, SyncJob
+from tests.test_agent_memory_write_flow import _extract_artifacts_from_prompt, _extract_memory_root_from_prompt
+
+
+def _fake_sync_factory(*, write_report: bool):
+    """Build a fake SDK run that writes and edits memories through the hook, then a packed summary."""
+
+    async def _fake_run(
+        _self: AcretaAgent,
+        *,
+        prompt: str,
+        session_id: str | None,
+        cwd: str | None,
+        allowed_tools: list[str],
+        permission_mode: str,
+        add_dirs=(),
+        env=None,
+        hooks=None,
+        agents=None,
+    ):
+        _ = (session_id, cwd, allowed_tools, permission_mode, add_dirs, env, agents)
+        artifacts = _extract_artifacts_from_prompt(prompt)
+        memory_root = _extract_memory_root_from_prompt(prompt)
+        callback = hooks["PreToolUse"][0].hooks[0]
+        write = {"file_path": str(memory_root / "learnings" / "x.md"), "content": "---\ntitle: Retry budget\n---\nCap.\n"}
+        result = await callback({"tool_name": "Write", "tool_input": write}, None, None)
+        updated = result["hookSpecificOutput"]["updatedInput"]
+        Path(updated["file_path"]).write_text(updated["content"], encoding="utf-8")
+        existing = memory_root / "learnings" / "existing.md"
+        edit = {"file_path": str(existing), "old_string": "Old", "new_string": "Half"}
+        await callback({"tool_name": "Edit", "tool_input": edit}, None, None)
+        existing.write_text(existing.read_text(encoding="utf-8").replace("Old", "Half"), encoding="utf-8")
+
+        summary = write_summary_markdown(
+            {"title": "Retry work", "summary": "Capped retries.", "date": "2026-02-01", "time": "09:00:00"},
+            memory_root,
+            run_id=Path(artifacts["extract"]).parent.name,
+            layout="packed",
+        )
+        Path(artifacts["extract"]).write_text("[]\n", encoding="utf-8")
+        Path(artifacts["summary"]).write_text(json.dumps({"summary_path": str(summary)}) + "\n", encoding="utf-8")
+        if write_report:
+            report = {"counts": {"add": 1, "update": 1}, "written_memory_paths": [updated["file_path"]]}
+            Path(artifacts["memory_actions"]).write_text(json.dumps(report) + "\n", encoding="utf-8")
+        return "ok", "session-1"
+
+    return _fake_run
+
+
+def _seed(tmp_path: Path) -> tuple[Path, Path, Path]:
+    """Create a trace, a memory root with one learning, and one earlier packed summary."""
+    trace = tmp_path / "trace.jsonl"
+    trace.write_text('{"role":"user","content":"hello"}\n', encoding="utf-8")
+    memory_root = tmp_path / "memory"
+    (memory_root / "learnings").mkdir(parents=True)
+    (memory_root / "learnings" / "existing.md").write_text("---\nid: existing\ntitle: Existing\n---\nOld.\n", encoding="utf-8")
+    earlier = {"title": "Earlier", "summary": "Before.", "date": "2026-02-01", "time": "08:00:00"}
+    write_summary_markdown(earlier, memory_root, layout="packed")
+    return trace, memory_root, tmp_path / "index" / TXN_DIRNAME
+
+
+def _memory_files(memory_root: Path) -> dict[Path, bytes]:
+    """Snapshot memory files, leaving out the digest cache the sync prompt refreshes."""
+    derived = {DIGEST_FILENAME, DIGEST_STATE_FILENAME}
+    return {path: path.read_bytes() for path in memory_root.rglob("*") if path.is_file() and path.name not in derived}
+
+
+def test_failed_sync_rolls_back_every_write(tmp_path, monkeypatch) -> None:
+    """A run that fails validation leaves memories, packs, and the journal as they were."""
+    trace, memory_root, txn_root = _seed(tmp_path)
+    monkeypatch.setattr(AcretaAgent, "_run_sdk_once", _fake_sync_factory(write_report=False))
+    before = _memory_files(memory_root)
+    seq = journal_for_memory_root(memory_root).latest_seq()
+
+    with pytest.raises(RuntimeError, match="missing_artifact"):
+        AcretaAgent(default_cwd=str(tmp_path)).sync(trace, memory_root=memory_root)
+
+    assert _memory_files(memory_root) == before
+    assert journal_for_memory_root(memory_root).changes(seq) == []
+    assert not any(txn_root.iterdir())
+
+
+def test_rejected_report_leaves_no_rolled_back_rows_in_the_digest(tmp_path, monkeypatch) -> None:
+    """A report that fails validation after the summary check rolls back and the digest forgets the write."""
+    trace, memory_root, _ = _seed(tmp_path)
+    fake = _fake_sync_factory(write_report=True)
+
+    async def _bad_report(_self: AcretaAgent, **kwargs):
+        result = await fake(_self, **kwargs)
+        Path(_extract_artifacts_from_prompt(kwargs["prompt"])["memory_actions"]).write_text("{", encoding="utf-8")
+        return result
+
+    monkeypatch.setattr(AcretaAgent, "_run_sdk_once", _bad_report)
+    with pytest.raises(RuntimeError, match="invalid_json_artifact"):
+        AcretaAgent(default_cwd=str(tmp_path)).sync(trace, memory_root=memory_root)
+
+    digest = existing_memory_digest(memory_root).read_text(encoding="utf-8")
+    assert "existing" in digest and "retry-budget" not in digest
+
+
+def test_committed_sync_journals_once_and_drops_the_record(tmp_path, monkeypatch) -> None:
+    """A successful run keeps its writes and journals them in one batch at commit."""
+    trace, memory_root, txn_root = _seed(tmp_path)
+    monkeypatch.setattr(AcretaAgent, "_run_sdk_once", _fake_sync_factory(write_report=True))
+    seq = journal_for_memory_root(memory_root).latest_seq()
+
+    result = AcretaAgent(default_cwd=str(tmp_path)).sync(trace, memory_root=memory_root)
+
+    events = journal_for_memory_root(memory_root).changes(seq)
+    run_id = Path(result["run_folder"]).name
+    assert [(event.op, event.memory_id) for event in events] == [
+        ("add", "retry-budget"),
+        ("update", ""),
+        ("add", "retry-work"),
+    ]
+    assert {event.run_id for event in events} == {run_id}
+    assert len({event.recorded_at for event in events}) == 1
+    assert "Half." in (memory_root / "learnings" / "existing.md").read_text(encoding="utf-8")
+    assert sorted(path.name for path in list_summary_paths(memory_root / "summaries")) == [
+        "20260201-080000-earlier.md",
+        "20260201-090000-retry-work.md",
+    ]
+    assert not any(txn_root.iterdir())
+
+
+def test_failed_maintain_rolls_back_its_edits(tmp_path, monkeypatch) -> None:
+    """Maintain runs in a transaction too: a missing report undoes its merges and journals nothing."""
+    _, memory_root, txn_root = _seed(tmp_path)
+
+    async def _fake_maintain(_self: AcretaAgent, *, prompt: str, session_id, hooks=None, **_kwargs):
+        existing = memory_root / "learnings" / "existing.md"
+        edit = {"file_path": str(existing), "old_string": "Old", "new_string": "Merged"}
+        await hooks["PreToolUse"][0].hooks[0]({"tool_name": "Edit", "tool_input": edit}, None, None)
+        existing.write_text(existing.read_text(encoding="utf-8").replace("Old", "Merged"), encoding="utf-8")
+        return "ok", session_id or "session"
+
+    monkeypatch.setattr(AcretaAgent, "_run_sdk_once", _fake_maintain)
+    before = _memory_files(memory_root)
+    seq = journal_for_memory_root(memory_root).latest_seq()
+
+    with pytest.raises(RuntimeError, match="missing_artifact"):
+        AcretaAgent(default_cwd=str(tmp_path)).maintain(memory_root=memory_root)
+
+    assert _memory_files(memory_root) == before
+    assert journal_for_memory_root(memory_root).changes(seq) == []
+    assert not any(txn_root.iterdir())
+
+
+def test_recovery_rolls_back_dead_runs_and_replays_interrupted_commits(tmp_path) -> None:
+    """Daemon-start recovery undoes open records of dead processes and finishes committing ones."""
+    memory_root = tmp_path / "memory"
+    kept = memory_root / "learnings" / "kept.md"
+    kept.parent.mkdir(parents=True)
+    kept.write_text("v1\n", encoding="utf-8")
+
+    crashed = MemoryTransaction.begin(memory_root, "sync-crashed")
+    crashed.write(kept, "half-written\n")
+    crashed.write(memory_root / "learnings" / "orphan.md", "orphan\n")
+    crashed._release_lease()
+    committing = MemoryTransaction.begin(memory_root, "sync-committing")
+    committing.write(memory_root / "decisions" / "done.md", "done\n", event={"op": "add", "path": "done", "memory_id": "done"})
+    committing._release_lease()
+    live = MemoryTransaction.begin(memory_root, "sync-live")
+    for transaction, state in ((crashed, "open"), (committing, "committing")):
+        with transaction._update() as record:
+            record["pid"], record["state"] = 0, state
+
+    assert recover_transactions(memory_root) == {"rolled_back": 1, "replayed": 1, "skipped": 1}
+    assert kept.read_text(encoding="utf-8") == "v1\n"
+    assert not (memory_root / "learnings" / "orphan.md").exists()
+    assert (memory_root / "decisions" / "done.md").read_text(encoding="utf-8") == "done\n"
+    assert [event.memory_id for event in journal_for_memory_root(memory_root).changes()] == ["done"]
+    assert live.state == "open" and not crashed.record_dir.exists()
+    live.rollback()
+
+
+def test_begin_recovers_dead_runs_of_its_own_root(tmp_path) -> None:
+    """A project root the daemon never recovers gets its crashed record rolled back by the next run."""
+    memory_root = tmp_path / "project" / ".acreta" / "memory"
+    kept = memory_root / "learnings" / "kept.md"
+    kept.parent.mkdir(parents=True)
+    kept.write_text("v1\n", encoding="utf-8")
+    crashed = MemoryTransaction.begin(memory_root, "sync-crashed")
+    crashed.write(kept, "half-written\n")
+    with crashed._update() as record:
+        record["pid"] = 0
+    crashed._release_lease()
+
+    following = MemoryTransaction.begin(memory_root, "sync-next")
+    assert kept.read_text(encoding="utf-8") == "v1\n" and not crashed.record_dir.exists()
+    assert following.record_dir.parent == memory_root.parent / "index" / TXN_DIRNAME
+    following.rollback()
+
+
+def test_second_transaction_waits_for_the_first_and_never_undoes_its_commit(tmp_path) -> None:
+    """The run lease keeps two transactions on one root from overlapping and bounds the wait."""
+    memory_root = tmp_path / "memory"
+    shared = memory_root / "learnings" / "shared.md"
+    shared.parent.mkdir(parents=True)
+    shared.write_text("v1\n", encoding="utf-8")
+    first = MemoryTransaction.begin(memory_root, "sync-first")
+    first.write(shared, "first\n", event={"op": "update", "path": str(shared)})
+    opened: list[MemoryTransaction] = []
+    waiter = threading.Thread(target=lambda: opened.append(MemoryTransaction.begin(memory_root, "sync-second")))
+    waiter.start()
+    waiter.join(0.2)
+    assert waiter.is_alive() and not opened
+    with pytest.raises(RunLeaseTimeoutError, match="held by sync-first"):
+        MemoryTransaction.begin(memory_root, "sync-impatient", timeout=0.2)
+
+    first.commit()
+    waiter.join(5)
+    second = opened[0]
+    second.write(shared, "second\n")
+    second.write(memory_root / "learnings" / "extra.md", "extra\n")
+    assert second.rollback() == 2
+    assert shared.read_text(encoding="utf-8") == "first\n"
+    assert not (memory_root / "learnings" / "extra.md").exists()
+    third = MemoryTransaction.begin(memory_root, "sync-third")
+    assert third.commit() == 0
+
+
+def test_batch_runs_same_root_syncs_one_at_a_time(tmp_path, monkeypatch) -> None:
+    """A failed sync in a batch rolls back only its own edit, not a neighbour's committed one."""
+    trace, memory_root, _ = _seed(tmp_path)
+    failing = tmp_path / "failing.jsonl"
+    failing.write_text(trace.read_text(encoding="utf-8"), encoding="utf-8")
+    active = {"now": 0, "peak": 0}
+
+    async def _fake_run(_self: AcretaAgent, *, prompt: str, session_id, hooks=None, **_kwargs):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        try:
+            artifacts = _extract_artifacts_from_prompt(prompt)
+            existing = memory_root / "learnings" / "existing.md"
+            edit = {"file_path": str(existing), "old_string": "Old", "new_string": "New"}
+            await hooks["PreToolUse"][0].hooks[0]({"tool_name": "Edit", "tool_input": edit}, None, None)
+            await asyncio.sleep(0.05)
+            marker = "failed" if str(failing) in prompt else "kept"
+            existing.write_text(f"---\nid: existing\ntitle: Existing\n---\n{marker}.\n", encoding="utf-8")
+            await asyncio.sleep(0.05)
+            if marker == "kept":
+                summary = write_summary_markdown(
+                    {"title": "Kept", "summary": "Kept.", "date": "2026-02-01", "time": "10:00:00"},
+                    memory_root,
+                    run_id=Path(artifacts["extract"]).parent.name,
+                    layout="packed",
+                )
+                Path(artifacts["extract"]).write_text("[]\n", encoding="utf-8")
+                Path(artifacts["summary"]).write_text(json.dumps({"summary_path": str(summary)}), encoding="utf-8")
+                Path(artifacts["memory_actions"]).write_text('{"counts": {"update": 1}}', encoding="utf-8")
+            return "ok", session_id or "session"
+        finally:
+            active["now"] -= 1
+
+    monkeypatch.setattr(AcretaAgent, "_run_sdk_once", _fake_run)
+    agent = AcretaAgent(default_cwd=str(tmp_path))
+    results = agent.sync_batch(
+        [SyncJob(trace, memory_root=memory_root), SyncJob(failing, memory_root=memory_root)], concurrency=2
+    )
+    assert [item.status for item in results] == ["ok", "error"]
+    assert active["peak"] == 1
+    assert "kept." in (memory_root / "learnings" / "existing.md").read_text(encoding="utf-8")
@@ -0,0 +1,80 @@
+"""Test streaming memory export and bulk import across JSONL and Parquet."""
+
+from __future__ import annotations
+
+import json
+
+from acreta.config.settings import reload_config
+from acreta.memory.journal import journal_for_memory_root
+from acreta.memory.summary_store import list_summary_paths
+from tests.helpers import run_cli, run_cli_json
+
+
+def _use_root(monkeypatch, root) -> None:
+    """Point config at one data root."""
+    monkeypatch.setenv("ACRETA_DATA_DIR", str(root))
+    monkeypatch.setenv("ACRETA_MEMORY_DIR", str(root / "memory"))
+    monkeypatch.setenv("ACRETA_INDEX_DIR", str(root / "index"))
+    reload_config()
+
+
+def test_export_import_round_trip_dedupes_and_normalizes(tmp_path, monkeypatch) -> None:
+    """JSONL and Parquet exports load into a fresh store once; re-imports are all duplicates."""
+    source = tmp_path / "source"
+    memory = source / "memory"
+    (memory / "decisions").mkdir(parents=True)
+    (memory / "learnings").mkdir(parents=True)
+    long_body = "Keep the queue bounded. " * 20
+    (memory / "decisions" / "pin-db.md").write_text(
+        "---\nid: pin-db\ntitle: Pin sqlite\ncreated: '2026-01-05T10:00:00Z'\nconfidence: 0.9\n---\nUse WAL.\n",
+        encoding="utf-8",
+    )
+    (memory / "learnings" / "any-name.md").write_text(
+        f"---\nid: bounded-queue\ntitle: Bounded queue\ncreated: '2026-02-01T08:00:00Z'\ntags: [queue]\n---\n{long_body}\n",
+        encoding="utf-8",
+    )
+    summary_dir = memory / "summaries" / "20260203" / "101500"
+    summary_dir.mkdir(parents=True)
+    (summary_dir / "queue-session.md").write_text(
+        "---\nid: queue-session\ntitle: Queue session\ndate: '2026-02-03'\ntime: '10:15:00'\n---\nTuned it.\n",
+        encoding="utf-8",
+    )
+    _use_root(monkeypatch, source)
+    try:
+        jsonl_path, parquet_path = tmp_path / "export.jsonl", tmp_path / "export.parquet"
+        assert run_cli(["memory", "export", "--format", "jsonl", "--output", str(jsonl_path)])[0] == 0
+        assert run_cli(["memory", "export", "--format", "parquet", "--output", str(parquet_path)])[0] == 0
+        rows = [json.loads(line) for line in jsonl_path.read_text(encoding="utf-8").splitlines()]
+        assert [(row["primitive"], row["id"]) for row in rows] == [
+            ("decision", "pin-db"),
+            ("learning", "bounded-queue"),
+            ("summary", "queue-session"),
+        ]
+        _, exported = run_cli_json(["memory", "export", "--format", "json"])
+        assert exported[1]["_body"] == long_body.strip() and exported[1]["tags"] == ["queue"]
+        _, markdown = run_cli(["memory", "export"])
+        assert long_body.strip() in markdown
+
+        target = tmp_path / "target"
+        _use_root(monkeypatch, target)
+        monkeypatch.setenv("ACRETA_MEMORY_SUMMARY_LAYOUT", "packed")
+        reload_config()
+        _, first = run_cli_json(["memory", "import", str(jsonl_path), "--batch-size", "2", "--json"])
+        assert (first["imported"], first["duplicates"], first["batches"]) == (3, 0, 2)
+        imported = target / "memory"
+        assert (imported / "decisions" / "20260105-pin-sqlite.md").is_file()
+        assert (imported / "learnings" / "20260201-bounded-queue.md").is_file()
+        assert [path.name for path in list_summary_paths(imported / "summaries")] == [
+            "20260203-101500-queue-session.md"
+        ]
+        _, again = run_cli_json(["memory", "import", str(parquet_path), "--json"])
+        assert (again["imported"], again["duplicates"]) == (0, 3)
+
+        events = journal_for_memory_root(imported).changes()
+        assert [event.memory_id for event in events] == ["pin-db", "bounded-queue", "queue-session"]
+        _, listed = run_cli_json(["memory", "list", "--json"])
+        assert {item["id"] for item in listed} == {"pin-db", "bounded-queue", "queue-session"}
+    finally:
+        monkeypatch.delenv("ACRETA_MEMORY_DIR")
+        monkeypatch.delenv("ACRETA_INDEX_DIR")
+        reload_config()
@@ -0,0 +1,124 @@
+"""Test per-run trace recording and the critical-path profile report."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from claude_agent_sdk.types import (
+    AssistantMessage,
+    ResultMessage,
+    TextBlock,
+    ToolResultBlock,
+    ToolUseBlock,
+    UserMessage,
+)
+
+from acreta.runtime.agent import AcretaAgent
+from acreta.runtime.tracing import TRACE_FILENAME, active_tracer, load_trace, profile_run
+from tests.helpers import run_cli_json
+from tests.test_runtime_agent_contract import _fake_run_sdk_once
+
+
+async def _traced_fake_run_sdk_once(
+    _self: AcretaAgent,
+    *,
+    prompt: str,
+    session_id: str | None,
+    cwd: str | None,
+    allowed_tools: list[str],
+    permission_mode: str,
+    add_dirs=(),
+    env=None,
+    hooks=None,
+    agents=None,
+):
+    """Feed SDK messages for one extract pipeline call into the active tracer."""
+    tracer = active_tracer()
+    assert tracer is not None
+    command = "python3 -m acreta.memory.extract_pipeline --trace x"
+    tracer.record_message(
+        AssistantMessage(
+            content=[TextBlock(text="extracting"), ToolUseBlock(id="t1", name="Bash", input={"command": command})],
+            model="m",
+        )
+    )
+    time.sleep(0.05)
+    tracer.record_message(UserMessage(content=[ToolResultBlock(tool_use_id="t1", content="ok")]))
+    tracer.record_message(
+        ResultMessage(
+            subtype="success",
+            duration_ms=60,
+            duration_api_ms=10,
+            is_error=False,
+            num_turns=2,
+            session_id="session-1",
+            usage={"input_tokens": 100, "output_tokens": 20},
+        )
+    )
+    return await _fake_run_sdk_once(
+        _self,
+        prompt=prompt,
+        session_id=session_id,
+        cwd=cwd,
+        allowed_tools=allowed_tools,
+        permission_mode=permission_mode,
+        add_dirs=add_dirs,
+        env=env,
+        hooks=hooks,
+        agents=agents,
+    )
+
+
+def test_sync_writes_trace_and_profile_attributes_pipeline_time(tmp_path) -> None:
+    """A sync run leaves trace.jsonl whose profile charges the pipeline call."""
+    trace_path = tmp_path / "session.jsonl"
+    trace_path.write_text('{"role":"user","content":"hello"}\n', encoding="utf-8")
+    agent = AcretaAgent(default_cwd=str(tmp_path))
+    agent._run_sdk_once = _traced_fake_run_sdk_once.__get__(agent, AcretaAgent)
+    result = agent.sync(trace_path)
+
+    run_folder = Path(result["run_folder"])
+    records = load_trace(run_folder / TRACE_FILENAME)
+    assert {record["name"] for record in records if record["type"] == "span"} == {"agent", "run"}
+    tool = next(record for record in records if record["type"] == "tool")
+    assert tool["name"] == "Bash" and tool["duration_ms"] >= 40
+
+    profile = profile_run(run_folder)
+    assert set(profile["phases"]) == {"prepare", "agent", "validate"}
+    assert profile["sdk"]["num_turns"] == 2
+    assert profile["sdk"]["usage"]["input_tokens"] == 100
+    pipeline = next(row for row in profile["critical_path"] if row["category"] == "extract_pipeline")
+    assert pipeline["calls"] == 1 and pipeline["ms"] >= 40
+
+    _, single = run_cli_json(["runs", "profile", str(run_folder), "--json"])
+    assert single["run_id"] == run_folder.name
+    _, aggregate = run_cli_json(["runs", "profile", str(run_folder.parent), "--json"])
+    assert aggregate["runs"] == 1
+    assert "extract_pipeline" in {row["category"] for row in aggregate["categories"]}
+
+
+async def _silent_fake_run_sdk_once(_self: AcretaAgent, *, session_id: str | None, **_kwargs):
+    """Return without writing any artifact, like an agent that gave up early."""
+    return "ok", session_id or "session-1"
+
+
+def test_failed_runs_record_an_error_run_span(tmp_path) -> None:
+    """Sync and maintain runs that fail after the agent phase still close the run span with their error."""
+    trace_path = tmp_path / "session.jsonl"
+    trace_path.write_text('{"role":"user","content":"hello"}\n', encoding="utf-8")
+    agent = AcretaAgent(default_cwd=str(tmp_path))
+    agent._run_sdk_once = _silent_fake_run_sdk_once.__get__(agent, AcretaAgent)
+    workspace = tmp_path / ".acreta" / "workspace"
+    with pytest.raises(RuntimeError, match="missing_artifact"):
+        agent.sync(trace_path)
+    with pytest.raises(RuntimeError, match="missing_artifact"):
+        agent.maintain()
+
+    for prefix in ("sync-", "maintain-"):
+        run_folder = next(workspace.glob(f"{prefix}*"))
+        run = next(record for record in load_trace(run_folder / TRACE_FILENAME) if record.get("name") == "run")
+        assert run["status"] == "error:RuntimeError"
+        assert profile_run(run_folder)["status"] == "error:RuntimeError"
@@ -0,0 +1,59 @@
+"""Test scope-aware memory search across project and global roots."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import replace
+from pathlib import Path
+
+from acreta.app import cli
+from acreta.memory import retrieval
+from tests.helpers import make_config
+
+
+def _write(memory_dir: Path, folder: str, name: str, title: str, body: str) -> None:
+    """Write one memory file with id and title frontmatter."""
+    path = memory_dir / folder / f"{name}.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\nid: {name}\ntitle: {title}\nconfidence: 0.8\n---\n{body}\n", encoding="utf-8")
+
+
+def test_search_merges_scopes_concurrently_and_reuses_indexes(tmp_path, monkeypatch) -> None:
+    """Both roots are scanned in parallel, hits are scope-labelled, and copies collapse."""
+    repo, global_dir = tmp_path / "repo", tmp_path / "global"
+    (repo / ".git").mkdir(parents=True)
+    project_memory = repo / ".acreta" / "memory"
+    _write(project_memory, "learnings", "retry-local", "Retry policy", "Retry flaky uploads with jitter.")
+    _write(global_dir / "memory", "learnings", "retry-global", "Retry policy everywhere", "Cap retry budgets per job.")
+    _write(global_dir / "memory", "decisions", "retry-copy", "Retry copy", "Retry flaky uploads with jitter.")
+    config = replace(
+        make_config(repo / ".acreta"),
+        memory_scope="project_fallback_global",
+        global_data_dir=global_dir,
+    )
+    monkeypatch.setattr(cli, "get_config", lambda: config)
+    monkeypatch.chdir(repo)
+
+    barrier = threading.Barrier(2, timeout=5)
+    original_refresh = retrieval._RootIndex.refresh
+
+    def _refresh_together(index):
+        barrier.wait()
+        return original_refresh(index)
+
+    monkeypatch.setattr(retrieval._RootIndex, "refresh", _refresh_together)
+    hits = cli.search_memory("retry jitter budgets", limit=10)
+    monkeypatch.setattr(retrieval._RootIndex, "refresh", original_refresh)
+
+    assert [(hit["id"], hit["scope"]) for hit in hits] == [("retry-local", "project"), ("retry-global", "global")]
+    assert hits[0]["_body"] == "Retry flaky uploads with jitter." and hits[0]["score"] > 0
+
+    parses: list[Path] = []
+    original_parse = retrieval._parse_doc
+    monkeypatch.setattr(
+        retrieval, "_parse_doc", lambda root, primitive, path: parses.append(path) or original_parse(root, primitive, path)
+    )
+    _write(global_dir / "memory", "learnings", "retry-new", "Retry storms", "Add jitter to avoid retry storms.")
+    again = cli.search_memory("retry storms", limit=10)
+    assert parses == [(global_dir / "memory" / "learnings" / "retry-new.md")]
+    assert again[0]["id"] == "retry-new"
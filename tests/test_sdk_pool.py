@@ -0,0 +1,225 @@
+"""Test pooled SDK client reuse, per-job hooks, reset, and recycling."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import claude_agent_sdk
+import pytest
+from claude_agent_sdk import HookMatcher
+from claude_agent_sdk.types import AssistantMessage, ResultMessage, TextBlock
+
+from acreta.config.settings import reload_config
+from acreta.memory.summarization_pipeline import write_summary_markdown
+from acreta.runtime import sdk_pool
+from acreta.runtime.agent import AcretaAgent
+from acreta.runtime.sdk_pool import SDKClientPool, pool_key
+from tests.test_agent_memory_write_flow import _extract_artifacts_from_prompt, _extract_memory_root_from_prompt
+
+
+class _FakeClient:
+    """Stand-in for ClaudeSDKClient that records connects, prompts, and hook calls."""
+
+    instances: list[_FakeClient] = []
+
+    def __init__(self, options=None) -> None:
+        self.options = options
+        self.prompts: list[str] = []
+        self.connected = False
+        self.disconnected = False
+        self.interrupted = False
+        _FakeClient.instances.append(self)
+
+    async def connect(self) -> None:
+        self.connected = True
+
+    async def query(self, prompt: str, session_id: str = "default") -> None:
+        self.prompts.append(prompt)
+        self._session_id = session_id
+
+    async def receive_response(self):
+        prompt = self.prompts[-1]
+        if prompt == "boom":
+            raise RuntimeError("cli crashed")
+        if prompt == "slow":
+            await asyncio.sleep(30)
+        text = prompt
+        if prompt.startswith("write:") and self.options.hooks:
+            hook = self.options.hooks["PreToolUse"][0].hooks[0]
+            text = (await hook({"tool_input": {"file_path": prompt[6:]}}, None, None))["decision"]
+        yield AssistantMessage(content=[TextBlock(text=f"echo {text}")], model="fake")
+        yield ResultMessage(
+            subtype="success",
+            duration_ms=0,
+            duration_api_ms=0,
+            is_error=False,
+            num_turns=1,
+            session_id=self._session_id,
+        )
+
+    async def interrupt(self) -> None:
+        self.interrupted = True
+
+    async def disconnect(self) -> None:
+        self.disconnected = True
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    """Patch the SDK client class and reset recorded instances."""
+    _FakeClient.instances = []
+    monkeypatch.setattr(claude_agent_sdk, "ClaudeSDKClient", _FakeClient)
+    return _FakeClient
+
+
+def _hooks(tag: str) -> dict:
+    """Build a one-hook PreToolUse config that answers with ``tag``."""
+
+    async def _hook(input_data, _tool_use_id, _context):
+        return {"decision": f"{tag}:{input_data['tool_input']['file_path']}"}
+
+    return {"PreToolUse": [HookMatcher(matcher="Write|Edit", hooks=[_hook])]}
+
+
+def _run(pool: SDKClientPool, prompt: str, *, key: str = "k", hooks=None) -> list:
+    """Run one prompt on the pool with a passthrough options factory."""
+
+    class _Options:
+        def __init__(self, pooled_hooks) -> None:
+            self.hooks = pooled_hooks
+
+    return pool.run(
+        key=key, options_factory=_Options, prompt=prompt, session_id="s1", hooks=hooks, timeout=5
+    )
+
+
+def test_pool_reuses_client_and_routes_per_job_hooks(fake_client) -> None:
+    """One warm client serves sequential jobs, each seeing its own hooks."""
+    pool = SDKClientPool(max_clients=1, max_jobs_per_client=3)
+    try:
+        first = _run(pool, "write:/a.md", hooks=_hooks("job1"))
+        second = _run(pool, "write:/b.md", hooks=_hooks("job2"))
+        assert first[0].content[0].text == "echo job1:/a.md"
+        assert second[0].content[0].text == "echo job2:/b.md"
+        assert len(fake_client.instances) == 1
+        assert fake_client.instances[0].prompts == ["write:/a.md", "/clear", "write:/b.md", "/clear"]
+
+        _run(pool, "third", hooks=_hooks("job3"))
+        _run(pool, "fourth", hooks=_hooks("job4"))
+        assert len(fake_client.instances) == 2
+        assert pool.stats["recycled"] >= 1
+    finally:
+        pool.close()
+    assert all(client.disconnected for client in fake_client.instances)
+
+
+def test_pool_recycles_client_after_error(fake_client) -> None:
+    """A failing job surfaces its error and the next job gets a fresh client."""
+    pool = SDKClientPool(max_clients=1, max_jobs_per_client=10)
+    try:
+        with pytest.raises(RuntimeError, match="cli crashed"):
+            _run(pool, "boom")
+        assert _run(pool, "ok")[0].content[0].text == "echo ok"
+        assert len(fake_client.instances) == 2
+        assert fake_client.instances[0].disconnected
+    finally:
+        pool.close()
+
+
+def test_cancelled_async_job_interrupts_its_client(fake_client) -> None:
+    """A caller-side timeout interrupts and disconnects the pooled client before returning."""
+    pool = SDKClientPool(max_clients=1, max_jobs_per_client=10)
+
+    class _Options:
+        def __init__(self, pooled_hooks) -> None:
+            self.hooks = pooled_hooks
+
+    async def _slow_then_ok() -> list:
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                pool.run_async(
+                    key="k", options_factory=_Options, prompt="slow", session_id="s1", hooks=None, timeout=None
+                ),
+                timeout=0.2,
+            )
+        return await pool.run_async(
+            key="k", options_factory=_Options, prompt="ok", session_id="s1", hooks=None, timeout=5
+        )
+
+    try:
+        messages = asyncio.run(_slow_then_ok())
+        assert messages[0].content[0].text == "echo ok"
+        first, second = fake_client.instances
+        assert first.interrupted and first.disconnected
+        assert second.prompts[0] == "ok"
+        assert pool.stats["recycled"] == 1
+    finally:
+        pool.close()
+
+
+def test_agent_chat_uses_pool_when_enabled(fake_client, tmp_path, monkeypatch) -> None:
+    """With pool_enabled, repeated agent runs share one warm client."""
+    monkeypatch.setenv("ACRETA_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("ACRETA_AGENT_POOL_ENABLED", "true")
+    reload_config()
+    try:
+        agent = AcretaAgent(default_cwd=str(tmp_path))
+        response, session_id = agent.chat("hello", session_id="acreta-test")
+        assert response == "echo hello"
+        assert session_id == "acreta-test"
+        agent.chat("again")
+        assert len(fake_client.instances) == 1
+        assert pool_key({"a": 1}, None) == pool_key({"a": 1, "hooks": {"x": []}}, None)
+    finally:
+        sdk_pool.close_sdk_pool()
+        monkeypatch.delenv("ACRETA_AGENT_POOL_ENABLED")
+        reload_config()
+
+
+class _SyncClient(_FakeClient):
+    """Fake client that answers sync prompts by writing the run's artifacts and summary."""
+
+    async def receive_response(self):
+        prompt = self.prompts[-1]
+        if "- artifact_paths_json: " in prompt:
+            artifacts = _extract_artifacts_from_prompt(prompt)
+            summary = write_summary_markdown(
+                {"title": f"Run {len(self.prompts)}", "summary": "Done."},
+                _extract_memory_root_from_prompt(prompt),
+                run_id=Path(artifacts["extract"]).parent.name,
+            )
+            Path(artifacts["extract"]).write_text("[]\n", encoding="utf-8")
+            Path(artifacts["summary"]).write_text(json.dumps({"summary_path": str(summary)}) + "\n", encoding="utf-8")
+            Path(artifacts["memory_actions"]).write_text('{"counts": {}}\n', encoding="utf-8")
+            prompt = "synced"
+        async for message in super().receive_response():
+            yield message
+
+
+def test_consecutive_syncs_reuse_one_pooled_client(tmp_path, monkeypatch) -> None:
+    """Per-run paths stay out of the SDK options, so back-to-back syncs share a warm client."""
+    _FakeClient.instances = []
+    monkeypatch.setattr(claude_agent_sdk, "ClaudeSDKClient", _SyncClient)
+    monkeypatch.setenv("ACRETA_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("ACRETA_INDEX_DIR", str(tmp_path / "index"))
+    monkeypatch.setenv("ACRETA_AGENT_POOL_ENABLED", "true")
+    reload_config()
+    try:
+        agent = AcretaAgent(default_cwd=str(tmp_path))
+        runs = []
+        for name in ("a", "b"):
+            trace = tmp_path / "traces" / f"{name}.jsonl"
+            trace.parent.mkdir(parents=True, exist_ok=True)
+            trace.write_text('{"role":"user","content":"hi"}\n', encoding="utf-8")
+            runs.append(agent.sync(trace, memory_root=tmp_path / "memory"))
+        assert runs[0]["run_folder"] != runs[1]["run_folder"]
+        assert all(Path(run["summary_path"]).exists() for run in runs)
+        assert len(_FakeClient.instances) == 1
+        assert sdk_pool.get_sdk_pool().stats == {"created": 1, "reused": 1, "recycled": 0}
+    finally:
+        sdk_pool.close_sdk_pool()
+        for key in ("ACRETA_DATA_DIR", "ACRETA_INDEX_DIR", "ACRETA_AGENT_POOL_ENABLED"):
+            monkeypatch.delenv(key)
+        reload_config()
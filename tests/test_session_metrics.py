@@ -0,0 +1,151 @@
+"""Test deterministic session metrics profiles and their consumers."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+from acreta.app import dashboard
+from acreta.config.settings import reload_config
+from acreta.runtime.prompts.sync import build_sync_prompt
+from acreta.sessions import catalog
+from acreta.sessions.metrics import compute_session_metrics
+
+
+def _setup(tmp_path, monkeypatch) -> None:
+    """Set up test environment with tmp dirs and config."""
+    monkeypatch.setenv("ACRETA_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("ACRETA_INDEX_DIR", str(tmp_path / "index"))
+    monkeypatch.setenv(
+        "ACRETA_SESSIONS_DB", str(tmp_path / "index" / "sessions.sqlite3")
+    )
+    reload_config()
+    catalog.init_sessions_db()
+
+
+def _write_jsonl(path: Path, rows: list[dict]) -> Path:
+    """Write rows as a JSONL trace file."""
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n", encoding="utf-8")
+    return path
+
+
+def test_codex_trace_metrics(tmp_path) -> None:
+    """Codex traces produce tool, error, token and model usage profiles."""
+    trace = _write_jsonl(
+        tmp_path / "codex.jsonl",
+        [
+            {"type": "turn_context", "timestamp": "2026-02-01T10:00:00Z", "payload": {"model": "gpt-x"}},
+            {"type": "event_msg", "payload": {"type": "user_message", "message": "go"}},
+            {
+                "type": "response_item",
+                "payload": {"type": "function_call", "name": "shell", "arguments": '{"path": "src/a.py"}'},
+            },
+            {
+                "type": "response_item",
+                "payload": {
+                    "type": "function_call_output",
+                    "output": json.dumps({"output": "boom", "metadata": {"exit_code": 2}}),
+                },
+            },
+            {
+                "type": "response_item",
+                "payload": {
+                    "type": "function_call_output",
+                    "output": json.dumps({"output": "grep: error handling docs", "metadata": {"exit_code": 0}}),
+                },
+            },
+            {"type": "response_item", "payload": {"type": "custom_tool_call_output", "output": "no errors found"}},
+            {
+                "type": "event_msg",
+                "timestamp": "2026-02-01T10:01:00Z",
+                "payload": {"type": "token_count", "info": {"last_token_usage": {"input_tokens": 10, "output_tokens": 4}}},
+            },
+        ],
+    )
+    metrics = compute_session_metrics(trace)
+    assert metrics is not None
+    assert metrics.user_turns == 1
+    assert metrics.tool_usage == {"shell": 1}
+    assert metrics.error_turns == 1
+    assert metrics.files_touched == ["src/a.py"]
+    assert metrics.duration_ms == 60_000
+    assert metrics.model_usage == {"gpt-x": {"input": 10, "output": 4, "total": 14, "calls": 1}}
+    assert compute_session_metrics(tmp_path / "missing.jsonl") is None
+
+
+def test_index_stores_metrics_and_dashboard_aggregates(monkeypatch, tmp_path) -> None:
+    """Index-time metrics fill dashboard model/tool usage and duration."""
+    _setup(tmp_path, monkeypatch)
+    trace = _write_jsonl(
+        tmp_path / "run-m.jsonl",
+        [
+            {"type": "user", "timestamp": "2026-02-01T10:00:00Z", "message": {"content": "edit"}},
+            {
+                "type": "assistant",
+                "timestamp": "2026-02-01T10:00:02Z",
+                "message": {
+                    "model": "claude-x",
+                    "content": [{"type": "tool_use", "name": "Edit", "input": {"file_path": "a.py"}}],
+                    "usage": {"input_tokens": 5, "output_tokens": 1},
+                },
+            },
+        ],
+    )
+
+    class _Adapter:
+        @staticmethod
+        def iter_sessions(traces_dir, start=None, end=None, known_run_ids=None):
+            _ = (traces_dir, start, end, known_run_ids)
+            return [
+                SimpleNamespace(
+                    run_id="run-m",
+                    agent_type="claude",
+                    session_path=str(trace),
+                    start_time="2026-02-01T10:00:00+00:00",
+                    repo_name=None,
+                    status="completed",
+                    duration_ms=0,
+                    message_count=2,
+                    tool_call_count=1,
+                    error_count=0,
+                    total_tokens=6,
+                    summaries=[],
+                )
+            ]
+
+    monkeypatch.setattr(
+        catalog.adapter_registry, "get_connected_platform_paths", lambda _p: {"claude": tmp_path}
+    )
+    monkeypatch.setattr(catalog.adapter_registry, "get_connected_agents", lambda _p: ["claude"])
+    monkeypatch.setattr(catalog.adapter_registry, "get_adapter", lambda _name: _Adapter)
+
+    assert len(catalog.index_new_sessions(return_details=True)) == 1
+    profile = catalog.fetch_session_metrics(["run-m"])["run-m"]
+    assert profile["tool_usage"] == {"Edit": 1}
+    assert catalog.fetch_session_doc("run-m")["duration_ms"] == 2000
+
+    rows = dashboard._sqlite_rows(None, datetime.now(timezone.utc), "all")
+    stats = dashboard._compute_stats(rows)
+    assert stats["tool_usage"] == {"Edit": 1}
+    assert stats["model_usage"]["claude-x"]["total"] == 6
+    assert stats["totals"]["input_tokens"] == 5
+
+
+def test_sync_prompt_passes_metrics_json(tmp_path) -> None:
+    """Stored metrics reach both pipeline commands instead of an empty object."""
+    prompt = build_sync_prompt(
+        trace_file=tmp_path / "trace.jsonl",
+        memory_root=tmp_path / "memory",
+        run_folder=tmp_path / "run",
+        artifact_paths={
+            "extract": tmp_path / "extract.json",
+            "summary": tmp_path / "summary.json",
+            "subagents_log": tmp_path / "subagents.log",
+            "memory_actions": tmp_path / "memory_actions.json",
+        },
+        metadata={"run_id": "r1"},
+        metrics={"tool_calls": 3},
+    )
+    assert prompt.count("--metrics-json '{\"tool_calls\": 3}'") == 2
@@ -0,0 +1,158 @@
+"""Test trivial-session triage between indexing and extraction."""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import replace
+from types import ModuleType
+
+from acreta.app import daemon
+from acreta.config.settings import reload_config
+from acreta.sessions import catalog
+from acreta.sessions.catalog import IndexedSession
+from acreta.sessions.triage import triage_session
+from tests.helpers import make_config
+
+
+def _setup(tmp_path, monkeypatch) -> None:
+    """Set up test environment with tmp dirs and config."""
+    monkeypatch.setenv("ACRETA_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("ACRETA_MEMORY_DIR", str(tmp_path / "memory"))
+    monkeypatch.setenv("ACRETA_INDEX_DIR", str(tmp_path / "index"))
+    monkeypatch.setenv(
+        "ACRETA_SESSIONS_DB", str(tmp_path / "index" / "sessions.sqlite3")
+    )
+    reload_config()
+    catalog.init_sessions_db()
+
+
+def test_triage_rules_and_classifier(tmp_path, monkeypatch) -> None:
+    """Threshold rules flag noise; a classifier verdict takes precedence."""
+    config = make_config(tmp_path)
+    assert triage_session({"message_count": 2}, None, config).reason == "messages<3"
+    assert triage_session({"message_count": 6}, None, config).reason == "low_activity"
+    assert not triage_session({"message_count": 6, "error_count": 1}, None, config).trivial
+    assert not triage_session({}, {"message_count": 8, "tool_calls": 4}, config).trivial
+
+    module = ModuleType("acreta_test_triage_classifier")
+    module.always_trivial = lambda metrics: metrics["tool_calls"] < 100
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+    with_classifier = replace(config, triage_classifier=f"{module.__name__}:always_trivial")
+    decision = triage_session({}, {"message_count": 8, "tool_calls": 4}, with_classifier)
+    assert decision.trivial and decision.reason == "classifier"
+
+    def _broken(_metrics):
+        raise RuntimeError("model offline")
+
+    module.broken = _broken
+    broken = replace(config, triage_classifier=f"{module.__name__}:broken")
+    assert triage_session({"message_count": 2}, None, broken).reason == "messages<3"
+    assert not triage_session({}, {"message_count": 8, "tool_calls": 4}, broken).trivial
+
+
+def test_sync_skips_trivial_sessions_unless_forced(tmp_path, monkeypatch) -> None:
+    """Trivial sessions get skipped_trivial status and never reach the agent."""
+    _setup(tmp_path, monkeypatch)
+    sessions = []
+    for run_id, messages, tools in (("run-hi", 2, 0), ("run-real", 12, 5)):
+        path = tmp_path / f"{run_id}.jsonl"
+        path.write_text('{"role":"user","content":"x"}\n', encoding="utf-8")
+        catalog.index_session_for_fts(
+            run_id=run_id,
+            agent_type="claude",
+            content=run_id,
+            message_count=messages,
+            tool_call_count=tools,
+            session_path=str(path),
+        )
+        sessions.append(IndexedSession(run_id, "claude", str(path), None))
+
+    synced: list[str] = []
+    monkeypatch.setattr(
+        "acreta.sessions.catalog.index_new_sessions", lambda **_kwargs: list(sessions)
+    )
+    monkeypatch.setattr(
+        "acreta.runtime.agent.AcretaAgent.sync",
+        lambda _self, trace_path, **_kwargs: synced.append(str(trace_path)) or {},
+    )
+
+    def _sync(force: bool, run_id: str | None = None):
+        return daemon.run_sync_once(
+            run_id=run_id,
+            agent_filter=None,
+            no_extract=False,
+            force=force,
+            max_sessions=5,
+            dry_run=False,
+            ignore_lock=True,
+            trigger="test",
+        )
+
+    _, summary = _sync(force=False)
+    assert summary.extracted_sessions == 1
+    assert summary.skipped_sessions == 1
+    assert [p.endswith("run-real.jsonl") for p in synced] == [True]
+    jobs = {row["run_id"]: row for row in catalog.list_session_jobs(limit=10)}
+    assert jobs["run-hi"]["status"] == catalog.JOB_STATUS_SKIPPED_TRIVIAL
+    assert jobs["run-hi"]["skip_reason"] == "messages<3"
+    assert catalog.count_session_jobs_by_status()["skipped_trivial"] == 1
+    assert not catalog.enqueue_session_job("run-hi")
+
+    _, forced = _sync(force=False, run_id="run-hi")
+    assert forced.extracted_sessions == 1
+    assert synced[-1].endswith("run-hi.jsonl")
+
+
+def test_grown_trivial_session_is_retriaged(tmp_path, monkeypatch) -> None:
+    """A skipped session that grows is re-triaged and extracted once it is no longer trivial."""
+    _setup(tmp_path, monkeypatch)
+    trace = tmp_path / "run-grow.jsonl"
+    trace.write_text('{"type":"user","message":{"role":"user","content":"hi"}}\n', encoding="utf-8")
+    catalog.index_session_for_fts(
+        run_id="run-grow", agent_type="claude", content="hi", session_path=str(trace)
+    )
+    catalog.refresh_session_metrics("run-grow", trace)
+    pending = [IndexedSession("run-grow", "claude", str(trace), None)]
+    monkeypatch.setattr(
+        "acreta.sessions.catalog.index_new_sessions",
+        lambda **_kwargs: [pending.pop()] if pending else [],
+    )
+    synced: list[str] = []
+    monkeypatch.setattr(
+        "acreta.runtime.agent.AcretaAgent.sync",
+        lambda _self, trace_path, **_kwargs: synced.append(str(trace_path)) or {},
+    )
+
+    def _sync():
+        return daemon.run_sync_once(
+            run_id=None,
+            agent_filter=None,
+            no_extract=False,
+            force=False,
+            max_sessions=5,
+            dry_run=False,
+            ignore_lock=True,
+            trigger="test",
+        )
+
+    def _append(*lines: str) -> None:
+        with trace.open("a", encoding="utf-8") as handle:
+            handle.write("".join(line + "\n" for line in lines))
+
+    _sync()
+    assert synced == [] and catalog.list_grown_sessions() == []
+    _append('{"type":"assistant","message":{"role":"assistant","content":[]}}')
+    assert [item.retriage for item in catalog.list_grown_sessions()] == [True]
+    _sync()
+    assert synced == [] and catalog.list_grown_sessions() == []
+    jobs = {row["run_id"]: row for row in catalog.list_session_jobs(limit=10)}
+    assert jobs["run-grow"]["status"] == catalog.JOB_STATUS_SKIPPED_TRIVIAL
+
+    _append(
+        '{"type":"user","message":{"role":"user","content":[{"type":"tool_result","is_error":true}]}}',
+        '{"type":"assistant","message":{"role":"assistant","content":[]}}',
+    )
+    _sync()
+    assert synced == [str(trace)]
+    jobs = {row["run_id"]: row for row in catalog.list_session_jobs(limit=10)}
+    assert jobs["run-grow"]["status"] == catalog.JOB_STATUS_DONE
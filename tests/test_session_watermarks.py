@@ -0,0 +1,175 @@
+"""Test incremental extraction watermarks for growing session traces."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from acreta.app import daemon
+from acreta.config.settings import reload_config
+from acreta.memory.utils import read_trace_text
+from acreta.sessions import catalog
+
+
+def _setup(tmp_path, monkeypatch) -> None:
+    """Set up test environment with tmp dirs and config."""
+    monkeypatch.setenv("ACRETA_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("ACRETA_MEMORY_DIR", str(tmp_path / "memory"))
+    monkeypatch.setenv("ACRETA_INDEX_DIR", str(tmp_path / "index"))
+    monkeypatch.setenv(
+        "ACRETA_SESSIONS_DB", str(tmp_path / "index" / "sessions.sqlite3")
+    )
+    reload_config()
+    catalog.init_sessions_db()
+
+
+def _sync(run_id: str | None = None, *, force: bool = False):
+    """Run one sync cycle with test-friendly defaults."""
+    return daemon.run_sync_once(
+        run_id=run_id,
+        agent_filter=None,
+        no_extract=False,
+        force=force,
+        max_sessions=5,
+        dry_run=False,
+        ignore_lock=True,
+        trigger="test",
+    )
+
+
+def _patch_sync(monkeypatch, calls: list[dict]) -> None:
+    """Record lead-agent sync calls instead of running the SDK."""
+
+    def _fake_sync(_self, trace_path, **kwargs):
+        calls.append({"trace_path": Path(trace_path), **kwargs})
+        return {"summary_path": f"/tmp/summary-{len(calls)}.md", "counts": {}}
+
+    monkeypatch.setattr("acreta.runtime.agent.AcretaAgent.sync", _fake_sync)
+    monkeypatch.setattr(
+        "acreta.sessions.catalog.index_new_sessions", lambda **_kwargs: []
+    )
+
+
+def test_compute_trace_watermark_stops_at_last_full_line(tmp_path) -> None:
+    """Partial trailing lines are excluded from the watermark."""
+    trace = tmp_path / "trace.jsonl"
+    trace.write_bytes(b'{"a":1}\n{"b":2}\n{"c":')
+    mark = catalog.compute_trace_watermark(trace)
+    assert mark is not None
+    assert mark.byte_offset == 16
+    assert mark.line_count == 2
+    assert read_trace_text(trace, mark.byte_offset) == '{"c":'
+
+
+def test_grown_session_resumes_from_watermark(tmp_path, monkeypatch) -> None:
+    """Appended sessions are re-enqueued and extracted from the stored offset."""
+    _setup(tmp_path, monkeypatch)
+    trace = tmp_path / "run-grow.jsonl"
+    trace.write_text('{"role":"user","content":"one"}\n', encoding="utf-8")
+    catalog.index_session_for_fts(
+        run_id="run-grow",
+        agent_type="claude",
+        content="one",
+        session_path=str(trace),
+    )
+    calls: list[dict] = []
+    _patch_sync(monkeypatch, calls)
+
+    _sync("run-grow")
+    first_offset = trace.stat().st_size
+    assert calls[0]["start_offset"] == 0
+    assert catalog.fetch_session_watermark("run-grow")["byte_offset"] == first_offset
+    assert catalog.list_grown_sessions() == []
+
+    with trace.open("a", encoding="utf-8") as handle:
+        handle.write('{"role":"assistant","content":"two"}\n')
+    assert [item.run_id for item in catalog.list_grown_sessions()] == ["run-grow"]
+
+    code, summary = _sync()
+    assert code == daemon.EXIT_OK
+    assert summary.extracted_sessions == 1
+    assert calls[1]["start_offset"] == first_offset
+    assert calls[1]["previous_summary_path"] == "/tmp/summary-1.md"
+    assert catalog.latest_service_run("sync")["details"]["grown_sessions"] == 1
+    assert catalog.list_grown_sessions() == []
+
+
+def test_rewritten_trace_falls_back_to_full_extraction(tmp_path, monkeypatch) -> None:
+    """A changed prefix or force flag resets extraction to offset zero."""
+    _setup(tmp_path, monkeypatch)
+    trace = tmp_path / "run-rewrite.jsonl"
+    trace.write_text('{"role":"user","content":"one"}\n', encoding="utf-8")
+    catalog.index_session_for_fts(
+        run_id="run-rewrite",
+        agent_type="claude",
+        content="one",
+        session_path=str(trace),
+    )
+    calls: list[dict] = []
+    _patch_sync(monkeypatch, calls)
+    _sync("run-rewrite")
+
+    trace.write_text(
+        '{"role":"user","content":"ONE"}\n{"role":"user","content":"x"}\n',
+        encoding="utf-8",
+    )
+    _sync("run-rewrite")
+    assert calls[1]["start_offset"] == 0
+
+    with trace.open("a", encoding="utf-8") as handle:
+        handle.write('{"role":"assistant","content":"more"}\n')
+    _sync("run-rewrite", force=True)
+    assert calls[2]["start_offset"] == 0
+    assert calls[2]["previous_summary_path"] is None
+
+
+def test_partial_tail_and_non_jsonl_traces_are_not_regrown(tmp_path, monkeypatch) -> None:
+    """Only newline-terminated appends to JSONL traces re-enqueue a session."""
+    _setup(tmp_path, monkeypatch)
+    trace = tmp_path / "run-tail.jsonl"
+    trace.write_text('{"role":"user","content":"one"}\n{"role":', encoding="utf-8")
+    state_db = tmp_path / "state.vscdb"
+    state_db.write_bytes(b"sqlite-bytes")
+    for run_id, path in (("run-tail", trace), ("run-cursor", state_db)):
+        catalog.index_session_for_fts(
+            run_id=run_id, agent_type="claude", content="x", session_path=str(path)
+        )
+    calls: list[dict] = []
+    _patch_sync(monkeypatch, calls)
+    _sync("run-tail")
+    _sync("run-cursor")
+    assert catalog.fetch_session_watermark("run-cursor") is None
+    assert catalog.list_grown_sessions() == []
+
+    with state_db.open("ab") as handle:
+        handle.write(b"more pages\n")
+    with trace.open("a", encoding="utf-8") as handle:
+        handle.write('"assistant"')
+    assert catalog.list_grown_sessions() == []
+
+    with trace.open("a", encoding="utf-8") as handle:
+        handle.write("}\n")
+    assert [item.run_id for item in catalog.list_grown_sessions()] == ["run-tail"]
+    assert catalog.resolve_extraction_start("run-cursor", state_db)["start_offset"] == 0
+
+
+def test_grown_session_refreshes_metrics_profile(tmp_path, monkeypatch) -> None:
+    """A re-enqueued session is extracted with metrics covering the appended turns."""
+    _setup(tmp_path, monkeypatch)
+    trace = tmp_path / "run-profile.jsonl"
+    trace.write_text(
+        '{"type":"user","message":{"role":"user","content":"one"}}\n', encoding="utf-8"
+    )
+    catalog.index_session_for_fts(
+        run_id="run-profile", agent_type="claude", content="one", session_path=str(trace)
+    )
+    catalog.refresh_session_metrics("run-profile", trace)
+    calls: list[dict] = []
+    _patch_sync(monkeypatch, calls)
+    _sync("run-profile")
+    assert calls[0]["metrics"]["message_count"] == 1
+
+    with trace.open("a", encoding="utf-8") as handle:
+        handle.write('{"type":"assistant","message":{"role":"assistant","content":[]}}\n')
+    _sync()
+    assert calls[1]["metrics"]["message_count"] == 2
+    assert catalog.fetch_session_metrics(["run-profile"])["run-profile"]["assistant_turns"] == 1
@@ -0,0 +1,73 @@
+"""Test cached platform and memory counters behind ``acreta status`` and ``connect list``."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from acreta.adapters import registry
+from acreta.config.settings import reload_config
+from acreta.sessions import catalog
+from tests.helpers import run_cli, run_cli_json
+
+_TRACE = '{"type":"user","timestamp":"2026-02-14T00:00:00Z","message":{"role":"user","content":"hi"}}\n'
+
+
+def _write_trace(traces: Path, name: str) -> None:
+    """Write one minimal Claude session trace."""
+    path = traces / "proj" / f"{name}.jsonl"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(_TRACE, encoding="utf-8")
+
+
+def test_status_reads_counters_until_indexer_or_live_refresh(tmp_path, monkeypatch) -> None:
+    """Status never walks traces or memories on a warm cache; indexing changed traces and ``--live`` refresh it."""
+    for key, value in {
+        "ACRETA_DATA_DIR": tmp_path,
+        "ACRETA_MEMORY_DIR": tmp_path / "memory",
+        "ACRETA_INDEX_DIR": tmp_path / "index",
+        "ACRETA_SESSIONS_DB": tmp_path / "index" / "sessions.sqlite3",
+        "ACRETA_PLATFORMS_PATH": tmp_path / "platforms.json",
+    }.items():
+        monkeypatch.setenv(key, str(value))
+    reload_config()
+    try:
+        traces = tmp_path / "claude"
+        _write_trace(traces, "s1")
+        _write_trace(traces, "s2")
+        code, output = run_cli(["connect", "claude", "--path", str(traces)])
+        assert code == 0 and "Sessions: 2" in output
+        learning = tmp_path / "memory" / "learnings" / "a.md"
+        learning.parent.mkdir(parents=True, exist_ok=True)
+        learning.write_text("---\nid: a\ntitle: A\n---\nA.\n", encoding="utf-8")
+        _write_trace(traces, "s3")
+
+        scans: list[str] = []
+        original_scan = registry._scan_sessions
+        monkeypatch.setattr(registry, "_scan_sessions", lambda path, name: scans.append(name) or original_scan(path, name))
+        _, first = run_cli_json(["status", "--json"])
+        _, second = run_cli_json(["status", "--json"])
+        assert scans == []
+        assert [(row["name"], row["session_count"]) for row in second["platforms"]] == [("claude", 2)]
+        assert second["platforms"][0]["total_bytes"] == 2 * len(_TRACE)
+        assert (first["memory_count"], first["memory_counts"]["cached"]) == (1, False)
+        assert (second["memory_count"], second["memory_counts"]["cached"]) == (1, True)
+
+        assert len(catalog.index_new_sessions(return_details=True)) == 3
+        assert scans == ["claude"]
+        assert catalog.index_new_sessions() == 0
+        assert scans == ["claude"]
+        code, output = run_cli(["memory", "add", "--title", "Retry budget", "--body", "Cap retries."])
+        assert code == 0
+        _, indexed = run_cli_json(["status", "--json"])
+        assert indexed["platforms"][0]["session_count"] == 3
+        assert (indexed["memory_count"], indexed["memory_counts"]["by_type"]["learning"]) == (2, 2)
+
+        _write_trace(traces, "s4")
+        _, live = run_cli_json(["status", "--json", "--live"])
+        assert live["platforms"][0]["session_count"] == 4 and live["memory_counts"]["cached"] is False
+        code, output = run_cli(["connect", "list"])
+        assert "claude:" in output and "(4 sessions, ok)" in output
+    finally:
+        for key in ("ACRETA_MEMORY_DIR", "ACRETA_INDEX_DIR", "ACRETA_SESSIONS_DB", "ACRETA_PLATFORMS_PATH"):
+            monkeypatch.delenv(key)
+        reload_config()
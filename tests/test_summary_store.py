@@ -0,0 +1,86 @@
+"""Test summary storage layouts: packed writes, listing, materialization, and migration."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from acreta.app import dashboard
+from acreta.config.settings import reload_config
+from acreta.memory.summarization_pipeline import write_summary_markdown
+from acreta.memory.summary_store import PACKS_DIRNAME, list_summary_paths, summary_exists
+from acreta.memory.utils import read_previous_summary
+from acreta.sessions import catalog
+from acreta.sessions.catalog import TraceWatermark
+from tests.helpers import run_cli, run_cli_json
+
+
+def _setup(tmp_path, monkeypatch, layout: str) -> Path:
+    """Point config at ``tmp_path`` with the given summary layout and return the memory dir."""
+    monkeypatch.setenv("ACRETA_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("ACRETA_MEMORY_DIR", str(tmp_path / "memory"))
+    monkeypatch.setenv("ACRETA_INDEX_DIR", str(tmp_path / "index"))
+    monkeypatch.setenv("ACRETA_SESSIONS_DB", str(tmp_path / "index" / "sessions.sqlite3"))
+    monkeypatch.setenv("ACRETA_MEMORY_SUMMARY_LAYOUT", layout)
+    reload_config()
+    catalog.init_sessions_db()
+    return tmp_path / "memory"
+
+
+def _payload(title: str, date: str, time: str) -> dict:
+    """Build a minimal summary pipeline payload."""
+    return {"title": title, "summary": f"{title} body.", "date": date, "time": time}
+
+
+def test_packed_summaries_are_listed_read_and_materialized(tmp_path, monkeypatch) -> None:
+    """Packed summaries need no per-summary directories yet behave like files for readers."""
+    memory = _setup(tmp_path, monkeypatch, "packed")
+    try:
+        first = write_summary_markdown(_payload("Queue fix", "2026-02-01", "09:00:00"), memory)
+        second = write_summary_markdown(_payload("Cache tuning", "2026-02-03", "10:30:00"), memory)
+        summaries = memory / "summaries"
+        assert first == summaries / "2026-02" / "20260201-090000-queue-fix.md"
+        assert sorted(path.name for path in summaries.iterdir()) == [PACKS_DIRNAME]
+        assert summary_exists(first) and read_previous_summary(second) == "Cache tuning body."
+
+        _, listed = run_cli_json(["memory", "list", "--json"])
+        assert {item["title"] for item in listed} == {"Queue fix", "Cache tuning"}
+        titles = {fm.get("title") for fm in dashboard._load_all_memories()}
+        assert {"Queue fix", "Cache tuning"} <= titles
+
+        _, materialized = run_cli_json(["memory", "materialize-summaries", "--json"])
+        assert materialized["materialized"] == [str(first), str(second)]
+        assert first.read_text(encoding="utf-8").endswith("Queue fix body.\n")
+        assert list_summary_paths(summaries) == [first, second]
+    finally:
+        monkeypatch.delenv("ACRETA_MEMORY_SUMMARY_LAYOUT")
+        reload_config()
+
+
+def test_migrate_tree_to_packed_and_back_keeps_resume_paths(tmp_path, monkeypatch) -> None:
+    """Migration moves every summary, prunes empty dirs, and rewrites stored watermarks."""
+    memory = _setup(tmp_path, monkeypatch, "tree")
+    try:
+        legacy = write_summary_markdown(_payload("Old run", "2025-12-30", "23:59:59"), memory)
+        assert legacy == memory / "summaries" / "20251230" / "235959" / "old-run.md"
+        catalog.record_session_watermark(
+            "run-1",
+            session_path="/tmp/s.jsonl",
+            watermark=TraceWatermark(byte_offset=10, line_count=1, content_hash="h"),
+            summary_path=str(legacy.resolve()),
+        )
+
+        _, result = run_cli_json(["memory", "migrate-summaries", "--layout", "packed", "--json"])
+        assert (result["layout"], result["moved"], result["packed"]) == ("packed", 1, 1)
+        assert result["watermarks_updated"] == 1
+        assert sorted(path.name for path in (memory / "summaries").iterdir()) == [PACKS_DIRNAME]
+        stored = Path(catalog.fetch_session_watermark("run-1")["summary_path"])
+        assert stored.name == "20251230-235959-old-run.md"
+        assert read_previous_summary(stored) == "Old run body."
+
+        code, output = run_cli(["memory", "migrate-summaries", "--layout", "tree"])
+        assert code == 0 and "unpacked=1" in output
+        assert legacy.is_file() and not (memory / "summaries" / PACKS_DIRNAME).exists()
+        assert catalog.fetch_session_watermark("run-1")["summary_path"] == str(legacy.resolve())
+    finally:
+        monkeypatch.delenv("ACRETA_MEMORY_SUMMARY_LAYOUT")
+        reload_config()
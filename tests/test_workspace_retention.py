@@ -0,0 +1,136 @@
+"""Test workspace run-folder retention: monthly archives, index lookup, and maintain hook."""
+
+from __future__ import annotations
+
+import json
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from acreta.runtime.agent import AcretaAgent
+from acreta.runtime.workspace_retention import (
+    ARCHIVE_DIRNAME,
+    compact_workspace,
+    load_archive_index,
+)
+from tests.helpers import run_cli_json
+
+
+def _make_run(workspace: Path, name: str) -> Path:
+    """Create one run folder with a couple of artifacts."""
+    folder = workspace / name
+    folder.mkdir(parents=True)
+    (folder / "extract.json").write_text("[]\n", encoding="utf-8")
+    (folder / "agent.log").write_text(f"{name}\n", encoding="utf-8")
+    return folder
+
+
+def test_compact_keeps_recent_runs_and_restores_archived_ones(tmp_path) -> None:
+    """Runs past both limits move into month zips and can be restored by id."""
+    workspace = tmp_path / "workspace"
+    for name in (
+        "sync-20250103-101010-aaaaaa",
+        "sync-20250128-101010-bbbbbb",
+        "maintain-20250301-101010-cccccc",
+        "sync-20251230-101010-dddddd",
+        "sync-20260101-101010-eeeeee",
+    ):
+        _make_run(workspace, name)
+    (workspace / ".claude").mkdir()
+
+    result = compact_workspace(
+        workspace, keep_runs=1, keep_days=7, now=datetime(2026, 1, 2, tzinfo=timezone.utc)
+    )
+
+    assert (result.kept, result.archived) == (2, 3)
+    assert sorted(result.archives) == ["2025-01.zip", "2025-03.zip"]
+    assert sorted(path.name for path in workspace.iterdir()) == [
+        ".claude",
+        ARCHIVE_DIRNAME,
+        "sync-20251230-101010-dddddd",
+        "sync-20260101-101010-eeeeee",
+    ]
+    index = load_archive_index(workspace)
+    assert index["sync-20250128-101010-bbbbbb"]["archive"] == "2025-01.zip"
+    assert index["maintain-20250301-101010-cccccc"]["files"] == ["agent.log", "extract.json"]
+
+    _, restored = run_cli_json(
+        ["runs", "restore", "sync-20250103-101010-aaaaaa", "--workspace", str(workspace), "--json"]
+    )
+    restored_folder = Path(restored["run_folder"])
+    assert (restored_folder / "agent.log").read_text(encoding="utf-8") == "sync-20250103-101010-aaaaaa\n"
+
+    again = compact_workspace(
+        workspace, keep_runs=1, keep_days=7, now=datetime(2026, 1, 2, tzinfo=timezone.utc)
+    )
+    assert again.archived == 1
+    assert len(load_archive_index(workspace)) == 3
+
+
+def test_failed_append_leaves_month_archive_untouched(tmp_path, monkeypatch) -> None:
+    """A crash while appending keeps the old archive bytes and the run folder; the next pass finishes."""
+    workspace = tmp_path / "workspace"
+    now = datetime(2026, 1, 2, tzinfo=timezone.utc)
+    _make_run(workspace, "sync-20250103-101010-aaaaaa")
+    compact_workspace(workspace, keep_runs=0, keep_days=7, now=now)
+    archive_path = workspace / ARCHIVE_DIRNAME / "2025-01.zip"
+    before = archive_path.read_bytes()
+    _make_run(workspace, "sync-20250128-101010-bbbbbb")
+
+    def _crash(*_args, **_kwargs):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(zipfile.ZipFile, "write", _crash)
+        try:
+            compact_workspace(workspace, keep_runs=0, keep_days=7, now=now)
+        except OSError:
+            pass
+    assert archive_path.read_bytes() == before
+    assert (workspace / "sync-20250128-101010-bbbbbb").exists()
+    assert sorted(path.name for path in archive_path.parent.iterdir()) == ["2025-01.zip", "index.jsonl"]
+
+    assert compact_workspace(workspace, keep_runs=0, keep_days=7, now=now).archived == 1
+    with zipfile.ZipFile(archive_path) as archive:
+        assert {name.split("/", 1)[0] for name in archive.namelist()} == {
+            "sync-20250103-101010-aaaaaa",
+            "sync-20250128-101010-bbbbbb",
+        }
+
+
+async def _fake_maintain_sdk_once(
+    _self: AcretaAgent,
+    *,
+    prompt: str,
+    session_id: str | None,
+    cwd: str | None,
+    allowed_tools: list[str],
+    permission_mode: str,
+    add_dirs=(),
+    env=None,
+    hooks=None,
+    agents=None,
+):
+    """Write an empty maintain report like a no-op maintain agent."""
+    _ = (session_id, cwd, allowed_tools, permission_mode, add_dirs, env, hooks, agents)
+    line = next(line for line in prompt.splitlines() if line.startswith("- artifact_paths: "))
+    artifacts = json.loads(line.split(": ", 1)[1])
+    Path(artifacts["maintain_actions"]).write_text(
+        json.dumps({"actions": [], "counts": {"unchanged": 0}}) + "\n", encoding="utf-8"
+    )
+    return "ok", "session-1"
+
+
+def test_maintain_compacts_old_runs_but_keeps_its_own(tmp_path) -> None:
+    """Maintain reports retention and never archives the run folder it created."""
+    workspace = tmp_path / ".acreta" / "workspace"
+    _make_run(workspace, "sync-20240101-000000-aaaaaa")
+    agent = AcretaAgent(default_cwd=str(tmp_path))
+    agent._workspace_retention = (0, 0)
+    agent._run_sdk_once = _fake_maintain_sdk_once.__get__(agent, AcretaAgent)
+
+    result = agent.maintain()
+
+    assert result["retention"]["archived"] == 1
+    assert Path(result["run_folder"]).exists()
+    assert "sync-20240101-000000-aaaaaa" in load_archive_index(workspace)